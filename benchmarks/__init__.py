@@ -0,0 +1,3 @@
+"""
+Benchmarks for the PypeIt reduction hot paths; see ``asv.conf.json``.
+"""
@@ -0,0 +1,69 @@
+"""
+Benchmarks for the 1D and 3D coadding.
+"""
+import numpy as np
+
+from pypeit.core import coadd
+from pypeit.core import datacube
+from pypeit.core.wavecal import wvutils
+
+from . import synthetic
+
+
+class Combspec:
+    """
+    Coadd a set of 1D spectra.
+    """
+    params = [3, 10]
+    param_names = ['nexp']
+
+    def setup(self, nexp):
+        self.waves, self.fluxes, self.ivars, self.gpms = synthetic.spectra_1d(nexp=nexp)
+
+    def time_combspec(self, nexp):
+        coadd.combspec(self.waves, self.fluxes, self.ivars, self.gpms, 31, verbose=False)
+
+    def peakmem_combspec(self, nexp):
+        coadd.combspec(self.waves, self.fluxes, self.ivars, self.gpms, 31, verbose=False)
+
+
+class SpecRejectComb:
+    """
+    Iteratively stack and reject outliers in a set of 1D spectra.
+    """
+    params = [10, 50]
+    param_names = ['nexp']
+
+    def setup(self, nexp):
+        self.waves, self.fluxes, self.ivars, self.gpms = synthetic.spectra_1d(nexp=nexp)
+        self.wave_grid, self.wave_grid_mid, _ \
+                = wvutils.get_wave_grid(waves=self.waves, gpms=self.gpms, wave_method='log10')
+        self.weights = [np.ones_like(flux) for flux in self.fluxes]
+
+    def time_spec_reject_comb(self, nexp):
+        coadd.spec_reject_comb(self.wave_grid, self.wave_grid_mid, self.waves, self.fluxes,
+                               self.ivars, self.gpms, self.weights)
+
+    def peakmem_spec_reject_comb(self, nexp):
+        coadd.spec_reject_comb(self.wave_grid, self.wave_grid_mid, self.waves, self.fluxes,
+                               self.ivars, self.gpms, self.weights)
+
+
+class Subpixellate:
+    """
+    Resample an IFU exposure into a datacube.
+    """
+    params = [1, 3]
+    param_names = ['subpixel']
+    timeout = 300
+
+    def setup(self, subpixel):
+        self.args = synthetic.ifu()
+
+    def time_subpixellate(self, subpixel):
+        datacube.subpixellate(*self.args, spec_subpixel=subpixel, spat_subpixel=subpixel,
+                              slice_subpixel=subpixel)
+
+    def peakmem_subpixellate(self, subpixel):
+        datacube.subpixellate(*self.args, spec_subpixel=subpixel, spat_subpixel=subpixel,
+                              slice_subpixel=subpixel)
@@ -0,0 +1,25 @@
+"""
+Benchmarks for collating 1D spectra by source.
+"""
+from pypeit.core import collate
+
+from . import synthetic
+
+
+class CollateSpectra:
+    """
+    Group the spectra of a survey by their source.
+    """
+    params = ([10000, 100000], ['ra/dec', 'pixel'])
+    param_names = ['nobj', 'match_type']
+    timeout = 600
+
+    def setup_cache(self):
+        return {(nobj, match_type): synthetic.collate_sources(nobj=nobj, match_type=match_type)
+                    for nobj in self.params[0] for match_type in self.params[1]}
+
+    def time_collate(self, sources, nobj, match_type):
+        collate.collate_spectra_by_source(sources[nobj, match_type], 0.5)
+
+    def peakmem_collate(self, sources, nobj, match_type):
+        collate.collate_spectra_by_source(sources[nobj, match_type], 0.5)
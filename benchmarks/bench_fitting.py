@@ -0,0 +1,68 @@
+"""
+Benchmarks for the fitting routines.
+"""
+import numpy as np
+
+from pypeit.core import fitting
+from pypeit.core import basis
+
+from . import synthetic
+
+
+class BsplineProfile:
+    """
+    Fit the sky spectrum of a slit, as done by the global sky subtraction.
+    """
+    params = [1, 3]
+    param_names = ['npoly']
+
+    def setup(self, npoly):
+        data = synthetic.science(nslits=4)
+        thismask = data['slitmask'] == data['slits'].spat_id[0]
+        piximg = data['tilts'][thismask] * (data['sciimg'].shape[0]-1)
+        srt = np.argsort(piximg)
+        self.xdata = piximg[srt]
+        self.ydata = data['sciimg'][thismask][srt]
+        self.invvar = data['sciivar'][thismask][srt]
+        left, right, _ = data['slits'].select_edges()
+        spat = np.where(thismask)[1]
+        ximg = (spat - 0.5*(left[0,0]+right[0,0])) / (right[0,0]-left[0,0])
+        self.basis = basis.fpoly(2*ximg[srt], npoly)
+        self.kwargs_bspline = {'bkspace': 0.6}
+
+    def time_bspline_profile(self, npoly):
+        fitting.bspline_profile(self.xdata, self.ydata, self.invvar, self.basis, upper=3.,
+                                lower=3., kwargs_bspline=self.kwargs_bspline, quiet=True)
+
+    def peakmem_bspline_profile(self, npoly):
+        fitting.bspline_profile(self.xdata, self.ydata, self.invvar, self.basis, upper=3.,
+                                lower=3., kwargs_bspline=self.kwargs_bspline, quiet=True)
+
+
+class Iterfit:
+    """
+    Fit a b-spline with rejection to the sky pixels of a slit, with a
+    polynomial in the spatial position of each pixel.
+    """
+    params = [1, 3]
+    param_names = ['npoly']
+
+    def setup(self, npoly):
+        data = synthetic.science(nslits=4)
+        thismask = data['slitmask'] == data['slits'].spat_id[0]
+        piximg = data['tilts'][thismask] * (data['sciimg'].shape[0]-1)
+        self.xdata = piximg
+        self.ydata = data['sciimg'][thismask]
+        self.invvar = data['sciivar'][thismask]
+        left, right, _ = data['slits'].select_edges()
+        spat = np.where(thismask)[1]
+        self.x2 = (spat - 0.5*(left[0,0]+right[0,0])) / (right[0,0]-left[0,0])
+        self.kwargs_bspline = {'bkspace': 0.6, 'npoly': npoly}
+
+    def time_iterfit(self, npoly):
+        fitting.iterfit(self.xdata, self.ydata, invvar=self.invvar, upper=3., lower=3.,
+                        x2=None if npoly == 1 else self.x2, kwargs_bspline=self.kwargs_bspline)
+
+    def peakmem_iterfit(self, npoly):
+        fitting.iterfit(self.xdata, self.ydata, invvar=self.invvar, upper=3., lower=3.,
+                        x2=None if npoly == 1 else self.x2, kwargs_bspline=self.kwargs_bspline)
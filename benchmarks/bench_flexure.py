@@ -0,0 +1,33 @@
+"""
+Benchmarks for the flexure corrections.
+"""
+from pypeit.core import flexure
+
+from . import synthetic
+
+
+class SpatFlexureShift:
+    """
+    Measure the spatial flexure of a frame with a known shift.
+    """
+    params = ['correlate', 'fft', 'collapse']
+    param_names = ['method']
+
+    shift = 3.37
+
+    def setup(self, method):
+        self.slits, self.sciimg = synthetic.flexure_frame(self.shift)
+
+    def _spat_flexure_shift(self, method):
+        return flexure.spat_flexure_shift(self.sciimg, self.slits, method=method)
+
+    def time_spat_flexure_shift(self, method):
+        self._spat_flexure_shift(method)
+
+    def peakmem_spat_flexure_shift(self, method):
+        self._spat_flexure_shift(method)
+
+    def track_error(self, method):
+        return abs(self._spat_flexure_shift(method) - self.shift)
+
+    track_error.unit = 'pixels'
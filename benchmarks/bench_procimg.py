@@ -0,0 +1,63 @@
+"""
+Benchmarks for the basic image processing.
+"""
+from pathlib import Path
+
+from pypeit.core import procimg
+from pypeit.images import buildimage
+from pypeit.images.rawimage import RawImage
+from pypeit.spectrographs.util import load_spectrograph
+
+from . import synthetic
+
+
+class LACosmic:
+    """
+    Detect cosmic rays in a science frame.
+    """
+    timeout = 300
+
+    def setup(self):
+        data = synthetic.science()
+        self.sciimg = data['sciimg']
+        self.varimg = 1/data['sciivar']
+
+    def time_lacosmic(self):
+        procimg.lacosmic(self.sciimg, varframe=self.varimg, maxiter=1)
+
+    def peakmem_lacosmic(self):
+        procimg.lacosmic(self.sciimg, varframe=self.varimg, maxiter=1)
+
+
+class ProcessRawFrames:
+    """
+    Process and combine raw science frames.
+    """
+    timeout = 300
+
+    def setup_cache(self):
+        # NOTE: asv executes this once in a temporary directory and passes
+        # the returned value to all the benchmarks
+        return synthetic.raw_frames(Path('.'), nframes=3)
+
+    def setup(self, files):
+        self.spectrograph = load_spectrograph('shane_kast_blue')
+        self.par = self.spectrograph.default_pypeit_par()['scienceframe']
+        # No calibrations are available, and cosmic-ray detection is
+        # benchmarked separately
+        self.par['process']['use_biasimage'] = False
+        self.par['process']['use_pixelflat'] = False
+        self.par['process']['use_illumflat'] = False
+        self.par['process']['mask_cr'] = False
+
+    def time_process(self, files):
+        RawImage(files[0], self.spectrograph, 1).process(self.par['process'])
+
+    def peakmem_process(self, files):
+        RawImage(files[0], self.spectrograph, 1).process(self.par['process'])
+
+    def time_combine(self, files):
+        buildimage.buildimage_fromlist(self.spectrograph, 1, self.par, files)
+
+    def peakmem_combine(self, files):
+        buildimage.buildimage_fromlist(self.spectrograph, 1, self.par, files)
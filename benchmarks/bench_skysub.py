@@ -0,0 +1,68 @@
+"""
+Benchmarks for the sky subtraction and extraction.
+"""
+import numpy as np
+
+from pypeit import extraction
+from pypeit.core import skysub
+
+from . import synthetic
+
+
+class GlobalSkysub:
+    """
+    Fit the global sky model for all slits.
+    """
+    timeout = 300
+
+    def setup(self):
+        self.data = synthetic.science()
+        self.left, self.right, _ = self.data['slits'].select_edges()
+
+    def _global_skysub(self):
+        sky = np.zeros_like(self.data['sciimg'])
+        for i, slit_spat in enumerate(self.data['slits'].spat_id):
+            thismask = self.data['slitmask'] == slit_spat
+            sky[thismask] = skysub.global_skysub(self.data['sciimg'], self.data['sciivar'],
+                                                 self.data['tilts'], thismask,
+                                                 self.left[:,i], self.right[:,i],
+                                                 inmask=self.data['gpm'] & thismask)
+        return sky
+
+    def time_global_skysub(self):
+        self._global_skysub()
+
+    def peakmem_global_skysub(self):
+        self._global_skysub()
+
+
+class LocalSkysubExtract:
+    """
+    Perform the local sky subtraction and extraction for all slits, using
+    either the full images or cutouts around each slit.
+    """
+    timeout = 300
+    params = [False, True]
+    param_names = ['cutout']
+
+    def setup(self, cutout):
+        self.data = synthetic.science(nspec=1024, nslits=4)
+        self.left, self.right, _ = self.data['slits'].select_edges()
+
+    def _local_skysub_extract(self, cutout):
+        images = dict(sciimg=self.data['sciimg'], sciivar=self.data['sciivar'],
+                      tilts=self.data['tilts'], waveimg=self.data['waveimg'],
+                      global_sky=self.data['sky'], gpm=self.data['gpm'],
+                      slitmask=self.data['slitmask'], base_var=self.data['base_var'])
+        for i, slit_spat in enumerate(self.data['slits'].spat_id):
+            indx = self.data['sobjs'].SLITID == slit_spat
+            cut = self.data['slits'].slit_cutout(i) if cutout else None
+            extraction.local_skysub_extract_slit(slit_spat, self.left[:,i], self.right[:,i],
+                                                 self.data['sobjs'][indx].copy(), cutout=cut,
+                                                 **images)
+
+    def time_local_skysub_extract(self, cutout):
+        self._local_skysub_extract(cutout)
+
+    def peakmem_local_skysub_extract(self, cutout):
+        self._local_skysub_extract(cutout)
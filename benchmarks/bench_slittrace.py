@@ -0,0 +1,26 @@
+"""
+Benchmarks for the slit geometry.
+"""
+from . import synthetic
+
+
+class SlitImg:
+    """
+    Construct the slit ID image.
+    """
+    params = [8, 64]
+    param_names = ['nslits']
+
+    def setup(self, nslits):
+        self.slits = synthetic.slits(nspat=4096, nslits=nslits, gap=2)
+
+    def _slit_img(self):
+        # Remove the cached slit geometry so that it is always recomputed
+        self.slits.span_cache = None
+        return self.slits.slit_img(pad=2)
+
+    def time_slit_img(self, nslits):
+        self._slit_img()
+
+    def peakmem_slit_img(self, nslits):
+        self._slit_img()
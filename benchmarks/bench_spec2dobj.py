@@ -0,0 +1,32 @@
+"""
+Benchmarks for reading spec2d files.
+"""
+from pathlib import Path
+
+from pypeit import spec2dobj
+
+from . import synthetic
+
+
+class LoadSpec2D:
+    """
+    Read a spec2d file and access the images used to show the slits.
+    """
+    params = ['all', 'attrs', 'lazy']
+    param_names = ['mode']
+
+    def setup_cache(self):
+        # NOTE: asv executes this once in a temporary directory and passes
+        # the returned value to all the benchmarks
+        return synthetic.spec2d_file(Path('.'))
+
+    def _load(self, ifile, mode):
+        kwargs = {'attrs': dict(attrs=['sciimg', 'slits']), 'lazy': dict(lazy=True)}
+        spec2d = spec2dobj.Spec2DObj.from_file(ifile, 'DET01', **kwargs.get(mode, {}))
+        return spec2d.sciimg, spec2d.slits
+
+    def time_load(self, ifile, mode):
+        self._load(ifile, mode)
+
+    def peakmem_load(self, ifile, mode):
+        self._load(ifile, mode)
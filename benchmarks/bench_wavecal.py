@@ -0,0 +1,95 @@
+"""
+Benchmarks for the wavelength calibration.
+"""
+import numpy as np
+
+from pypeit.core import arc
+from pypeit.core.wavecal import autoid
+from pypeit.core.wavecal import patterns
+from pypeit.core.wavecal import waveio
+from pypeit.par import pypeitpar
+
+from . import synthetic
+
+
+class ArcLines:
+    """
+    Detect and identify the lines in an arc spectrum.
+    """
+    def setup(self):
+        self.wave, self.spec, self.line_list = synthetic.arc()
+        # Use a shifted and stretched version of the arc as the archived
+        # template
+        wave_arxiv = self.wave[0] + 1.01*(self.wave - self.wave[0]) - 20.
+        _, spec_arxiv, _ = synthetic.arc(seed=2)
+        self.spec_arxiv = np.interp(self.wave, wave_arxiv, spec_arxiv)
+        self.wave_arxiv = self.wave
+
+    def time_detect_lines(self):
+        arc.detect_lines(self.spec, sigdetect=10., fwhm=3.)
+
+    def time_reidentify(self):
+        autoid.reidentify(self.spec, self.spec_arxiv, self.wave_arxiv, self.line_list, 1,
+                          sigdetect=10., fwhm=3.)
+
+    def peakmem_reidentify(self):
+        autoid.reidentify(self.spec, self.spec_arxiv, self.wave_arxiv, self.line_list, 1,
+                          sigdetect=10., fwhm=3.)
+
+
+class HolyGrail:
+    """
+    Identify the lines in a multi-slit arc using brute-force pattern matching.
+    """
+    timeout = 300
+
+    def setup(self):
+        # Two slits with different wavelength ranges
+        _, spec1, _ = synthetic.arc()
+        _, spec2, _ = synthetic.arc(wave_min=4000., wave_max=9500., seed=2)
+        self.spec = np.stack((spec1, spec2), axis=1)
+        self.par = pypeitpar.WavelengthSolutionPar()
+        self.fwhm = np.full(self.spec.shape[1], 3.)
+        # Detected lines and line list used to construct the patterns
+        self.tcent = np.sort(arc.detect_lines(spec1, sigdetect=10., fwhm=3.)[2])
+        _, line_list, _ = waveio.load_line_lists(['ArI', 'NeI', 'HgI'])
+        self.wvdata = np.sort(line_list['wave'].data)
+
+    def time_triangles(self):
+        patterns.triangles(self.tcent, self.wvdata, self.spec.shape[0], detsrch=5, lstsrch=5)
+
+    def time_quadrangles(self):
+        patterns.quadrangles(self.tcent, self.wvdata, self.spec.shape[0], detsrch=5, lstsrch=5)
+
+    def time_holy_grail(self):
+        autoid.HolyGrail(self.spec, ['ArI', 'NeI', 'HgI'], par=self.par,
+                         measured_fwhms=self.fwhm, nonlinear_counts=1e10)
+
+    def peakmem_holy_grail(self):
+        autoid.HolyGrail(self.spec, ['ArI', 'NeI', 'HgI'], par=self.par,
+                         measured_fwhms=self.fwhm, nonlinear_counts=1e10)
+
+
+class ArxivReidentify:
+    """
+    Reidentify the lines in an arc spectrum using a large archive of spectra.
+    """
+    params = [None, 3]
+    param_names = ['cc_nrefine']
+    timeout = 600
+
+    def setup(self, cc_nrefine):
+        self.wave, self.spec, self.line_list = synthetic.arc()
+        # Archive of shifted and stretched versions of the arc
+        rng = np.random.default_rng(3)
+        self.spec_arxiv = np.empty((self.spec.size, 20), dtype=float)
+        for i in range(self.spec_arxiv.shape[1]):
+            wave_arxiv = self.wave[0] + rng.uniform(0.98, 1.02)*(self.wave - self.wave[0]) \
+                            + rng.uniform(-40., 40.)
+            _, spec_arxiv, _ = synthetic.arc(seed=i+2)
+            self.spec_arxiv[:,i] = np.interp(self.wave, wave_arxiv, spec_arxiv)
+        self.wave_arxiv = np.tile(self.wave, (self.spec_arxiv.shape[1], 1)).T
+
+    def time_reidentify(self, cc_nrefine):
+        autoid.reidentify(self.spec, self.spec_arxiv, self.wave_arxiv, self.line_list, 1,
+                          sigdetect=10., fwhm=3., cc_nrefine=cc_nrefine)
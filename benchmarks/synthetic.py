@@ -0,0 +1,451 @@
+"""
+Generate synthetic data used by the benchmarks.
+
+None of the functions here require remote data; all of the data are generated
+on the fly using a fixed random seed so that the benchmarks are reproducible.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from astropy.io import fits
+from astropy.time import Time
+
+from pypeit import specobj, specobjs
+from pypeit import spec2dobj
+from pypeit import alignframe
+from pypeit import coadd3d
+from pypeit.core import collate
+from pypeit.core import datacube
+from pypeit.core.wavecal import waveio
+from pypeit.images.imagebitmask import ImageBitMaskArray
+from pypeit.slittrace import SlitTraceSet
+from pypeit.spectrographs.util import load_spectrograph
+
+
+def slits(nspec=2048, nspat=1024, nslits=8, gap=8, curvature=3., pypeline='MultiSlit'):
+    """
+    Construct a set of slits that evenly cover the detector.
+
+    Args:
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        nspat (:obj:`int`, optional):
+            Number of spatial pixels.
+        nslits (:obj:`int`, optional):
+            Number of slits.
+        gap (:obj:`float`, optional):
+            Number of pixels between adjacent slits.
+        curvature (:obj:`float`, optional):
+            Spatial offset of the slit edges at the ends of the detector with
+            respect to the center.
+        pypeline (:obj:`str`, optional):
+            Pipeline type.
+
+    Returns:
+        :class:`~pypeit.slittrace.SlitTraceSet`: The slit traces.
+    """
+    width = (nspat - gap*(nslits+1)) / nslits
+    spec = np.arange(nspec)
+    curve = curvature * (2*spec/(nspec-1) - 1)**2
+    left = gap + np.arange(nslits)*(width + gap) + 0.3
+    left = left[None,:] + curve[:,None]
+    right = left + width - 0.6
+    return SlitTraceSet(left, right, pypeline, nspat=nspat, PYP_SPEC='dummy')
+
+
+def tilts(nspec, nspat, tilt=0.02):
+    """
+    Construct a tilts image with lines of constant wavelength that are tilted
+    with respect to the detector rows.
+
+    Args:
+        nspec (:obj:`int`):
+            Number of spectral pixels.
+        nspat (:obj:`int`):
+            Number of spatial pixels.
+        tilt (:obj:`float`, optional):
+            Spectral offset of the lines of constant wavelength per spatial
+            pixel.
+
+    Returns:
+        `numpy.ndarray`_: The tilts image, normalized by ``nspec-1``.
+    """
+    spec = np.arange(nspec)[:,None]
+    spat = np.arange(nspat)[None,:]
+    return (spec + tilt*(spat - nspat/2))/(nspec-1)
+
+
+def arc(nspec=2048, wave_min=3500., wave_max=9000., lamps=('ArI', 'NeI', 'HgI'), fwhm=3.,
+        noise=5., seed=1):
+    """
+    Construct an arc-lamp spectrum using the PypeIt line lists.
+
+    Args:
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        wave_min, wave_max (:obj:`float`, optional):
+            Wavelength range of the spectrum.
+        lamps (:obj:`tuple`, optional):
+            Lamps to include.
+        fwhm (:obj:`float`, optional):
+            FWHM of the lines in pixels.
+        noise (:obj:`float`, optional):
+            Standard deviation of the Gaussian noise.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`tuple`: The wavelength vector, the arc spectrum, and the line
+        list.
+    """
+    rng = np.random.default_rng(seed)
+    wave = np.linspace(wave_min, wave_max, nspec)
+    _, line_list, _ = waveio.load_line_lists(list(lamps))
+    line_list = line_list[(line_list['wave'] > wave_min) & (line_list['wave'] < wave_max)]
+    pix = np.interp(line_list['wave'], wave, np.arange(nspec))
+    amp = 1e4 * rng.uniform(0.05, 1., size=len(line_list))
+    sigma = fwhm / 2.355
+    spec = np.arange(nspec)
+    flux = np.zeros(nspec, dtype=float)
+    for p, a in zip(pix, amp):
+        lo, hi = max(int(p - 5*sigma), 0), min(int(p + 5*sigma) + 2, nspec)
+        flux[lo:hi] += a * np.exp(-0.5*((spec[lo:hi] - p)/sigma)**2)
+    flux += 50. + rng.normal(scale=noise, size=nspec)
+    return wave, flux, line_list
+
+
+def science(nspec=2048, nspat=1024, nslits=8, ncr=500, seed=2):
+    """
+    Construct a science frame with sky lines and one object per slit.
+
+    Args:
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        nspat (:obj:`int`, optional):
+            Number of spatial pixels.
+        nslits (:obj:`int`, optional):
+            Number of slits.
+        ncr (:obj:`int`, optional):
+            Number of cosmic rays.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`dict`: Dictionary with the slits (``slits``), the slit image
+        (``slitmask``), the science image (``sciimg``), its inverse variance
+        (``sciivar``), base-level variance (``base_var``), and good-pixel mask
+        (``gpm``), the tilts (``tilts``), the wavelength image (``waveimg``),
+        the noiseless sky (``sky``), and the objects on each slit (``sobjs``).
+    """
+    rng = np.random.default_rng(seed)
+    _slits = slits(nspec=nspec, nspat=nspat, nslits=nslits)
+    slitmask = _slits.slit_img()
+    _tilts = tilts(nspec, nspat)
+    piximg = _tilts * (nspec-1)
+    waveimg = (4000. + 2.*piximg) * (slitmask > -1)
+
+    # Sky continuum plus lines
+    sky = 50. + 10.*np.sin(piximg/150.)
+    for p, a in zip(rng.uniform(0, nspec, size=40), rng.uniform(100., 2000., size=40)):
+        sky += a * np.exp(-0.5*((piximg - p)/1.5)**2)
+    sky *= slitmask > -1
+
+    # One object per slit
+    spec = np.arange(nspec)
+    spat = np.arange(nspat)[None,:]
+    left, right, _ = _slits.select_edges()
+    obj = np.zeros_like(sky)
+    sobjs = specobjs.SpecObjs()
+    for i, slit_spat in enumerate(_slits.spat_id):
+        trace = left[:,i] + 0.4*(right[:,i] - left[:,i])
+        obj += (slitmask == slit_spat) * 300. * np.exp(-0.5*((spat - trace[:,None])/2.)**2)
+        sobj = specobj.SpecObj('MultiSlit', 'DET01', SLITID=slit_spat)
+        sobj.TRACE_SPAT = trace
+        sobj.trace_spec = spec
+        sobj.FWHM = 4.7
+        sobj.maskwidth = 15.
+        sobj.BOX_RADIUS = 5.
+        sobj.SPAT_PIXPOS = trace[nspec//2]
+        sobj.OBJID = 1
+        sobj.set_name()
+        sobjs.add_sobj(sobj)
+
+    var = sky + obj + 4.**2
+    sciimg = sky + obj + rng.normal(size=sky.shape)*np.sqrt(var)
+    # Add cosmic rays
+    sciimg[rng.integers(nspec, size=ncr), rng.integers(nspat, size=ncr)] += \
+            rng.uniform(1e3, 1e4, size=ncr)
+    return dict(slits=_slits, slitmask=slitmask, sciimg=sciimg, sciivar=1/var,
+                base_var=np.full(sciimg.shape, 4.**2), gpm=np.ones(sciimg.shape, dtype=bool), tilts=_tilts, waveimg=waveimg, sky=sky,
+                sobjs=sobjs)
+
+
+def flexure_frame(shift, nspec=2048, nspat=1024, nslits=8, seed=7):
+    """
+    Construct a flat-illuminated frame with the slits offset by a spatial
+    flexure shift.
+
+    Args:
+        shift (:obj:`float`):
+            Spatial offset in pixels of the illuminated slits with respect to
+            the slit traces.
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        nspat (:obj:`int`, optional):
+            Number of spatial pixels.
+        nslits (:obj:`int`, optional):
+            Number of slits.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`tuple`: The slit traces and the science image.
+    """
+    rng = np.random.default_rng(seed)
+    _slits = slits(nspec=nspec, nspat=nspat, nslits=nslits)
+    left, right, _ = _slits.select_edges(flexure=shift)
+    # Fraction of each pixel covered by the shifted slits
+    spat = np.arange(nspat)[None,:,None]
+    cover = np.clip(np.minimum(spat + 0.5, right[:,None,:])
+                    - np.maximum(spat - 0.5, left[:,None,:]), 0, 1).sum(axis=2)
+    sciimg = 200.*cover + rng.normal(size=cover.shape)*np.sqrt(200.*cover + 4.**2)
+    return _slits, sciimg
+
+
+def raw_frames(path, nframes=3, spectrograph='shane_kast_blue', exptime=300., seed=3):
+    """
+    Write a set of raw science frames.
+
+    The frames mimic the raw data format of the provided spectrograph such
+    that they can be read using its
+    :func:`~pypeit.spectrographs.spectrograph.Spectrograph.get_rawimage`
+    method.
+
+    Args:
+        path (:obj:`str`, `Path`_):
+            Directory for the files.
+        nframes (:obj:`int`, optional):
+            Number of frames to write.
+        spectrograph (:obj:`str`, optional):
+            Spectrograph used to format the frames.  Currently only
+            ``shane_kast_blue`` is supported.
+        exptime (:obj:`float`, optional):
+            Exposure time of each frame.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`list`: The paths to the written files.
+    """
+    if spectrograph != 'shane_kast_blue':
+        raise NotImplementedError(f'Cannot generate raw frames for {spectrograph}.')
+    rng = np.random.default_rng(seed)
+    # Kast blue raw frames have two amplifiers with 1024 data columns each,
+    # followed by the overscan columns.
+    nspec, nspat, nraw = 2048, 2048, 2112
+    sci = science(nspec=nspec, nspat=nspat, nslits=1, ncr=0, seed=seed)
+    path = Path(path).absolute()
+    files = []
+    for i in range(nframes):
+        # Counts in ADU (gain = 1.2) above a bias level of 1000 ADU
+        img = np.full((nspec, nraw), 1000., dtype=float)
+        counts = sci['sky'] + sci['sky'].max()*0.01
+        img[:,:nspat] += rng.poisson(np.clip(counts, 0, None)) / 1.2
+        img += rng.normal(scale=3.7/1.2, size=img.shape)
+        # Add cosmic rays
+        ncr = 500
+        img[rng.integers(nspec, size=ncr), rng.integers(nspat, size=ncr)] += \
+                rng.uniform(1e3, 1e4, size=ncr)
+        hdr = fits.Header()
+        hdr['OBJECT'] = 'synthetic'
+        hdr['EXPTIME'] = exptime
+        hdr['DATE'] = Time(60000. + i*exptime/86400., format='mjd').isot
+        hdr['AIRMASS'] = 1.1
+        hdr['RA'] = '12:00:00.0'
+        hdr['DEC'] = '+30:00:00.0'
+        hdr['SLIT_N'] = '2.0 arcsec'
+        hdr['GRISM_N'] = '600/4310'
+        hdr['BSPLIT_N'] = 'd55'
+        hdr['VERSION'] = 'kastb'
+        for lamp in ['1', '2', '3', '4', '5', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I', 'J',
+                     'K']:
+            hdr[f'LAMPSTA{lamp}'] = 'off'
+        ofile = path / f'synthetic_{i:02d}.fits'
+        fits.PrimaryHDU(data=np.round(img).astype(np.uint16), header=hdr).writeto(ofile,
+                                                                                 overwrite=True)
+        files += [str(ofile)]
+    return files
+
+
+def spec2d_file(path, nspec=2048, nspat=1024, nslits=8, seed=2):
+    """
+    Write a spec2d file with the reduction of a synthetic science frame.
+
+    Args:
+        path (:obj:`str`, `Path`_):
+            Directory for the file.
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        nspat (:obj:`int`, optional):
+            Number of spatial pixels.
+        nslits (:obj:`int`, optional):
+            Number of slits.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`str`: The path to the written file.
+    """
+    sci = science(nspec=nspec, nspat=nspat, nslits=nslits, seed=seed)
+    detector = load_spectrograph('shane_kast_blue').get_detector_par(1)
+    spec2d = spec2dobj.Spec2DObj(sciimg=sci['sciimg'], ivarraw=sci['sciivar'],
+                                 skymodel=sci['sky'], bkg_redux_skymodel=None,
+                                 objmodel=sci['sciimg'] - sci['sky'], ivarmodel=sci['sciivar'],
+                                 scaleimg=np.ones_like(sci['sciimg']), waveimg=sci['waveimg'],
+                                 bpmmask=ImageBitMaskArray(sci['sciimg'].shape),
+                                 detector=detector, sci_spat_flexure=0.,
+                                 sci_spec_flexure=None, vel_type=None, vel_corr=None,
+                                 slits=sci['slits'], wavesol=None, tilts=sci['tilts'],
+                                 maskdef_designtab=None)
+    allspec2d = spec2dobj.AllSpec2DObj()
+    allspec2d['meta']['bkg_redux'] = False
+    allspec2d['meta']['find_negative'] = False
+    allspec2d[detector.name] = spec2d
+    ofile = Path(path).absolute() / 'spec2d_synthetic.fits'
+    allspec2d.write_to_fits(ofile, overwrite=True)
+    return str(ofile)
+
+
+def spectra_1d(nexp=5, nspec=4000, seed=4):
+    """
+    Construct a set of 1D spectra of the same source with random shifts in the
+    wavelength grid, flux scale, and noise.
+
+    Args:
+        nexp (:obj:`int`, optional):
+            Number of exposures.
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`tuple`: Lists with the wavelengths, fluxes, inverse variances, and
+        good-pixel masks of each spectrum.
+    """
+    rng = np.random.default_rng(seed)
+    waves, fluxes, ivars, gpms = [], [], [], []
+    for i in range(nexp):
+        wave = np.linspace(4000., 9000., nspec) + rng.uniform(-1., 1.)
+        flux = 10. + 3.*np.sin(wave/200.) + 20.*np.exp(-0.5*((wave - 6563.)/5.)**2)
+        flux *= rng.uniform(0.7, 1.3)
+        sig = np.full(nspec, 1.)
+        waves += [wave]
+        fluxes += [flux + rng.normal(size=nspec)*sig]
+        ivars += [1/sig**2]
+        gpms += [np.ones(nspec, dtype=bool)]
+    return waves, fluxes, ivars, gpms
+
+
+def ifu(nspec=1024, nslices=12, slice_width=24, gap=4, seed=5):
+    """
+    Construct the data needed to resample a slicer-IFU exposure into a
+    datacube using :func:`~pypeit.core.datacube.subpixellate`.
+
+    Args:
+        nspec (:obj:`int`, optional):
+            Number of spectral pixels.
+        nslices (:obj:`int`, optional):
+            Number of IFU slices.
+        slice_width (:obj:`int`, optional):
+            Width of each slice in pixels.
+        gap (:obj:`int`, optional):
+            Number of pixels between adjacent slices.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`tuple`: The positional arguments of
+        :func:`~pypeit.core.datacube.subpixellate`.
+    """
+    rng = np.random.default_rng(seed)
+    nspat = nslices*(slice_width + gap) + gap
+    _slits = slits(nspec=nspec, nspat=nspat, nslits=nslices, gap=gap, curvature=0.5,
+                   pypeline='SlicerIFU')
+    _tilts = tilts(nspec, nspat, tilt=0.01)
+    slitmask = _slits.slit_img(pad=0, initial=True)
+    wave0, dwave = 5000., 1.
+    waveimg = (wave0 + dwave*_tilts*(nspec-1)) * (slitmask > -1)
+    sciimg = (100. + rng.normal(size=slitmask.shape)) * (slitmask > -1)
+    ivarimg = np.ones_like(sciimg)
+    wghtimg = np.ones_like(sciimg)
+
+    # WCS of the exposure: slices are along the first axis, pixels along the
+    # slice along the second, and spectral pixels along the third.
+    pxscl = 0.3/3600.
+    slscl = 1.0/3600.
+    exp_wcs = datacube.generate_WCS([180., 30., wave0], [-slscl, pxscl, dwave])
+    exp_wcs.wcs.crpix = [nslices/2, 0., 1.]
+    left, right, _ = _slits.select_edges(initial=True)
+    traces = np.stack([left, right], axis=1)
+    astrom_trans = alignframe.AlignmentSplines(traces, np.array([0., 1.]), _tilts)
+    raimg, decimg, _ = _slits.get_radec_image(exp_wcs, astrom_trans, _tilts)
+
+    dar = coadd3d.DARcorrection(1.1, 0., 611., 2., 10., np.cos(np.radians(30.)))
+    slitid_img_gpm = np.clip(slitmask, 0, None)
+    output_wcs, bins, _ = datacube.create_wcs(raimg, decimg, waveimg, slitid_img_gpm,
+                                              pxscl, dwave)
+    return (output_wcs, bins, sciimg, ivarimg, waveimg, slitid_img_gpm, wghtimg, exp_wcs,
+            _tilts, _slits, astrom_trans, dar, 0., 0.)
+
+
+def collate_sources(nobj=100000, nfiles=200, match_type='ra/dec', seed=6):
+    """
+    Construct the uncollated sources for a survey of repeated spec1d
+    observations of the same field, using two instrument configurations.
+
+    Args:
+        nobj (:obj:`int`, optional):
+            Total number of extracted spectra.
+        nfiles (:obj:`int`, optional):
+            Number of spec1d files.
+        match_type (:obj:`str`, optional):
+            Type of matching; must be 'ra/dec' or 'pixel'.
+        seed (:obj:`int`, optional):
+            Seed for the random number generator.
+
+    Returns:
+        :obj:`list`: List of :class:`~pypeit.core.collate.SourceObject`, one
+        per spectrum.
+    """
+    rng = np.random.default_rng(seed)
+    spectrograph = load_spectrograph('keck_deimos')
+    headers = []
+    for dispname in ['830G', '600ZD']:
+        headers += [fits.Header({'PYP_SPEC': spectrograph.name, 'DISPNAME': dispname,
+                                 'DISPANGLE': 8800., 'AMP': 'SINGLE:B', 'FILTER1': 'OG550',
+                                 'DECKER': 'Z6CL01B', 'BINNING': '1,1'})]
+
+    # Each spectrum is a repeat observation of one of the unique sources,
+    # spread over a 1 degree field, with some astrometric and centroiding
+    # error.
+    nunique = nobj // 5
+    ra0 = 150. + rng.uniform(-0.5, 0.5, size=nunique)
+    dec0 = 2. + rng.uniform(-0.5, 0.5, size=nunique)
+    pix0 = rng.uniform(0., 8000., size=nunique)
+    src = rng.integers(nunique, size=nobj)
+    ra = ra0[src] + rng.normal(scale=0.1/3600., size=nobj)
+    dec = dec0[src] + rng.normal(scale=0.1/3600., size=nobj)
+    pix = pix0[src] + rng.normal(scale=0.5, size=nobj)
+    ifile = np.sort(rng.integers(nfiles, size=nobj))
+
+    sources = []
+    for i in range(nobj):
+        sobj = specobj.SpecObj('MultiSlit', 'DET01', SLITID=i)
+        sobj.RA = ra[i]
+        sobj.DEC = dec[i]
+        sobj.SPAT_PIXPOS = pix[i]
+        sources += [collate.SourceObject(sobj, headers[ifile[i] % 2], f'spec1d_{ifile[i]}.fits',
+                                         spectrograph, match_type)]
+    return sources
@@ -22,12 +22,12 @@ from pypeit import msgs
 
 try:
     from pypeit.bspline.utilc import cholesky_band, cholesky_solve, solution_arrays, intrv, \
-                                     bspline_model
+                                     bspline_model, bspline_action
 except:
     warnings.warn('Unable to load bspline C extension.  Try rebuilding pypeit.  In the '
                   'meantime, falling back to pure python code.')
     from pypeit.bspline.utilpy import cholesky_band, cholesky_solve, solution_arrays, intrv, \
-                                        bspline_model
+                                        bspline_model, bspline_action
 
 # TODO: Used for testing.  Keep around for now.
 #from pypeit.bspline.utilpy import bspline_model
@@ -306,10 +306,9 @@ class bspline(datamodel.DataContainer):
                     xmax=self.xmax,
                     funcname=self.funcname)
 
-    # TODO: C this
     # TODO: Should this be used, or should we effectively replace it
     # with the content of utils.bspline_profile
-    def fit(self, xdata, ydata, invvar, x2=None):
+    def fit(self, xdata, ydata, invvar, x2=None, action=None, lower=None, upper=None):
         """Calculate a B-spline in the least-squares sense.
 
         Fit is based on two variables: x which is sorted and spans a large range
@@ -326,6 +325,17 @@ class bspline(datamodel.DataContainer):
             Inverse variance of `ydata`.
         x2 : `numpy.ndarray`_, optional
             Orthogonal dependent variable for 2d fits.
+        action : `numpy.ndarray`_, optional
+            Action matrix to use; see :func:`action`.  If not supplied it is
+            calculated.  The action matrix only depends on ``xdata``, ``x2``,
+            and the unmasked breakpoints, such that it can be reused by
+            iterative fits that only change ``invvar``.
+        lower : `numpy.ndarray`_, optional
+            If the action parameter is supplied, this parameter must also
+            be supplied.
+        upper : `numpy.ndarray`_, optional
+            If the action parameter is supplied, this parameter must also
+            be supplied.
 
         Returns
         -------
@@ -341,32 +351,19 @@ class bspline(datamodel.DataContainer):
             yfit = np.zeros(ydata.shape, dtype=float)
             return (-2, yfit)
         nfull = nn * self.npoly
-        bw = self.npoly * self.nord
-        a1, lower, upper = self.action(xdata, x2=x2)
-        foo = np.tile(invvar, bw).reshape(bw, invvar.size).transpose()
-        a2 = a1 * foo
-        alpha = np.zeros((bw, nfull+bw), dtype=float)
-        beta = np.zeros((nfull+bw,), dtype=float)
-        bi = np.arange(bw, dtype=int)
-        bo = np.arange(bw, dtype=int)
-        for k in range(1, bw):
-            bi = np.append(bi, np.arange(bw-k, dtype=int)+(bw+1)*k)
-            bo = np.append(bo, np.arange(bw-k, dtype=int)+bw*k)
-        for k in range(nn-self.nord+1):
-            itop = k*self.npoly
-            ibottom = min(itop, nfull) + bw - 1
-            ict = upper[k] - lower[k] + 1
-            if ict > 0:
-                work = np.dot(a1[lower[k]:upper[k]+1, :].T, a2[lower[k]:upper[k]+1, :])
-                wb = np.dot(ydata[lower[k]:upper[k]+1], a2[lower[k]:upper[k]+1, :])
-                alpha.T.flat[bo+itop*bw] += work.flat[bi]
-                beta[itop:ibottom+1] += wb
+        if action is None:
+            action, lower, upper = self.action(xdata, x2=x2)
+        elif lower is None or upper is None:
+            raise ValueError('Must specify lower and upper if action is set.')
+        alpha, beta = solution_arrays(nn, self.npoly, self.nord,
+                                      np.ascontiguousarray(ydata, dtype=float), action,
+                                      np.ascontiguousarray(invvar, dtype=float), upper, lower)
         min_influence = 1.0e-10 * invvar.sum() / nfull
         errb = cholesky_band(alpha, mininf=min_influence)  # ,verbose=True)
         if isinstance(errb[0], int) and errb[0] == -1:
             a = errb[1]
         else:
-            yfit, foo = self.value(xdata, x2=x2, action=a1, upper=upper, lower=lower)
+            yfit, foo = self.value(xdata, x2=x2, action=action, upper=upper, lower=lower)
             return (self.maskpoints(errb[0]), yfit)
         errs = cholesky_solve(a, beta)
         if isinstance(errs[0], int) and errs[0] == -1:
@@ -377,7 +374,7 @@ class bspline(datamodel.DataContainer):
             # has only one return statement, & that statement guarantees that
             # errs[0] == -1
             #
-            yfit, foo = self.value(xdata, x2=x2, action=a1, upper=upper, lower=lower)
+            yfit, foo = self.value(xdata, x2=x2, action=action, upper=upper, lower=lower)
             return (self.maskpoints(errs[0]), yfit)
         if self.coeff.ndim == 2:
             # JFH made major bug fix here.
@@ -386,10 +383,10 @@ class bspline(datamodel.DataContainer):
         else:
             self.icoeff[goodbk] = np.array(a[0, 0:nfull], dtype=a.dtype)
             self.coeff[goodbk] = np.array(sol[0:nfull], dtype=sol.dtype)
-        yfit, foo = self.value(xdata, x2=x2, action=a1, upper=upper, lower=lower)
+        yfit, foo = self.value(xdata, x2=x2, action=action, upper=upper, lower=lower)
         return (0, yfit)
 
-    def action(self, x, x2=None):
+    def action(self, x, x2=None, profile_basis=None):
         """Construct banded bspline matrix, with dimensions [ndata, bandwidth].
 
         Parameters
@@ -398,6 +395,11 @@ class bspline(datamodel.DataContainer):
             Independent variable.
         x2 : `numpy.ndarray`_, optional
             Orthogonal dependent variable for 2d fits.
+        profile_basis : `numpy.ndarray`_, optional
+            Model profiles evaluated at each value of ``x``, with shape
+            ``(x.size, npoly)``, used instead of the polynomials in ``x2``;
+            see :func:`~pypeit.core.fitting.bspline_profile`.  If provided,
+            ``x2`` is ignored.
 
         Returns
         -------
@@ -416,94 +418,65 @@ class bspline(datamodel.DataContainer):
         lower = np.zeros((n - self.nord + 1,), dtype=int)
         upper = np.zeros((n - self.nord + 1,), dtype=int) - 1
         indx = intrv(self.nord, self.breakpoints[self.mask], x)
-        bf1 = self.bsplvn(x, indx)
-#        print('F_CONTIGUOUS after bsplvn: {0}'.format(bf1.flags['F_CONTIGUOUS']))
         aa = uniq(indx)
         upper[indx[aa]-self.nord+1] = aa
         rindx = indx[::-1]
         bb = uniq(rindx)
         lower[rindx[bb]-self.nord+1] = nx - bb - 1
-        if x2 is None:
-            return bf1, lower, upper
-
-#        print('x2!')
-
-        if x2.size != nx:
-            raise ValueError('Dimensions of x and x2 do not match.')
-
-        # TODO: Below is unchanged.
-        x2norm = 2.0 * (x2 - self.xmin) / (self.xmax - self.xmin) - 1.0
-        # TODO: Should consider faster ways of generating the temppoly arrays for poly and poly1
-        if self.funcname == 'poly':
-            temppoly = np.ones((nx, self.npoly), dtype=float)
-            for i in range(1, self.npoly):
-                temppoly[:, i] = temppoly[:, i-1] * x2norm
-        elif self.funcname == 'poly1':
-            temppoly = np.tile(x2norm, self.npoly).reshape(nx, self.npoly)
-            for i in range(1, self.npoly):
-                temppoly[:, i] = temppoly[:, i-1] * x2norm
-        elif self.funcname == 'chebyshev':
-            # JFH fixed bug here where temppoly needed to be transposed because of different IDL and python array conventions
-            # NOTE: Transposed them in the functions themselves
-            temppoly = basis.fchebyshev(x2norm, self.npoly)
-        elif self.funcname == 'legendre':
-            temppoly = basis.flegendre(x2norm, self.npoly)
+
+        if profile_basis is not None:
+            if profile_basis.shape[0] != nx:
+                raise ValueError('Dimensions of x and profile_basis do not match.')
+            temppoly = profile_basis
+        elif x2 is None:
+            temppoly = np.ones((nx, 1), dtype=float)
         else:
-            raise ValueError('Unknown value of funcname.')
-
-        # TODO: Should consider faster way of calculating action that
-        # doesn't require a nested loop. Below might work, but it needs
-        # to be tested.
-#        _action = (bf1[:,:,None] * temppoly[:,None,:]).reshape(nx,-1)
-        bw = self.npoly*self.nord
-        action = np.zeros((nx, bw), dtype=float, order='F')
-        counter = -1
-        for ii in range(self.nord):
-            for jj in range(self.npoly):
-                counter += 1
-                action[:, counter] = bf1[:, ii]*temppoly[:, jj]
-        return action, lower, upper
-
-
-    # TODO: C this?
+            if x2.size != nx:
+                raise ValueError('Dimensions of x and x2 do not match.')
+            x2norm = 2.0 * (x2 - self.xmin) / (self.xmax - self.xmin) - 1.0
+            # TODO: Should consider faster ways of generating the temppoly arrays for poly and poly1
+            if self.funcname == 'poly':
+                temppoly = np.ones((nx, self.npoly), dtype=float)
+                for i in range(1, self.npoly):
+                    temppoly[:, i] = temppoly[:, i-1] * x2norm
+            elif self.funcname == 'poly1':
+                temppoly = np.tile(x2norm, self.npoly).reshape(nx, self.npoly)
+                for i in range(1, self.npoly):
+                    temppoly[:, i] = temppoly[:, i-1] * x2norm
+            elif self.funcname == 'chebyshev':
+                # JFH fixed bug here where temppoly needed to be transposed because of different IDL and python array conventions
+                # NOTE: Transposed them in the functions themselves
+                temppoly = basis.fchebyshev(x2norm, self.npoly)
+            elif self.funcname == 'legendre':
+                temppoly = basis.flegendre(x2norm, self.npoly)
+            else:
+                raise ValueError('Unknown value of funcname.')
+
+        # Column ii*npoly+jj of the action matrix is the product of the
+        # ii-th b-spline basis function and the jj-th function along the
+        # second dimension
+        return bspline_action(self.nord, self.breakpoints[self.mask], x, indx, temppoly), \
+                    lower, upper
+
     def bsplvn(self, x, ileft):
-        """To be documented.
+        """Compute the non-zero b-spline basis functions.
 
         Parameters
         ----------
         x : `numpy.ndarray`_
-            To be documented.
-        ileft : :class:`int`
-            To be documented
+            Independent variable.
+        ileft : `numpy.ndarray`_
+            The break-point segment of each value in ``x``; see
+            :func:`~pypeit.bspline.utilc.intrv`.
 
         Returns
         -------
         vnikx : `numpy.ndarray`_
-            To be documented.
+            The ``nord`` non-zero b-spline basis functions evaluated at each
+            value of ``x``.
         """
-        bkpt = self.breakpoints[self.mask]
-        # TODO: Had to set the order here to keep it consistent with
-        # utils.bspline_profile, but is this going to break things
-        # elsewhere? Ideally, we wouldn't be setting the memory order
-        # anywhere...
-        vnikx = np.zeros((x.size, self.nord), dtype=x.dtype, order='F')
-        deltap = vnikx.copy()
-        deltam = vnikx.copy()
-        j = 0
-        vnikx[:, 0] = 1.0
-        while j < self.nord - 1:
-            ipj = ileft+j+1
-            deltap[:, j] = bkpt[ipj] - x
-            imj = ileft-j
-            deltam[:, j] = x - bkpt[imj]
-            vmprev = 0.0
-            for l in range(j+1):
-                vm = vnikx[:, l]/(deltap[:, l] + deltam[:, j-l])
-                vnikx[:, l] = vm*deltap[:, l] + vmprev
-                vmprev = vm*deltam[:, j-l]
-            j += 1
-            vnikx[:, j] = vmprev
-        return vnikx
+        return bspline_action(self.nord, self.breakpoints[self.mask], x, ileft,
+                              np.ones((x.size, 1), dtype=float))
 
     def value(self, x, x2=None, action=None, lower=None, upper=None):
         """Evaluate a bspline at specified values.
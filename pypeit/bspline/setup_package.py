@@ -67,4 +67,4 @@ def get_extensions():
                       extra_link_args=extra_link_args,
                       export_symbols=['bspline_model', 'solution_arrays',
                                       'cholesky_band', 'cholesky_solve',
-                                      'intrv'])]
+                                      'intrv', 'bspline_action'])]
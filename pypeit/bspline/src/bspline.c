@@ -174,6 +174,69 @@ void intrv(int32_t nord, double *breakpoints, int32_t nb, double *x, int32_t nx,
 }
 
 
+void bspline_action(double *breakpoints, int32_t nord, double *x, int32_t nx, int64_t *indx,
+                    double *basis, int32_t npoly, double *action) {
+    /*
+    Construct the bspline action matrix.
+
+    The b-spline basis functions are computed using the recursion in
+    pypeit.bspline.bspline.bspline.bsplvn and multiplied by each of the
+    functions in basis.
+
+    Args:
+        breakpoints:
+            Locations of good breakpoints
+        nord:
+            Fit order.
+        x:
+            Data values, assumed to be monotonically increasing.
+        nx:
+            Number of data values.
+        indx:
+            The break-point segment of each data value; see intrv.
+        basis:
+            Functions along the second dimension of the fit evaluated
+            at each data value.  The shape of the array is expected
+            to be ``nx`` by ``npoly``, stored in row-major order.
+        npoly:
+            Polynomial per fit order.
+        action:
+            Action matrix.  The shape of the array is ``nx`` by
+            ``npoly*nord``, stored in column-major order.  Memory must
+            have already been allocated.
+    */
+    int32_t i, j, l, k;
+    double vm, vmprev;
+    double *vnikx, *deltap, *deltam;
+    #pragma omp parallel private(i,j,l,k,vm,vmprev,vnikx,deltap,deltam)
+    {
+        // Work space, allocated once by each thread
+        vnikx = (double*) malloc (3 * nord * sizeof(double));
+        deltap = vnikx + nord;
+        deltam = deltap + nord;
+        #pragma omp for
+        for (i = 0; i < nx; ++i) {
+            vnikx[0] = 1.0;
+            for (j = 0; j < nord-1; ++j) {
+                deltap[j] = breakpoints[indx[i]+j+1] - x[i];
+                deltam[j] = x[i] - breakpoints[indx[i]-j];
+                vmprev = 0.0;
+                for (l = 0; l <= j; ++l) {
+                    vm = vnikx[l]/(deltap[l] + deltam[j-l]);
+                    vnikx[l] = vm*deltap[l] + vmprev;
+                    vmprev = vm*deltam[j-l];
+                }
+                vnikx[j+1] = vmprev;
+            }
+            for (l = 0; l < nord; ++l)
+                for (k = 0; k < npoly; ++k)
+                    action[(l*npoly + k)*nx + i] = vnikx[l]*basis[i*npoly + k];
+        }
+        free(vnikx);
+    }
+}
+
+
 void solution_arrays(int32_t nn, int32_t npoly, int32_t nord, int32_t nd, double *ydata, double *ivar,
                      double *action, int64_t *upper, int64_t *lower, double *alpha, int32_t ar,
                      double *beta, int32_t bn) {
@@ -235,29 +298,59 @@ void solution_arrays(int32_t nn, int32_t npoly, int32_t nord, int32_t nd, double
     int32_t *bo = upper_triangle(bw, true);
 
     int32_t i, j, k;
-    int32_t ii, jj, kk;
+    int32_t kk;
     int32_t itop;
 
-    // Construct alpha and beta
-    #pragma omp parallel for private(i,j,k,kk,ii,jj,itop)
-    for (k = 0; k < nn-nord+1; ++k) {
-        if (!(upper[k]+1 > lower[k]))
-            continue;
-
-        itop = k*npoly;
-        for (i = 0; i < nbi; ++i) {
-            kk = column_to_row_major_index(bo[i]+itop*bw, ar, bn);
-            flat_row_major_indices(bi[i], nd, bw, &ii, &jj);
-            for (j = lower[k]; j <= upper[k]; ++j)
+    // Indices of the two action columns in each element of the upper
+    // triangle
+    int32_t *ii = (int32_t*) malloc (nbi * sizeof(int32_t));
+    int32_t *jj = (int32_t*) malloc (nbi * sizeof(int32_t));
+    for (i = 0; i < nbi; ++i)
+        flat_row_major_indices(bi[i], nd, bw, &ii[i], &jj[i]);
+
+    // Construct alpha and beta.  The sums over the data in each
+    // breakpoint interval are accumulated before being added to alpha
+    // and beta, such that each element is only updated once per
+    // interval.
+    double *asum, *bsum, *row;
+    #pragma omp parallel private(i,j,k,kk,itop,asum,bsum,row)
+    {
+        // Work space, allocated once by each thread
+        asum = (double*) malloc ((nbi + bw) * sizeof(double));
+        bsum = asum + nbi;
+        #pragma omp for
+        for (k = 0; k < nn-nord+1; ++k) {
+            if (!(upper[k]+1 > lower[k]))
+                continue;
+
+            for (i = 0; i < nbi; ++i)
+                asum[i] = 0.0;
+            for (i = 0; i < bw; ++i)
+                bsum[i] = 0.0;
+            for (j = lower[k]; j <= upper[k]; ++j) {
+                row = action + j*bw;
+                for (i = 0; i < nbi; ++i)
+                    asum[i] += ivar[j] * row[ii[i]] * row[jj[i]];
+                for (i = 0; i < bw; ++i)
+                    bsum[i] += ydata[j] * ivar[j] * row[i];
+            }
+
+            itop = k*npoly;
+            for (i = 0; i < nbi; ++i) {
+                kk = column_to_row_major_index(bo[i]+itop*bw, ar, bn);
                 #pragma omp atomic
-                alpha[kk] += ivar[j] * action[j*bw + ii] * action[j*bw + jj];
-        }
-        for (i = 0; i < bw; ++i)
-            for (j = lower[k]; j <= upper[k]; ++j)
+                alpha[kk] += asum[i];
+            }
+            for (i = 0; i < bw; ++i) {
                 #pragma omp atomic
-                beta[itop+i] += ydata[j] * ivar[j] * action[j*bw + i];
+                beta[itop+i] += bsum[i];
+            }
+        }
+        free(asum);
     }
     // Free memory
+    free(jj);
+    free(ii);
     free(bo);
     free(bi);
 }
@@ -11,6 +11,8 @@ int32_t* upper_triangle(int32_t kn, bool upper_left);
 void bspline_model(double *action, int64_t *lower, int64_t *upper, double *coeff,
                    int32_t n, int32_t nord, int32_t npoly, int32_t nd, double *yfit);
 void intrv(int32_t nord, double *breakpoints, int32_t nb, double *x, int32_t nx, int64_t *indx);
+void bspline_action(double *breakpoints, int32_t nord, double *x, int32_t nx, int64_t *indx,
+                    double *basis, int32_t npoly, double *action);
 void solution_arrays(int32_t nn, int32_t npoly, int32_t nord, int32_t nd, double *ydata,
                      double *ivar, double *action, int64_t *upper, int64_t *lower,
                      double *alpha, int32_t ar, double *beta, int32_t bn);
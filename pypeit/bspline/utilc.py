@@ -114,6 +114,53 @@ def intrv(nord, breakpoints, x):
 #-----------------------------------------------------------------------
 
 
+#-----------------------------------------------------------------------
+bspline_action_c = _bspline.bspline_action
+bspline_action_c.restype = None
+bspline_action_c.argtypes = [np.ctypeslib.ndpointer(ctypes.c_double, flags="C_CONTIGUOUS"),
+                             ctypes.c_int32,
+                             np.ctypeslib.ndpointer(ctypes.c_double, flags="C_CONTIGUOUS"),
+                             ctypes.c_int32,
+                             np.ctypeslib.ndpointer(ctypes.c_int64, flags="C_CONTIGUOUS"),
+                             np.ctypeslib.ndpointer(ctypes.c_double, flags="C_CONTIGUOUS"),
+                             ctypes.c_int32,
+                             np.ctypeslib.ndpointer(ctypes.c_double, flags="F_CONTIGUOUS")]
+
+def bspline_action(nord, breakpoints, x, indx, basis):
+    """
+    Construct the bspline action matrix.
+
+    This method wraps a C function.
+
+    Args:
+        nord (:obj:`int`):
+            Fit order.
+        breakpoints (`numpy.ndarray`_):
+            Locations of good breakpoints.
+        x (`numpy.ndarray`_):
+            Data values, assumed to be monotonically increasing.
+        indx (`numpy.ndarray`_):
+            The break-point segment of each data value; see
+            :func:`intrv`.
+        basis (`numpy.ndarray`_):
+            Functions along the second dimension of the fit evaluated
+            at each data value.  Shape must be ``nx`` by ``npoly``.
+
+    Returns:
+        `numpy.ndarray`_: The action matrix with shape ``nx`` by
+        ``npoly*nord``, stored in column-major (fortran-style) order.
+    """
+    nx, npoly = basis.shape
+    action = np.zeros((nx, npoly*nord), dtype=float, order='F')
+    # NOTE: indx *must* be np.int64 to match the argtypes above.
+    bspline_action_c(np.ascontiguousarray(breakpoints, dtype=float), nord,
+                     np.ascontiguousarray(x, dtype=float), nx,
+                     np.ascontiguousarray(indx, dtype=np.int64),
+                     np.ascontiguousarray(basis, dtype=float), npoly, action)
+    return action
+#-----------------------------------------------------------------------
+
+
 #-----------------------------------------------------------------------
 solution_arrays_c = _bspline.solution_arrays
 solution_arrays_c.restype = None
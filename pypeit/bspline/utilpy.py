@@ -97,6 +97,50 @@ def intrv(nord, breakpoints, x):
         indx[i] = ileft
     return indx
 
+
+def bspline_action(nord, breakpoints, x, indx, basis):
+    """
+    Construct the bspline action matrix.
+
+    This function is pure python.
+
+    Args:
+        nord (:obj:`int`):
+            Fit order.
+        breakpoints (`numpy.ndarray`_):
+            Locations of good breakpoints.
+        x (`numpy.ndarray`_):
+            Data values, assumed to be monotonically increasing.
+        indx (`numpy.ndarray`_):
+            The break-point segment of each data value; see
+            :func:`intrv`.
+        basis (`numpy.ndarray`_):
+            Functions along the second dimension of the fit evaluated
+            at each data value.  Shape must be ``nx`` by ``npoly``.
+
+    Returns:
+        `numpy.ndarray`_: The action matrix with shape ``nx`` by
+        ``npoly*nord``, stored in column-major (fortran-style) order.
+    """
+    vnikx = np.zeros((x.size, nord), dtype=float, order='F')
+    deltap = vnikx.copy()
+    deltam = vnikx.copy()
+    j = 0
+    vnikx[:, 0] = 1.0
+    while j < nord - 1:
+        ipj = indx+j+1
+        deltap[:, j] = breakpoints[ipj] - x
+        imj = indx-j
+        deltam[:, j] = x - breakpoints[imj]
+        vmprev = 0.0
+        for l in range(j+1):
+            vm = vnikx[:, l]/(deltap[:, l] + deltam[:, j-l])
+            vnikx[:, l] = vm*deltap[:, l] + vmprev
+            vmprev = vm*deltam[:, j-l]
+        j += 1
+        vnikx[:, j] = vmprev
+    return np.asfortranarray((vnikx[:,:,None] * basis[:,None,:]).reshape(x.size, -1))
+
 def solution_arrays(nn, npoly, nord, ydata, action, ivar, upper, lower):
     """
     Support function that builds the arrays for Cholesky
@@ -6,12 +6,15 @@ Implements the calibration frame base class.
 
 """
 from pathlib import Path
+from collections import OrderedDict
+from copy import deepcopy
 
 from IPython import embed
 
 import numpy as np
 
 from astropy.io import fits
+from astropy.table import Table
 
 from pypeit import msgs
 from pypeit.pypmsgs import PypeItError
@@ -522,3 +525,213 @@ class CalibFrame(datamodel.DataContainer):
         # Return the applicable calibrations
         return files[keep].tolist() if any(keep) else None
 
+
+
+class CalibFrameCache:
+    """
+    An in-memory cache of processed calibration frames read from disk.
+
+    The cache is used by :class:`~pypeit.calibrations.Calibrations` so that
+    calibration frames that are needed more than once within a single
+    execution of PypeIt (e.g., for each pass through the detectors in
+    :func:`~pypeit.pypeit.PypeIt.reduce_exposure` and for every science frame
+    in the same calibration group) are only read and parsed once.  Frames
+    built during the execution are added to the cache when they are written
+    (see :func:`insert`), so they are never read back from disk.
+
+    Objects are identified by their calibration type, setup, calibration
+    group(s), detector name, and the directory with the processed calibration
+    files.  The size and modification time of the file are also recorded so
+    that a file that has been rewritten since it was cached is read again.
+    Objects returned by the cache are *always* deep copies so that any
+    alterations made by the caller (e.g., to the slit mask) do not propagate
+    back to the cached object.
+
+    The memory used by the cache is limited by ``max_size``; when a new object
+    would exceed the budget, the least-recently used objects are evicted.
+
+    The cache is never pickled; i.e., the copy of a cache sent to a separate
+    process is empty.  Each process therefore keeps its own cache.
+
+    Args:
+        max_size (:obj:`float`, optional):
+            The maximum size of the cache in MB.  If 0 or negative, nothing is
+            cached.
+    """
+    def __init__(self, max_size=1024.):
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self.nbytes = 0
+
+    def __getstate__(self):
+        """Ensure the cache is empty when pickled."""
+        return {'max_size': self.max_size}
+
+    def __setstate__(self, state):
+        """Instantiate an empty cache when unpickled."""
+        self.__init__(max_size=state['max_size'])
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def max_bytes(self):
+        """The maximum size of the cache in bytes."""
+        return 0 if self.max_size is None else int(self.max_size * 1024**2)
+
+    @staticmethod
+    def construct_key(frameclass, cal_file):
+        """
+        Construct the key used to identify an object in the cache.
+
+        Args:
+            frameclass (:class:`CalibFrame`):
+                The subclass used to read the processed calibration frame.
+            cal_file (:obj:`str`, `Path`_):
+                The processed calibration file.
+
+        Returns:
+            :obj:`tuple`: The calibration type, setup, calibration group(s),
+            detector name, and calibration directory.
+        """
+        calib_key, calib_dir = CalibFrame.parse_key_dir(str(cal_file), from_filename=True)
+        return (frameclass.calib_type,) + CalibFrame.parse_calib_key(calib_key) + (calib_dir,)
+
+    @staticmethod
+    def file_signature(cal_file):
+        """
+        Return the size and modification time of a file.
+        """
+        stat = Path(cal_file).stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def object_nbytes(obj, _seen=None):
+        """
+        Estimate the memory used by an object.
+
+        Only the size of the array data held by the object is included, which
+        dominates the size of any processed calibration frame.
+
+        Args:
+            obj (object):
+                Object to assess.  This is typically a :class:`CalibFrame`.
+
+        Returns:
+            :obj:`int`: The approximate number of bytes used by the object.
+        """
+        _seen = set() if _seen is None else _seen
+        if id(obj) in _seen:
+            return 0
+        _seen.add(id(obj))
+        if isinstance(obj, np.ndarray):
+            return obj.nbytes
+        if isinstance(obj, Table):
+            return sum([CalibFrameCache.object_nbytes(obj[c], _seen=_seen)
+                            for c in obj.colnames])
+        if isinstance(obj, (list, tuple)):
+            return sum([CalibFrameCache.object_nbytes(o, _seen=_seen) for o in obj])
+        nbytes = 0
+        if isinstance(obj, dict):
+            nbytes += sum([CalibFrameCache.object_nbytes(o, _seen=_seen)
+                                for o in obj.values()])
+        if hasattr(obj, '__dict__'):
+            nbytes += sum([CalibFrameCache.object_nbytes(o, _seen=_seen)
+                                for o in vars(obj).values()])
+        return nbytes
+
+    def clear(self):
+        """
+        Remove all objects from the cache.
+        """
+        self._cache.clear()
+        self.nbytes = 0
+
+    def remove(self, key):
+        """
+        Remove an object from the cache.
+
+        Args:
+            key (:obj:`tuple`):
+                The key of the object to remove; see :func:`construct_key`.
+                If the key is not in the cache, nothing is done.
+        """
+        if key not in self._cache:
+            return
+        self.nbytes -= self._cache.pop(key)[2]
+
+    def add(self, key, signature, obj):
+        """
+        Add an object to the cache, evicting the least-recently used objects
+        as necessary to stay within the memory budget.
+
+        Args:
+            key (:obj:`tuple`):
+                The key of the object; see :func:`construct_key`.
+            signature (:obj:`tuple`):
+                The signature of the file from which the object was read; see
+                :func:`file_signature`.
+            obj (:class:`CalibFrame`):
+                The object to cache.  The cached object is *not* a copy, so the
+                caller should not alter it after it is added.
+        """
+        self.remove(key)
+        nbytes = self.object_nbytes(obj)
+        if nbytes > self.max_bytes:
+            # Object is too large to be cached
+            return
+        while len(self._cache) > 0 and self.nbytes + nbytes > self.max_bytes:
+            self.remove(next(iter(self._cache)))
+        self._cache[key] = (signature, obj, nbytes)
+        self.nbytes += nbytes
+
+    def load(self, frameclass, cal_file, chk_version=True):
+        """
+        Load a processed calibration frame, using the cached object if
+        possible.
+
+        Args:
+            frameclass (:class:`CalibFrame`):
+                The subclass used to read the processed calibration frame.
+            cal_file (:obj:`str`, `Path`_):
+                The processed calibration file.
+            chk_version (:obj:`bool`, optional):
+                Passed to the ``from_file`` method of ``frameclass``, if the
+                file needs to be read.
+
+        Returns:
+            :class:`CalibFrame`: A copy of the processed calibration frame.
+        """
+        if self.max_bytes <= 0:
+            return frameclass.from_file(cal_file, chk_version=chk_version)
+
+        key = self.construct_key(frameclass, cal_file)
+        signature = self.file_signature(cal_file)
+        if key in self._cache:
+            cached_signature, obj, _ = self._cache[key]
+            if cached_signature == signature and isinstance(obj, frameclass):
+                msgs.info(f'Using cached {frameclass.calib_type} calibration frame: '
+                          f'{Path(cal_file).name}')
+                self._cache.move_to_end(key)
+                return deepcopy(obj)
+
+        obj = frameclass.from_file(cal_file, chk_version=chk_version)
+        self.add(key, signature, obj)
+        return deepcopy(obj) if key in self._cache else obj
+
+    def insert(self, obj):
+        """
+        Add a processed calibration frame that has just been written to disk.
+
+        Args:
+            obj (:class:`CalibFrame`):
+                The calibration frame.  It must have already been written to
+                the file given by its :func:`~CalibFrame.get_path` method.  A
+                copy is cached, so the object can be altered after it is
+                inserted.
+        """
+        if self.max_bytes <= 0:
+            return
+        cal_file = obj.get_path()
+        self.add(self.construct_key(type(obj), cal_file), self.file_signature(cal_file),
+                 deepcopy(obj))
@@ -77,6 +77,12 @@ class Calibrations:
             version checking to ensure a valid file.  If False, the code will
             try to keep going, but this may lead to faults and quiet failures.
             User beware!
+        calib_cache (:class:`~pypeit.calibframe.CalibFrameCache`, optional):
+            An in-memory cache of previously loaded processed calibration
+            frames.  If provided, any processed calibration frame read from
+            disk is cached so that it need not be read again by this or any
+            other :class:`Calibrations` instance sharing the same cache.  If
+            None, the frames are always read from disk.
 
     Attributes:
         fitstbl (:class:`~pypeit.metadata.PypeItMetaData`):
@@ -91,6 +97,8 @@ class Calibrations:
             Path for the QA diagnostics.
         reuse_calibs (:obj:`bool`):
             See instantiation arguments.
+        calib_cache (:class:`~pypeit.calibframe.CalibFrameCache`):
+            See instantiation arguments.
         show (:obj:`bool`):
             See instantiation arguments.
         user_slits (:obj:`dict`):
@@ -147,7 +155,8 @@ class Calibrations:
         return calibclass(fitstbl, par, spectrograph, caldir, **kwargs)
 
     def __init__(self, fitstbl, par, spectrograph, caldir, qadir=None,
-                 reuse_calibs=False, show=False, user_slits=None, chk_version=True):
+                 reuse_calibs=False, show=False, user_slits=None, chk_version=True,
+                 calib_cache=None):
 
         # Check the types
         # TODO -- Remove this None option once we have data models for all the Calibrations
@@ -167,6 +176,7 @@ class Calibrations:
         # Calibrations
         self.reuse_calibs = reuse_calibs
         self.chk_version = chk_version
+        self.calib_cache = calib_cache
         self.calib_dir = Path(caldir).absolute()
         if not self.calib_dir.exists():
             self.calib_dir.mkdir(parents=True)
@@ -271,6 +281,45 @@ class Calibrations:
         return self.fitstbl.frame_paths(rows), cal_file, calib_key, setup, \
                     frameclass.ingest_calib_id(calib_id), detname
 
+    def load_calib(self, frameclass, cal_file):
+        """
+        Load a processed calibration frame from disk.
+
+        If :attr:`calib_cache` is defined, the frame is pulled from the cache,
+        if possible, or added to the cache after it is read.
+
+        Parameters
+        ----------
+        frameclass : :class:`~pypeit.calibframe.CalibFrame`
+            The subclass used to read the processed calibration data.
+        cal_file : `Path`_
+            The path to the processed calibration frame.
+
+        Returns
+        -------
+        :class:`~pypeit.calibframe.CalibFrame`
+            The processed calibration frame.
+        """
+        if self.calib_cache is None:
+            return frameclass.from_file(cal_file, chk_version=self.chk_version)
+        return self.calib_cache.load(frameclass, cal_file, chk_version=self.chk_version)
+
+    def save_calib(self, calib):
+        """
+        Write a processed calibration frame to disk.
+
+        If :attr:`calib_cache` is defined, the frame is also added to the
+        cache, such that it is not read from disk when it is needed again.
+
+        Parameters
+        ----------
+        calib : :class:`~pypeit.calibframe.CalibFrame`
+            The processed calibration frame to write.
+        """
+        calib.to_file()
+        if self.calib_cache is not None:
+            self.calib_cache.insert(calib)
+
     def set_config(self, frame, det, par=None):
         """
         Specify the critical attributes of the class to perform a set of calibrations.
@@ -328,7 +377,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.msarc = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.msarc = self.load_calib(frame['class'], cal_file)
             return self.msarc
 
         # Reset the BPM
@@ -342,7 +391,7 @@ class Calibrations:
                                                     dark=self.msdark, calib_dir=self.calib_dir,
                                                     setup=setup, calib_id=calib_id)
         # Save the result
-        self.msarc.to_file()
+        self.save_calib(self.msarc)
         # Return it
         return self.msarc
 
@@ -371,7 +420,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.mstilt = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.mstilt = self.load_calib(frame['class'], cal_file)
             return self.mstilt
 
         # Reset the BPM
@@ -386,7 +435,7 @@ class Calibrations:
                                                      calib_dir=self.calib_dir, setup=setup,
                                                      calib_id=calib_id)
         # Save the result
-        self.mstilt.to_file()
+        self.save_calib(self.mstilt)
         # Return it
         return self.mstilt
 
@@ -419,7 +468,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.alignments = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.alignments = self.load_calib(frame['class'], cal_file)
             self.alignments.is_synced(self.slits)
             return self.alignments
 
@@ -442,7 +491,7 @@ class Calibrations:
         self.alignments = alignment.run(show=self.show)
         # NOTE: The alignment object inherets the calibration frame naming from
         # the msalign image.
-        self.alignments.to_file()
+        self.save_calib(self.alignments)
         return self.alignments
 
     def get_bias(self):
@@ -470,7 +519,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.msbias = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.msbias = self.load_calib(frame['class'], cal_file)
             return self.msbias
 
         # Otherwise, create the processed file.
@@ -480,7 +529,7 @@ class Calibrations:
                                                      calib_dir=self.calib_dir, setup=setup,
                                                      calib_id=calib_id)
         # Save the result
-        self.msbias.to_file()
+        self.save_calib(self.msbias)
         # Return it
         return self.msbias
 
@@ -509,7 +558,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.msdark = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.msdark = self.load_calib(frame['class'], cal_file)
             return self.msdark
 
         # TODO: If a bias has been constructed and it will be subtracted from
@@ -529,7 +578,7 @@ class Calibrations:
                                                      bias=self.msbias, calib_dir=self.calib_dir,
                                                      setup=setup, calib_id=calib_id)
         # Save the result
-        self.msdark.to_file()
+        self.save_calib(self.msdark)
         # Return it
         return self.msdark
 
@@ -585,7 +634,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.msscattlight = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.msscattlight = self.load_calib(frame['class'], cal_file)
             return self.msscattlight
 
         # Scattered light model does not exist or we're not reusing it.
@@ -641,7 +690,7 @@ class Calibrations:
 
             # Save the master scattered light model
             self.msscattlight.set_paths(self.calib_dir, setup, calib_id, detname)
-            self.msscattlight.to_file()
+            self.save_calib(self.msscattlight)
 
         return self.msscattlight
 
@@ -703,8 +752,7 @@ class Calibrations:
         setup = illum_setup if pixel_setup is None else pixel_setup
         calib_id = illum_calib_id if pixel_calib_id is None else pixel_calib_id
         if cal_file.exists() and self.reuse_calibs:
-            self.flatimages = flatfield.FlatImages.from_file(cal_file,
-                                                             chk_version=self.chk_version)
+            self.flatimages = self.load_calib(flatfield.FlatImages, cal_file)
             self.flatimages.is_synced(self.slits)
             # Load user defined files
             if self.par['flatfield']['pixelflat_file'] is not None:
@@ -808,9 +856,9 @@ class Calibrations:
         if self.flatimages is not None:
             self.flatimages.set_paths(self.calib_dir, setup, calib_id, detname)
             # Save flat images
-            self.flatimages.to_file()
+            self.save_calib(self.flatimages)
             # Save slits too, in case they were tweaked
-            self.slits.to_file()
+            self.save_calib(self.slits)
 
         # Apply user-supplied images
         # NOTE: These are the *final* images, not just a stack, and it will
@@ -860,7 +908,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.slits = frame['class'].from_file(cal_file, chk_version=self.chk_version)
+            self.slits = self.load_calib(frame['class'], cal_file)
             self.slits.mask = self.slits.mask_init.copy()
             if self.user_slits is not None:
                 self.slits.user_mask(detname, self.user_slits)
@@ -876,7 +924,7 @@ class Calibrations:
             self.slits = edgetrace.EdgeTraceSet.from_file(edges_file,
                                                           chk_version=self.chk_version).get_slits()
             # Write the slits calibration file
-            self.slits.to_file()
+            self.save_calib(self.slits)
             if self.user_slits is not None:
                 self.slits.user_mask(detname, self.user_slits)
             return self.slits
@@ -933,7 +981,7 @@ class Calibrations:
         self.slits = edges.get_slits()
         traceImage = None
         edges = None
-        self.slits.to_file()
+        self.save_calib(self.slits)
         if self.user_slits is not None:
             self.slits.user_mask(detname, self.user_slits)
         return self.slits
@@ -977,7 +1025,7 @@ class Calibrations:
         # we want to reuse it, do so (or just load it):
         if cal_file.exists() and self.reuse_calibs: 
             # Load the file
-            self.wv_calib = wavecalib.WaveCalib.from_file(cal_file, chk_version=self.chk_version)
+            self.wv_calib = self.load_calib(wavecalib.WaveCalib, cal_file)
             self.wv_calib.chk_synced(self.slits)
             self.slits.mask_wvcalib(self.wv_calib)
             if self.par['wavelengths']['method'] == 'echelle':
@@ -1016,9 +1064,9 @@ class Calibrations:
         #   or if redo_slits
         if (self.par['wavelengths']['redo_slits'] is not None) or (
             self.spectrograph.pypeline == 'Echelle' and not self.spectrograph.ech_fixed_format):
-            self.slits.to_file()
+            self.save_calib(self.slits)
         # Save calibration frame
-        self.wv_calib.to_file()
+        self.save_calib(self.wv_calib)
 
         # Return
         return self.wv_calib
@@ -1055,7 +1103,7 @@ class Calibrations:
         # If a processed calibration frame exists and we want to reuse it, do
         # so:
         if cal_file.exists() and self.reuse_calibs:
-            self.wavetilts = wavetilts.WaveTilts.from_file(cal_file, chk_version=self.chk_version)
+            self.wavetilts = self.load_calib(wavetilts.WaveTilts, cal_file)
             self.wavetilts.is_synced(self.slits)
             self.slits.mask_wavetilts(self.wavetilts)
             return self.wavetilts
@@ -1072,7 +1120,7 @@ class Calibrations:
 
         # TODO still need to deal with syntax for LRIS ghosts. Maybe we don't need it
         self.wavetilts = buildwaveTilts.run(doqa=self.write_qa, show=self.show)
-        self.wavetilts.to_file()
+        self.save_calib(self.wavetilts)
         return self.wavetilts
 
     def run_the_steps(self):
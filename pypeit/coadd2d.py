@@ -1047,7 +1047,10 @@ class CoAdd2D:
                 s2dobj = f
             else:
                 # If spec2d is a list of files, option to also use spec1ds
-                s2dobj = spec2dobj.Spec2DObj.from_file(f, self.detname, chk_version=chk_version)
+                s2dobj = spec2dobj.Spec2DObj.from_file(f, self.detname, chk_version=chk_version,
+                                                       attrs=['sciimg', 'waveimg', 'skymodel',
+                                                              'ivarmodel', 'bpmmask', 'slits',
+                                                              'maskdef_designtab'])
                 spec1d_file = f.replace('spec2d', 'spec1d')
                 if os.path.isfile(spec1d_file):
                     sobjs = specobjs.SpecObjs.from_fitsfile(spec1d_file, chk_version=chk_version)
@@ -415,6 +415,10 @@ class CoAdd3D:
         self.combine = self.cubepar['combine']
         self.align = self.cubepar['align']
         self.correct_dar = self.cubepar['correct_dar']
+        # Options used to build the datacube in parallel and/or out-of-core
+        self.cube_kwargs = dict(n_proc=self.cubepar['n_proc'],
+                                dtype=np.float32 if self.cubepar['single_precision'] else float,
+                                memmap_dir=self.cubepar['memmap_dir'])
         # Do some quick checks on the input options
         if skysub_frame is not None and len(skysub_frame) != self.numfiles:
             msgs.error("The skysub_frame list should be identical length to the spec2dfiles list")
@@ -1184,7 +1188,7 @@ class SlicerIFUCoAdd3D(CoAdd3D):
                                                         spat_subpixel=self.spat_subpixel,
                                                         slice_subpixel=self.slice_subpixel,
                                                         skip_subpix_weights=self.skip_subpix_weights,
-                                                        correct_dar=self.correct_dar)
+                                                        correct_dar=self.correct_dar, **self.cube_kwargs)
                     # Prepare the header
                     hdr = self.all_wcs[ff].to_header()
                     if self.fluxcal:
@@ -1258,7 +1262,8 @@ class SlicerIFUCoAdd3D(CoAdd3D):
                                                            ra_offsets, dec_offsets,
                                                            spec_subpixel=self.spec_subpixel,
                                                            spat_subpixel=self.spat_subpixel,
-                                                           slice_subpixel=self.slice_subpixel)
+                                                           slice_subpixel=self.slice_subpixel,
+                                                           n_proc=self.cubepar['n_proc'])
                 if reference_image is None:
                     # ref_idx will be the index of the cube with the highest S/N
                     ref_idx = np.argmax(self.weights)
@@ -1393,7 +1398,7 @@ class SlicerIFUCoAdd3D(CoAdd3D):
                                                     spat_subpixel=self.spat_subpixel,
                                                     slice_subpixel=self.slice_subpixel,
                                                     skip_subpix_weights=self.skip_subpix_weights,
-                                                    correct_dar=self.correct_dar)
+                                                    correct_dar=self.correct_dar, **self.cube_kwargs)
                 # Prepare the header
                 hdr = cube_wcs.to_header()
                 if self.fluxcal:
@@ -1420,7 +1425,7 @@ class SlicerIFUCoAdd3D(CoAdd3D):
                                                         spat_subpixel=self.spat_subpixel,
                                                         slice_subpixel=self.slice_subpixel,
                                                         skip_subpix_weights=self.skip_subpix_weights,
-                                                        correct_dar=self.correct_dar)
+                                                        correct_dar=self.correct_dar, **self.cube_kwargs)
                     # Prepare the header
                     hdr = cube_wcs.to_header()
                     if self.fluxcal:
@@ -1177,11 +1177,98 @@ def scale_spec(wave, flux, ivar, sn, wave_ref, flux_ref, ivar_ref, mask=None, ma
 
     return flux_scale, ivar_scale, scale, method_used
 
-def compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights, min_weight=1e-8):
+class StackBinning:
+    """
+    Assignment of the pixels of a set of spectra to the bins of a wavelength
+    grid.
+
+    The wavelength bin of every pixel is found once, such that any number of
+    quantities can then be summed in each bin using `numpy.bincount`_.  The
+    binning can be reused by all stacks of the same set of spectra (e.g., by
+    all the rejection iterations in :func:`spec_reject_comb`), regardless of
+    changes to their fluxes, masks, or weights.
+
+    The bins are the same as those used by `numpy.histogram`_: each bin
+    includes its lower edge, and the last bin also includes its upper edge.
+
+    Parameters
+    ----------
+    wave_grid : `numpy.ndarray`_
+        Edges of the wavelength bins.  shape=(ngrid+1,)
+    waves : list
+        List of length nexp `numpy.ndarray`_ float wavelength arrays for the
+        spectra to be stacked.
+
+    Attributes
+    ----------
+    nbins : int
+        Number of wavelength bins.
+    nspec : list
+        The number of pixels in each spectrum.
+    wave : `numpy.ndarray`_
+        The flattened wavelengths of all spectra.
+    indx : `numpy.ndarray`_
+        The bin of each pixel in :attr:`wave`.
+    inbin : `numpy.ndarray`_
+        Boolean array selecting the pixels that fall in one of the bins.
+    """
+    def __init__(self, wave_grid, waves):
+        self.wave_grid = wave_grid
+        self.nbins = wave_grid.size - 1
+        self.nspec = [wave.size for wave in waves]
+        self.wave = self.flatten(waves)
+        self.indx = np.searchsorted(wave_grid, self.wave, side='right') - 1
+        self.indx[self.wave == wave_grid[-1]] = self.nbins - 1
+        self.inbin = (self.indx >= 0) & (self.indx < self.nbins)
+
+    def flatten(self, arrays):
+        """
+        Concatenate a list of arrays aligned with the binned spectra.
+
+        Parameters
+        ----------
+        arrays : list
+            List of length nexp `numpy.ndarray`_ arrays aligned with the
+            wavelength arrays used to construct the binning.
+
+        Returns
+        -------
+        `numpy.ndarray`_
+            The flattened arrays.
+        """
+        return np.concatenate([np.ravel(a) for a in arrays])
+
+    def accumulate(self, gpm, *values):
+        """
+        Count the pixels in each bin and sum the provided quantities.
+
+        Parameters
+        ----------
+        gpm : `numpy.ndarray`_
+            Flattened good-pixel mask (see :func:`flatten`) selecting the
+            pixels to include.  True=Good.
+        *values : `numpy.ndarray`_
+            Any number of flattened quantities to sum in each bin.
+
+        Returns
+        -------
+        nused : `numpy.ndarray`_
+            The number of pixels in each bin.  shape=(ngrid,)
+        *totals : `numpy.ndarray`_
+            The sum of each of the provided quantities in each bin.
+            shape=(ngrid,)
+        """
+        _gpm = gpm & self.inbin
+        indx = self.indx[_gpm]
+        return (np.bincount(indx, minlength=self.nbins),) \
+                + tuple(np.bincount(indx, weights=v[_gpm], minlength=self.nbins) for v in values)
+
+
+def compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights, min_weight=1e-8, binning=None):
     """
     Compute a stacked spectrum from a set of exposures on the specified
     wave_grid with proper treatment of weights and masking. This code uses
-    np.histogram to combine the data using NGP and does not perform any
+    NGP binning to combine the data and does not perform any
     interpolations and thus does not correlate errors. It uses wave_grid to
     determine the set of wavelength bins that the data are averaged on. The
     final spectrum will be on an ouptut wavelength grid which is not the same as
@@ -1230,6 +1317,11 @@ def compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights, min_weight=1e-
         waves and were computed using sn_weights.
     min_weight : float, optional
         Minimum allowed weight for any individual spectrum
+    binning : :class:`StackBinning`, optional
+        The assignment of the pixels in ``waves`` to the bins in
+        ``wave_grid``.  If None, it is constructed.  Provide it to avoid
+        recomputing the binning when stacking the same spectra multiple
+        times.
 
     Returns
     -------
@@ -1260,39 +1352,34 @@ def compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights, min_weight=1e-
 
     #mask bad values and extreme values (usually caused by extreme low sensitivity at the edge of detectors)
     #TODO cutting on the value of ivar is dicey for data in different units. This should be removed.
+    if binning is None:
+        binning = StackBinning(wave_grid, waves)
+    elif binning.nspec != [wave.size for wave in waves]:
+        msgs.error('Binning does not match the spectra to be stacked.')
     uber_gpms = [gpm & (weight > 0.0) & (wave > 1.0) & (ivar > 0.0) & (utils.inverse(ivar)<1e10)
                  for gpm, weight, wave, ivar in zip(gpms, weights, waves, ivars)]
-    waves_flat, fluxes_flat, ivars_flat, weights_flat = [], [], [], []
-    for wave, flux, ivar, weight, ugpm in zip(waves, fluxes, ivars, weights, uber_gpms):
-        waves_flat   += wave[ugpm].tolist()
-        fluxes_flat  += flux[ugpm].tolist()
-        ivars_flat   += ivar[ugpm].tolist()
-        weights_flat += weight[ugpm].tolist()
-
-    waves_flat = np.array(waves_flat)
-    fluxes_flat = np.array(fluxes_flat)
-    ivars_flat = np.array(ivars_flat)
-    weights_flat = np.array(weights_flat)
-    vars_flat = utils.inverse(np.array(ivars_flat))
-
-    # Counts how many pixels in each wavelength bin
-    nused, wave_edges = np.histogram(waves_flat,bins=wave_grid,density=False)
-
-    # Calculate the summed weights for the denominator
-    weights_total, wave_edges = np.histogram(waves_flat,bins=wave_grid,density=False,weights=weights_flat)
+    gpm_flat = binning.flatten(uber_gpms)
+    waves_flat = binning.wave
+    fluxes_flat = binning.flatten(fluxes)
+    weights_flat = binning.flatten(weights)
+    vars_flat = utils.inverse(binning.flatten(ivars))
+
+    # Count how many pixels are in each wavelength bin, and calculate the
+    # summed weights for the denominator and the weighted sums of the
+    # wavelength, flux and variance
+    nused, weights_total, wave_stack_total, flux_stack_total, var_stack_total \
+            = binning.accumulate(gpm_flat, weights_flat, waves_flat*weights_flat,
+                                 fluxes_flat*weights_flat, vars_flat*weights_flat**2)
 
     # Calculate the stacked wavelength
     ## TODO: JFH Made the minimum weight 1e-8 from 1e-4. I'm not sure what this min_weight is necessary for, or
     # is achieving FW.
-    wave_stack_total, wave_edges = np.histogram(waves_flat,bins=wave_grid,density=False,weights=waves_flat*weights_flat)
     wave_stack = (weights_total > min_weight)*wave_stack_total/(weights_total+(weights_total==0.))
 
     # Calculate the stacked flux
-    flux_stack_total, wave_edges = np.histogram(waves_flat,bins=wave_grid,density=False,weights=fluxes_flat*weights_flat)
     flux_stack = (weights_total > min_weight)*flux_stack_total/(weights_total+(weights_total==0.))
 
     # Calculate the stacked ivar
-    var_stack_total, wave_edges = np.histogram(waves_flat,bins=wave_grid,density=False,weights=vars_flat*weights_flat**2)
     var_stack = (weights_total > min_weight)*var_stack_total/(weights_total+(weights_total==0.))**2
     ivar_stack = utils.inverse(var_stack)
 
@@ -1741,7 +1828,7 @@ def update_errors(fluxes, ivars, masks, fluxes_stack, ivars_stack, masks_stack,
 
 def spec_reject_comb(wave_grid, wave_grid_mid, waves_list, fluxes_list, ivars_list, gpms_list, weights_list, sn_clip=30.0, lower=3.0, upper=3.0,
                      maxrej=None, maxiter_reject=5, title='', debug=False,
-                     verbose=False):
+                     verbose=False, binning=None):
     """
     Routine for executing the iterative combine and rejection of a set of
     spectra to compute a final stacked spectrum.
@@ -1804,6 +1891,10 @@ def spec_reject_comb(wave_grid, wave_grid_mid, waves_list, fluxes_list, ivars_li
         Show QA plots useful for debugging.
     verbose : bool, optional, default=False
         Level of verbosity.
+    binning : :class:`StackBinning`, optional
+        The assignment of the pixels in ``waves_list`` to the bins in
+        ``wave_grid``.  If None, it is constructed.  In either case, it is
+        used by all the combine/rejection iterations.
 
     Returns
     -------
@@ -1853,12 +1944,16 @@ def spec_reject_comb(wave_grid, wave_grid_mid, waves_list, fluxes_list, ivars_li
     weights, _ = utils.explist_to_array(weights_list, pad_value=0.0)
     gpms, _ = utils.explist_to_array(gpms_list, pad_value=False)
     this_gpms = np.copy(gpms)
+    # The wavelengths are the same for all iterations, so only bin them once
+    if binning is None:
+        binning = StackBinning(wave_grid, waves_list)
     iter = 0
     qdone = False
     while (not qdone) and (iter < maxiter_reject):
         # Compute the stack
         wave_stack, flux_stack, ivar_stack, gpm_stack, nused = compute_stack(
-            wave_grid, waves_list, fluxes_list, ivars_list, utils.array_to_explist(this_gpms, nspec_list=nspec_list), weights_list)
+            wave_grid, waves_list, fluxes_list, ivars_list, utils.array_to_explist(this_gpms, nspec_list=nspec_list), weights_list,
+            binning=binning)
         # Interpolate the individual spectra onto the wavelength grid of the stack. Use wave_grid_mid for this
         # since it has no masked values
         flux_stack_nat, ivar_stack_nat, gpm_stack_nat, _ = interp_spec(
@@ -1891,7 +1986,7 @@ def spec_reject_comb(wave_grid, wave_grid_mid, waves_list, fluxes_list, ivars_li
 
     # Compute the final stack using this outmask
     wave_stack, flux_stack, ivar_stack, gpm_stack, nused = compute_stack(
-        wave_grid, waves_list, fluxes_list, ivars_list, out_gpms_list, weights_list)
+        wave_grid, waves_list, fluxes_list, ivars_list, out_gpms_list, weights_list, binning=binning)
 
     # Used only for plotting below
     if debug:
@@ -1920,7 +2015,7 @@ def scale_spec_stack(wave_grid, wave_grid_mid, waves, fluxes, ivars, gpms, sns,
                      ref_percentile=70.0, maxiter_scale=5,
                      sigrej_scale=3.0, scale_method='auto',
                      hand_scale=None, sn_min_polyscale=2.0, sn_min_medscale=0.5,
-                     debug=False, show=False):
+                     debug=False, show=False, binning=None):
 
     """
     Scales a set of spectra to a common flux scale. This is done by first
@@ -1984,6 +2079,9 @@ def scale_spec_stack(wave_grid, wave_grid_mid, waves, fluxes, ivars, gpms, sns,
         minimum SNR for perforing median scaling
     debug : bool, optional, default=False
         show interactive QA plot
+    binning : :class:`StackBinning`, optional
+        The assignment of the pixels in ``waves`` to the bins in
+        ``wave_grid``.  If None, it is constructed.
 
     Returns
     -------
@@ -2000,7 +2098,8 @@ def scale_spec_stack(wave_grid, wave_grid_mid, waves, fluxes, ivars, gpms, sns,
     """
 
     # Compute an initial stack as the reference, this has its own wave grid based on the weighted averages
-    wave_stack, flux_stack, ivar_stack, gpm_stack, nused = compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights)
+    wave_stack, flux_stack, ivar_stack, gpm_stack, nused = compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights,
+                                                                         binning=binning)
 
     # Rescale spectra to line up with our preliminary stack so that we can sensibly reject outliers
     fluxes_scale, ivars_scale, scales, scale_method_used = [], [], [], []
@@ -2181,16 +2280,20 @@ def combspec(waves, fluxes, ivars, gpms, sn_smooth_npix,
         wave_grid_input=wave_grid_input,
         dwave=dwave, dv=dv, dloglam=dloglam, spec_samp_fact=spec_samp_fact)
 
+    # Bin the wavelengths once for all the stacks computed below
+    binning = StackBinning(wave_grid, _waves)
+
     # Evaluate the sn_weights. This is done once at the beginning
     rms_sn, weights = sn_weights(_fluxes, _ivars, gpms, sn_smooth_npix=sn_smooth_npix, weight_method=weight_method, verbose=verbose)
     fluxes_scale, ivars_scale, scales, scale_method_used = scale_spec_stack(
         wave_grid, wave_grid_mid, _waves, _fluxes, _ivars, gpms, rms_sn, weights, ref_percentile=ref_percentile, maxiter_scale=maxiter_scale,
         sigrej_scale=sigrej_scale, scale_method=scale_method, hand_scale=hand_scale,
-        sn_min_polyscale=sn_min_polyscale, sn_min_medscale=sn_min_medscale, debug=debug_scale, show=show_scale)
+        sn_min_polyscale=sn_min_polyscale, sn_min_medscale=sn_min_medscale, debug=debug_scale, show=show_scale,
+        binning=binning)
     # Rejecting and coadding
     wave_stack, flux_stack, ivar_stack, gpm_stack, nused, outmask = spec_reject_comb(
         wave_grid, wave_grid_mid, _waves, fluxes_scale, ivars_scale, gpms, weights, sn_clip=sn_clip, lower=lower, upper=upper,
-        maxrej=maxrej, maxiter_reject=maxiter_reject, debug=debug, title=title)
+        maxrej=maxrej, maxiter_reject=maxiter_reject, debug=debug, title=title, binning=binning)
 
     if show:
         # JFH Use wave_grid_mid for QA plots
@@ -2643,11 +2746,16 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
     #######################
     #debug_scale=True
     fluxes_scl_interord_setup_list, ivars_scl_interord_setup_list, scales_interord_setup_list = [], [], []
+    # The binning of the wavelengths of each order is reused by the order
+    # stacks computed below
+    binning_setup_list = []
     for isetup in range(nsetups):
         fluxes_scl_interord_isetup, ivars_scl_interord_isetup, scales_interord_isetup = [], [], []
+        binning_isetup = []
         for iord in range(norders[isetup]):
             ind_start = iord*nexps[isetup]
             ind_end = (iord+1)*nexps[isetup]
+            binning_isetup.append(StackBinning(wave_grid, waves_setup_list[isetup][ind_start:ind_end]))
             fluxes_scl_interord_iord, ivars_scl_interord_iord, scales_interord_iord, scale_method_used = \
                 scale_spec_stack(wave_grid, wave_grid_mid, waves_setup_list[isetup][ind_start:ind_end],
                                  fluxes_setup_list[isetup][ind_start:ind_end],ivars_setup_list[isetup][ind_start:ind_end],
@@ -2655,7 +2763,8 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
                                  weights_setup_list[isetup][ind_start:ind_end], ref_percentile=ref_percentile,
                                  maxiter_scale=maxiter_scale, sigrej_scale=sigrej_scale, scale_method=scale_method,
                                  hand_scale=hand_scale,
-                                 sn_min_polyscale=sn_min_polyscale, sn_min_medscale=sn_min_medscale, debug=debug_scale)
+                                 sn_min_polyscale=sn_min_polyscale, sn_min_medscale=sn_min_medscale, debug=debug_scale,
+                                 binning=binning_isetup[iord])
             fluxes_scl_interord_isetup += fluxes_scl_interord_iord
             ivars_scl_interord_isetup += ivars_scl_interord_iord
             scales_interord_isetup += scales_interord_iord
@@ -2663,6 +2772,7 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
         fluxes_scl_interord_setup_list.append(fluxes_scl_interord_isetup)
         ivars_scl_interord_setup_list.append(ivars_scl_interord_isetup)
         scales_interord_setup_list.append(scales_interord_isetup)
+        binning_setup_list.append(binning_isetup)
 
     # TODO Add checking above in inter-order scaling such that orders with low S/N ratio are instead scaled using
     # scale factors from higher S/N ratio. The point is it makes no sense to take 0.0/0.0. In the low S/N regime,
@@ -2694,6 +2804,9 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
     # It was initially implemented with NIRSPEC in mind, but was not very effective in that case. We have tested
     # it against the X-Shooter dev suite example and found it does not harm the reduction, and may prove helpful in future. 
     scale_method_iter = ['median']*(2) + [scale_method]  + ['median']*(niter_order_scale - 3)
+    # Bin the wavelengths of all setups, orders, and exposures once for the
+    # global stacks
+    binning_concat = StackBinning(wave_grid, waves_concat)
     # Iteratively scale and stack the entire set of spectra arcoss all setups, orders, and exposures
     for iteration in range(niter_order_scale):
         # JFH This scale_spec_stack routine takes a list of [(nspec1,), (nspec2,), ...] arrays, so a loop needs to be
@@ -2703,7 +2816,7 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
             weights_concat, ref_percentile=ref_percentile,
             maxiter_scale=maxiter_scale, sigrej_scale=sigrej_scale, scale_method=scale_method_iter[iteration], hand_scale=hand_scale,
             sn_min_polyscale=sn_min_polyscale, sn_min_medscale=sn_min_medscale,
-            show=(show_order_scale & (iteration == (niter_order_scale-1))))
+            show=(show_order_scale & (iteration == (niter_order_scale-1))), binning=binning_concat)
         scales_concat = [scales_orig*scales_new for scales_orig, scales_new in zip(scales_concat, scales_iter_concat)]
         fluxes_pre_scale_concat = copy.deepcopy(fluxes_scale_concat)
         ivars_pre_scale_concat = copy.deepcopy(ivars_scale_concat)
@@ -2716,7 +2829,7 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
     wave_final_stack, flux_final_stack, ivar_final_stack, gpm_final_stack, nused_final_stack, out_gpms_concat = \
         spec_reject_comb(wave_grid, wave_grid_mid, waves_concat, fluxes_scale_concat, ivars_scale_concat, gpms_concat,
                          weights_concat, sn_clip=sn_clip, lower=lower, upper=upper, maxrej=maxrej,
-                         maxiter_reject=maxiter_reject, debug=debug_global_stack)
+                         maxiter_reject=maxiter_reject, debug=debug_global_stack, binning=binning_concat)
 
     # Generate setup_lists and  arr_setup for some downstream computations
     fluxes_scale_setup_list = utils.concat_to_setup_list(fluxes_scale_concat, norders, nexps)
@@ -2744,7 +2857,7 @@ def ech_combspec(waves_arr_setup, fluxes_arr_setup, ivars_arr_setup, gpms_arr_se
                 fluxes_scale_setup_list[isetup][ind_start:ind_end], ivars_scale_setup_list[isetup][ind_start:ind_end],
                 gpms_setup_list[isetup][ind_start:ind_end], weights_setup_list[isetup][ind_start:ind_end],
                 sn_clip=sn_clip, lower=lower, upper=upper, maxrej=maxrej, maxiter_reject=maxiter_reject, debug=debug_order_stack,
-                title='order_stacks')
+                title='order_stacks', binning=binning_setup_list[isetup][iord])
             waves_order_stack.append(wave_order_stack_iord)
             fluxes_order_stack.append(flux_order_stack_iord)
             ivars_order_stack.append(ivar_order_stack_iord)
@@ -16,7 +16,8 @@ import os.path
 import numpy as np
 from astropy.time import Time
 import astropy.units as u
-from astropy.coordinates import SkyCoord, Angle
+from astropy.coordinates import SkyCoord, Angle, angular_separation
+from scipy.spatial import cKDTree
 
 from pypeit import specobjs
 from pypeit.spectrographs.util import load_spectrograph
@@ -193,21 +194,102 @@ def collate_spectra_by_source(source_list, tolerance, unit=u.arcsec):
 
     """
 
-    collated_list = []
-    for source in source_list:
+    if len(source_list) == 0:
+        return []
+
+    # Find the spatial neighbors of every source up front, so that each source
+    # only has to be compared against the collated sources founded by one of
+    # its neighbors, instead of against every collated source.
+    neighbors = _find_neighbors(source_list, tolerance, unit)
 
-        # Search for a collated SourceObject that matches this one.
+    collated_list = []
+    # Index of the collated SourceObject founded by each source, or -1
+    founded = np.full(len(source_list), -1, dtype=int)
+    config_match = {}
+    for i, source in enumerate(source_list):
+
+        # Search for a collated SourceObject that matches this one.  The
+        # position of a collated SourceObject is that of the source that
+        # founded it, so only those founded by a neighbor can match.  They're
+        # checked in the order they were created.
         # If one can't be found, treat this as a new collated SourceObject.
         found = False
-        for collated_source in collated_list:
-            if  collated_source.match(source.spec_obj_list[0], 
-                                      source.spec1d_header_list[0],
-                                      tolerance, unit):
-
-                collated_source.combine(source)
+        for j in np.sort(founded[neighbors[i]]):
+            if j < 0:
+                continue
+            # Sources from the same spec1d file share the same header, so
+            # cache the result of comparing the configurations
+            header = source.spec1d_header_list[0]
+            key = (id(collated_list[j].spec1d_header_list[0]), id(header))
+            if key not in config_match:
+                config_match[key] = collated_list[j]._config_key_match(header)
+            if config_match[key]:
+                collated_list[j].combine(source)
                 found = True
 
         if not found:
-            collated_list.append(copy.deepcopy(source))
+            founded[i] = len(collated_list)
+            # Only the lists are changed when combining, so there's no need
+            # to (deep) copy the spectra and headers themselves.
+            collated_source = copy.copy(source)
+            collated_source.spec_obj_list = list(source.spec_obj_list)
+            collated_source.spec1d_file_list = list(source.spec1d_file_list)
+            collated_source.spec1d_header_list = list(source.spec1d_header_list)
+            collated_list.append(collated_source)
 
     return collated_list
+
+
+def _find_neighbors(source_list, tolerance, unit):
+    """
+    Find the sources within the matching tolerance of each source.
+
+    Candidate pairs are found using a KD-tree built over the source positions:
+    unit vectors on the sphere for 'ra/dec' matching, or the spatial pixel
+    position for 'pixel' matching.  The candidates are then checked using the
+    same distance criterion as :func:`SourceObject.match`.
+
+    Args:
+        source_list (list of :obj:`SourceObject`):
+            The uncollated source objects, all with the same match type.
+        tolerance (float):
+            Maximum distance that two spectra can be from each other to be
+            considered to be from the same source.
+        unit (`astropy.units.Unit`_):
+            Units of ``tolerance`` if the match type is 'ra/dec'.
+
+    Returns:
+        list: For each source, an integer array with the indices of the
+        sources within the tolerance (including itself).
+    """
+    if source_list[0].match_type == 'ra/dec':
+        ra = np.array([s.spec_obj_list[0].RA for s in source_list], dtype=float)
+        dec = np.array([s.spec_obj_list[0].DEC for s in source_list], dtype=float)
+        _ra, _dec = np.radians(ra), np.radians(dec)
+        points = np.column_stack((np.cos(_dec)*np.cos(_ra), np.cos(_dec)*np.sin(_ra),
+                                  np.sin(_dec)))
+        tol = Angle(tolerance, unit=unit)
+        # Chord length subtended by the tolerance, padded to make sure no
+        # candidates are lost to round-off
+        radius = 2*np.sin(min(tol.radian, np.pi)/2) * (1 + 1e-8) + 1e-12
+    else:
+        pos = np.array([s.coord for s in source_list], dtype=float)
+        points = pos[:,None]
+        radius = tolerance * (1 + 1e-8) + 1e-12
+
+    tree = cKDTree(points)
+    candidates = tree.query_ball_point(points, radius)
+
+    # Check all the candidate pairs at once
+    ncand = np.array([len(c) for c in candidates])
+    i = np.repeat(np.arange(len(source_list)), ncand)
+    j = np.concatenate(candidates).astype(int)
+    if source_list[0].match_type == 'ra/dec':
+        sep = angular_separation(ra[j]*u.deg, dec[j]*u.deg, ra[i]*u.deg, dec[i]*u.deg)
+        keep = sep <= tol
+    else:
+        keep = np.fabs(pos[i] - pos[j]) <= tolerance
+    neighbors = np.split(j, np.cumsum(ncand)[:-1])
+    keep = np.split(keep, np.cumsum(ncand)[:-1])
+    neighbors = [n[k] for n, k in zip(neighbors, keep)]
+    return neighbors
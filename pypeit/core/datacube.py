@@ -4,7 +4,9 @@ Module containing routines used by 3D datacubes.
 .. include:: ../include/links.rst
 """
 
+import contextlib
 import os
+import tempfile
 
 from astropy import wcs, units
 from astropy.coordinates import AltAz, SkyCoord
@@ -18,9 +20,6 @@ from pypeit import msgs
 from pypeit import utils
 from pypeit.core import coadd, flux_calib
 
-# Use a fast histogram for speed!
-from fast_histogram import histogramdd
-
 from IPython import embed
 
 
@@ -1296,7 +1295,8 @@ def compute_weights(raImg, decImg, waveImg, sciImg, ivarImg, slitidImg,
 
 def generate_image_subpixel(image_wcs, bins, sciImg, ivarImg, waveImg, slitid_img_gpm, wghtImg,
                             all_wcs, tilts, slits, astrom_trans, all_dar, ra_offset, dec_offset,
-                            spec_subpixel=5, spat_subpixel=5, slice_subpixel=5, combine=False, correct_dar=True):
+                            spec_subpixel=5, spat_subpixel=5, slice_subpixel=5, combine=False, correct_dar=True,
+                            n_proc=1):
     """
     Generate a white light image from the input pixels
 
@@ -1365,6 +1365,9 @@ def generate_image_subpixel(image_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
             If True, the DAR correction will be applied to the input images
             before generating the white light images. If False, the DAR
             correction will not be applied.
+        n_proc (:obj:`int`, optional):
+            Number of processes used to resample the slits; see
+            :func:`subpixellate`.
 
     Returns:
         `numpy.ndarray`_: The white light images for all frames
@@ -1387,13 +1390,13 @@ def generate_image_subpixel(image_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
             img, _, _ = subpixellate(image_wcs, bins, _sciImg, _ivarImg, _waveImg, _slitid_img_gpm, _wghtImg,
                                      _all_wcs, _tilts, _slits, _astrom_trans, _all_dar, _ra_offset, _dec_offset,
                                      spec_subpixel=spec_subpixel, spat_subpixel=spat_subpixel, slice_subpixel=slice_subpixel,
-                                     skip_subpix_weights=True, correct_dar=correct_dar)
+                                     skip_subpix_weights=True, correct_dar=correct_dar, n_proc=n_proc)
         else:
             # Subpixellate
             img, _, _ = subpixellate(image_wcs, bins, _sciImg[fr], _ivarImg[fr], _waveImg[fr], _slitid_img_gpm[fr], _wghtImg[fr],
                                      _all_wcs[fr], _tilts[fr], _slits[fr], _astrom_trans[fr], _all_dar[fr], _ra_offset[fr], _dec_offset[fr],
                                      spec_subpixel=spec_subpixel, spat_subpixel=spat_subpixel, slice_subpixel=slice_subpixel,
-                                     skip_subpix_weights=True, correct_dar=correct_dar)
+                                     skip_subpix_weights=True, correct_dar=correct_dar, n_proc=n_proc)
         all_wl_imgs[:, :, fr] = img[:, :, 0]
     # Return the constructed white light images
     return all_wl_imgs
@@ -1403,7 +1406,8 @@ def generate_cube_subpixel(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
                            all_wcs, tilts, slits, astrom_trans, all_dar,
                            ra_offset, dec_offset,
                            spec_subpixel=5, spat_subpixel=5, slice_subpixel=5, skip_subpix_weights=False,
-                           overwrite=False, outfile=None, whitelight_range=None, correct_dar=True):
+                           overwrite=False, outfile=None, whitelight_range=None, correct_dar=True,
+                           n_proc=1, dtype=float, memmap_dir=None):
     """
     Save a datacube using the subpixel algorithm. Refer to the subpixellate()
     docstring for further details about this algorithm
@@ -1491,6 +1495,14 @@ def generate_cube_subpixel(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
         correct_dar (bool, optional):
             If True, the DAR correction will be applied to the datacube. If the
             DAR correction is not available, the datacube will not be corrected.
+        n_proc (int, optional):
+            Number of processes used to resample the slits; see
+            :func:`subpixellate`.
+        dtype (`numpy.dtype`_, optional):
+            Data type of the accumulated datacubes; see :func:`subpixellate`.
+        memmap_dir (str, optional):
+            Directory for the memory-mapped datacubes; see
+            :func:`subpixellate`.
 
     Returns:
         :obj:`tuple`: Four `numpy.ndarray`_ objects containing
@@ -1512,7 +1524,8 @@ def generate_cube_subpixel(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
                                              all_wcs, tilts, slits, astrom_trans, all_dar, ra_offset, dec_offset,
                                              spec_subpixel=spec_subpixel, spat_subpixel=spat_subpixel,
                                              slice_subpixel=slice_subpixel, skip_subpix_weights=skip_subpix_weights,
-                                             correct_dar=correct_dar)
+                                             correct_dar=correct_dar, n_proc=n_proc, dtype=dtype,
+                                             memmap_dir=memmap_dir)
 
     # Get wavelength of each pixel
     nspec = flxcube.shape[2]
@@ -1538,13 +1551,135 @@ def generate_cube_subpixel(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_im
         img_hdu.writeto(out_whitelight, overwrite=overwrite)
 
     # TODO :: Avoid transposing these large cubes
-    return flxcube.T, np.sqrt(varcube.T), bpmcube.T, wave
+    return flxcube.T, np.sqrt(varcube.T, out=varcube.T), bpmcube.T, wave
+
+
+def voxel_index(vox_coord, outshape, binrng):
+    """
+    Convert voxel coordinates into an index in the flattened datacube.
+
+    Args:
+        vox_coord (`numpy.ndarray`_):
+            The voxel coordinates.  The last axis must have length 3 and
+            provide the x, y spatial and z wavelength coordinates.
+        outshape (tuple):
+            The shape of the datacube.
+        binrng (`numpy.ndarray`_):
+            The range covered by the bins in each dimension.  Shape is (3,2).
+
+    Returns:
+        `numpy.ndarray`_: The index of the voxel in the flattened datacube
+        (see `numpy.ravel`_) that contains each coordinate.  Coordinates that
+        are outside the datacube have an index of -1.  The shape is the same
+        as ``vox_coord`` without the last axis.
+    """
+    _outshape = np.array(outshape)
+    vox = np.floor(_outshape * (vox_coord - binrng[:,0]) / (binrng[:,1] - binrng[:,0]))
+    inside = np.all((vox >= 0) & (vox < _outshape), axis=-1)
+    vox = vox[inside].astype(int)
+    index = np.full(vox_coord.shape[:-1], -1, dtype=int)
+    index[inside] = (vox[:,0] * outshape[1] + vox[:,1]) * outshape[2] + vox[:,2]
+    return index
+
+
+def subpixel_occurrences(vox_index):
+    """
+    Calculate the sub-pixellation weights.
+
+    For each detector pixel, this counts the number of its subpixels that fall
+    in the same voxel; i.e., this is the vectorized equivalent of applying
+    :func:`~pypeit.utils.occurrences` to each row of ``vox_index``.
+
+    Args:
+        vox_index (`numpy.ndarray`_):
+            The voxel index of each subpixel (see :func:`voxel_index`).  Shape
+            is (npix, nsubpix).
+
+    Returns:
+        `numpy.ndarray`_: The number of subpixels of the same detector pixel in
+        the same voxel as each subpixel.  Shape is (npix, nsubpix).
+    """
+    # Sort the indices of each pixel and find the runs of identical indices
+    srt = np.argsort(vox_index, axis=1)
+    srt_index = np.take_along_axis(vox_index, srt, axis=1)
+    newrun = np.ones(srt_index.shape, dtype=bool)
+    newrun[:,1:] = srt_index[:,1:] != srt_index[:,:-1]
+    # The first subpixel of each pixel always starts a new run, so runs never
+    # span more than one pixel
+    run = np.cumsum(newrun.ravel()).reshape(srt_index.shape) - 1
+    count = np.bincount(run.ravel())[run]
+    # Return the counts in the original order
+    occurrences = np.empty_like(count)
+    np.put_along_axis(occurrences, srt, count, axis=1)
+    return occurrences
+
+
+def bin_voxels(vox_index, weights, dtype=float):
+    """
+    Accumulate one or more sets of weights into (partial) datacubes.
+
+    The voxels within the datacube are selected only once, and the same
+    selection is used to accumulate all the weights.  To limit the memory
+    used, the accumulated weights are only returned for the range of
+    voxels (in the flattened datacube) that are selected.
+
+    Args:
+        vox_index (`numpy.ndarray`_):
+            The index of the voxel for each element (see :func:`voxel_index`).
+            Elements with an index of -1 are ignored.
+        weights (list):
+            List of `numpy.ndarray`_ objects with the weights to accumulate.
+            Each must have the same shape as ``vox_index``.
+        dtype (`numpy.dtype`_, optional):
+            Data type of the returned partial datacubes.  Each partial
+            datacube is only held in double precision while its weights are
+            summed.
+
+    Returns:
+        :obj:`tuple`: The index of the first voxel in the flattened datacube
+        covered by the partial datacubes, and a list of `numpy.ndarray`_
+        objects with the flattened partial datacubes, one per element of
+        ``weights``.  I.e., the partial datacubes are added to a full datacube
+        using ``cube.reshape(-1)[offset:offset+part.size] += part``.
+    """
+    inside = vox_index >= 0
+    index = vox_index[inside]
+    if index.size == 0:
+        return 0, [np.zeros(0, dtype=dtype) for w in weights]
+    offset = np.min(index)
+    index -= offset
+    nvox = np.max(index) + 1
+    return offset, [np.bincount(index, weights=w[inside], minlength=nvox).astype(dtype, copy=False)
+                        for w in weights]
+
+
+def empty_cube(shape, dtype=float, memmap_dir=None):
+    """
+    Allocate a datacube initialized to zero.
+
+    Args:
+        shape (tuple):
+            Shape of the datacube.
+        dtype (`numpy.dtype`_, optional):
+            Data type of the datacube.
+        memmap_dir (:obj:`str`, optional):
+            If provided, the datacube is memory-mapped to an anonymous temporary
+            file in this directory, instead of being held in memory.  The file
+            is removed when the datacube is deleted.
+
+    Returns:
+        `numpy.ndarray`_: The datacube.
+    """
+    if memmap_dir is None:
+        return np.zeros(shape, dtype=dtype)
+    with tempfile.TemporaryFile(dir=memmap_dir) as f:
+        return np.memmap(f, dtype=dtype, mode='w+', shape=shape)
 
 
 def subpixellate(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_img_gpm, wghtImg,
                  all_wcs, tilts, slits, astrom_trans, all_dar, ra_offset, dec_offset,
                  spec_subpixel=5, spat_subpixel=5, slice_subpixel=5, skip_subpix_weights=False,
-                 correct_dar=True):
+                 correct_dar=True, n_proc=1, dtype=float, memmap_dir=None):
     r"""
     Subpixellate the input data into a datacube. This algorithm splits each
     detector pixel into multiple subpixels and each IFU slice into multiple subslices.
@@ -1632,22 +1767,152 @@ def subpixellate(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_img_gpm, wgh
         correct_dar (bool, optional):
             If True, the DAR correction will be applied to the datacube. The
             default is True.
+        n_proc (int, optional):
+            Number of processes used to resample the slits of all exposures.
+            If 1, the slits are resampled serially; if less than 1, the number
+            of processes is set to the number of available CPUs.  The partial
+            datacubes from each slit are always accumulated in the same order,
+            such that the result does not depend on the number of processes.
+        dtype (`numpy.dtype`_, optional):
+            Data type of the accumulated datacubes.  Use ``np.float32`` to halve
+            the memory needed for large datacubes.
+        memmap_dir (str, optional):
+            If provided, the datacubes are accumulated in memory-mapped
+            temporary files in this directory, allowing for datacubes that are
+            larger than the available memory.
 
     Returns:
-        :obj:`tuple`: Three or four `numpy.ndarray`_ objects containing (1) the
+        :obj:`tuple`: Three `numpy.ndarray`_ objects containing (1) the
         datacube generated from the subpixellated inputs, (2) the corresponding
-        variance cube, (3) the corresponding bad pixel mask cube, and (4) the
-        residual cube.  The latter is only returned if debug is True.
+        variance cube, and (3) the corresponding bad pixel mask cube.
     """
     # Check the inputs for combinations of lists or not
-    _sciImg, _ivarImg, _waveImg, _gpmImg, _wghtImg, _all_wcs, _tilts, _slits, _astrom_trans, _all_dar, _ra_offset, _dec_offset = \
-        check_inputs([sciImg, ivarImg, waveImg, slitid_img_gpm, wghtImg, all_wcs, tilts, slits, astrom_trans, all_dar, ra_offset, dec_offset])
-    numframes = len(_sciImg)
+    frames = check_inputs([sciImg, ivarImg, waveImg, slitid_img_gpm, wghtImg, all_wcs, tilts, slits,
+                           astrom_trans, all_dar, ra_offset, dec_offset])
+    numframes = len(frames[0])
 
     # Prepare the output arrays
     outshape = (bins[0].size-1, bins[1].size-1, bins[2].size-1)
     binrng = np.array([[bins[0][0], bins[0][-1]], [bins[1][0], bins[1][-1]], [bins[2][0], bins[2][-1]]])
-    flxcube, varcube, normcube = np.zeros(outshape), np.zeros(outshape), np.zeros(outshape)
+    flxcube, varcube, normcube = [empty_cube(outshape, dtype=dtype, memmap_dir=memmap_dir)
+                                    for i in range(3)]
+    kwargs = dict(output_wcs=output_wcs, outshape=outshape, binrng=binrng,
+                  spec_subpixel=spec_subpixel, spat_subpixel=spat_subpixel,
+                  slice_subpixel=slice_subpixel, skip_subpix_weights=skip_subpix_weights,
+                  correct_dar=correct_dar, dtype=dtype)
+
+    # Resample each slit of each exposure, either serially or in parallel
+    tasks = [(fr, sl) for fr in range(numframes) for sl in range(frames[7][fr].nslits)]
+    n_proc = utils.get_nproc(n_proc, len(tasks))
+    with contextlib.ExitStack() as context:
+        if n_proc > 1:
+            msgs.info(f'Resampling {len(tasks)} slits using {n_proc} processes.')
+            # NOTE: The input images are passed to each process once, when it
+            # is started, instead of with every slit.  The results are
+            # returned in the order of the slits, such that the cubes are
+            # accumulated in the same order as when resampling serially.  The
+            # number of slits resampled ahead of the accumulation is limited,
+            # such that only a few partial cubes are held in memory at once.
+            # Each process gets its own copy of the (empty) frame cache.
+            pool = context.enter_context(
+                        utils.SharedProcessPool(n_proc, _subpixellate_slit_task, frames=frames,
+                                                frame_cache={}, **kwargs))
+            results = pool.map(tasks, max_pending=n_proc)
+        else:
+            _frame_cache = {}
+            results = (subpixellate_slit(frames, fr, sl, frame_cache=_frame_cache, **kwargs)
+                        for fr, sl in tasks)
+
+        # Accumulate the partial cubes
+        for (fr, sl), (offset, partial) in zip(tasks, results):
+            if numframes == 1:
+                msgs.info(f"Resampled slit {sl + 1}/{frames[7][fr].nslits}")
+            else:
+                msgs.info(f"Resampled slit {sl + 1}/{frames[7][fr].nslits} of frame {fr + 1}/{numframes}")
+            for cube, part in zip([flxcube, varcube, normcube], partial):
+                cube.reshape(-1)[offset:offset+part.size] += part
+
+    # Normalise the datacube and variance cube.  This is done one plane at a
+    # time to limit the memory used by large (memory-mapped) cubes.
+    bpmcube = empty_cube(outshape, dtype=np.uint8, memmap_dir=memmap_dir)
+    for i in range(outshape[0]):
+        nc_inverse = utils.inverse(normcube[i])
+        flxcube[i] *= nc_inverse
+        varcube[i] *= nc_inverse**2
+        bpmcube[i] = (normcube[i] == 0).astype(np.uint8)
+
+    # Return the datacube, variance cube and bad pixel cube
+    return flxcube, varcube, bpmcube
+
+
+def subpixellate_slit(frames, fr, sl, output_wcs, outshape, binrng, spec_subpixel=5,
+                      spat_subpixel=5, slice_subpixel=5, skip_subpix_weights=False,
+                      correct_dar=True, dtype=float, frame_cache=None):
+    """
+    Subpixellate the data in one slit of one exposure into a partial datacube.
+
+    See :func:`subpixellate` for a description of the algorithm.
+
+    Args:
+        frames (:obj:`list`):
+            Lists with the input data for all exposures, as returned by
+            :func:`check_inputs` for the first 12 arguments of
+            :func:`subpixellate` (i.e., the science, inverse variance,
+            wavelength, slit ID, and weight images, the WCS, tilts, slits,
+            alignment splines, DAR correction, and RA and DEC offsets).
+        fr (:obj:`int`):
+            Index of the exposure.
+        sl (:obj:`int`):
+            Index of the slit.
+        output_wcs (`astropy.wcs.WCS`_):
+            Output world coordinate system.
+        outshape (tuple):
+            The shape of the datacube.
+        binrng (`numpy.ndarray`_):
+            The range covered by the bins in each dimension.  Shape is (3,2).
+        spec_subpixel (int, optional):
+            Subpixellation factor in the spectral direction.
+        spat_subpixel (int, optional):
+            Subpixellation factor in the spatial direction.
+        slice_subpixel (int, optional):
+            Subpixellation factor in the slice direction.
+        skip_subpix_weights (bool, optional):
+            If True, skip the calculation of the subpixellation weights.
+        correct_dar (bool, optional):
+            If True, apply the DAR correction.
+        dtype (`numpy.dtype`_, optional):
+            Data type of the partial datacubes.
+        frame_cache (:obj:`dict`, optional):
+            Used to cache the pixels selected from the images of the last
+            exposure processed, such that they are not re-selected for every
+            slit.
+
+    Returns:
+        :obj:`tuple`: The offset of the partial datacubes within the
+        flattened datacube and a list with the flattened partial flux,
+        variance, and normalization datacubes; see :func:`bin_voxels`.
+    """
+    _sciImg, _ivarImg, _waveImg, _gpmImg, _wghtImg, _all_wcs, _tilts, _slits, _astrom_trans, \
+        _all_dar, _ra_offset, _dec_offset = frames
+    # Select the good pixels on the slits of this exposure
+    if frame_cache is None or frame_cache.get('fr') != fr:
+        onslit_gpm = _gpmImg[fr]
+        this_onslit_gpm = onslit_gpm > 0
+        this_specpos, this_spatpos = np.where(this_onslit_gpm)
+        frame = dict(fr=fr, specpos=this_specpos, spatpos=this_spatpos,
+                     spatid=onslit_gpm[this_onslit_gpm], wght=_wghtImg[fr][this_onslit_gpm],
+                     sci=_sciImg[fr][this_onslit_gpm],
+                     var=utils.inverse(_ivarImg[fr][this_onslit_gpm]),
+                     wav=_waveImg[fr][this_onslit_gpm],
+                     # The RA/DEC are only calculated for the pixels within
+                     # the (initial) slit edges
+                     slitid_img=_slits[fr].slit_img(pad=0, initial=True))
+        if frame_cache is not None:
+            frame_cache.clear()
+            frame_cache.update(frame)
+    else:
+        frame = frame_cache
+
     # Divide each pixel into subpixels
     spec_offs = np.arange(0.5/spec_subpixel, 1, 1/spec_subpixel) - 0.5  # -0.5 is to offset from the centre of each pixel.
     spat_offs = np.arange(0.5/spat_subpixel, 1, 1/spat_subpixel) - 0.5  # -0.5 is to offset from the centre of each pixel.
@@ -1655,103 +1920,95 @@ def subpixellate(output_wcs, bins, sciImg, ivarImg, waveImg, slitid_img_gpm, wgh
     spat_x, spec_y = np.meshgrid(spat_offs, spec_offs)
     num_subpixels = spec_subpixel * spat_subpixel  # Number of subpixels (spat & spec) per detector pixel
     num_all_subpixels = num_subpixels * slice_subpixel  # Number of subpixels, including slice subpixels
-    # Loop through all exposures
-    for fr in range(numframes):
-        onslit_gpm = _gpmImg[fr]
-        this_onslit_gpm = onslit_gpm > 0
-        this_specpos, this_spatpos = np.where(this_onslit_gpm)
-        this_spatid = onslit_gpm[this_onslit_gpm]
-
-        # Extract tilts and slits for convenience
-        this_tilts = _tilts[fr]
-        this_slits = _slits[fr]
-        this_wcs = _all_wcs[fr]
-        this_astrom_trans = _astrom_trans[fr]
-        this_wght_subpix = _wghtImg[fr][this_onslit_gpm]
-        this_sci = _sciImg[fr][this_onslit_gpm]
-        this_var = utils.inverse(_ivarImg[fr][this_onslit_gpm])
-        this_wav = _waveImg[fr][this_onslit_gpm]
-        # Loop through all slits
-        for sl, spatid in enumerate(this_slits.spat_id):
-            if numframes == 1:
-                msgs.info(f"Resampling slit {sl + 1}/{this_slits.nslits}")
-            else:
-                msgs.info(f"Resampling slit {sl + 1}/{this_slits.nslits} of frame {fr + 1}/{numframes}")
-            # Find the pixels on this slit
-            this_sl = np.where(this_spatid == spatid)
-            wpix = (this_specpos[this_sl], this_spatpos[this_sl])
-            # Create an array to index each subpixel
-            numpix = wpix[0].size
-            # Generate a spline between spectral pixel position and wavelength
-            yspl = this_tilts[wpix] * (this_slits.nspec - 1)
-            tiltpos = np.add.outer(yspl, spec_y).flatten()
-            wspl = this_wav[this_sl]
-            asrt = np.argsort(yspl)
-            wave_spl = interp1d(yspl[asrt], wspl[asrt], kind='linear', bounds_error=False, fill_value='extrapolate')
-            # Calculate the wavelength at each subpixel
-            this_wave_subpix = wave_spl(tiltpos)
-            # Calculate the DAR correction at each sub pixel
-            ra_corr, dec_corr = 0.0, 0.0
-            if correct_dar:
-                # NOTE :: This routine needs the wavelengths to be expressed in Angstroms
-                ra_corr, dec_corr = _all_dar[fr].correction( this_wave_subpix)
-            # Calculate spatial and spectral positions of the subpixels
-            spat_xx = np.add.outer(wpix[1], spat_x.flatten()).flatten()
-            spec_yy = np.add.outer(wpix[0], spec_y.flatten()).flatten()
-            # Transform this to spatial location
-            spatpos_subpix = _astrom_trans[fr].transform(sl, spat_xx, spec_yy)
-            spatpos = _astrom_trans[fr].transform(sl, wpix[1], wpix[0])
-            ssrt = np.argsort(spatpos)
-            # Initialize the voxel coordinates for each spec2D pixel
-            vox_coord = np.full((numpix, num_all_subpixels, 3), -1, dtype=float)
-            # Loop over the subslices
-            for ss in range(slice_subpixel):
-                if slice_subpixel > 1:
-                    # Only print this if there are multiple subslices
-                    msgs.info(f"Resampling subslice {ss+1}/{slice_subpixel}")
-                # Generate an RA/Dec image for this subslice
-                raimg, decimg, minmax = this_slits.get_radec_image(this_wcs, this_astrom_trans, this_tilts,
-                                                                   slit_compute=sl, slice_offset=slice_offs[ss])
-                this_ra = raimg[this_onslit_gpm]
-                this_dec = decimg[this_onslit_gpm]
-                # Interpolate the RA/Dec over the subpixel spatial positions
-                tmp_ra = this_ra[this_sl]
-                tmp_dec = this_dec[this_sl]
-                ra_spl = interp1d(spatpos[ssrt], tmp_ra[ssrt], kind='linear', bounds_error=False, fill_value='extrapolate')
-                dec_spl = interp1d(spatpos[ssrt], tmp_dec[ssrt], kind='linear', bounds_error=False, fill_value='extrapolate')
-                # Evaluate the RA/Dec at the subpixel spatial positions
-                this_ra_int = ra_spl(spatpos_subpix)
-                this_dec_int = dec_spl(spatpos_subpix)
-                # Now apply the DAR correction and any user-supplied offsets
-                this_ra_int += ra_corr + _ra_offset[fr]
-                this_dec_int += dec_corr + _dec_offset[fr]
-                # Convert world coordinates to voxel coordinates, then histogram
-                sslo = ss * num_subpixels
-                sshi = (ss + 1) * num_subpixels
-                vox_coord[:,sslo:sshi,:] = output_wcs.wcs_world2pix(np.vstack((this_ra_int, this_dec_int, this_wave_subpix * 1.0E-10)).T, 0).reshape(numpix, num_subpixels, 3)
-            # Convert the voxel coordinates to a bin index
-            if num_all_subpixels == 1 or skip_subpix_weights:
-                subpix_wght = 1.0
-            else:
-                msgs.info("Preparing subpixel weights")
-                vox_index = np.floor(outshape * (vox_coord - binrng[:,0].reshape((1, 1, 3))) /
-                                                (binrng[:,1] - binrng[:,0]).reshape((1, 1, 3))).astype(int)
-                # Convert to a unique index
-                vox_index = np.dot(vox_index, np.array([1, outshape[0], outshape[0]*outshape[1]]))
-                # Calculate the number of repeated indices for each subpixel - this is the subpixel weights
-                subpix_wght = np.apply_along_axis(utils.occurrences, 1, vox_index).flatten()
-            # Reshape the voxel coordinates
-            vox_coord = vox_coord.reshape(numpix * num_all_subpixels, 3)
-            # Use the "fast histogram" algorithm, that assumes regular bin spacing
-            flxcube += histogramdd(vox_coord, bins=outshape, range=binrng, weights=np.repeat(this_sci[this_sl] * this_wght_subpix[this_sl], num_all_subpixels) * subpix_wght)
-            varcube += histogramdd(vox_coord, bins=outshape, range=binrng, weights=np.repeat(this_var[this_sl] * this_wght_subpix[this_sl]**2, num_all_subpixels) * subpix_wght**3)
-            normcube += histogramdd(vox_coord, bins=outshape, range=binrng, weights=np.repeat(this_wght_subpix[this_sl], num_all_subpixels) * subpix_wght)
-
-    # Normalise the datacube and variance cube
-    nc_inverse = utils.inverse(normcube)
-    flxcube *= nc_inverse
-    varcube *= nc_inverse**2
-    bpmcube = (normcube == 0).astype(np.uint8)
 
-    # Return the datacube, variance cube and bad pixel cube
-    return flxcube, varcube, bpmcube
+    # Extract tilts and slits for convenience
+    this_tilts = _tilts[fr]
+    this_slits = _slits[fr]
+    this_wcs = _all_wcs[fr]
+    this_astrom_trans = _astrom_trans[fr]
+    spatid = this_slits.spat_id[sl]
+    # Find the pixels on this slit
+    this_sl = np.where(frame['spatid'] == spatid)
+    wpix = (frame['specpos'][this_sl], frame['spatpos'][this_sl])
+    # Create an array to index each subpixel
+    numpix = wpix[0].size
+    # Generate a spline between spectral pixel position and wavelength
+    yspl = this_tilts[wpix] * (this_slits.nspec - 1)
+    tiltpos = np.add.outer(yspl, spec_y).flatten()
+    wspl = frame['wav'][this_sl]
+    asrt = np.argsort(yspl)
+    wave_spl = interp1d(yspl[asrt], wspl[asrt], kind='linear', bounds_error=False, fill_value='extrapolate')
+    # Calculate the wavelength at each subpixel
+    this_wave_subpix = wave_spl(tiltpos)
+    # Calculate the DAR correction at each sub pixel
+    ra_corr, dec_corr = 0.0, 0.0
+    if correct_dar:
+        # NOTE :: This routine needs the wavelengths to be expressed in Angstroms
+        ra_corr, dec_corr = _all_dar[fr].correction( this_wave_subpix)
+    # Calculate spatial and spectral positions of the subpixels
+    spat_xx = np.add.outer(wpix[1], spat_x.flatten()).flatten()
+    spec_yy = np.add.outer(wpix[0], spec_y.flatten()).flatten()
+    # Transform this to spatial location
+    spatpos_subpix = this_astrom_trans.transform(sl, spat_xx, spec_yy)
+    spatpos = this_astrom_trans.transform(sl, wpix[1], wpix[0])
+    ssrt = np.argsort(spatpos)
+    # Pixels within the slit edges
+    onslit = frame['slitid_img'][wpix] == spatid
+    # Calculate the RA/Dec of the pixels in each subslice
+    radec = np.zeros((numpix, 2, slice_subpixel))
+    for ss in range(slice_subpixel):
+        radec[onslit,0,ss], radec[onslit,1,ss], _ \
+                = this_slits.get_radec(this_wcs, this_astrom_trans, this_tilts, sl,
+                                       wpix[0][onslit], wpix[1][onslit],
+                                       slice_offset=slice_offs[ss])
+    # Interpolate the RA/Dec of all subslices over the subpixel spatial
+    # positions at once
+    radec_spl = interp1d(spatpos[ssrt], radec[ssrt], kind='linear', axis=0, bounds_error=False, fill_value='extrapolate')
+    radec_int = radec_spl(spatpos_subpix)
+    # Initialize the voxel coordinates for each spec2D pixel
+    vox_coord = np.full((numpix, num_all_subpixels, 3), -1, dtype=float)
+    # Loop over the subslices
+    for ss in range(slice_subpixel):
+        this_ra_int = radec_int[:,0,ss]
+        this_dec_int = radec_int[:,1,ss]
+        # Now apply the DAR correction and any user-supplied offsets
+        this_ra_int += ra_corr + _ra_offset[fr]
+        this_dec_int += dec_corr + _dec_offset[fr]
+        # Convert world coordinates to voxel coordinates
+        sslo = ss * num_subpixels
+        sshi = (ss + 1) * num_subpixels
+        vox_coord[:,sslo:sshi,:] = output_wcs.wcs_world2pix(np.vstack((this_ra_int, this_dec_int, this_wave_subpix * 1.0E-10)).T, 0).reshape(numpix, num_subpixels, 3)
+    # Convert the voxel coordinates to a (flattened) voxel index
+    vox_index = voxel_index(vox_coord, outshape, binrng)
+    if num_all_subpixels == 1 or skip_subpix_weights:
+        subpix_wght = 1.0
+    else:
+        # The number of subpixels of each detector pixel that fall in the same
+        # voxel is the subpixel weight
+        subpix_wght = subpixel_occurrences(vox_index).flatten()
+    vox_index = vox_index.flatten()
+    # Bin the subpixels
+    this_wght_subpix = frame['wght'][this_sl]
+    return bin_voxels(vox_index,
+                      [np.repeat(frame['sci'][this_sl] * this_wght_subpix, num_all_subpixels) * subpix_wght,
+                       np.repeat(frame['var'][this_sl] * this_wght_subpix**2, num_all_subpixels) * subpix_wght**3,
+                       np.repeat(this_wght_subpix, num_all_subpixels) * subpix_wght],
+                      dtype=dtype)
+
+
+def _subpixellate_slit_task(task, frames=None, **kwargs):
+    """
+    Resample a slit in a :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        task (:obj:`tuple`):
+            The indices of the exposure and slit.
+        frames (:obj:`list`):
+            Input data for all exposures passed to :func:`subpixellate_slit`.
+        **kwargs:
+            Other keyword arguments passed to :func:`subpixellate_slit`.
+
+    Returns:
+        :obj:`tuple`: The results of :func:`subpixellate_slit`.
+    """
+    return subpixellate_slit(frames, *task, **kwargs)
@@ -164,6 +164,8 @@ def ech_findobj_ineach_order(
 
     This routine:
 
+        - Rectifies all the orders at once; see :func:`rectify_and_clip_slits`.
+
         - Loops over the good orders
 
         - Calls the :func:`objs_in_slit` method to find objects in the order.
@@ -290,6 +292,19 @@ def ech_findobj_ineach_order(
     if inmask is None:
         inmask = allmask
 
+    # Rectify all the orders at once
+    spec_min_max_out = np.zeros((len(order_vec), 2), dtype=int)
+    find_min_max_out = np.zeros((len(order_vec), 2), dtype=int)
+    for iord in range(len(order_vec)):
+        # NOTE: slitmask is only used if the spectral range is not defined
+        _spec_min_max = spec_min_max[:,iord]
+        thisslit_gpm = slitmask == slit_spats[iord] \
+            if np.any([s is None or np.isinf(s) for s in _spec_min_max]) else None
+        spec_min_max_out[iord], find_min_max_out[iord] \
+                = get_spec_min_max(thisslit_gpm, spec_min_max=_spec_min_max)
+    rect = rectify_and_clip_slits(image, ivar, inmask & (ivar > 0.0), slit_left, slit_righ,
+                                  find_min_max_out.T, slitmask=slitmask, slit_ids=slit_spats)
+
     # Loop over orders and find objects
     sobjs = specobjs.SpecObjs()
     for iord, iorder in enumerate(order_vec):
@@ -310,7 +325,7 @@ def ech_findobj_ineach_order(
             objs_in_slit(
                 image, ivar, thisslit_gpm, 
                 slit_left[:,iord], slit_righ[:,iord], 
-                spec_min_max=spec_min_max[:,iord],
+                spec_min_max=spec_min_max_out[iord],
                 inmask=inmask_iord,std_trace=std_in, 
                 ncoeff=ncoeff, fwhm=fwhm, use_user_fwhm=use_user_fwhm, maxdev=maxdev,
                 hand_extract_dict=hand_extract_dict,  
@@ -319,7 +334,7 @@ def ech_findobj_ineach_order(
                 boxcar_rad=box_radius/plate_scale_ord[iord],
                 show_peaks=show_peaks, show_fits=show_single_fits,
                 show_trace=show_single_trace, qa_title=qa_title, specobj_dict=specobj_dict,
-                objfindQA_filename=ech_objfindQA_filename)
+                objfindQA_filename=ech_objfindQA_filename, rect=rect[iord])
         sobjs.add_sobj(sobjs_slit)
 
     # Return
@@ -2145,6 +2160,194 @@ def get_fwhm(fwhm_in, nsamp, smash_peakflux, spat_fracpos, flux_smash_smth):
     return fwhm_out
 
 
+def get_spec_min_max(thismask, spec_min_max=None, find_min_max=None):
+    """
+    Determine the spectral range of a slit/order and the range used for
+    object finding.
+
+    The pixels selected by ``thismask`` are only used if either range is not
+    fully defined by the input.
+
+    Args:
+        thismask (`numpy.ndarray`_):
+            Boolean mask image selecting pixels associated with the slit/order
+            (True means on the slit/order).
+        spec_min_max (:obj:`tuple`, optional):
+            2-tuple defining the minimum and maximum pixel in the spectral
+            direction with useable data for this slit/order.  If None, or if
+            either element is None or infinite, the missing values are
+            determined from ``thismask``.
+        find_min_max (:obj:`tuple`, optional):
+            2-tuple defining the minimum and maximum spectral pixel to use for
+            object finding.  If None, or if either element is None or
+            infinite, the missing values are set by ``spec_min_max``.
+
+    Returns:
+        :obj:`tuple`: Two integer `numpy.ndarray`_ objects with the spectral
+        range of the slit/order and the spectral range to use for object
+        finding.
+    """
+    if spec_min_max is None or np.any([s is None or np.isinf(s) for s in spec_min_max]):
+        ispec, ispat = np.where(thismask)
+        spec_min = ispec.min()
+        spec_max = ispec.max()
+        if spec_min_max is None:
+            spec_min_max_out = np.array([spec_min, spec_max])
+        else:
+            spec_min_max_out = np.array(spec_min_max).copy()
+            if spec_min_max_out[0] is None or np.isinf(spec_min_max_out[0]):
+                spec_min_max_out[0] = spec_min
+            if spec_min_max_out[1] is None or np.isinf(spec_min_max_out[1]):
+                spec_min_max_out[1] = spec_max
+        spec_min_max_out = np.array(spec_min_max_out).astype(int)
+    else:
+        spec_min_max_out = np.array(spec_min_max).astype(int)
+
+    if find_min_max is None or np.any([f is None or np.isinf(f) for f in find_min_max]):
+        if find_min_max is None:
+            find_min_max_out = spec_min_max_out
+        else:
+            find_min_max_out = np.array(find_min_max).copy()
+            if find_min_max_out[0] is None or np.isinf(find_min_max_out[0]):
+                find_min_max_out[0] = spec_min_max_out[0]
+            if find_min_max_out[1] is None or np.isinf(find_min_max_out[1]):
+                find_min_max_out[1] = spec_min_max_out[1]
+        find_min_max_out = np.array(find_min_max_out).astype(int)
+    else:
+        find_min_max_out = np.array(find_min_max).astype(int)
+
+    return spec_min_max_out, find_min_max_out
+
+
+def rectify_and_clip_slits(image, ivar, gpm, slit_left, slit_righ, find_min_max,
+                           sigclip_smash=5.0, slitmask=None, slit_ids=None):
+    """
+    Rectify one or more slits/orders and sigma-clip the rectified images along
+    the spectral direction.
+
+    Each slit is rectified by boxcar extracting the image in ``nsamp``
+    asymmetric boxes between the slit edges, where ``nsamp`` is the maximum
+    slit width rounded up to the next integer pixel.  Pixels outside the
+    spectral range used for object finding (``find_min_max``) are masked
+    before sigma-clipping each rectified spatial position along the spectral
+    direction.
+
+    All the boxes of all slits are extracted with a single call to
+    :func:`~pypeit.core.extract.extract_asym_boxcar`, and the sigma-clipping
+    is done for all rectified spatial positions at once.  Because both
+    operations treat each box independently, the result for each slit is
+    identical to processing the slits one at a time.
+
+    Args:
+        image (`numpy.ndarray`_):
+            Image to rectify with shape (nspec, nspat).
+        ivar (`numpy.ndarray`_):
+            Inverse variance of ``image``.
+        gpm (`numpy.ndarray`_):
+            Boolean good-pixel mask for ``image``.  If ``slitmask`` is None,
+            this must also exclude all pixels off the slit (or the slits) to
+            be rectified.
+        slit_left (`numpy.ndarray`_):
+            Left slit edges with shape (nspec,) or (nspec, nslits).
+        slit_righ (`numpy.ndarray`_):
+            Right slit edges with shape (nspec,) or (nspec, nslits).
+        find_min_max (`numpy.ndarray`_):
+            Integer spectral range used for object finding with shape (2,) or
+            (2, nslits); see :func:`get_spec_min_max`.
+        sigclip_smash (:obj:`float`, optional):
+            Sigma-clipping threshold.
+        slitmask (`numpy.ndarray`_, optional):
+            Integer image with the ID of the slit associated with each pixel;
+            pixels not on any slit must have a value of -1.  If provided, the
+            good pixels for each slit are those in ``gpm`` with a value in
+            ``slitmask`` that matches the slit ID.
+        slit_ids (array-like, optional):
+            The ID of each slit in ``slitmask``.  Must be provided if
+            ``slitmask`` is provided.
+
+    Returns:
+        :obj:`list`: A list with one 4-tuple per slit.  Each tuple provides the
+        rectified image, its good-pixel mask, its inverse variance, and the
+        good-pixel mask after sigma-clipping.  All arrays have shape (nspec,
+        nsamp), where nsamp is different for each slit.
+    """
+    _slit_left = slit_left.reshape(slit_left.shape[0], -1)
+    _slit_righ = slit_righ.reshape(slit_righ.shape[0], -1)
+    _find_min_max = np.asarray(find_min_max).reshape(2, -1)
+    nspec, nslits = _slit_left.shape
+    if slitmask is not None and (slit_ids is None or len(slit_ids) != nslits):
+        msgs.error('Must provide the ID of each slit if providing a slitmask.')
+
+    # Construct the asymmetric boxes for each slit.  These are (at most) one
+    # pixel wide.
+    left_asym = [None]*nslits
+    righ_asym = [None]*nslits
+    for i in range(nslits):
+        xsize = _slit_righ[:,i] - _slit_left[:,i]
+        nsamp = np.ceil(xsize.max())
+        left_asym[i] = _slit_left[:,i,None] + np.outer(xsize/nsamp, np.arange(nsamp))
+        righ_asym[i] = left_asym[i] + np.outer(xsize/nsamp, np.ones(int(nsamp)))
+
+    # Rectify the slits
+    rect = [None]*nslits
+    if slitmask is None:
+        batch = np.arange(nslits)
+        batch_gpm = gpm
+    else:
+        # A single mask can be used for all slits, as long as none of the
+        # pixels used to extract the boxes of a slit fall on another slit.
+        # Check a conservative range of pixels around each slit, and rectify
+        # any slit that fails this check on its own.
+        nspat = slitmask.shape[1]
+        spec = np.arange(nspec)[:,None]
+        batch = []
+        for i in range(nslits):
+            lo = np.floor(_slit_left[:,i] - 0.5).astype(int) - 2
+            hi = np.floor(_slit_righ[:,i] + 0.5).astype(int) + 3
+            spat = lo[:,None] + np.arange(np.amax(hi - lo) + 1)[None,:]
+            indx = (spat <= hi[:,None]) & (spat >= 0) & (spat < nspat)
+            ids = slitmask[np.broadcast_to(spec, spat.shape)[indx], spat[indx]]
+            if np.all((ids == slit_ids[i]) | (ids == -1)):
+                batch += [i]
+                continue
+            rect[i] = extract.extract_asym_boxcar(image, left_asym[i], righ_asym[i],
+                                                  gpm=gpm & (slitmask == slit_ids[i]), ivar=ivar)
+        batch = np.array(batch, dtype=int)
+        batch_gpm = gpm & (slitmask > -1) if batch.size > 0 else None
+
+    if batch.size > 0:
+        nsamp = np.array([left_asym[i].shape[1] for i in batch])
+        image_rect, gpm_rect, npix_rect, ivar_rect \
+                = extract.extract_asym_boxcar(image, np.hstack([left_asym[i] for i in batch]),
+                                              np.hstack([righ_asym[i] for i in batch]),
+                                              gpm=batch_gpm, ivar=ivar)
+        for i, _image_rect, _gpm_rect, _npix_rect, _ivar_rect \
+                in zip(batch, *[np.split(r, np.cumsum(nsamp)[:-1], axis=1)
+                                for r in [image_rect, gpm_rect, npix_rect, ivar_rect]]):
+            rect[i] = (_image_rect, _gpm_rect, _npix_rect, _ivar_rect)
+
+    # Only use the pixels in the object-finding range
+    nsamp = np.array([r[0].shape[1] for r in rect])
+    image_rect = np.hstack([r[0] for r in rect])
+    gpm_rect = np.hstack([r[1] for r in rect])
+    ivar_rect = np.hstack([r[3] for r in rect])
+    find_min_max_gpm = np.zeros_like(image_rect, dtype=bool)
+    for i, (s, e) in enumerate(zip(np.append(0, np.cumsum(nsamp)[:-1]), np.cumsum(nsamp))):
+        find_min_max_gpm[_find_min_max[0,i]:_find_min_max[1,i], s:e] = True
+
+    # Sigma-clip along the spectral direction
+    data = np.ma.MaskedArray(image_rect, mask=np.logical_not(gpm_rect & find_min_max_gpm))
+    sigclip = astropy.stats.SigmaClip(
+        sigma=sigclip_smash, maxiters=25, cenfunc='median', stdfunc=utils.nan_mad_std
+    )
+    data_clipped, lower, upper = sigclip(data, axis=0, masked=True, return_bounds=True)
+    gpm_sigclip = np.logical_not(data_clipped.mask)
+
+    split = np.cumsum(nsamp)[:-1]
+    return list(zip(*[np.split(r, split, axis=1)
+                      for r in [image_rect, gpm_rect, ivar_rect, gpm_sigclip]]))
+
+
 def objs_in_slit(image, ivar, thismask, slit_left, slit_righ, 
                  inmask=None, fwhm=3.0,
                  sigclip_smash=5.0, use_user_fwhm=False, boxcar_rad=7.,
@@ -2152,7 +2355,7 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
                  ncoeff=5, nperslit=None, snr_thresh=10.0, trim_edg=(5,5),
                  extract_maskwidth=4.0, specobj_dict=None, find_min_max=None,
                  show_peaks=False, show_fits=False, show_trace=False,
-                 debug_all=False, qa_title='objfind', objfindQA_filename=None):
+                 debug_all=False, qa_title='objfind', objfindQA_filename=None, rect=None):
     """
     Find the location of objects in a slitmask slit or a echelle order.
 
@@ -2309,6 +2512,13 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
         objfindQA_filename (:obj:`str`, optional):
             Full path (directory and filename) for the object profile QA plot.
             If None, not plot is produced and saved.
+        rect (:obj:`tuple`, optional):
+            The rectified image, its good-pixel mask, its inverse variance, and
+            the good-pixel mask after sigma-clipping along the spectral
+            direction, as returned for this slit/order by
+            :func:`rectify_and_clip_slits`.  If None, these are computed
+            here.  This is used to rectify many slits/orders at once; see
+            :func:`ech_findobj_ineach_order`.
 
     Returns:
         :class:`~pypeit.specobjs.SpecObjs`: Object containing the objects
@@ -2331,78 +2541,29 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
     spec_vec = np.arange(nspec)
     spat_vec = np.arange(nspat)
 
-    ximg, edgmask = pixels.ximg_and_edgemask(slit_left, slit_righ, thismask, trim_edg=trim_edg)
-
     # If a mask was not passed in, create it
     if inmask is None:
         inmask = thismask
 
-    # If spec_min_max was not passed in, determine it from the thismask
-    ispec, ispat = np.where(thismask)
-    spec_min = ispec.min()
-    spec_max = ispec.max()
-    if spec_min_max is None or np.any([s is None or np.isinf(s) for s in spec_min_max]):
-        if spec_min_max is None:
-            spec_min_max_out = np.array([spec_min, spec_max])
-        else:
-            spec_min_max_out = np.array(spec_min_max).copy()
-            if spec_min_max_out[0] is None or np.isinf(spec_min_max_out[0]):
-                spec_min_max_out[0] = spec_min
-            if spec_min_max_out[1] is None or np.isinf(spec_min_max_out[1]):
-                spec_min_max_out[1] = spec_max
-        spec_min_max_out = np.array(spec_min_max_out).astype(int)
-    else:
-        spec_min_max_out = np.array(spec_min_max).astype(int)
-
-
-    # If find_min_max was not passed in, set it to the values for spec_min_max
-    if find_min_max is None or np.any([f is None or np.isinf(f) for f in find_min_max]):
-        if find_min_max is None:
-            find_min_max_out = spec_min_max_out
-        else:
-            find_min_max_out = np.array(find_min_max).copy()
-            if find_min_max_out[0] is None or np.isinf(find_min_max_out[0]):
-                find_min_max_out[0] = spec_min_max_out[0]
-            if find_min_max_out[1] is None or np.isinf(find_min_max_out[1]):
-                find_min_max_out[1] = spec_min_max_out[1]
-        find_min_max_out = np.array(find_min_max_out).astype(int)
-    else:
-        find_min_max_out = np.array(find_min_max).astype(int)
+    # If spec_min_max and/or find_min_max were not passed in, determine them
+    # from thismask
+    spec_min_max_out, find_min_max_out \
+            = get_spec_min_max(thismask, spec_min_max=spec_min_max, find_min_max=find_min_max)
 
     #totmask = thismask & inmask & np.invert(edgmask)
     #  Smash the image (for this slit) into a single flux vector.  How many pixels wide is the slit at each Y?
     xsize = slit_righ - slit_left
     #nsamp = np.ceil(np.median(xsize)) # JFH Changed 07-07-19
     nsamp = np.ceil(xsize.max())
-    # Mask skypixels with 2 fwhm of edge
-    left_asym = slit_left[:,None] + np.outer(xsize/nsamp, np.arange(nsamp))
-    righ_asym = left_asym + np.outer(xsize/nsamp, np.ones(int(nsamp)))
-    # This extract_asymbox_boxcar call rectifies the image along the curved object traces
-    gpm_tot = thismask & inmask & (ivar > 0.0)
-
-    image_rect, gpm_rect, npix_rect, ivar_rect = extract.extract_asym_boxcar(image, left_asym, righ_asym, gpm=gpm_tot, ivar=ivar)
-
-    # This smashes out the spatial direction to construct an aggregate sky model
-    #sky_mean, sky_median, sky_sig = stats.sigma_clipped_stats(image_rect, mask=np.logical_not(gpm_rect), axis=1, sigma=3.0,
-    #                                                          cenfunc='median', stdfunc=utils.nan_mad_std)
-    #gpm_sky = np.sum(gpm_rect,axis=1) != 0 & np.isfinite(sky_median)
-    #sky_fill_value = np.median(sky_median[gpm_sky]) if np.any(gpm_sky) else 0.0
-    #sky_median[np.logical_not(gpm_sky)] = sky_fill_value
-
-    #sky_rect = np.repeat(sky_median[:, np.newaxis], nsamp, axis=1)
-    #sky_rect = 0.0*image_rect
-
-
-    # Apply find_min_max_out
-    find_min_max_gpm = np.zeros_like(image_rect, dtype=bool)
-    find_min_max_gpm[find_min_max_out[0]: find_min_max_out[1], :] = True
-    data = np.ma.MaskedArray(
-        image_rect, mask=np.logical_not(gpm_rect & find_min_max_gpm)) # the total gpm = gpm_rect & find_min_max_gpm
-    sigclip = astropy.stats.SigmaClip(
-        sigma=sigclip_smash, maxiters=25, cenfunc='median', stdfunc=utils.nan_mad_std
-    )
-    data_clipped, lower, upper = sigclip(data, axis=0, masked=True, return_bounds=True)
-    gpm_sigclip = np.logical_not(data_clipped.mask)
+    if rect is None:
+        # This rectifies the image along the curved object traces and
+        # sigma-clips the rectified image along the spectral direction
+        gpm_tot = thismask & inmask & (ivar > 0.0)
+        image_rect, gpm_rect, ivar_rect, gpm_sigclip \
+                = rectify_and_clip_slits(image, ivar, gpm_tot, slit_left, slit_righ,
+                                         find_min_max_out, sigclip_smash=sigclip_smash)[0]
+    else:
+        image_rect, gpm_rect, ivar_rect, gpm_sigclip = rect
 
 
     # Compute the average flux over the set of pixels that are not masked by gpm_sigclip
@@ -2601,6 +2762,12 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
             msgs.warn("No source to use as a trace.  Using the slit boundary")
             trace_model = slit_left
 
+        # The fractional slit position image is only needed to place the hand
+        # apertures
+        if nobj_hand > 0:
+            ximg, _ = pixels.ximg_and_edgemask(slit_left, slit_righ, thismask, trim_edg=trim_edg)
+            f_ximg = scipy.interpolate.RectBivariateSpline(spec_vec, spat_vec, ximg)
+
         # Loop over hand_extract apertures and create and assign specobj
         for iobj in range(nobj_hand):
             # Proceed
@@ -2611,7 +2778,6 @@ def objs_in_slit(image, ivar, thismask, slit_left, slit_righ,
             thisobj.hand_extract_fwhm = hand_extract_fwhm[iobj]
             thisobj.hand_extract_flag = True
             # SPAT_FRACPOS
-            f_ximg = scipy.interpolate.RectBivariateSpline(spec_vec, spat_vec, ximg)
             thisobj.SPAT_FRACPOS = float(f_ximg(thisobj.hand_extract_spec, thisobj.hand_extract_spat, grid=False)) # interpolate from ximg
             thisobj.smash_peakflux = np.interp(thisobj.SPAT_FRACPOS*nsamp,np.arange(nsamp), flux_smash_smth) # interpolate from fluxconv
             thisobj.smash_snr = np.interp(thisobj.SPAT_FRACPOS*nsamp,np.arange(nsamp), snr_smash_smth) # interpolate from fluxconv
@@ -251,7 +251,9 @@ def evaluate_fit(fitc, func, x, x2=None, minx=None,
 
     Args:
         fitc (`numpy.ndarray`_):
-            Fit coefficients
+            Fit coefficients.  For 1D fits, the coefficients of many fits can
+            be evaluated at once by providing a 2D array with shape (ncoeff,
+            nfit).
         func (str):
             Name of the functional form to fit
         x (`numpy.ndarray`_):
@@ -268,7 +270,8 @@ def evaluate_fit(fitc, func, x, x2=None, minx=None,
             Maximum x value for the fit used to normalise the x2 values
 
     Returns:
-        `numpy.ndarray`_:  Evaluated fit at the x (and x2) locations
+        `numpy.ndarray`_:  Evaluated fit at the x (and x2) locations.  If
+        ``fitc`` is 2D for a 1D fit, the shape is (nfit,) + x.shape.
 
     """
     if func is None:
@@ -291,6 +294,13 @@ def evaluate_fit(fitc, func, x, x2=None, minx=None,
         # because of the if/elif/else above.  What should the behavior be, raise
         # an exception or return None?
         return None
+    elif func in ["polynomial", "legendre", "chebyshev"] and np.ndim(fitc) == 2:
+        # Evaluate many 1D fits at once using the pseudo-Vandermonde matrix
+        xv = x if func == "polynomial" else scale_minmax(x, minx=minx, maxx=maxx)[0]
+        vander = np.polynomial.polynomial.polyvander if func == "polynomial" \
+                    else (np.polynomial.legendre.legvander if func == "legendre"
+                          else np.polynomial.chebyshev.chebvander)
+        return np.moveaxis(np.dot(vander(xv, fitc.shape[0]-1), fitc), -1, 0)
     elif func == "polynomial":
         return np.polynomial.polynomial.polyval(x, fitc)
     elif func == "legendre" or func == "chebyshev":
@@ -986,6 +996,10 @@ def iterfit(xdata, ydata, invvar=None, inmask=None, upper=5, lower=5, x2=None,
     iiter = 0
     error = -1
     qdone = False
+    # The action matrix only depends on the unmasked breakpoints, such that
+    # it is reused by all rejection iterations
+    action = laction = uaction = None
+    action_mask = None
     while (error != 0 or qdone is False) and iiter <= maxiter:
         goodbk = sset.mask.nonzero()[0]
         if maskwork.sum() <= 1 or not sset.mask.any():
@@ -1007,11 +1021,19 @@ def iterfit(xdata, ydata, invvar=None, inmask=None, upper=5, lower=5, x2=None,
                         ct = 0
                     else:
                         sset.mask[goodbk[ileft]] = False
+            if action_mask is None or not np.array_equal(sset.mask, action_mask):
+                # Rebuild the action matrix for the new set of breakpoints.
+                # If there are too few, leave it to bspline.fit to catch.
+                action = laction = uaction = None
+                action_mask = sset.mask.copy()
+                if sset.mask.sum() >= 2*sset.nord:
+                    action, laction, uaction = sset.action(xwork, x2=x2work)
             error, yfit = sset.fit(
                 xwork,  # x-sorted x data array
                 ywork,  # x-sorted y data array
                 invwork * maskwork,  # masked x-sorted invvar array
-                x2=x2work  # x-sorted x2 array
+                x2=x2work,  # x-sorted x2 array
+                action=action, lower=laction, upper=uaction
             )
         iiter += 1
         inmask_rej = maskwork
@@ -1170,10 +1192,10 @@ def bspline_profile(xdata, ydata, invvar, profile_basis, ingpm=None, upper=5, lo
         # TODO: Why isn't maskwork returned?
         return sset, outmask, yfit, reduced_chi, 4
 
-    # This was checked in detail against IDL for identical inputs
-    # KBW: Tried a few things and this was about as fast as you can get.
-    outer = np.outer(np.ones(nord, dtype=float), profile_basis.flatten('F')).T
-    action_multiple = outer.reshape((nx, npoly * nord), order='F')
+    # The action matrix is the product of the b-spline basis functions and
+    # each of the model profiles.  It only changes when breakpoints are
+    # masked, such that it is reused by all rejection iterations.
+    profile_basis = np.reshape(profile_basis, (nx, npoly), order='F')
     # --------------------
     # Iterate spline fit
     iiter = 0
@@ -1198,16 +1220,11 @@ def bspline_profile(xdata, ydata, invvar, profile_basis, ingpm=None, upper=5, lo
 
             # we'll do the fit right here..............
             if error != 0:
-                bf1, laction, uaction = sset.action(xdata)
-                if np.any(bf1 == -2) or bf1.size != nx * nord:
+                action, laction, uaction = sset.action(xdata, profile_basis=profile_basis)
+                if isinstance(action, int) or action.size != nx * npoly * nord:
                     msgs.error("BSPLINE_ACTION failed!")
-                action = np.copy(action_multiple)
-                for ipoly in range(npoly):
-                    action[:, np.arange(nord) * npoly + ipoly] *= bf1
-                del bf1  # Clear the memory
-
-            if np.any(np.logical_not(np.isfinite(action))):
-                msgs.error('Infinities in action matrix.  B-spline fit faults.')
+                if np.any(np.logical_not(np.isfinite(action))):
+                    msgs.error('Infinities in action matrix.  B-spline fit faults.')
 
             error, yfit = sset.workit(xdata, ydata, invvar * maskwork, action, laction, uaction)
 
@@ -17,6 +17,7 @@ import matplotlib
 from astropy import stats
 from astropy import units
 from astropy.io import ascii
+import scipy.fft
 import scipy.signal
 import scipy.optimize as opt
 from scipy import interpolate
@@ -42,8 +43,9 @@ from pypeit import wavemodel
 from IPython import embed
 
 
-def spat_flexure_shift(sciimg, slits, debug=False, maxlag = 20):
-    """
+def spat_flexure_shift(sciimg, slits, debug=False, maxlag = 20, method='correlate',
+                       nstat=100000):
+    r"""
     Calculate a rigid flexure shift in the spatial dimension
     between the slitmask and the science image.
 
@@ -52,29 +54,76 @@ def spat_flexure_shift(sciimg, slits, debug=False, maxlag = 20):
 
     Otherwise, the WaveTilts could get out of sync with science images
 
+    The shift is the peak of the cross-correlation between the science image
+    and the image of the slits, which is computed using one of the following
+    methods:
+
+        - ``'correlate'``: Cross-correlate the flattened images directly
+          (see :func:`~pypeit.utils.cross_correlate`).  This is the reference
+          method, but its cost scales as :math:`N_{\rm pix} N_{\rm lag}`.
+
+        - ``'fft'``: Cross-correlate each spectral row of the images along
+          the spatial direction using FFTs and sum the result over all rows.
+          Apart from the correlation of pixels across adjacent rows at the
+          edges of the detector, this is identical to ``'correlate'``.
+
+        - ``'collapse'``: Sum the images along the spectral direction and
+          cross-correlate the resulting spatial profiles.  This is the fastest
+          method, but the correlation peak is broadened by the curvature of
+          the slits.
+
+    In all cases, the peak is detected by fitting a Gaussian to the
+    cross-correlation (see :func:`~pypeit.core.arc.detect_lines`).  For the
+    ``'fft'`` and ``'collapse'`` methods, the sub-pixel location of the peak
+    is then refined using :func:`refine_xcorr_peak`, which is more accurate
+    for the nearly triangular peak produced by the slit edges.
+
     Args:
         sciimg (`numpy.ndarray`_):
         slits (:class:`pypeit.slittrace.SlitTraceSet`):
         maxlag (:obj:`int`, optional):
             Maximum flexure searched for
+        method (:obj:`str`, optional):
+            Method used to compute the cross-correlation.  Must be
+            ``'correlate'``, ``'fft'``, or ``'collapse'``; see above.
+        nstat (:obj:`int`, optional):
+            For the ``'fft'`` and ``'collapse'`` methods, the approximate
+            number of pixels in the slits used to determine the threshold
+            used to clip bright pixels in the science image.  The
+            ``'correlate'`` method always uses all pixels.
 
     Returns:
         float:  The spatial flexure shift relative to the initial slits
 
     """
+    if method not in ['correlate', 'fft', 'collapse']:
+        msgs.error(f'Unknown spatial flexure method: {method}')
+
     # Mask -- Includes short slits and those excluded by the user (e.g. ['rdx']['slitspatnum'])
     slitmask = slits.slit_img(initial=True, exclude_flag=slits.bitmask.exclude_for_flexure)
 
     _sciimg = sciimg if slitmask.shape == sciimg.shape \
                 else arc.resize_mask2arc(slitmask.shape, sciimg) 
     onslits = slitmask > -1
-    corr_slits = onslits.astype(float).flatten()
 
     # Compute
-    mean_sci, med_sci, stddev_sci = stats.sigma_clipped_stats(_sciimg[onslits])
+    sci_onslits = _sciimg[onslits]
+    if method != 'correlate' and sci_onslits.size > 2*nstat:
+        # Estimate the clipping threshold using a regular subsample of the
+        # pixels in the slits
+        sci_onslits = sci_onslits[::sci_onslits.size // nstat]
+    mean_sci, med_sci, stddev_sci = stats.sigma_clipped_stats(sci_onslits)
     thresh =  med_sci + 5.0*stddev_sci
-    corr_sci = np.fmin(_sciimg.flatten(), thresh)
-    lags, xcorr = utils.cross_correlate(corr_sci, corr_slits, maxlag)
+    corr_sci = np.fmin(_sciimg, thresh)
+    corr_slits = onslits.astype(float)
+    if method == 'collapse':
+        # Correlate the spatial profiles
+        corr_sci = np.sum(corr_sci, axis=0)
+        corr_slits = np.sum(corr_slits, axis=0)
+    if method == 'fft':
+        lags, xcorr = spat_cross_correlate_fft(corr_sci, corr_slits, maxlag)
+    else:
+        lags, xcorr = utils.cross_correlate(corr_sci.ravel(), corr_slits.ravel(), maxlag)
     xcorr_denom = np.sqrt(np.sum(corr_sci*corr_sci)*np.sum(corr_slits*corr_slits))
     xcorr_norm = xcorr / xcorr_denom
     # TODO -- Generate a QA plot
@@ -89,6 +138,8 @@ def spat_flexure_shift(sciimg, slits, debug=False, maxlag = 20):
         return 0.
     
     # Find the peak
+    if method != 'correlate':
+        pix_max = np.atleast_1d(refine_xcorr_peak(xcorr_norm, pix_max[0]))
     xcorr_max = np.interp(pix_max, np.arange(lags.shape[0]), xcorr_norm)
     lag_max = np.interp(pix_max, np.arange(lags.shape[0]), lags)
     msgs.info('Spatial flexure measured: {}'.format(lag_max[0]))
@@ -118,6 +169,71 @@ def spat_flexure_shift(sciimg, slits, debug=False, maxlag = 20):
     return lag_max[0]
 
 
+def spat_cross_correlate_fft(x, y, maxlag):
+    r"""
+    Cross-correlate two images along their spatial direction.
+
+    Each row of ``x`` is cross-correlated with the same row of ``y`` using
+    FFTs, and the result is summed over all rows.  The images are padded with
+    zeros to avoid wrapping the rows.  For each lag, this is the same as the
+    cross-correlation of the flattened images (see
+    :func:`~pypeit.utils.cross_correlate`), except that pixels are never
+    correlated with pixels in the adjacent rows.
+
+    Args:
+        x (`numpy.ndarray`_):
+            First image of the cross-correlation, with shape
+            :math:`(N_{\rm spec}, N_{\rm spat})`.
+        y (`numpy.ndarray`_):
+            Second image of the cross-correlation.  Must have the same shape
+            as ``x``.
+        maxlag (:obj:`int`):
+            The maximum lag for which to compute the cross-correlation.
+
+    Returns:
+        :obj:`tuple`: The integer lags from ``-maxlag`` to ``maxlag`` and the
+        cross-correlation at each lag.
+    """
+    if x.ndim != 2 or x.shape != y.shape:
+        msgs.error('Images to cross-correlate must be two-dimensional and have the same shape.')
+    nfft = scipy.fft.next_fast_len(x.shape[1] + maxlag, real=True)
+    power = np.sum(scipy.fft.rfft(x, n=nfft, axis=1)
+                   * np.conj(scipy.fft.rfft(y, n=nfft, axis=1)), axis=0)
+    xcorr = scipy.fft.irfft(power, n=nfft)
+    lags = np.arange(-maxlag, maxlag + 1)
+    return lags.astype(float), xcorr[lags]
+
+
+def refine_xcorr_peak(xcorr, pix):
+    """
+    Refine the sub-pixel location of a cross-correlation peak.
+
+    The cross-correlation of images with sharp edges (like the slit image
+    used by :func:`spat_flexure_shift`) has a peak with straight sides.  The
+    peak is located by intersecting two lines with opposite slopes, one
+    through the maximum pixel and its lower neighbor and the other through
+    the remaining neighbor (i.e., equiangular line fitting).
+
+    Args:
+        xcorr (`numpy.ndarray`_):
+            Cross-correlation sampled at integer lags.
+        pix (:obj:`float`):
+            Approximate location of the peak in pixels.  The maximum within
+            one pixel of this location is refined.
+
+    Returns:
+        :obj:`float`: The refined location of the peak in pixels.  If the
+        maximum is at the edge of ``xcorr``, ``pix`` is returned.
+    """
+    i0 = int(np.clip(np.round(pix) - 1, 0, xcorr.size-1))
+    i = i0 + np.argmax(xcorr[i0:i0+3])
+    if i == 0 or i == xcorr.size-1:
+        return pix
+    lo, peak, hi = xcorr[i-1:i+2]
+    denom = peak - min(lo, hi)
+    return i if denom <= 0 else i + 0.5*(hi - lo)/denom
+
+
 def spec_flex_shift(obj_skyspec, sky_file=None, arx_skyspec=None, arx_fwhm_pix=None,
                     spec_fwhm_pix=None, mxshft=20, excess_shft="crash",
                     method="boxcar", minwave=None, maxwave=None):
@@ -1313,14 +1313,17 @@ def Flam_to_Nlam(wave, zeropoint, zp_min=5.0, zp_max=30.0):
     wave: `numpy.ndarray`_
        Wavelength array, float, shape (nspec,)
     zeropoint: `numpy.ndarray`_
-       zeropoint array, float, shape (nspec,)
+       zeropoint array, float, shape (nspec,) or (nsamp, nspec)
 
     Returns
     -------
     factor: `numpy.ndarray`_
-        Factor that when multiplied into F_lam converts to N_lam, i.e. 1/S_lam
+        Factor that when multiplied into F_lam converts to N_lam, i.e. 1/S_lam.
+        Shape matches ``zeropoint``.
 
     """
+    # Allow for many zeropoints, e.g. with shape (nsamp, nspec)
+    wave, zeropoint = np.broadcast_arrays(wave, zeropoint)
     gpm = (wave > 1.0) & (zeropoint > zp_min) & (zeropoint < zp_max)
     factor = np.zeros_like(wave)
     factor[gpm] = np.power(10.0, 0.4*(zeropoint[gpm] - ZP_UNIT_CONST))*np.square(wave[gpm])
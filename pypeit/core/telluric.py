@@ -4,6 +4,7 @@
 .. include:: ../include/links.rst
 """
 
+
 from IPython import embed
 
 import matplotlib.pyplot as plt
@@ -99,6 +100,10 @@ def qso_pca_eval(theta,qso_pca_dict):
         `numpy.ndarray`_: Evaluated PCA for the QSO
 
     """
+    if np.ndim(theta) == 2:
+        # The shift of the PCA components is different for each parameter
+        # vector
+        return np.array([qso_pca_eval(_theta, qso_pca_dict) for _theta in np.transpose(theta)])
 
     C = qso_pca_dict['components']
     z_fid = qso_pca_dict['z_fid']
@@ -140,7 +145,7 @@ def qso_pca_eval(theta,qso_pca_dict):
 #    return gaussian_mixture_model.score_samples(A.reshape(1,-1))
 
 
-def read_telluric_pca(filename, wave_min=None, wave_max=None, pad_frac=0.10):
+def read_telluric_pca(filename, wave_min=None, wave_max=None, pad_frac=0.10, cache_size=0.):
     """
     Reads in the telluric PCA components from a file.
 
@@ -159,6 +164,11 @@ def read_telluric_pca(filename, wave_min=None, wave_max=None, pad_frac=0.10):
             ``wave_min`` or ``wave_max`` are input; ignored otherwise. The
             resulting grid will extend from ``(1.0 - pad_frac)*wave_min`` to
             ``(1.0 + pad_frac)*wave_max``.
+        cache_size (:obj:`float`, optional):
+            Maximum size in MB of the on-disk cache of the PCA components
+            within the selected wavelength range; see
+            :func:`~pypeit.io.load_telluric_band`.  If 0, the components are
+            not cached.
 
     Returns:
         :obj:`dict`: Dictionary containing the telluric PCA components.
@@ -172,20 +182,21 @@ def read_telluric_pca(filename, wave_min=None, wave_max=None, pad_frac=0.10):
             - teltype: Type of telluric model, i.e. 'pca'
     """
     # load_telluric_grid() takes care of path and existance check
-    hdul = io.load_telluric_grid(filename)
-    wave_grid_full = hdul[1].data
-    pca_comp_full = hdul[0].data
-    nspec_full = wave_grid_full.size
-    ncomp = hdul[0].header['NCOMP']
-    bounds = hdul[2].data
-    model_coefs = hdul[3].data
-
-    ind_lower = np.argmin(np.abs(wave_grid_full - (1.0 - pad_frac)*wave_min)) \
-                    if wave_min is not None else 0
-    ind_upper = np.argmin(np.abs(wave_grid_full - (1.0 + pad_frac)*wave_max)) \
-                    if wave_max is not None else nspec_full
-    wave_grid = wave_grid_full[ind_lower:ind_upper]
-    pca_comp_grid = pca_comp_full[:,ind_lower:ind_upper]
+    # The file is memory-mapped, such that only the selected wavelength band
+    # of the PCA components is read
+    with io.load_telluric_grid(filename) as hdul:
+        wave_grid_full = hdul[1].data.astype(float)
+        nspec_full = wave_grid_full.size
+        ncomp = hdul[0].header['NCOMP']
+        bounds = hdul[2].data.astype(float)
+        model_coefs = hdul[3].data.astype(float)
+
+        ind_lower = np.argmin(np.abs(wave_grid_full - (1.0 - pad_frac)*wave_min)) \
+                        if wave_min is not None else 0
+        ind_upper = np.argmin(np.abs(wave_grid_full - (1.0 + pad_frac)*wave_max)) \
+                        if wave_max is not None else nspec_full
+        wave_grid = wave_grid_full[ind_lower:ind_upper]
+        pca_comp_grid = io.load_telluric_band(hdul[0], ind_lower, ind_upper, cache_size=cache_size)
 
     dwave, dloglam, resln_guess, pix_per_sigma = wvutils.get_sampling(wave_grid)
     tell_pad_pix = int(np.ceil(10.0 * pix_per_sigma))
@@ -195,7 +206,7 @@ def read_telluric_pca(filename, wave_min=None, wave_max=None, pad_frac=0.10):
                 tell_pca=pca_comp_grid, bounds_tell_pca=bounds,
                 coefs_tell_pca=model_coefs, teltype='pca')
             
-def read_telluric_grid(filename, wave_min=None, wave_max=None, pad_frac=0.10):
+def read_telluric_grid(filename, wave_min=None, wave_max=None, pad_frac=0.10, cache_size=0.):
     """
     Reads in the telluric grid from a file. This method is no longer the
     preferred approach; see "read_telluric_pca" for the PCA mode.
@@ -215,6 +226,11 @@ def read_telluric_grid(filename, wave_min=None, wave_max=None, pad_frac=0.10):
            ``wave_min`` or ``wave_max`` are input; ignored otherwise. The
            resulting grid will extend from ``(1.0 - pad_frac)*wave_min`` to
            ``(1.0 + pad_frac)*wave_max``.
+        cache_size (:obj:`float`, optional):
+           Maximum size in MB of the on-disk cache of the grid within the
+           selected wavelength range; see
+           :func:`~pypeit.io.load_telluric_band`.  If 0, the grid is not
+           cached.
 
     Returns:
         :obj:`dict`:  Dictionary containing the telluric grid
@@ -229,25 +245,27 @@ def read_telluric_grid(filename, wave_min=None, wave_max=None, pad_frac=0.10):
             - teltype: Type of telluric model, i.e. 'grid'
     """
     # load_telluric_grid() takes care of path and existance check
-    hdul = io.load_telluric_grid(filename)
-    wave_grid_full = 10.0*hdul[1].data
-    model_grid_full = hdul[0].data
-    nspec_full = wave_grid_full.size
-
-    ind_lower = np.argmin(np.abs(wave_grid_full - (1.0 - pad_frac)*wave_min)) \
-                    if wave_min is not None else 0
-    ind_upper = np.argmin(np.abs(wave_grid_full - (1.0 + pad_frac)*wave_max)) \
-                    if wave_max is not None else nspec_full
-    wave_grid = wave_grid_full[ind_lower:ind_upper]
-    model_grid = model_grid_full[...,ind_lower:ind_upper]
-
-    pg = hdul[0].header['PRES0']+hdul[0].header['DPRES']*np.arange(0,hdul[0].header['NPRES'])
-    tg = hdul[0].header['TEMP0']+hdul[0].header['DTEMP']*np.arange(0,hdul[0].header['NTEMP'])
-    hg = hdul[0].header['HUM0']+hdul[0].header['DHUM']*np.arange(0,hdul[0].header['NHUM'])
-    if hdul[0].header['NAM'] > 1:
-        ag = hdul[0].header['AM0']+hdul[0].header['DAM']*np.arange(0,hdul[0].header['NAM'])
+    # The file is memory-mapped, such that only the selected wavelength band
+    # of the grid is read
+    with io.load_telluric_grid(filename) as hdul:
+        wave_grid_full = 10.0*hdul[1].data
+        nspec_full = wave_grid_full.size
+        hdr = hdul[0].header
+
+        ind_lower = np.argmin(np.abs(wave_grid_full - (1.0 - pad_frac)*wave_min)) \
+                        if wave_min is not None else 0
+        ind_upper = np.argmin(np.abs(wave_grid_full - (1.0 + pad_frac)*wave_max)) \
+                        if wave_max is not None else nspec_full
+        wave_grid = wave_grid_full[ind_lower:ind_upper]
+        model_grid = io.load_telluric_band(hdul[0], ind_lower, ind_upper, cache_size=cache_size)
+
+    pg = hdr['PRES0']+hdr['DPRES']*np.arange(0,hdr['NPRES'])
+    tg = hdr['TEMP0']+hdr['DTEMP']*np.arange(0,hdr['NTEMP'])
+    hg = hdr['HUM0']+hdr['DHUM']*np.arange(0,hdr['NHUM'])
+    if hdr['NAM'] > 1:
+        ag = hdr['AM0']+hdr['DAM']*np.arange(0,hdr['NAM'])
     else:
-        ag = hdul[0].header['AM0']+1*np.arange(0,1)
+        ag = hdr['AM0']+1*np.arange(0,1)
 
     dwave, dloglam, resln_guess, pix_per_sigma = wvutils.get_sampling(wave_grid)
     tell_pad_pix = int(np.ceil(10.0 * pix_per_sigma))
@@ -271,7 +289,8 @@ def interp_telluric_grid(theta, tell_dict):
     Args:
         theta (`numpy.ndarray`_):
             A 4-element vector with the telluric model parameters: pressure,
-            temperature, humidity, and airmass.
+            temperature, humidity, and airmass.  To evaluate the model for
+            many sets of parameters at once, the shape can also be (4, nsamp).
         tell_dict (dict):
             Dictionary containing the telluric grid. See
             :func:`read_telluric_grid`.
@@ -279,7 +298,8 @@ def interp_telluric_grid(theta, tell_dict):
     Returns:
         `numpy.ndarray`_: Telluric model evaluated at the provided 4D
         position in parameter space. The telluric model is provided over all
-        available wavelengths in ``tell_dict``.
+        available wavelengths in ``tell_dict``.  If ``theta`` is 2D, the shape
+        is (nsamp, nwave).
     """
     if len(theta) != 4:
         msgs.error('Input parameter vector must have 4 and only 4 values.')
@@ -288,6 +308,14 @@ def interp_telluric_grid(theta, tell_dict):
     hg = tell_dict['h2o_grid']
     ag = tell_dict['airmass_grid']
     p, t, h, a = theta
+    if np.ndim(theta) == 2:
+        # Select the nearest models for all sets of parameters at once
+        zero = np.zeros(np.shape(theta)[1], dtype=int)
+        pi = np.round((p-pg[0])/(pg[1]-pg[0])).astype(int) if len(pg) > 1 else zero
+        ti = np.round((t-tg[0])/(tg[1]-tg[0])).astype(int) if len(tg) > 1 else zero
+        hi = np.round((h-hg[0])/(hg[1]-hg[0])).astype(int) if len(hg) > 1 else zero
+        ai = np.round((a-ag[0])/(ag[1]-ag[0])).astype(int) if len(ag) > 1 else zero
+        return tell_dict['tell_grid'][pi,ti,hi,ai]
     pi = int(np.round((p-pg[0])/(pg[1]-pg[0]))) if len(pg) > 1 else 0
     ti = int(np.round((t-tg[0])/(tg[1]-tg[0]))) if len(tg) > 1 else 0
     hi = int(np.round((h-hg[0])/(hg[1]-hg[0]))) if len(hg) > 1 else 0
@@ -303,19 +331,22 @@ def conv_telluric(tell_model, dloglam, res):
         tell_model (`numpy.ndarray`_):
             Input telluric model at the native resolution of the telluric model grid. The shape of this input is in
             general different from the size of the raw telluric model (read in by read_telluric_* above) because it is
-            trimmed to relevant wavelengths using ind_lower, ind_upper. See eval_telluric below.
+            trimmed to relevant wavelengths using ind_lower, ind_upper. See eval_telluric below.  To convolve many
+            models at once, the shape can also be (nsamp, nwave).
         dloglam (float):
             Wavelength spacing of the telluric grid expressed as a dlog10(lambda), i.e. stored in the
             tell_dict as tell_dict['dloglam']
         res (float):
             Desired resolution expressed as lambda/dlambda. Note that here dlambda is linear, whereas dloglam is
-            the delta of the log10.
+            the delta of the log10.  If ``tell_model`` is 2D, this must be an array with one resolution per model.
 
     Returns:
         `numpy.ndarray`_:
             Resolution convolved telluric model. Shape = same size as input tell_model.
 
     """
+    if tell_model.ndim == 2:
+        return _conv_telluric_batch(tell_model, dloglam, res)
 
 
     pix_per_sigma = 1.0/res/(dloglam*np.log(10.0))/(2.0 * np.sqrt(2.0 * np.log(2))) # number of dloglam pixels per 1 sigma dispersion
@@ -334,6 +365,46 @@ def conv_telluric(tell_model, dloglam, res):
     conv_model = scipy.signal.convolve(tell_model,g,mode='same')
     return conv_model
 
+
+def _conv_telluric_batch(tell_model, dloglam, res):
+    """
+    Convolve a set of telluric models, each to its own resolution.
+
+    This is the vectorized equivalent of :func:`conv_telluric`: the Gaussian
+    kernels of all models are padded to the same (odd) length, and all models
+    are convolved at once using FFTs.
+
+    Args:
+        tell_model (`numpy.ndarray`_):
+            Telluric models at the native resolution of the telluric grid.
+            Shape is (nsamp, nwave).
+        dloglam (float):
+            Wavelength spacing of the telluric grid expressed as dlog10(lambda).
+        res (`numpy.ndarray`_):
+            Desired resolution of each model expressed as lambda/dlambda.
+            Shape is (nsamp,).
+
+    Returns:
+        `numpy.ndarray`_: Resolution convolved telluric models, with the same
+        shape as ``tell_model``.
+    """
+    pix_per_sigma = 1.0/np.asarray(res)/(dloglam*np.log(10.0))/(2.0 * np.sqrt(2.0 * np.log(2)))
+    sig2pix = 1.0/pix_per_sigma
+    # As in conv_telluric, models that are not sampled finely enough are not
+    # convolved; this is done by replacing their kernel with a delta function.
+    skip = sig2pix > 2.0
+    if np.any(skip):
+        msgs.warn('The telluric model grid is not sampled finely enough to properly convolve to the desired '
+                  'resolution. Skipping resolution convolution for now. Create a higher resolution telluric '
+                  'model grid')
+    # Number of kernel pixels on either side of the center, matching the
+    # kernel constructed by conv_telluric
+    nhalf = np.where(skip, 0, np.ceil(4/np.where(skip, 1., sig2pix)).astype(int) - 1)
+    pix = np.arange(-nhalf.max(), nhalf.max()+1)
+    g = np.exp(-0.5*np.square(pix[None,:]*sig2pix[:,None])) * (np.absolute(pix)[None,:] <= nhalf[:,None])
+    g /= np.sum(g, axis=1, keepdims=True)
+    return scipy.signal.fftconvolve(tell_model, g, mode='same', axes=1)
+
 def shift_telluric(tell_model, loglam, dloglam, shift, stretch):
     """
     Routine to apply a shift to the telluric model. Note that the shift can be sub-pixel, i.e this routine interpolates.
@@ -359,6 +430,14 @@ def shift_telluric(tell_model, loglam, dloglam, shift, stretch):
             Shifted telluric model. Shape = same size as input tell_model.
 
     """
+    if tell_model.ndim == 2:
+        # Shift and stretch many models at once; shift and stretch are arrays
+        # with one value per model.  NOTE: Interpolating one model at a time
+        # is faster than a vectorized search of the interpolation indices.
+        loglam_shift = loglam[0] + np.arange(len(loglam))[None,:] * dloglam * np.asarray(stretch)[:,None] \
+                            + np.asarray(shift)[:,None] * dloglam
+        return np.array([np.interp(_loglam_shift, loglam, _tell_model)
+                            for _loglam_shift, _tell_model in zip(loglam_shift, tell_model)])
     loglam_shift = loglam[0] + np.arange(len(loglam)) * dloglam * stretch + shift * dloglam
     #loglam_shift = loglam + shift*dloglam
     tell_model_shift = np.interp(loglam_shift, loglam, tell_model)
@@ -389,7 +468,10 @@ def eval_telluric(theta_tell, tell_dict, ind_lower=None, ind_upper=None):
             Vector with tell_npca PCA coefficients (if teltype='pca')
             or pressure, temperature, humidity, and airmass (if teltype='grid'),
             followed by spectral resolution, shift, and stretch.
-            Final length is then tell_npca+3 or 7.
+            Final length is then tell_npca+3 or 7.  To evaluate the model for
+            many sets of parameters at once (e.g., the full population of the
+            differential evolution optimizer), the shape can also be
+            (tell_npca+3, nsamp) or (7, nsamp).
         tell_dict (:obj:`dict`):
             Dictionary containing the telluric data. See
             :func:`read_telluric_pca` if teltype=='pca'.
@@ -410,7 +492,7 @@ def eval_telluric(theta_tell, tell_dict, ind_lower=None, ind_upper=None):
         `numpy.ndarray`_: Telluric model evaluated at the desired location
         theta_tell in model atmosphere parameter space. Shape is given by
         the size of ``wave_grid`` plus ``tell_pad_pix`` padding from the input
-        tell_dict.
+        tell_dict.  If ``theta_tell`` is 2D, the shape is (nsamp, nwave).
         
     """
     ntheta = len(theta_tell)
@@ -433,6 +515,23 @@ def eval_telluric(theta_tell, tell_dict, ind_lower=None, ind_upper=None):
     ind_lower_final = ind_lower_pad if ind_lower_pad == ind_lower else ind_lower - ind_lower_pad
     ind_upper_final = ind_upper_pad if ind_upper_pad == ind_upper else ind_upper - ind_upper_pad
 
+    if np.ndim(theta_tell) == 2:
+        # Evaluate all the models at once, only over the padded wavelength range
+        if teltype == 'pca':
+            coeff = np.vstack((np.ones(theta_tell.shape[1]), theta_tell[:ntell]))
+            tellmodel_hires = np.dot(coeff.T, tell_dict['tell_pca'][:ntell+1][:,ind_lower_pad:ind_upper_pad+1])
+            # Convert from arsinh of the optical depth to transmission,
+            # trimming negative optical depths
+            tellmodel_hires = np.exp(-np.clip(np.sinh(tellmodel_hires), 0, None))
+        elif teltype == 'grid':
+            tellmodel_hires = interp_telluric_grid(theta_tell[:ntell],
+                                                   tell_dict)[:,ind_lower_pad:ind_upper_pad+1]
+        tellmodel_conv = conv_telluric(tellmodel_hires, tell_dict['dloglam'], theta_tell[-3])
+        tellmodel_out = shift_telluric(tellmodel_conv,
+                                       np.log10(tell_dict['wave_grid'][ind_lower_pad:ind_upper_pad+1]),
+                                       tell_dict['dloglam'], theta_tell[-2], theta_tell[-1])
+        return tellmodel_out[:,ind_lower_final:ind_upper_final]
+
     if teltype == 'pca':
         # Evaluate PCA model after truncating the wavelength range
         tellmodel_hires = np.zeros_like(tell_dict['tell_pca'][0])
@@ -472,7 +571,10 @@ def tellfit_chi2(theta, flux, thismask, arg_dict):
     Args:
         theta (`numpy.ndarray`_):
            
-            Parameter vector for the object + telluric model.
+            Parameter vector for the object + telluric model.  If 2D, the
+            shape is (ntheta, nsamp), and the loss function is evaluated for
+            all nsamp parameter vectors at once (see ``vectorized`` in
+            :func:`tellfit`).
 
             This is actually two concatenated parameter vectors, one for
             the object and one for the telluric, i.e.:
@@ -520,7 +622,8 @@ def tellfit_chi2(theta, flux, thismask, arg_dict):
     Returns:
         float:
            The value of the loss function at the location in parameter space theta. This is loss function is the thing
-           that is minimized to perform the fit.
+           that is minimized to perform the fit.  If ``theta`` is 2D, this is an array with the loss function for
+           each parameter vector.
 
     """
     
@@ -540,6 +643,20 @@ def tellfit_chi2(theta, flux, thismask, arg_dict):
 
     tell_model = eval_telluric(theta_tell, arg_dict['tell_dict'],
                                  ind_lower=arg_dict['ind_lower'], ind_upper=arg_dict['ind_upper'])
+    if theta.ndim == 2:
+        # Evaluate the loss function for all parameter vectors at once.  The
+        # object model must then also accept 2D parameter arrays, returning
+        # models with shape (nsamp, nspec).
+        obj_model, model_gpm = obj_model_func(theta_obj, arg_dict['obj_dict'])
+        totalmask = np.broadcast_to(thismask & model_gpm, tell_model.shape)
+        chi_vec = totalmask * (flux - tell_model*obj_model) * np.sqrt(flux_ivar)
+        robust_scale = 2.0
+        huber_vec = scipy.special.huber(robust_scale, chi_vec)
+        loss_function = np.sum(huber_vec * totalmask, axis=1)
+        # If everything is masked return infinity
+        loss_function[np.logical_not(np.any(totalmask, axis=1))] = np.inf
+        return loss_function
+
     obj_model, model_gpm = obj_model_func(theta_obj, arg_dict['obj_dict'])
 
     totalmask = thismask & model_gpm
@@ -586,6 +703,17 @@ def tellfit(flux, thismask, arg_dict, init_from_last=None):
                   object model arguments which is passed to the
                   obj_model_func
 
+            The optional key ``arg_dict['vectorized']`` selects whether the
+            loss function is evaluated for the full population of the
+            differential evolution optimizer at once (see
+            :func:`tellfit_chi2`).  This is faster, but requires the
+            population to be updated once per generation (``updating =
+            'deferred'`` in `scipy.optimize.differential_evolution`_), such
+            that the result is not identical to the default, one-at-a-time
+            evaluation.  It also requires ``obj_model_func`` to accept
+            parameter arrays with shape (ntheta_obj, nsamp); all the object
+            models provided in this module do.
+
         init_from_last (object, optional):
              Optional. Result object returned by the differential
              evolution optimizer for the last iteration. If this is passed the code
@@ -645,10 +773,15 @@ def tellfit(flux, thismask, arg_dict, init_from_last=None):
         # If this is the first iteration and no object model optimum is presented, use a latin hypercube which is the default
         init = 'latinhypercube'
 
+    # Evaluating the full population at once requires the population to be
+    # updated once per generation
+    vectorized = arg_dict.get('vectorized', False)
+    updating = 'deferred' if vectorized else 'immediate'
     result = scipy.optimize.differential_evolution(tellfit_chi2, bounds, args=(flux, thismask, arg_dict,), seed=rng,
-                                                   init = init, updating='immediate', popsize=popsize,
+                                                   init = init, updating=updating, popsize=popsize,
                                                    recombination=arg_dict['recombination'], maxiter=arg_dict['diff_evol_maxiter'],
-                                                   polish=arg_dict['polish'], disp=arg_dict['disp'])
+                                                   polish=arg_dict['polish'], disp=arg_dict['disp'],
+                                                   vectorized=vectorized)
                                         
     theta_obj  = result.x[:-ntheta_tell]
     theta_tell = result.x[-ntheta_tell:]
@@ -942,7 +1075,7 @@ def eval_sensfunc_model(theta, obj_dict):
     ----------
     theta : `numpy.ndarray`_ 
         Array containing the parameters that describe the model.
-        shape is (ntheta,)
+        shape is (ntheta,) or, to evaluate many models at once, (ntheta, nsamp)
     obj_dict : :obj:`dict`
         Dictionary containing additional arguments needed to evaluate the model
 
@@ -1052,7 +1185,7 @@ def eval_qso_model(theta, obj_dict):
     ----------
     theta : `numpy.ndarray`_
         Array containing the PCA coefficients
-        shape=(ntheta,)
+        shape=(ntheta,) or, to evaluate many models at once, (ntheta, nsamp)
 
     obj_dict : dict
        Dictionary containing additional arguments needed to evaluate the PCA model
@@ -1167,7 +1300,7 @@ def eval_star_model(theta, obj_dict):
     ----------
     theta : `numpy.ndarray`_
         Array containing the polynomial coefficients.
-        shape (ntheta,)
+        shape (ntheta,) or, to evaluate many models at once, (ntheta, nsamp)
 
     obj_dict : dict
        Dictionary containing additional arguments needed to evaluate the star model.
@@ -1291,7 +1424,7 @@ def eval_poly_model(theta, obj_dict):
     ----------
     theta : `numpy.ndarray`_
         Array containing the polynomial coefficients.
-        shape=(ntheta,)
+        shape=(ntheta,) or, to evaluate many models at once, (ntheta, nsamp)
 
     obj_dict : dict
        Dictionary containing additional arguments needed to evaluate the star model.
@@ -1320,7 +1453,8 @@ def sensfunc_telluric(wave, counts, counts_ivar, counts_mask, exptime, airmass,
                       delta_coeff_bounds=(-20.0, 20.0), minmax_coeff_bounds=(-5.0, 5.0),
                       sn_clip=30.0, ballsize=5e-4, only_orders=None, maxiter=3, lower=3.0,
                       upper=3.0, tol=1e-3, popsize=30, recombination=0.7, polish=True, disp=False,
-                      debug_init=False, debug=False):
+                      vectorized=False, n_proc=1, band_cache_size=0., debug_init=False,
+                      debug=False):
     r"""
     Compute a sensitivity function from a standard star spectrum by
     simultaneously fitting a polynomial sensitivity function and a telluric
@@ -1436,6 +1570,15 @@ def sensfunc_telluric(wave, counts, counts_ivar, counts_mask, exptime, airmass,
         display status messages to the screen indicating the status of the
         optimization. See above for a description of the output and how to know
         if things are working well.
+    vectorized : :obj:`bool`, optional, default=False
+        Evaluate the model for the full population of the differential
+        evolution optimizer at once; see :class:`Telluric`.
+    n_proc : :obj:`int`, optional, default=1
+        Number of processes used to fit the orders in parallel; see
+        :class:`Telluric`.
+    band_cache_size : :obj:`float`, optional, default=0.
+        Maximum size in MB of the on-disk cache of the telluric models; see
+        :class:`Telluric`.
     debug_init : :obj:`bool`, optional, default=False
         Show plots to the screen useful for debugging model initialization
     debug : :obj:`bool`, optional, default=False
@@ -1488,7 +1631,8 @@ def sensfunc_telluric(wave, counts, counts_ivar, counts_mask, exptime, airmass,
                       resln_guess=resln_guess, resln_frac_bounds=resln_frac_bounds, sn_clip=sn_clip,
                       maxiter=maxiter,  lower=lower, upper=upper, tol=tol, 
                       popsize=popsize, recombination=recombination, polish=polish, disp=disp,
-                      sensfunc=True, debug=debug)
+                      sensfunc=True, vectorized=vectorized, n_proc=n_proc,
+                      band_cache_size=band_cache_size, debug=debug)
     TelObj.run(only_orders=only_orders)
 
     return TelObj
@@ -1532,8 +1676,9 @@ def qso_telluric(spec1dfile, telgridfile,  pca_file, z_qso, telloutfile, outfile
                  teltype='pca', tell_npca=4,
                  bounds_norm=(0.1, 3.0), tell_norm_thresh=0.9, sn_clip=30.0, only_orders=None,
                  maxiter=3, tol=1e-3, popsize=30, recombination=0.7, polish=True, disp=False,
-                 pix_shift_bounds=(-5.0,5.0), debug_init=False, debug=False, show=False,
-                 chk_version=True):
+                 vectorized=False, n_proc=1, band_cache_size=0., pix_shift_bounds=(-5.0,5.0),
+                 debug_init=False,
+                 debug=False, show=False, chk_version=True):
     """
     Fit and correct a QSO spectrum for telluric absorption.
 
@@ -1615,6 +1760,15 @@ def qso_telluric(spec1dfile, telgridfile,  pca_file, z_qso, telloutfile, outfile
         status messages to the screen indicating the status of the optimization.
         See above for a description of the output and how to know if things are
         working well.  Note: this is automatically set to True if debug is True.
+    vectorized : :obj:`bool`, optional, default=False
+        Evaluate the model for the full population of the differential
+        evolution optimizer at once; see :class:`Telluric`.
+    n_proc : :obj:`int`, optional, default=1
+        Number of processes used to fit the orders in parallel; see
+        :class:`Telluric`.
+    band_cache_size : :obj:`float`, optional, default=0.
+        Maximum size in MB of the on-disk cache of the telluric models; see
+        :class:`Telluric`.
     debug_init : :obj:`bool`, optional, default=False
         Show plots to the screen useful for debugging model initialization
     debug : :obj:`bool`, optional, default=False
@@ -1660,7 +1814,8 @@ def qso_telluric(spec1dfile, telgridfile,  pca_file, z_qso, telloutfile, outfile
                       eval_qso_model, pix_shift_bounds=pix_shift_bounds,
                       sn_clip=sn_clip, maxiter=maxiter, tol=tol, popsize=popsize, teltype=teltype,
                       tell_npca=tell_npca, recombination=recombination, polish=polish,
-                      disp=disp, debug=debug)
+                      disp=disp, vectorized=vectorized, n_proc=n_proc,
+                      band_cache_size=band_cache_size, debug=debug)
     TelObj.run(only_orders=only_orders)
     TelObj.to_file(telloutfile, overwrite=True)
 
@@ -1709,8 +1864,9 @@ def star_telluric(spec1dfile, telgridfile, telloutfile, outfile, star_type=None,
                   mask_helium_lines=False, hydrogen_mask_wid=10., delta_coeff_bounds=(-20.0, 20.0),
                   minmax_coeff_bounds=(-5.0, 5.0), only_orders=None, sn_clip=30.0, maxiter=3,
                   tol=1e-3, popsize=30, recombination=0.7, polish=True, disp=False,
-                  pix_shift_bounds=(-5.0,5.0), debug_init=False, debug=False, show=False,
-                  chk_version=True):
+                  vectorized=False, n_proc=1, band_cache_size=0., pix_shift_bounds=(-5.0,5.0),
+                  debug_init=False,
+                  debug=False, show=False, chk_version=True):
     """
     This needs a doc string.
 
@@ -1771,7 +1927,9 @@ def star_telluric(spec1dfile, telgridfile, telloutfile, outfile, star_type=None,
                       eval_star_model, pix_shift_bounds=pix_shift_bounds,
                       teltype=teltype, tell_npca=tell_npca,
                       sn_clip=sn_clip, tol=tol, popsize=popsize,
-                      recombination=recombination, polish=polish, disp=disp, debug=debug)
+                      recombination=recombination, polish=polish, disp=disp,
+                      vectorized=vectorized, n_proc=n_proc,
+                      band_cache_size=band_cache_size, debug=debug)
     TelObj.run(only_orders=only_orders)
     TelObj.to_file(telloutfile, overwrite=True)
 
@@ -1818,8 +1976,10 @@ def poly_telluric(spec1dfile, telgridfile, telloutfile, outfile, z_obj=0.0, func
                   model='exp', polyorder=3, fit_wv_min_max=None, mask_lyman_a=True, teltype='pca',
                   tell_npca=4, delta_coeff_bounds=(-20.0, 20.0), minmax_coeff_bounds=(-5.0, 5.0),
                   only_orders=None, sn_clip=30.0, maxiter=3, tol=1e-3, popsize=30,
-                  recombination=0.7, polish=True, disp=False, pix_shift_bounds=(-5.0,5.0),
-                  debug_init=False, debug=False, show=False, chk_version=True):
+                  recombination=0.7, polish=True, disp=False, vectorized=False, n_proc=1,
+                  band_cache_size=0.,
+                  pix_shift_bounds=(-5.0,5.0), debug_init=False, debug=False, show=False,
+                  chk_version=True):
     """
     This needs a doc string.
 
@@ -1871,7 +2031,9 @@ def poly_telluric(spec1dfile, telgridfile, telloutfile, outfile, z_obj=0.0, func
     TelObj = Telluric(wave, flux, ivar, mask_tot, telgridfile, obj_params, init_poly_model,
                       eval_poly_model, pix_shift_bounds=pix_shift_bounds,
                       sn_clip=sn_clip, maxiter=maxiter, tol=tol, popsize=popsize, teltype=teltype,
-                      tell_npca=tell_npca, recombination=recombination, polish=polish, disp=disp, debug=debug)
+                      tell_npca=tell_npca, recombination=recombination, polish=polish, disp=disp,
+                      vectorized=vectorized, n_proc=n_proc,
+                      band_cache_size=band_cache_size, debug=debug)
     TelObj.run(only_orders=only_orders)
     TelObj.to_file(telloutfile, overwrite=True)
 
@@ -2185,6 +2347,26 @@ class Telluric(datamodel.DataContainer):
             flux is in counts and then converted to counts per angstrom,
             since the sensfunc is obtained by fitting counts per angstrom.
             TODO: This explanation is unclear.
+        vectorized (:obj:`bool`, optional):
+            If True, the differential evolution optimizer evaluates the model
+            for its full population at once (see :func:`tellfit`).  This is
+            faster, but the population is then only updated once per
+            generation, such that the result differs from the default
+            optimization.  This requires ``eval_obj_model`` to accept 2D
+            parameter arrays.
+        n_proc (:obj:`int`, optional):
+            Number of processes used to fit the orders in parallel.  If 1, the
+            orders are fit serially; if less than 1, the number of processes
+            is set to the number of available CPUs.  When fit in parallel, the
+            fit of each order uses its own random number generator, seeded by
+            ``seed`` and the order index, such that the result is independent
+            of the number of processes (but not identical to a serial fit).
+            Ignored if ``debug`` is True.
+        band_cache_size (:obj:`float`, optional):
+            Maximum size in MB of the on-disk cache of the telluric models
+            within the wavelength range of the data; see
+            :func:`~pypeit.io.load_telluric_band`.  If 0, the models are
+            always read from ``telgridfile``.
         debug (:obj:`bool`, optional):
             If True, QA plots will be shown to the screen indicating the
             quality of the fits. Specifically, the residual distributions
@@ -2259,6 +2441,9 @@ class Telluric(datamodel.DataContainer):
                  'diff_evol_maxiter',
                  'disp',
                  'sensfunc',
+                 'vectorized',
+                 'n_proc',
+                 'band_cache_size',
                  'debug',
 
                  'wave_in_arr',
@@ -2366,7 +2551,8 @@ class Telluric(datamodel.DataContainer):
                  airmass_guess=1.5, resln_guess=None, resln_frac_bounds=(0.3, 1.5), pix_shift_bounds=(-5.0, 5.0),
                  pix_stretch_bounds=(0.9,1.1), maxiter=2, sticky=True, lower=3.0, upper=3.0,
                  seed=777, ballsize = 5e-4, tol=1e-3, diff_evol_maxiter=1000,  popsize=30,
-                 recombination=0.7, polish=True, disp=False, sensfunc=False, debug=False):
+                 recombination=0.7, polish=True, disp=False, sensfunc=False, vectorized=False, n_proc=1,
+                 band_cache_size=0., debug=False):
 
         # Instantiate as an empty DataContainer
         super().__init__()
@@ -2409,6 +2595,9 @@ class Telluric(datamodel.DataContainer):
         # Turn on disp for the differential_evolution if debug mode is turned on.
         self.disp = disp or debug
         self.sensfunc = sensfunc
+        self.vectorized = vectorized
+        self.n_proc = n_proc
+        self.band_cache_size = band_cache_size
         self.debug = debug
         self.log10_blaze_func_in_arr = None
 
@@ -2426,11 +2615,13 @@ class Telluric(datamodel.DataContainer):
         wv_gpm = self.wave_in_arr > 1.0
         if self.teltype == 'pca':
             self.tell_dict = read_telluric_pca(self.telgrid, wave_min=self.wave_in_arr[wv_gpm].min(),
-                                               wave_max=self.wave_in_arr[wv_gpm].max())
+                                               wave_max=self.wave_in_arr[wv_gpm].max(),
+                                               cache_size=self.band_cache_size)
         elif self.teltype == 'grid':
             self.tell_npca = 4
             self.tell_dict = read_telluric_grid(self.telgrid, wave_min=self.wave_in_arr[wv_gpm].min(),
-                                                wave_max=self.wave_in_arr[wv_gpm].max())
+                                                wave_max=self.wave_in_arr[wv_gpm].max(),
+                                                cache_size=self.band_cache_size)
 
             
         self.wave_grid = self.tell_dict['wave_grid']
@@ -2509,7 +2700,8 @@ class Telluric(datamodel.DataContainer):
                                  ballsize=self.ballsize, bounds=bounds_iord, rng=self.rng,
                                  diff_evol_maxiter=self.diff_evol_maxiter, tol=self.tol,
                                  popsize=self.popsize, recombination=self.recombination,
-                                 polish=self.polish, disp=self.disp, debug=debug)
+                                 polish=self.polish, disp=self.disp, vectorized=self.vectorized,
+                                 debug=debug)
             self.arg_dict_list[iord] = arg_dict_iord
 
         # 6) Initalize the output tables
@@ -2538,17 +2730,36 @@ class Telluric(datamodel.DataContainer):
         self.tellmodel_list = [None]*self.norders
         self.theta_obj_list = [None]*self.norders
         self.theta_tell_list = [None]*self.norders
+        fit_kwargs = dict(maxiter=self.maxiter, lower=self.lower, upper=self.upper, sticky=self.sticky)
+        tasks = [iord for iord in self.srt_order_tell if iord in good_orders]
+        # The orders are always fit serially when the QA plots are shown
+        n_proc = 1 if self.debug else utils.get_nproc(self.n_proc, len(tasks))
+        if n_proc > 1:
+            msgs.info(f'Fitting object + telluric model for {len(tasks)} orders using {n_proc} processes'
+                      + f' with user supplied function: {self.init_obj_model.__name__}')
+            # NOTE: The data and the telluric model are passed to each process
+            # once, when it is started.  Each order is fit using its own random
+            # number generator (see _tellfit_order_task), such that the
+            # result does not depend on the number of processes.
+            with utils.SharedProcessPool(n_proc, _tellfit_order_task, flux_arr=self.flux_arr,
+                                         mask_arr=self.mask_arr, ind_lower=self.ind_lower,
+                                         ind_upper=self.ind_upper,
+                                         arg_dict_list=self.arg_dict_list, seed=self.seed,
+                                         **fit_kwargs) as pool:
+                fits = dict(zip(tasks, pool.map(tasks)))
         for counter, iord in enumerate(self.srt_order_tell):
             if iord not in good_orders:
                 continue
-            msgs.info(f'Fitting object + telluric model for order: {iord}, {counter}/{self.norders}'
-                      + f' with user supplied function: {self.init_obj_model.__name__}')
-            self.result_list[iord], ymodel, ivartot, self.outmask_list[iord] \
-                    = fitting.robust_optimize(self.flux_arr[self.ind_lower[iord]:self.ind_upper[iord]+1,iord],
-                                              tellfit, self.arg_dict_list[iord],
-                                              inmask=self.mask_arr[self.ind_lower[iord]:self.ind_upper[iord]+1,iord],
-                                              maxiter=self.maxiter, lower=self.lower,
-                                              upper=self.upper, sticky=self.sticky)
+            if n_proc > 1:
+                self.result_list[iord], ymodel, ivartot, self.outmask_list[iord] = fits[iord]
+            else:
+                msgs.info(f'Fitting object + telluric model for order: {iord}, {counter}/{self.norders}'
+                          + f' with user supplied function: {self.init_obj_model.__name__}')
+                self.result_list[iord], ymodel, ivartot, self.outmask_list[iord] \
+                        = fitting.robust_optimize(self.flux_arr[self.ind_lower[iord]:self.ind_upper[iord]+1,iord],
+                                                  tellfit, self.arg_dict_list[iord],
+                                                  inmask=self.mask_arr[self.ind_lower[iord]:self.ind_upper[iord]+1,iord],
+                                                  **fit_kwargs)
             if self.teltype == 'pca':
                 self.theta_obj_list[iord] = self.result_list[iord].x[:-(self.tell_npca+3)]
                 self.theta_tell_list[iord] = self.result_list[iord].x[-(self.tell_npca+3):]
@@ -2806,3 +3017,40 @@ class Telluric(datamodel.DataContainer):
         return tell_med.argsort()
 
 
+def _tellfit_order_task(iord, flux_arr=None, mask_arr=None, ind_lower=None, ind_upper=None,
+                        arg_dict_list=None, seed=None, **kwargs):
+    """
+    Fit the object + telluric model to one order in a
+    :class:`~pypeit.utils.SharedProcessPool`.
+
+    The random number generator used by the fit is seeded using both the
+    shared seed and the order index.
+
+    Args:
+        iord (:obj:`int`):
+            Index of the order to fit.
+        flux_arr (`numpy.ndarray`_):
+            Flux of all orders interpolated onto the telluric wavelength grid.
+        mask_arr (`numpy.ndarray`_):
+            Good-pixel mask of all orders.
+        ind_lower (`numpy.ndarray`_):
+            Index of the first pixel of the telluric grid fit for each order.
+        ind_upper (`numpy.ndarray`_):
+            Index of the last pixel of the telluric grid fit for each order.
+        arg_dict_list (:obj:`list`):
+            The arguments passed to :func:`tellfit` for each order.
+        seed (:obj:`int`):
+            Seed for the random number generators used by the fits.
+        **kwargs:
+            Other keyword arguments passed to
+            :func:`~pypeit.core.fitting.robust_optimize`.
+
+    Returns:
+        :obj:`tuple`: The results of
+        :func:`~pypeit.core.fitting.robust_optimize`.
+    """
+    msgs.info(f'Fitting object + telluric model for order: {iord}')
+    indx = slice(ind_lower[iord], ind_upper[iord]+1)
+    arg_dict = dict(arg_dict_list[iord], rng=np.random.default_rng([seed, iord]))
+    return fitting.robust_optimize(flux_arr[indx,iord], tellfit, arg_dict,
+                                   inmask=mask_arr[indx,iord], **kwargs)
@@ -851,9 +851,9 @@ def fit_tilts(trc_tilt_dict, thismask, slit_cen, spat_order=3, spec_order=4, max
     # msgs.info("RMS/FWHM: {}".format(rms_real/fwhm))
 
 
-def fit2tilts(shape, coeff2, func2d, spat_shift=None):
+def fit2tilts(shape, coeff2, func2d, spat_shift=None, cutout=None):
     """
-    Evaluate the wavelength tilt model over the full image.
+    Evaluate the wavelength tilt model over the full image or a cutout of it.
 
     Parameters
     ----------
@@ -867,12 +867,17 @@ def fit2tilts(shape, coeff2, func2d, spat_shift=None):
         Spatial shift to be added to image pixels before evaluation
         If you are accounting for flexure, then you probably wish to
         input -1*flexure_shift into this parameter.
+    cutout : tuple of slices, optional
+        Slices selecting the region of the image over which to evaluate the
+        tilts; see :func:`~pypeit.slittrace.SlitTraceSet.slit_cutout`.  If
+        None, the tilts are evaluated over the full image.
 
     Returns
     -------
     tilts : `numpy.ndarray`_, float
         Image indicating how spectral pixel locations move across the
-        image. This output is used in the pipeline.
+        image. This output is used in the pipeline.  If ``cutout`` is
+        provided, the shape of the image is that of the cutout.
 
     """
     # Init
@@ -882,7 +887,11 @@ def fit2tilts(shape, coeff2, func2d, spat_shift=None):
     xnspecmin1 = float(nspec - 1)
     xnspatmin1 = float(nspat - 1)
     spec_vec = np.arange(nspec)
-    spat_vec = np.arange(nspat) - _spat_shift
+    spat_vec = np.arange(nspat)
+    if cutout is not None:
+        spec_vec = spec_vec[cutout[0]]
+        spat_vec = spat_vec[cutout[1]]
+    spat_vec = spat_vec - _spat_shift
     spat_img, spec_img = np.meshgrid(spat_vec, spec_vec)
     #
     pypeitFit = fitting.PypeItFit(fitc=coeff2, minx=0.0, maxx=1.0,
@@ -3,7 +3,12 @@
 .. include:: ../include/links.rst
 """
 import copy
+import hashlib
 import itertools
+import os
+from pathlib import Path
+
+import astropy.config.paths
 
 import astropy.stats
 import astropy.table
@@ -27,6 +32,7 @@ from pypeit.core import arc
 from pypeit.core import fitting
 
 from pypeit.core import pca
+from pypeit import io
 from pypeit import utils
 
 from pypeit import msgs
@@ -377,12 +383,132 @@ def match_qa(arc_spec, tcent, line_list, IDs, scores, outfile = None, title=None
     return
 
 
+def reid_arxiv_lines(spec_arxiv, cont_sub=True, sigdetect=5.0, fwhm=4.0, nonlinear_counts=1e10,
+                     percent_ceil=50.0, xcorr=False, cache_size=0., cache_dir=None,
+                     debug_peaks=False):
+    """
+    Detect the arc lines in the arxiv spectra used by :func:`reidentify`.
+
+    If ``cache_size`` is larger than 0, the result is saved in ``cache_dir``,
+    keyed by the content of the arxiv spectra and the parameters used to
+    detect the lines, and the cached result is used whenever the same arxiv
+    spectra are processed again with the same parameters; e.g., when reducing
+    more data with the same ``reid_arxiv`` template file.  When the total size
+    of the cached files would exceed ``cache_size``, the least recently used
+    files are removed (see :func:`~pypeit.io.prune_file_cache`).
+
+    Parameters
+    ----------
+    spec_arxiv : ndarray
+        Arxiv arc spectra, shape = (nspec, narxiv).
+    cont_sub : bool, default = True
+        Use the continuum-subtracted arxiv spectra to construct the synthetic
+        arcs for the cross-correlation.
+    sigdetect : float, default = 5.0
+        Threshold for detecting the arc lines.
+    fwhm : float, default = 4.0
+        FWHM of the arc lines.
+    nonlinear_counts : float, default = 1e10
+        Arc lines above this saturation threshold are not used.
+    percent_ceil : float, default = 50.0
+        Percentile ceiling applied to the line amplitudes of the synthetic
+        arcs; see :func:`~pypeit.core.wavecal.wvutils.get_xcorr_arc`.
+    xcorr : bool, default = False
+        Construct the synthetic arcs used for the cross-correlation.
+    cache_size : float, default = 0.
+        Maximum size in MB of all the files in the on-disk cache.  If 0, the
+        cache is not used.  Ignored if ``debug_peaks`` is True.
+    cache_dir : str, `Path`_, optional
+        Cache directory.  If None, the default is ``reid_arxiv`` in the PypeIt
+        cache directory (see :mod:`~pypeit.cache`).
+    debug_peaks : bool, default = False
+        Show plots of the line detection.
+
+    Returns
+    -------
+    spec_arxiv_cont_sub : ndarray
+        Continuum-subtracted arxiv spectra, shape = (nspec, narxiv).
+    det_arxiv : dict
+        Pixel locations of the lines detected in each arxiv spectrum, keyed by
+        the string index of the spectrum.
+    xcorr_arxiv : ndarray
+        Synthetic arcs of the arxiv spectra, shape = (nspec, narxiv).  This is
+        all zeros for arxiv spectra without detected lines, and None if
+        ``xcorr`` is False.
+    """
+    nspec, narxiv = spec_arxiv.shape
+    cache_file = None
+    if cache_size > 0 and not debug_peaks:
+        _cache_dir = Path(astropy.config.paths.get_cache_dir('pypeit')) / 'reid_arxiv' \
+                        if cache_dir is None else Path(cache_dir).absolute()
+        key = hashlib.sha1(np.ascontiguousarray(spec_arxiv, dtype=float).tobytes())
+        key.update(repr((cont_sub, sigdetect, fwhm, nonlinear_counts, percent_ceil,
+                         xcorr)).encode())
+        cache_file = _cache_dir / f'{key.hexdigest()}.npz'
+        if cache_file.exists():
+            try:
+                # Mark the file as recently used
+                os.utime(cache_file)
+            except OSError:
+                pass
+            with np.load(cache_file) as data:
+                det = np.split(data['det'], np.cumsum(data['ndet'])[:-1])
+                return data['cont_sub'], {str(i): d for i, d in enumerate(det)}, \
+                        (data['xcorr'] if xcorr else None)
+
+    spec_arxiv_cont_sub = np.zeros_like(spec_arxiv)
+    det_arxiv = {}
+    for iarxiv in range(narxiv):
+        tcent_arxiv, ecent_arxiv, cut_tcent_arxiv, icut_arxiv, spec_cont_sub_now = wvutils.arc_lines_from_spec(
+            spec_arxiv[:, iarxiv], sigdetect=sigdetect, nonlinear_counts=nonlinear_counts, fwhm=fwhm,
+            debug=debug_peaks)
+        spec_arxiv_cont_sub[:, iarxiv] = spec_cont_sub_now
+        det_arxiv[str(iarxiv)] = tcent_arxiv[icut_arxiv]
+
+    xcorr_arxiv = None
+    if xcorr:
+        use_spec_arxiv = spec_arxiv_cont_sub if cont_sub else spec_arxiv
+        xcorr_arxiv = np.zeros_like(spec_arxiv, dtype=float)
+        for iarxiv in range(narxiv):
+            arc_now = wvutils.get_xcorr_arc(use_spec_arxiv[:, iarxiv], percent_ceil=percent_ceil,
+                                            sigdetect=sigdetect, fwhm=fwhm)
+            if arc_now is not None:
+                xcorr_arxiv[:, iarxiv] = arc_now
+
+    if cache_file is not None:
+        det = [det_arxiv[str(i)] for i in range(narxiv)]
+        try:
+            _cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so that concurrent runs never read
+            # a partially written cache file
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, cont_sub=spec_arxiv_cont_sub,
+                         det=np.concatenate(det).astype(float),
+                         ndet=np.array([d.size for d in det], dtype=int),
+                         xcorr=xcorr_arxiv if xcorr else np.zeros(0))
+            nbytes = tmp_file.stat().st_size
+            if nbytes > cache_size * 1024**2:
+                msgs.warn(f'Arxiv arc lines ({nbytes/1024**2:.1f} MB) are larger than the '
+                          f'cache size ({cache_size} MB); not caching.')
+                tmp_file.unlink()
+            else:
+                # Remove the least recently used files to make room
+                io.prune_file_cache(_cache_dir, '*.npz', cache_size * 1024**2 - nbytes)
+                os.replace(tmp_file, cache_file)
+        except OSError as e:
+            msgs.warn(f'Unable to cache the arxiv arc lines in {_cache_dir}: {e}')
+
+    return spec_arxiv_cont_sub, det_arxiv, xcorr_arxiv
+
+
 def reidentify(spec, spec_arxiv_in, wave_soln_arxiv_in, line_list,
                nreid_min, cont_sub=True, det_arxiv=None, detections=None,
                cc_shift_range=None, cc_thresh=0.8, cc_local_thresh=0.8,
                match_toler=2.0, nlocal_cc=11, nonlinear_counts=1e10,
                sigdetect=5.0, fwhm=4.0, percent_ceil=50, max_lag_frac=1.0,
-               debug_xcorr=False, debug_reid=False, debug_peaks = False, stretch_func = 'linear'):
+               debug_xcorr=False, debug_reid=False, debug_peaks = False, stretch_func = 'linear',
+               cc_nrefine=None, cache_size=0.):
     """ Determine  a wavelength solution for a set of spectra based on archival wavelength solutions
 
     Parameters
@@ -471,6 +597,19 @@ def reidentify(spec, spec_arxiv_in, wave_soln_arxiv_in, line_list,
         Fraction of the total spectral pixels used to determine the range of lags
         to search over.  The range of lags will be [-nspec*max_lag_frac +1, nspec*max_lag_frac].
 
+    cc_nrefine : int, default = None
+        If set, cross-correlate the arc spectrum with all the arxiv spectra
+        at once, and only optimize the shift and stretch for the cc_nrefine
+        arxiv spectra with the largest cross-correlation; see
+        :func:`~pypeit.core.wavecal.wvutils.xcorr_shift_stretch_batch`.  If
+        None, the shift and stretch are optimized for each arxiv spectrum using
+        :func:`~pypeit.core.wavecal.wvutils.xcorr_shift_stretch`.
+
+    cache_size : float, default = 0.
+        If larger than 0 and ``cc_nrefine`` is set, the lines detected in the
+        arxiv spectra are cached on disk, using at most this size in MB; see
+        :func:`reid_arxiv_lines`.
+
         
     Returns
     -------
@@ -551,14 +690,12 @@ def reidentify(spec, spec_arxiv_in, wave_soln_arxiv_in, line_list,
 
     use_spec_arxiv = spec_arxiv
     # Continuum subtract the arxiv spectrum
-    spec_arxiv_cont_sub = np.zeros_like(spec_arxiv)
-    det_arxiv1 = {}
-    for iarxiv in range(narxiv):
-        tcent_arxiv, ecent_arxiv, cut_tcent_arxiv, icut_arxiv, spec_cont_sub_now = wvutils.arc_lines_from_spec(
-            spec_arxiv[:, iarxiv], sigdetect=sigdetect, nonlinear_counts=nonlinear_counts, fwhm=fwhm,
-            debug=debug_peaks)
-        spec_arxiv_cont_sub[:, iarxiv] = spec_cont_sub_now
-        det_arxiv1[str(iarxiv)] = tcent_arxiv[icut_arxiv]
+    spec_arxiv_cont_sub, det_arxiv1, xcorr_arxiv \
+            = reid_arxiv_lines(spec_arxiv, cont_sub=cont_sub, sigdetect=sigdetect, fwhm=fwhm,
+                               nonlinear_counts=nonlinear_counts, percent_ceil=percent_ceil,
+                               xcorr=cc_nrefine is not None,
+                               cache_size=0. if cc_nrefine is None else cache_size,
+                               debug_peaks=debug_peaks)
     if det_arxiv is None:
         det_arxiv = det_arxiv1
     if cont_sub:
@@ -590,16 +727,30 @@ def reidentify(spec, spec_arxiv_in, wave_soln_arxiv_in, line_list,
     stretch_vec = np.zeros(narxiv)
     stretch2_vec = np.zeros(narxiv)
     ccorr_vec = np.zeros(narxiv)
-    
+
+    if cc_nrefine is not None:
+        # Cross-correlate with all the arxiv spectra at once
+        msgs.info(f'Cross-correlating with {narxiv} arxiv slits')
+        success_vec, shift_vec, stretch_vec, stretch2_vec, ccorr_vec, _, _ = \
+            wvutils.xcorr_shift_stretch_batch(use_spec, xcorr_arxiv, sigdetect=sigdetect,
+                                              lag_range=cc_shift_range, cc_thresh=cc_thresh,
+                                              fwhm=fwhm, nrefine=cc_nrefine, debug=debug_xcorr,
+                                              percent_ceil=percent_ceil,
+                                              max_lag_frac=max_lag_frac,
+                                              stretch_func=stretch_func)
+
     for iarxiv in range(narxiv):
-        msgs.info('Cross-correlating with arxiv slit # {:d}'.format(iarxiv))
         this_det_arxiv = det_arxiv[str(iarxiv)]
-        # Match the peaks between the two spectra. This code attempts to compute the stretch if cc > cc_thresh
-        success, shift_vec[iarxiv], stretch_vec[iarxiv], stretch2_vec[iarxiv], ccorr_vec[iarxiv], _, _ = \
-            wvutils.xcorr_shift_stretch(use_spec, use_spec_arxiv[:, iarxiv], sigdetect=sigdetect,
-                                        lag_range=cc_shift_range, cc_thresh=cc_thresh, fwhm=fwhm, seed=random_state,
-                                        debug=debug_xcorr, percent_ceil=percent_ceil, max_lag_frac=max_lag_frac,
-                                        stretch_func=stretch_func)
+        if cc_nrefine is None:
+            msgs.info('Cross-correlating with arxiv slit # {:d}'.format(iarxiv))
+            # Match the peaks between the two spectra. This code attempts to compute the stretch if cc > cc_thresh
+            success, shift_vec[iarxiv], stretch_vec[iarxiv], stretch2_vec[iarxiv], ccorr_vec[iarxiv], _, _ = \
+                wvutils.xcorr_shift_stretch(use_spec, use_spec_arxiv[:, iarxiv], sigdetect=sigdetect,
+                                            lag_range=cc_shift_range, cc_thresh=cc_thresh, fwhm=fwhm, seed=random_state,
+                                            debug=debug_xcorr, percent_ceil=percent_ceil, max_lag_frac=max_lag_frac,
+                                            stretch_func=stretch_func)
+        else:
+            success = success_vec[iarxiv]
         msgs.info(f'shift = {shift_vec[iarxiv]:5.3f}, stretch = {stretch_vec[iarxiv]:5.3f}, cc = {ccorr_vec[iarxiv]:5.3f}')
         # If cc < cc_thresh or if this optimization failed, don't reidentify from this arxiv spectrum
         if success != 1:
@@ -1034,7 +1185,7 @@ def set_fwhm(par, measured_fwhm=None, verbose=False):
 def full_template(spec, lamps, par, ok_mask, det, binspectral, nsnippet=2, slit_ids=None,
                   measured_fwhms=None, debug_xcorr=False, debug_reid=False,
                   x_percentile=50., template_dict=None, debug=False, 
-                  nonlinear_counts=1e10):
+                  nonlinear_counts=1e10, n_proc=1):
     """
     Method of wavelength calibration using a single, comprehensive template spectrum
 
@@ -1082,6 +1233,10 @@ def full_template(spec, lamps, par, ok_mask, det, binspectral, nsnippet=2, slit_
         Show plots useful for debugging the cross-correlation
     debug_reid : bool, optional
         Show plots useful for debugging the reidentification
+    n_proc : int, optional
+        Number of processes used to calibrate the slits; see
+        :func:`calibrate_slits`.  The slits are always calibrated serially
+        when debugging.
 
     Returns
     -------
@@ -1129,217 +1284,278 @@ def full_template(spec, lamps, par, ok_mask, det, binspectral, nsnippet=2, slit_
         nslits = 1
         spec = np.reshape(spec, (nspec,1))
 
-    # Loop on slits
-    wvcalib = {}
+    # Collect the parameters for each slit
+    tasks = []
     for slit in range(nslits):
         # Sigdetect
         sigdetect = wvutils.parse_param(par, 'sigdetect', slit)
         # Check
         if slit not in ok_mask:
-            wvcalib[str(slit)] = None
             continue
         slit_txt = f'slit/order {slit_ids[slit]} ({slit+1}/{nslits})' if slit_ids is not None else f'slit {slit+1}/{nslits}'
         msgs.info("Processing " + slit_txt)
         msgs.info("Using sigdetect = {}".format(sigdetect))
-        # Grab the observed arc spectrum
-        obs_spec_i = spec[:,slit]
         # get FWHM for this slit
         fwhm = set_fwhm(par, measured_fwhm=measured_fwhms[slit], verbose=True)
+        tasks += [dict(slit=slit, sigdetect=sigdetect, fwhm=fwhm)]
+
+    # Calibrate each slit.  The slits are always calibrated serially when
+    # debugging.
+    template = dict(wave=temp_wv, spec=temp_spec, spec_og=temp_spec_og, lines_pix=lines_pix,
+                    lines_wav=lines_wav, lines_fit_ord=lines_fit_ord)
+    results = calibrate_slits(full_template_slit, tasks,
+                              n_proc=1 if debug or debug_xcorr or debug_reid else n_proc,
+                              spec=spec, template=template, line_lists=line_lists, par=par,
+                              nsnippet=nsnippet, x_percentile=x_percentile,
+                              nonlinear_counts=nonlinear_counts, debug=debug,
+                              debug_xcorr=debug_xcorr, debug_reid=debug_reid)
+    results = dict(zip([task['slit'] for task in tasks], results))
+
+    # Collect the results in slit order
+    wvcalib = {}
+    for slit in range(nslits):
+        wvcalib[str(slit)] = copy.deepcopy(results[slit]) if slit in results else None
+    # Finish
+    return wvcalib, order
 
-        # Find the shift
-        ncomb = temp_spec.size
-        # Remove the continuum before adding the padding to obs_spec_i
-        _, _, _, _, obs_spec_cont_sub = wvutils.arc_lines_from_spec(obs_spec_i)
-        _, _, _, _, templ_spec_cont_sub = wvutils.arc_lines_from_spec(temp_spec)
-        # Pad
-        pad_spec = np.zeros_like(temp_spec)
-        nspec = len(obs_spec_i)
-        npad = ncomb - nspec
-        if npad > 0:    # Pad the input spectrum
-            pad_spec[npad // 2:npad // 2 + len(obs_spec_i)] = obs_spec_cont_sub
-            tspec = templ_spec_cont_sub
-        elif npad < 0:  # Pad the template!
-            pad_spec = obs_spec_cont_sub
-            npad *= -1
-            tspec = np.zeros(nspec)
-            tspec[npad // 2:npad // 2 + ncomb] = templ_spec_cont_sub
-        else:  # No padding necessary
-            pad_spec = obs_spec_cont_sub
-            tspec = templ_spec_cont_sub
-
-        # check if there is an arxived solution for this slit:
-        if lines_pix is not None:
-            if lines_pix[slit] is not None:
-                msgs.info(f'An arxived solution exists! Loading those line IDs for slit {slit+1}/{nslits}')
-                msgs.info('Checking for possible shifts')
-                shift_cc, corr_cc = wvutils.xcorr_shift(temp_spec_og[slit,:], obs_spec_i, debug=debug, fwhm=fwhm, 
-                                                        percent_ceil=50.0, lag_range=par['cc_shift_range'])#par['cc_percent_ceil'])
-                msgs.info(f'Shift = {shift_cc} pixels! Shifting detections now')
-                pix_arxiv_ss = lines_pix[slit] - shift_cc
-                bdisp = np.nanmedian(np.abs(temp_wv - np.roll(temp_wv, 1)))
-                # Collate and proceed
-                dets = pix_arxiv_ss[np.where(np.logical_and(pix_arxiv_ss < len(obs_spec_i)-50, pix_arxiv_ss > 50))[0]]
-                IDs = lines_wav[slit][np.where(np.logical_and(pix_arxiv_ss < len(obs_spec_i)-50, pix_arxiv_ss > 50))[0]]
-                msgs.info(f'Using lines from pixel {dets} mapped to Wavelengths: {IDs}')
-                gd_det = np.where(IDs > 0.)[0]
-                if len(gd_det) < 2:
-                    msgs.warn("Not enough useful IDs")
-                    wvcalib[str(slit)] = None
-                    continue
-                # Fit
-                xnspecmin1 = (float(len(obs_spec_i))-1)
-                pypeitFit = fitting.robust_fit(dets[gd_det]/(float(len(obs_spec_i))-1), IDs[gd_det], lines_fit_ord[slit], 
-                                                function=par['func'], maxiter=gd_det.size - lines_fit_ord[slit] - 2,
-                            lower=2.0, upper=2.0, maxrej=1, sticky=True,
-                            minx=0.0, maxx=1.0, weights=np.ones(dets.size))
-                all_idsion = []
-                for ss, iwave in enumerate(IDs):
-                    mn = np.min(np.abs(iwave-line_lists['wave']))
-                    if mn/bdisp < par['match_toler']:
-                        imn = np.argmin(np.abs(iwave-line_lists['wave']))
-                        #print(imn, line_lists['ion'])
-                        all_idsion.append(line_lists['ion'][imn])
-                    else:
-                        all_idsion.append('UNKNWN')
-                all_idsion = np.array(all_idsion)
-
-                ions = all_idsion
-                # Final RMS
-                rms_ang = pypeitFit.calc_fit_rms(apply_mask=True)
-                rms_pix = rms_ang/bdisp
-
-                # Pack up fit
-                spec_vec = np.arange(nspec)
-                wave_soln = pypeitFit.eval(spec_vec/xnspecmin1)
-                cen_wave = pypeitFit.eval(float(nspec)/2/xnspecmin1)
-                cen_wave_min1 = pypeitFit.eval((float(nspec)/2 - 1.0)/xnspecmin1)
-                cen_disp = cen_wave - cen_wave_min1
-
-                # Ions bit
-                ion_bits = np.zeros(len(ions), dtype=wv_fitting.WaveFit.bitmask.minimum_dtype())
-                for kk,ion in enumerate(ions):
-                    ion_bits[kk] = wv_fitting.WaveFit.bitmask.turn_on(ion_bits[kk], ion.replace(' ', ''))
-                # DataContainer time
-
-                try:        
-                    # spat_id is set to an arbitrary -1 here and is updated in wavecalib.py
-                    final_fit = wv_fitting.WaveFit(-1, pypeitfit=pypeitFit, pixel_fit=dets[gd_det], wave_fit=IDs[gd_det],
-                                        ion_bits=ion_bits, xnorm=(float(len(obs_spec_i))-1),
-                                        cen_wave=cen_wave, cen_disp=cen_disp,
-                                        spec=obs_spec_i, wave_soln = wave_soln, sigrej=3.0,
-                                        shift=0., tcent=dets, rms=rms_pix)
-
-                except TypeError:
-                    wvcalib[str(slit)] = None
-                else:
-                    wvcalib[str(slit)] = copy.deepcopy(final_fit)
 
-                continue
-            else:
-                msgs.info('No solution yet for this slit, so making one now...')
-
-        # Cross-correlate
-        shift_cc, corr_cc = wvutils.xcorr_shift(tspec, pad_spec, debug=debug, fwhm=fwhm,
-                                                percent_ceil=x_percentile, lag_range=par['cc_shift_range'])
-        msgs.info(f"Shift = {shift_cc:.2f}; cc = {corr_cc:.4f}")
-        if debug:
-            xvals = np.arange(tspec.size)
-            plt.clf()
-            ax = plt.gca()
-            #
-            ax.plot(xvals, tspec, label='template')  # Template
-            ax.plot(xvals, np.roll(pad_spec, int(shift_cc)), 'k', label='input')  # Input
-            ax.legend()
-            plt.show()
-        i0 = npad // 2 + int(shift_cc)
-
-        # Generate the template snippet
-        if i0 < 0: # Pad?
-            mspec = np.concatenate([np.zeros(-1*i0), temp_spec[0:i0+nspec]])
-            mwv = np.concatenate([np.zeros(-1*i0), temp_wv[0:i0+nspec]])
-        elif (i0+nspec) > temp_spec.size: # Pad?
-            mspec = np.concatenate([temp_spec[i0:], np.zeros(nspec-temp_spec.size+i0)])
-            mwv = np.concatenate([temp_wv[i0:], np.zeros(nspec-temp_spec.size+i0)])
-        else: # Don't pad
-            mspec = temp_spec[i0:i0 + nspec]
-            mwv = temp_wv[i0:i0 + nspec]
-
-        # Loop on snippets
-        nsub = obs_spec_i.size // nsnippet
-        sv_det, sv_IDs = [], []
-        for kk in range(nsnippet):
-            # Construct
-            j0 = nsub * kk
-            j1 = min(nsub*(kk+1), obs_spec_i.size)
-            tsnippet = obs_spec_i[j0:j1]
-            msnippet = mspec[j0:j1]
-            mwvsnippet = mwv[j0:j1]
-            # TODO: JFH This continue statement deals with the case when the msnippet derives from *entirely* zero-padded
-            #  pixels, and allows the code to continue with crashing. This code is constantly causing reidentify to crash
-            #  by passing in these junk snippets that are almost entirely zero-padded for large shifts. We should
-            #  be checking for this intelligently rather than constantly calling reidentify with basically junk arxiv
-            #  spectral snippets.
-            if not np.any(msnippet):
-                continue
-            # TODO -- JXP
-            #  should we use par['cc_thresh'] instead of hard-coding cc_thresh??
-            # Run reidentify
-            detections, spec_cont_sub, patt_dict = reidentify(tsnippet, msnippet, mwvsnippet,
-                                                              line_lists, 1, cont_sub=par['reid_cont_sub'],
-                                                              debug_xcorr=debug_xcorr,
-                                                              sigdetect=sigdetect,
-                                                              nonlinear_counts=nonlinear_counts,
-                                                              debug_reid=debug_reid,  # verbose=True,
-                                                              match_toler=par['match_toler'],
-                                                              percent_ceil=x_percentile,
-                                                              cc_shift_range=par['cc_shift_range'],
-                                                              cc_thresh=0.1, fwhm=fwhm,
-                                                              stretch_func=par['stretch_func'])
-            # Deal with IDs
-            sv_det.append(j0 + detections)
-            try:
-                sv_IDs.append(patt_dict['IDs'])
-            except KeyError:
-                msgs.warn("Failed to perform wavelength calibration in reidentify..")
-                sv_IDs.append(np.zeros_like(detections))
-            else:
-                # Save now in case the next one barfs
-                bdisp = patt_dict['bdisp']
-
-        # Collate and proceed
-        dets = np.concatenate(sv_det)
-        IDs = np.concatenate(sv_IDs)
-        gd_det = np.where(IDs > 0.)[0]
-        if len(gd_det) < 2:
-            msgs.warn("Not enough useful IDs")
-            wvcalib[str(slit)] = None
+def full_template_slit(slit, spec, template, line_lists, par, sigdetect, fwhm, nsnippet=2,
+                       x_percentile=50., nonlinear_counts=1e10, debug=False, debug_xcorr=False,
+                       debug_reid=False):
+    """
+    Wavelength calibrate one slit using a single, comprehensive template
+    spectrum; see :func:`full_template`.
+
+    Parameters
+    ----------
+    slit : int
+        Index of the slit in ``spec``.
+    spec : `numpy.ndarray`_
+        Spectra to be calibrated.  Shape is (nspec, nslit).
+    template : dict
+        Dictionary with the template wavelengths (``wave``) and spectrum
+        (``spec``), rebinned to the binning of ``spec``, the original template
+        spectrum (``spec_og``), and the arxived line IDs (``lines_pix``,
+        ``lines_wav``, and ``lines_fit_ord``), if any.
+    line_lists : `astropy.table.Table`_
+        Line list used for the reidentification and the fit.
+    par : :class:`~pypeit.par.pypeitpar.WavelengthSolutionPar`
+        Calibration parameters
+    sigdetect : float
+        Detection threshold for the arc lines in this slit.
+    fwhm : float
+        FWHM of the arc lines in this slit in pixels.
+    nsnippet : int, optional
+        Number of snippets to chop the input spectrum into when IDing lines.
+    x_percentile : float, optional
+        Passed to reidentify to reduce the dynamic range of arc line amplitudes
+    nonlinear_counts : float, optional
+        Arc lines above this saturation threshold are not used in the fit.
+    debug : bool, optional
+        Show plots useful for debugging
+    debug_xcorr : bool, optional
+        Show plots useful for debugging the cross-correlation
+    debug_reid : bool, optional
+        Show plots useful for debugging the reidentification
+
+    Returns
+    -------
+    final_fit : :class:`~pypeit.core.wavecal.wv_fitting.WaveFit`
+        The wavelength solution for this slit, or None if the calibration
+        failed.
+    """
+    nslits = spec.shape[1]
+    temp_wv, temp_spec, temp_spec_og, lines_pix, lines_wav, lines_fit_ord \
+            = [template[k] for k in ['wave', 'spec', 'spec_og', 'lines_pix', 'lines_wav',
+                                     'lines_fit_ord']]
+    # Grab the observed arc spectrum
+    obs_spec_i = spec[:,slit]
+
+    # Find the shift
+    ncomb = temp_spec.size
+    # Remove the continuum before adding the padding to obs_spec_i
+    _, _, _, _, obs_spec_cont_sub = wvutils.arc_lines_from_spec(obs_spec_i)
+    _, _, _, _, templ_spec_cont_sub = wvutils.arc_lines_from_spec(temp_spec)
+    # Pad
+    pad_spec = np.zeros_like(temp_spec)
+    nspec = len(obs_spec_i)
+    npad = ncomb - nspec
+    if npad > 0:    # Pad the input spectrum
+        pad_spec[npad // 2:npad // 2 + len(obs_spec_i)] = obs_spec_cont_sub
+        tspec = templ_spec_cont_sub
+    elif npad < 0:  # Pad the template!
+        pad_spec = obs_spec_cont_sub
+        npad *= -1
+        tspec = np.zeros(nspec)
+        tspec[npad // 2:npad // 2 + ncomb] = templ_spec_cont_sub
+    else:  # No padding necessary
+        pad_spec = obs_spec_cont_sub
+        tspec = templ_spec_cont_sub
+
+    # check if there is an arxived solution for this slit:
+    if lines_pix is not None:
+        if lines_pix[slit] is not None:
+            msgs.info(f'An arxived solution exists! Loading those line IDs for slit {slit+1}/{nslits}')
+            msgs.info('Checking for possible shifts')
+            shift_cc, corr_cc = wvutils.xcorr_shift(temp_spec_og[slit,:], obs_spec_i, debug=debug, fwhm=fwhm, 
+                                                    percent_ceil=50.0, lag_range=par['cc_shift_range'])#par['cc_percent_ceil'])
+            msgs.info(f'Shift = {shift_cc} pixels! Shifting detections now')
+            pix_arxiv_ss = lines_pix[slit] - shift_cc
+            bdisp = np.nanmedian(np.abs(temp_wv - np.roll(temp_wv, 1)))
+            # Collate and proceed
+            dets = pix_arxiv_ss[np.where(np.logical_and(pix_arxiv_ss < len(obs_spec_i)-50, pix_arxiv_ss > 50))[0]]
+            IDs = lines_wav[slit][np.where(np.logical_and(pix_arxiv_ss < len(obs_spec_i)-50, pix_arxiv_ss > 50))[0]]
+            msgs.info(f'Using lines from pixel {dets} mapped to Wavelengths: {IDs}')
+            gd_det = np.where(IDs > 0.)[0]
+            if len(gd_det) < 2:
+                msgs.warn("Not enough useful IDs")
+                return None
+            # Fit
+            xnspecmin1 = (float(len(obs_spec_i))-1)
+            pypeitFit = fitting.robust_fit(dets[gd_det]/(float(len(obs_spec_i))-1), IDs[gd_det], lines_fit_ord[slit], 
+                                            function=par['func'], maxiter=gd_det.size - lines_fit_ord[slit] - 2,
+                        lower=2.0, upper=2.0, maxrej=1, sticky=True,
+                        minx=0.0, maxx=1.0, weights=np.ones(dets.size))
+            all_idsion = []
+            for ss, iwave in enumerate(IDs):
+                mn = np.min(np.abs(iwave-line_lists['wave']))
+                if mn/bdisp < par['match_toler']:
+                    imn = np.argmin(np.abs(iwave-line_lists['wave']))
+                    #print(imn, line_lists['ion'])
+                    all_idsion.append(line_lists['ion'][imn])
+                else:
+                    all_idsion.append('UNKNWN')
+            all_idsion = np.array(all_idsion)
+
+            ions = all_idsion
+            # Final RMS
+            rms_ang = pypeitFit.calc_fit_rms(apply_mask=True)
+            rms_pix = rms_ang/bdisp
+
+            # Pack up fit
+            spec_vec = np.arange(nspec)
+            wave_soln = pypeitFit.eval(spec_vec/xnspecmin1)
+            cen_wave = pypeitFit.eval(float(nspec)/2/xnspecmin1)
+            cen_wave_min1 = pypeitFit.eval((float(nspec)/2 - 1.0)/xnspecmin1)
+            cen_disp = cen_wave - cen_wave_min1
+
+            # Ions bit
+            ion_bits = np.zeros(len(ions), dtype=wv_fitting.WaveFit.bitmask.minimum_dtype())
+            for kk,ion in enumerate(ions):
+                ion_bits[kk] = wv_fitting.WaveFit.bitmask.turn_on(ion_bits[kk], ion.replace(' ', ''))
+            # DataContainer time
+
+            try:        
+                # spat_id is set to an arbitrary -1 here and is updated in wavecalib.py
+                final_fit = wv_fitting.WaveFit(-1, pypeitfit=pypeitFit, pixel_fit=dets[gd_det], wave_fit=IDs[gd_det],
+                                    ion_bits=ion_bits, xnorm=(float(len(obs_spec_i))-1),
+                                    cen_wave=cen_wave, cen_disp=cen_disp,
+                                    spec=obs_spec_i, wave_soln = wave_soln, sigrej=3.0,
+                                    shift=0., tcent=dets, rms=rms_pix)
+
+            except TypeError:
+                return None
+            return final_fit
+        else:
+            msgs.info('No solution yet for this slit, so making one now...')
+
+    # Cross-correlate
+    shift_cc, corr_cc = wvutils.xcorr_shift(tspec, pad_spec, debug=debug, fwhm=fwhm,
+                                            percent_ceil=x_percentile, lag_range=par['cc_shift_range'])
+    msgs.info(f"Shift = {shift_cc:.2f}; cc = {corr_cc:.4f}")
+    if debug:
+        xvals = np.arange(tspec.size)
+        plt.clf()
+        ax = plt.gca()
+        #
+        ax.plot(xvals, tspec, label='template')  # Template
+        ax.plot(xvals, np.roll(pad_spec, int(shift_cc)), 'k', label='input')  # Input
+        ax.legend()
+        plt.show()
+    i0 = npad // 2 + int(shift_cc)
+
+    # Generate the template snippet
+    if i0 < 0: # Pad?
+        mspec = np.concatenate([np.zeros(-1*i0), temp_spec[0:i0+nspec]])
+        mwv = np.concatenate([np.zeros(-1*i0), temp_wv[0:i0+nspec]])
+    elif (i0+nspec) > temp_spec.size: # Pad?
+        mspec = np.concatenate([temp_spec[i0:], np.zeros(nspec-temp_spec.size+i0)])
+        mwv = np.concatenate([temp_wv[i0:], np.zeros(nspec-temp_spec.size+i0)])
+    else: # Don't pad
+        mspec = temp_spec[i0:i0 + nspec]
+        mwv = temp_wv[i0:i0 + nspec]
+
+    # Loop on snippets
+    nsub = obs_spec_i.size // nsnippet
+    sv_det, sv_IDs = [], []
+    for kk in range(nsnippet):
+        # Construct
+        j0 = nsub * kk
+        j1 = min(nsub*(kk+1), obs_spec_i.size)
+        tsnippet = obs_spec_i[j0:j1]
+        msnippet = mspec[j0:j1]
+        mwvsnippet = mwv[j0:j1]
+        # TODO: JFH This continue statement deals with the case when the msnippet derives from *entirely* zero-padded
+        #  pixels, and allows the code to continue with crashing. This code is constantly causing reidentify to crash
+        #  by passing in these junk snippets that are almost entirely zero-padded for large shifts. We should
+        #  be checking for this intelligently rather than constantly calling reidentify with basically junk arxiv
+        #  spectral snippets.
+        if not np.any(msnippet):
             continue
-        # get n_final for this slit
-        n_final = wvutils.parse_param(par, 'n_final', slit)
-        # Fit
+        # TODO -- JXP
+        #  should we use par['cc_thresh'] instead of hard-coding cc_thresh??
+        # Run reidentify
+        detections, spec_cont_sub, patt_dict = reidentify(tsnippet, msnippet, mwvsnippet,
+                                                          line_lists, 1, cont_sub=par['reid_cont_sub'],
+                                                          debug_xcorr=debug_xcorr,
+                                                          sigdetect=sigdetect,
+                                                          nonlinear_counts=nonlinear_counts,
+                                                          debug_reid=debug_reid,  # verbose=True,
+                                                          match_toler=par['match_toler'],
+                                                          percent_ceil=x_percentile,
+                                                          cc_shift_range=par['cc_shift_range'],
+                                                          cc_thresh=0.1, fwhm=fwhm,
+                                                          stretch_func=par['stretch_func'])
+        # Deal with IDs
+        sv_det.append(j0 + detections)
         try:
-            final_fit = wv_fitting.iterative_fitting(obs_spec_i, dets, gd_det,
-                                              IDs[gd_det], line_lists, bdisp,
-                                              verbose=False, n_first=par['n_first'],
-                                              match_toler=par['match_toler'],
-                                              func=par['func'],
-                                              n_final=n_final,
-                                              sigrej_first=par['sigrej_first'],
-                                              sigrej_final=par['sigrej_final'])
-        except TypeError:
-            wvcalib[str(slit)] = None
+            sv_IDs.append(patt_dict['IDs'])
+        except KeyError:
+            msgs.warn("Failed to perform wavelength calibration in reidentify..")
+            sv_IDs.append(np.zeros_like(detections))
         else:
-            wvcalib[str(slit)] = copy.deepcopy(final_fit)
-        
-    # Finish
-    return wvcalib, order
+            # Save now in case the next one barfs
+            bdisp = patt_dict['bdisp']
+
+    # Collate and proceed
+    dets = np.concatenate(sv_det)
+    IDs = np.concatenate(sv_IDs)
+    gd_det = np.where(IDs > 0.)[0]
+    if len(gd_det) < 2:
+        msgs.warn("Not enough useful IDs")
+        return None
+    # get n_final for this slit
+    n_final = wvutils.parse_param(par, 'n_final', slit)
+    # Fit
+    try:
+        final_fit = wv_fitting.iterative_fitting(obs_spec_i, dets, gd_det,
+                                          IDs[gd_det], line_lists, bdisp,
+                                          verbose=False, n_first=par['n_first'],
+                                          match_toler=par['match_toler'],
+                                          func=par['func'],
+                                          n_final=n_final,
+                                          sigrej_first=par['sigrej_first'],
+                                          sigrej_final=par['sigrej_final'])
+    except TypeError:
+        return None
+    return final_fit
 
 
 def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
                     ok_mask=None, measured_fwhms=None, use_unknowns=True, debug_all=False,
                     debug_peaks=False, debug_xcorr=False, debug_reid=False,
                     debug_fits=False, nonlinear_counts=1e10,
-                    redo_slits:list=None):
+                    redo_slits:list=None, n_proc=1):
     r"""
     Algorithm to wavelength calibrate echelle data based on a predicted or archived wavelength solution
 
@@ -1395,6 +1611,10 @@ def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
     redo_slits: list, optional
         If provided, only perform the wavelength calibration for the
         given slit(s).
+    n_proc : int, default = 1, optional
+        Number of processes used to reidentify and fit the orders; see
+        :func:`calibrate_slits`.  The orders are always calibrated serially
+        when debugging the peaks, cross-correlation, or reidentification.
 
     Returns
     -------
@@ -1437,7 +1657,47 @@ def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
     detections = {}
     wv_calib = {}
     bad_orders = np.array([], dtype=int)
-    # Reidentify each slit, and perform a fit
+    # Collect the parameters for each order
+    tasks = []
+    for iord in range(norders):
+        if redo_slits is not None and orders[iord] not in redo_slits:
+            continue
+        if iord not in ok_mask or np.all(spec_arxiv[:, iord] == 0.0):
+            continue
+        msgs.info('Reidentifying and fitting Order = {0:d}, which is {1:d}/{2:d}'.format(orders[iord], iord+1, norders))
+        sigdetect = wvutils.parse_param(par, 'sigdetect', iord)
+        cc_thresh = wvutils.parse_param(par, 'cc_thresh', iord)
+        msgs.info("Using sigdetect =  {}".format(sigdetect))
+        # Set FWHM for this order
+        fwhm = set_fwhm(par, measured_fwhm=measured_fwhms[iord], verbose=True)
+        # get rms threshold for this slit
+        rms_thresh = round(par['rms_thresh_frac_fwhm'] * fwhm, 3)
+        msgs.info(f"Using RMS threshold = {rms_thresh} (pixels); RMS/FWHM threshold = {par['rms_thresh_frac_fwhm']}")
+        n_final = wvutils.parse_param(par, 'n_final', iord)
+        tasks += [dict(slit=iord, iarxiv=iord, sigdetect=sigdetect, cc_thresh=cc_thresh, fwhm=fwhm,
+                       n_final=n_final)]
+
+    # Reidentify each order, and perform a fit.  The orders are always
+    # calibrated serially when debugging.
+    debug = debug_peaks or debug_xcorr or debug_reid or debug_all
+    fit_kwargs = dict(match_toler=par['match_toler'], func=par['func'], n_first=par['n_first'],
+                      sigrej_first=par['sigrej_first'], sigrej_final=par['sigrej_final'])
+    results = calibrate_slits(reidentify_slit, tasks, n_proc=1 if debug else n_proc, spec=spec,
+                              spec_arxiv=spec_arxiv, wave_arxiv=wave_arxiv,
+                              line_list=tot_line_list, nreid_min=par['nreid_min'],
+                              fit_kwargs=fit_kwargs, cont_sub=par['reid_cont_sub'],
+                              match_toler=par['match_toler'], cc_shift_range=par['cc_shift_range'],
+                              cc_local_thresh=par['cc_local_thresh'], nlocal_cc=par['nlocal_cc'],
+                              nonlinear_counts=nonlinear_counts,
+                              percent_ceil=par['cc_percent_ceil'],
+                              max_lag_frac=par['cc_offset_minmax'],
+                              debug_peaks=(debug_peaks or debug_all),
+                              debug_xcorr=(debug_xcorr or debug_all),
+                              debug_reid=(debug_reid or debug_all), stretch_func=par['stretch_func'],
+                              cc_nrefine=par['cc_nrefine'], cache_size=par['reid_cache_size'])
+    results = dict(zip([task['slit'] for task in tasks], zip(tasks, results)))
+
+    # Collect the results in order
     for iord in range(norders):
         if redo_slits is not None and orders[iord] not in redo_slits:
             continue
@@ -1447,30 +1707,15 @@ def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
             wv_calib[str(iord)] = None
             all_patt_dict[str(iord)] = None
             continue
-        if np.all(spec_arxiv[:, iord] == 0.0):
+        if iord not in results:
             msgs.warn(f"Order = {orders[iord]} ({iord+1}/{norders}) cannot be reidentified "
                       f"because this order is not present in the arxiv")
             wv_calib[str(iord)] = None
             all_patt_dict[str(iord)] = None
             continue
-        msgs.info('Reidentifying and fitting Order = {0:d}, which is {1:d}/{2:d}'.format(orders[iord], iord+1, norders))
-        sigdetect = wvutils.parse_param(par, 'sigdetect', iord)
-        cc_thresh = wvutils.parse_param(par, 'cc_thresh', iord)
-        msgs.info("Using sigdetect =  {}".format(sigdetect))
-        # Set FWHM for this order
-        fwhm = set_fwhm(par, measured_fwhm=measured_fwhms[iord], verbose=True)
-        # get rms threshold for this slit
-        rms_thresh = round(par['rms_thresh_frac_fwhm'] * fwhm, 3)
-        msgs.info(f"Using RMS threshold = {rms_thresh} (pixels); RMS/FWHM threshold = {par['rms_thresh_frac_fwhm']}")
-        detections[str(iord)], spec_cont_sub[:, iord], all_patt_dict[str(iord)] = reidentify(
-            spec[:, iord], spec_arxiv[:, iord], wave_arxiv[:, iord], tot_line_list, par['nreid_min'],
-            cont_sub=par['reid_cont_sub'], match_toler=par['match_toler'], cc_shift_range=par['cc_shift_range'],
-            cc_thresh=cc_thresh, cc_local_thresh=par['cc_local_thresh'], nlocal_cc=par['nlocal_cc'],
-            nonlinear_counts=nonlinear_counts, sigdetect=sigdetect, fwhm=fwhm,
-            percent_ceil=par['cc_percent_ceil'], max_lag_frac=par['cc_offset_minmax'],
-            debug_peaks=(debug_peaks or debug_all),
-            debug_xcorr=(debug_xcorr or debug_all),
-            debug_reid=(debug_reid or debug_all), stretch_func=par['stretch_func'])
+        task, (detections[str(iord)], spec_cont_sub[:, iord], all_patt_dict[str(iord)],
+               final_fit) = results[iord]
+        rms_thresh = round(par['rms_thresh_frac_fwhm'] * task['fwhm'], 3)
 
         # Check if an acceptable reidentification solution was found
         if not all_patt_dict[str(iord)]['acceptable']:
@@ -1481,17 +1726,6 @@ def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
                       f'  Cross-correlation failed' +
                       msgs.newline() + '---------------------------------------------------')
             continue
-        # Perform the fit
-        n_final = wvutils.parse_param(par, 'n_final', iord)
-        final_fit = wv_fitting.fit_slit(
-            spec[:, iord], all_patt_dict[str(iord)],
-            detections[str(iord)], tot_line_list,
-            match_toler=par['match_toler'],
-            func=par['func'], n_first=par['n_first'],
-            sigrej_first=par['sigrej_first'],
-            n_final=n_final,
-            sigrej_final=par['sigrej_final'])
-        msgs.info(f"Number of lines used in fit: {len(final_fit['pixel_fit'])}")
         # Did the fit succeed?
         if final_fit is None:
             # This pattern wasn't good enough
@@ -1502,6 +1736,7 @@ def echelle_wvcalib(spec, orders, spec_arxiv, wave_arxiv, lamps, par,
                       f'  Final fit failed' +
                       msgs.newline() + '---------------------------------------------------')
             continue
+        msgs.info(f"Number of lines used in fit: {len(final_fit['pixel_fit'])}")
         # Is the RMS below the threshold?
         if final_fit['rms'] > rms_thresh:
             msgs.warn(msgs.newline() + '---------------------------------------------------' + msgs.newline() +
@@ -1640,6 +1875,10 @@ class ArchiveReid:
         For arc line detection: Arc lines above this saturation
         threshold are not used in wavelength solution fits because
         they cannot be accurately centroided
+    n_proc : int, default = 1, optional
+        Number of processes used to reidentify and fit the slits; see
+        :func:`calibrate_slits`.  The slits are always calibrated serially
+        when debugging the peaks, cross-correlation, or reidentification.
 
     Attributes
     ----------
@@ -1654,7 +1893,7 @@ class ArchiveReid:
     def __init__(self, spec, lamps, par, ech_fixed_format=False, ok_mask=None,
                  measured_fwhms=None, use_unknowns=True, debug_all=False,
                  debug_peaks=False, debug_xcorr=False, debug_reid=False, debug_fits=False,
-                 orders=None, nonlinear_counts=1e10):
+                 orders=None, nonlinear_counts=1e10, n_proc=1):
 
         # TODO: Perform detailed checking of the input
 
@@ -1762,11 +2001,10 @@ class ArchiveReid:
         self.detections = {}
         self.wv_calib = {}
         self.bad_slits = np.array([], dtype=int)
-        # Reidentify each slit, and perform a fit
+        # Collect the parameters for each slit
+        tasks = []
         for slit in range(self.nslits):
-            # ToDO should we still be populating wave_calib with an empty dict here?
             if slit not in self.ok_mask:
-                self.wv_calib[str(slit)] = None
                 continue
             msgs.info('Reidentifying and fitting slit # {0:d}/{1:d}'.format(slit+1,self.nslits))
             # If this is a fixed format echelle, arxiv has exactly the same orders as the data and so
@@ -1782,14 +2020,39 @@ class ArchiveReid:
             # get rms threshold for this slit
             rms_thresh = round(self.par['rms_thresh_frac_fwhm'] * fwhm, 3)
             msgs.info(f"Using RMS threshold = {rms_thresh} (pixels); RMS/FWHM threshold = {self.par['rms_thresh_frac_fwhm']}")
-            self.detections[str(slit)], self.spec_cont_sub[:,slit], self.all_patt_dict[str(slit)] = \
-                reidentify(self.spec[:,slit], self.spec_arxiv[:,ind_sp], self.wave_soln_arxiv[:,ind_sp],
-                           self.tot_line_list, self.nreid_min, cont_sub=self.par['reid_cont_sub'],
-                           cc_thresh=cc_thresh, match_toler=self.match_toler,
-                           cc_shift_range=self.par['cc_shift_range'], cc_local_thresh=self.cc_local_thresh,
-                           nlocal_cc=self.nlocal_cc, nonlinear_counts=self.nonlinear_counts,
-                           sigdetect=sigdetect, fwhm=fwhm, debug_peaks=self.debug_peaks, debug_xcorr=self.debug_xcorr,
-                           debug_reid=self.debug_reid, stretch_func=self.par['stretch_func'])
+            n_final = wvutils.parse_param(self.par, 'n_final', slit)
+            tasks += [dict(slit=slit, iarxiv=ind_sp, sigdetect=sigdetect, cc_thresh=cc_thresh,
+                           fwhm=fwhm, n_final=n_final)]
+
+        # Reidentify each slit, and perform a fit.  The slits are always
+        # calibrated serially when debugging.
+        debug = self.debug_peaks or self.debug_xcorr or self.debug_reid
+        fit_kwargs = dict(match_toler=self.match_toler, func=self.func, n_first=self.n_first,
+                          sigrej_first=self.sigrej_first, sigrej_final=self.sigrej_final)
+        results = calibrate_slits(reidentify_slit, tasks, n_proc=1 if debug else n_proc,
+                                  spec=self.spec,
+                                  spec_arxiv=self.spec_arxiv, wave_arxiv=self.wave_soln_arxiv,
+                                  line_list=self.tot_line_list, nreid_min=self.nreid_min,
+                                  fit_kwargs=fit_kwargs, cont_sub=self.par['reid_cont_sub'],
+                                  match_toler=self.match_toler,
+                                  cc_shift_range=self.par['cc_shift_range'],
+                                  cc_local_thresh=self.cc_local_thresh, nlocal_cc=self.nlocal_cc,
+                                  nonlinear_counts=self.nonlinear_counts,
+                                  debug_peaks=self.debug_peaks, debug_xcorr=self.debug_xcorr,
+                                  debug_reid=self.debug_reid, stretch_func=self.par['stretch_func'],
+                                  cc_nrefine=self.par['cc_nrefine'],
+                                  cache_size=self.par['reid_cache_size'])
+        results = dict(zip([task['slit'] for task in tasks], zip(tasks, results)))
+
+        # Collect the results in slit order
+        for slit in range(self.nslits):
+            # ToDO should we still be populating wave_calib with an empty dict here?
+            if slit not in results:
+                self.wv_calib[str(slit)] = None
+                continue
+            task, (self.detections[str(slit)], self.spec_cont_sub[:,slit],
+                   self.all_patt_dict[str(slit)], final_fit) = results[slit]
+            rms_thresh = round(self.par['rms_thresh_frac_fwhm'] * task['fwhm'], 3)
             # str for the reports below
             order_str = '' if orders is None else ', order={}'.format(orders[slit])
             # Check if an acceptable reidentification solution was found
@@ -1802,13 +2065,6 @@ class ArchiveReid:
                           '---------------------------------------------------')
                 continue
 
-            # Perform the fit
-            n_final = wvutils.parse_param(self.par, 'n_final', slit)
-            final_fit = wv_fitting.fit_slit(self.spec[:, slit], self.all_patt_dict[str(slit)],
-                                         self.detections[str(slit)],
-                                         self.tot_line_list, match_toler=self.match_toler,func=self.func, n_first=self.n_first,
-                                         sigrej_first=self.sigrej_first, n_final=n_final,sigrej_final=self.sigrej_final)
-
             # Did the fit succeed?
             if final_fit is None:
                 # This pattern wasn't good enough
@@ -2999,7 +3255,6 @@ class HolyGrail:
         #histimgp = gaussian_filter(histimgp, 3)
         #histimgm = gaussian_filter(histimgm, 3)
         histimg = histimgp - histimgm
-        sm_histimg = scipy.ndimage.gaussian_filter(histimg, [30, 15])
 
         #histpeaks = patterns.detect_2Dpeaks(np.abs(sm_histimg))
         histpeaks = patterns.detect_2Dpeaks(np.abs(histimg))
@@ -3287,7 +3542,7 @@ class HolyGrail:
 
 
 def results_kdtree_nb(use_tcent, wvdata, res, residx, dindex, lindex, nindx, npix, ordfit=1):
-    """ A numba speedup of the results_kdtree function in the General class (see above).
+    """ A vectorized version of the results_kdtree function in the General class (see above).
     For all of the acceptable pattern matches, estimate the central wavelength and dispersion,
     and record the index in the linelist and the corresponding indices of the detected lines.
 
@@ -3327,22 +3582,113 @@ def results_kdtree_nb(use_tcent, wvdata, res, residx, dindex, lindex, nindx, npi
     """
     # Assign wavelengths to each pixel
     ncols = len(res)
-    wvdisp = np.zeros(ncols, dtype=float)
-    wvcent = np.zeros(ncols, dtype=float)
-    dind = np.zeros((ncols, nindx), dtype=np.uint64)
-    lind = np.zeros((ncols, nindx), dtype=np.uint64)
-    Xmat = np.ones((nindx, ordfit+1), dtype=float)
-    for x in range(ncols):
-        for ii in range(ordfit, -1, -1):
-            Xmat[:, ii] = np.power(use_tcent[dindex[residx[x], :]], ordfit-ii)
-        coeff = np.linalg.lstsq(Xmat, wvdata[lindex[res[x]]])[0]
-        sumv = 0.0
-        for ii in range(ordfit, -1, -1):
-            wvcent[x] += coeff[ordfit-ii]*((npix/2.0)**ii)
-            sumv += coeff[ordfit-ii]*(((npix+1)/2.0)**ii)
-        wvdisp[x] = abs(sumv - wvcent[x])
-        dind[x, :] = dindex[residx[x], :]
-        lind[x, :] = lindex[res[x], :]
+    if ncols == 0:
+        return np.zeros((0, nindx), dtype=np.uint64), np.zeros((0, nindx), dtype=np.uint64), \
+                np.zeros(0, dtype=float), np.zeros(0, dtype=float)
+    dind = dindex[residx, :].astype(np.uint64)
+    lind = lindex[res, :].astype(np.uint64)
+    # Fit all the patterns at once
+    Xmat = np.power(use_tcent[dindex[residx, :]][...,None], np.arange(ordfit, -1, -1))
+    coeff = np.matmul(np.linalg.pinv(Xmat), wvdata[lindex[res]][...,None])[...,0]
+    wvcent = np.polynomial.polynomial.polyval(npix/2.0, coeff[:,::-1].T)
+    wvdisp = np.absolute(np.polynomial.polynomial.polyval((npix+1)/2.0, coeff[:,::-1].T) - wvcent)
     return dind, lind, wvcent, wvdisp
 
 
+def reidentify_slit(slit, iarxiv, spec, spec_arxiv, wave_arxiv, line_list, nreid_min,
+                    n_final=4, fit_kwargs=None, **reid_kwargs):
+    """
+    Reidentify the arc lines in one slit using archived arc spectra and fit
+    the wavelength solution.
+
+    Args:
+        slit (:obj:`int`):
+            Index of the slit in ``spec``.
+        iarxiv (:obj:`int`, `numpy.ndarray`_):
+            Index or indices of the archived spectra in ``spec_arxiv`` to use.
+        spec (`numpy.ndarray`_):
+            Arc spectra of all slits.  Shape is (nspec, nslits).
+        spec_arxiv (`numpy.ndarray`_):
+            Archived arc spectra.  Shape is (nspec_arxiv, narxiv).
+        wave_arxiv (`numpy.ndarray`_):
+            Wavelength solutions of the archived arc spectra.  Shape is
+            (nspec_arxiv, narxiv).
+        line_list (`astropy.table.Table`_):
+            Line list used for the reidentification and the fit.
+        nreid_min (:obj:`int`):
+            Minimum number of times that a line must be reidentified; see
+            :func:`reidentify`.
+        n_final (:obj:`int`, optional):
+            Order of the final fit; see
+            :func:`~pypeit.core.wavecal.wv_fitting.fit_slit`.
+        fit_kwargs (:obj:`dict`, optional):
+            Other keyword arguments passed to
+            :func:`~pypeit.core.wavecal.wv_fitting.fit_slit`.
+        **reid_kwargs:
+            Other keyword arguments passed to :func:`reidentify`.
+
+    Returns:
+        :obj:`tuple`: The detected lines, the continuum-subtracted arc
+        spectrum, and the pattern dictionary returned by :func:`reidentify`,
+        and the result of the fit.  The latter is None if the
+        reidentification or the fit failed.
+    """
+    detections, spec_cont_sub, patt_dict \
+            = reidentify(spec[:,slit], spec_arxiv[:,iarxiv], wave_arxiv[:,iarxiv], line_list,
+                         nreid_min, **reid_kwargs)
+    if not patt_dict['acceptable']:
+        return detections, spec_cont_sub, patt_dict, None
+    _fit_kwargs = {} if fit_kwargs is None else fit_kwargs
+    final_fit = wv_fitting.fit_slit(spec[:,slit], patt_dict, detections, line_list,
+                                    n_final=n_final, **_fit_kwargs)
+    return detections, spec_cont_sub, patt_dict, final_fit
+
+
+def calibrate_slits(func, tasks, n_proc=1, **kwargs):
+    """
+    Calibrate a set of slits, either serially or in parallel.
+
+    Args:
+        func (callable):
+            Module-level function that calibrates a single slit; e.g.,
+            :func:`reidentify_slit`.
+        tasks (:obj:`list`):
+            List of dictionaries with the keyword arguments for ``func`` that
+            are specific to each slit.
+        n_proc (:obj:`int`, optional):
+            Number of processes to use; see :func:`~pypeit.utils.get_nproc`.
+        **kwargs:
+            Keyword arguments for ``func`` that are the same for all slits.
+            These are passed to each process once, when it is started.
+
+    Returns:
+        :obj:`list`: The results of ``func`` for each task, in the same order
+        as ``tasks``.
+    """
+    n_proc = utils.get_nproc(n_proc, len(tasks))
+    if n_proc == 1:
+        return [func(**task, **kwargs) for task in tasks]
+
+    msgs.info(f'Calibrating {len(tasks)} slits using {n_proc} processes.')
+    with utils.SharedProcessPool(n_proc, _calibrate_slit_task, slit_func=func, **kwargs) as pool:
+        return list(pool.map(tasks))
+
+
+def _calibrate_slit_task(task, slit_func=None, **kwargs):
+    """
+    Calibrate one slit in a :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        task (:obj:`dict`):
+            Keyword arguments for the calibration function that are specific to
+            this slit.
+        slit_func (callable):
+            Function that calibrates a single slit.
+        **kwargs:
+            Keyword arguments for ``slit_func`` that are the same for all
+            slits.
+
+    Returns:
+        The result of the calibration function.
+    """
+    return slit_func(**task, **kwargs)
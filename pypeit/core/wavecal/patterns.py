@@ -2,6 +2,8 @@
 
 .. include:: ../include/links.rst
 """
+import itertools
+
 import numpy as np
 import scipy.ndimage
 
@@ -205,7 +207,7 @@ def scan_for_matches(wvcen, disp, npix, cut_tcent, wvdata, best_dict=None,
                 IDs.append(wvdata[uni[imx]])
             else:
                 IDs.append(0.)
-        ngd_match = np.sum(mask)
+        ngd_match = int(np.sum(mask))
         #import pdb; pdb.set_trace()
         # Update in place
         if ngd_match > best_dict['nmatch']:
@@ -268,7 +270,98 @@ def score_quad_matches(fidx):
     return scores
 
 
-#@nb.jit(nopython=True, cache=True)
+def pattern_index(nlines, nsrch, nptn):
+    """
+    Construct the indices of all the patterns of lines used by the brute-force
+    pattern matching.
+
+    Each pattern starts at one line, ends at one of the next ``nsrch-1``
+    lines, and includes ``nptn-2`` of the lines in between.  The patterns are
+    ordered by the start line, then the end line, and then the lines in
+    between.
+
+    Parameters
+    ----------
+    nlines : int
+        Number of (sorted) lines
+    nsrch : int
+        Number of consecutive lines to use to create a pattern (-1 means all
+        lines)
+    nptn : int
+        Number of lines in each pattern
+
+    Returns
+    -------
+    index : ndarray
+        Integer array with shape (npattern, nptn) with the indices of the lines
+        in each pattern.
+    """
+    width = nlines if nsrch == -1 else nsrch
+    # Offsets of the lines in all patterns with respect to the start line
+    offsets = np.array([(0,) + mid + (end,) for end in range(nptn-1, width)
+                            for mid in itertools.combinations(range(1, end), nptn-2)],
+                       dtype=int).reshape(-1, nptn)
+    index = np.arange(max(nlines-nptn+1, 0))[:,None,None] + offsets[None,...]
+    return index[index[...,-1] < nlines]
+
+
+def match_patterns(detpatt, detlines, lstpatt, linelist, pixtol, chunk_size=2**22):
+    """
+    Find all of the line-list patterns that match each pattern of detected
+    lines.
+
+    The positions of the middle lines in each pattern, relative to the first
+    and last lines, are compared for all pairs of detected-line and line-list
+    patterns at once.  A pair is matched if all of the relative positions agree
+    to within ``pixtol`` pixels.
+
+    Parameters
+    ----------
+    detpatt : ndarray
+        Indices of the detected lines in each pattern; see
+        :func:`pattern_index`.
+    detlines : ndarray
+        list of detected lines in pixels (sorted, increasing)
+    lstpatt : ndarray
+        Indices of the line-list lines in each pattern; see
+        :func:`pattern_index`.
+    linelist : ndarray
+        list of lines that should be detected (sorted, increasing)
+    pixtol : float
+        tolerance that is used to determine if a match is successful (in units
+        of pixels)
+    chunk_size : int, optional
+        Maximum number of pattern pairs to compare at once.  This limits the
+        memory used.
+
+    Returns
+    -------
+    dmatch : ndarray
+        Index of the detected-line pattern in each matched pair.
+    lmatch : ndarray
+        Index of the line-list pattern in each matched pair.  The pairs are
+        ordered by ``dmatch`` and then ``lmatch``.
+    """
+    dspan = detlines[detpatt[:,-1]] - detlines[detpatt[:,0]]
+    dval = (detlines[detpatt[:,1:-1]] - detlines[detpatt[:,:1]]) / dspan[:,None]
+    tol = pixtol / dspan
+    lval = (linelist[lstpatt[:,1:-1]] - linelist[lstpatt[:,:1]]) \
+                / (linelist[lstpatt[:,-1]] - linelist[lstpatt[:,0]])[:,None]
+
+    nchunk = max(chunk_size // max(lval.size, 1), 1)
+    dmatch, lmatch = [], []
+    for start in range(0, dval.shape[0], nchunk):
+        end = start + nchunk
+        match = np.all(np.absolute(lval[None,...] - dval[start:end,None,:])
+                        <= tol[start:end,None,None], axis=-1)
+        d, l = np.nonzero(match)
+        dmatch += [d + start]
+        lmatch += [l]
+    if len(dmatch) == 0:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return np.concatenate(dmatch), np.concatenate(lmatch)
+
+
 def triangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
     """
 
@@ -308,7 +401,7 @@ def triangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
     Returns
     -------
     dindex : ndarray
-        Index array of all detlines used in each triangle
+        Index array of all detlines used in each matched triangle
     lindex : ndarray
         Index array of the assigned line to each index in dindex
     wvcen : ndarray
@@ -317,77 +410,18 @@ def triangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
         Dispersion of each triangle (angstroms/pixel)
     """
 
-    nptn = 3  # Number of lines used to create a pattern
-
-    sz_d = detlines.size
-    sz_l = linelist.size
-
-    # Count the number of detlines patterns that will be created
-    cntdet = 0
-    dup = 0
-    for d in range(detsrch-nptn+1):
-        dup += d+1
-        if d == detsrch-nptn:
-            cntdet += dup*(sz_d-detsrch+1)
-        else:
-            cntdet += dup
-
-    # Count the number of linelist patterns that will be created
-    cntlst = 0
-    lup = 0
-    for l in range(lstsrch-nptn+1):
-        lup += l+1
-        if l == lstsrch-nptn:
-            cntlst += lup*(sz_l-lstsrch+1)
-        else:
-            cntlst += lup
-
-    lindex = np.zeros((cntdet*cntlst, nptn),dtype=np.uint64) #, dtype=nb.types.uint64)
-    dindex = np.zeros((cntdet*cntlst, nptn),dtype=np.uint64) #, dtype=nb.types.uint64)
-    wvcen = np.zeros((cntdet*cntlst))
-    disps = np.zeros((cntdet*cntlst))
-
-    # Test each detlines combination
-    cntdet = 0
-    for d in range(0, sz_d-nptn+1):      # d is the starting point of the pattern
-        dup = d + detsrch
-        if dup > sz_d:
-            dup = sz_d
-        if detsrch == -1:
-            dup = sz_d
-        for dd in range(d+nptn-1, dup):  # dd is the end point of the pattern
-            for xd in range(d+1, dd):  # xd is the mid point of the pattern
-                # Create the test pattern
-                dval = (detlines[xd]-detlines[d])/(detlines[dd]-detlines[d])
-                tol = pixtol/(detlines[dd]-detlines[d])
-                # Search through all possible patterns in the linelist
-                for l in range(0, sz_l-nptn+1):
-                    lup = l + lstsrch
-                    if lup > sz_l:
-                        lup = sz_l
-                    if lstsrch == -1:
-                        lup = sz_l
-                    for ll in range(l+nptn-1, lup):
-                        for xl in range(l+1, ll):
-                            lval = (linelist[xl]-linelist[l])/(linelist[ll]-linelist[l])
-                            tst = lval-dval
-                            if tst < 0.0:
-                                tst *= -1.0
-                            if tst <= tol:
-                                lindex[cntdet, 0] = l
-                                lindex[cntdet, 1] = xl
-                                lindex[cntdet, 2] = ll
-                                dindex[cntdet, 0] = d
-                                dindex[cntdet, 1] = xd
-                                dindex[cntdet, 2] = dd
-                                tst = (linelist[ll]-linelist[l]) / (detlines[dd]-detlines[d])
-                                wvcen[cntdet] = (npixels/2.0) * tst + (linelist[ll]-tst*detlines[dd])
-                                disps[cntdet] = tst
-                            cntdet += 1
+    dpatt = pattern_index(detlines.size, detsrch, 3)
+    lpatt = pattern_index(linelist.size, lstsrch, 3)
+    dmatch, lmatch = match_patterns(dpatt, detlines, lpatt, linelist, pixtol)
+    dindex = dpatt[dmatch].astype(np.uint64)
+    lindex = lpatt[lmatch].astype(np.uint64)
+    dl, dr = detlines[dpatt[dmatch,0]], detlines[dpatt[dmatch,-1]]
+    ll, lr = linelist[lpatt[lmatch,0]], linelist[lpatt[lmatch,-1]]
+    disps = (lr - ll) / (dr - dl)
+    wvcen = (npixels/2.0) * disps + (lr - disps*dr)
     return dindex, lindex, wvcen, disps
 
 
-#@nb.jit(nopython=True, cache=True)
 def quadrangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
     """
 
@@ -427,7 +461,7 @@ def quadrangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
     Returns
     -------
     dindex : ndarray
-        Index array of all detlines used in each triangle
+        Index array of all detlines used in each matched quadrangle
     lindex : ndarray
         Index array of the assigned line to each index in dindex
     wvcen : ndarray
@@ -436,62 +470,18 @@ def quadrangles(detlines, linelist, npixels, detsrch=5, lstsrch=10, pixtol=1.0):
         Dispersion of each triangle (angstroms/pixel)
     """
 
-    nptn = 4  # Number of lines used to create a pattern
-
-    sz_d = detlines.size
-    sz_l = linelist.size
-
-    lindex = np.zeros((1, nptn),dtype=np.uint64) #, dtype=nb.types.uint64)
-    dindex = np.zeros((1, nptn),dtype=np.uint64) #, dtype=nb.types.uint64)
-    wvcen = np.zeros((1,), dtype=np.ulonglong) #, dtype=nb.types.ulong)
-    disps = np.zeros((1,), dtype=np.ulonglong) #, dtype=nb.types.ulong)
-
-    # Generate the patterns
-    for dl in range(0, sz_d-nptn+1):  # dl is the starting point of the detlines pattern
-        dup = dl + detsrch
-        if dup > sz_d:
-            dup = sz_d
-        if detsrch == -1:
-            dup = sz_d
-        for dr in range(dl+nptn-1, dup):  # dr is the end point of the detlines pattern
-            # Set the tolerance
-            tol = pixtol / (detlines[dr] - detlines[dl])
-            for da in range(dl+1, dr-1):  # da is the left mid point of the detlines pattern
-                # Create the test pattern
-                daval = (detlines[da]-detlines[dl])/(detlines[dr]-detlines[dl])
-                for db in range(da+1, dr):  # db is the right mid point of the detlines pattern
-                    # Create the test pattern
-                    dbval = (detlines[db]-detlines[dl])/(detlines[dr]-detlines[dl])
-                    # Search through all possible patterns in the linelist
-                    for ll in range(0, sz_l-nptn+1):  # ll is the start point of the linelist pattern
-                        lup = ll + lstsrch
-                        if lup > sz_l:
-                            lup = sz_l
-                        if lstsrch == -1:
-                            lup = sz_l
-                        for lr in range(ll+nptn-1, lup):  # lr is the end point of the linelist pattern
-                            for la in range(ll+1, lr-1):  # la is the end point of the linelist pattern
-                                laval = (linelist[la] - linelist[ll]) / (linelist[lr] - linelist[ll])
-                                tst = laval - daval
-                                if tst < 0.0:
-                                    tst *= -1.0
-                                if tst <= tol:
-                                    # The first pattern matches, check the second one.
-                                    for lb in range(la+1, lr):  # la is the end point of the linelist pattern
-                                        lbval = (linelist[lb] - linelist[ll]) / (linelist[lr] - linelist[ll])
-                                        tst = lbval - dbval
-                                        if tst < 0.0:
-                                            tst *= -1.0
-                                        if tst <= tol:
-                                            # The second pattern matches, store the result!
-                                            lindex = np.vstack((lindex, np.array([[ll, la, lb, lr]], dtype=np.uint64))) #, dtype=nb.types.uint64)))
-                                            dindex = np.vstack((dindex, np.array([[dl, da, db, dr]], dtype=np.uint64))) #, dtype=nb.types.uint64)))
-                                            tst = (linelist[lr] - linelist[ll]) / (detlines[dr] - detlines[dl])
-                                            wvl = (npixels/2.)*tst + (linelist[lr]-tst*detlines[dr])
-                                            wvcen = np.hstack((wvcen, np.array([wvl], dtype=np.ulonglong))) #, dtype=nb.types.ulong)))
-                                            disps = np.hstack((disps, np.array([tst], dtype=np.ulonglong))) # , dtype=nb.types.ulong)))
-    # Return, but first remove the spurious first entry due to array creation
-    return dindex[1:, :], lindex[1:, :], wvcen[1:], disps[1:]
+    dpatt = pattern_index(detlines.size, detsrch, 4)
+    lpatt = pattern_index(linelist.size, lstsrch, 4)
+    dmatch, lmatch = match_patterns(dpatt, detlines, lpatt, linelist, pixtol)
+    dindex = dpatt[dmatch].astype(np.uint64)
+    lindex = lpatt[lmatch].astype(np.uint64)
+    dl, dr = detlines[dpatt[dmatch,0]], detlines[dpatt[dmatch,-1]]
+    ll, lr = linelist[lpatt[lmatch,0]], linelist[lpatt[lmatch,-1]]
+    disps = (lr - ll) / (dr - dl)
+    wvcen = (npixels/2.) * disps + (lr - disps*dr)
+    # NOTE: The central wavelengths and dispersions of the quadrangles have
+    # always been returned as (truncated) unsigned integers.
+    return dindex, lindex, wvcen.astype(np.ulonglong), disps.astype(np.ulonglong)
 
 
 #@nb.jit(nopython=True, cache=True)
@@ -773,27 +763,21 @@ def solve_triangles(detlines, linelist, dindex, lindex, patt_dict=None):
     if patt_dict is None:
         patt_dict = dict(acceptable=False, nmatch=0, ibest=-1, bwv=0., mask=np.zeros(nlines, dtype=bool))
 
-    # Find the best ID of each line
-    detids = np.zeros(nlines)
+    # Count the number of times each detected line is matched to each line in
+    # the line list
+    nlist = linelist.size
+    counts = np.bincount((dindex.astype(int)*nlist + lindex.astype(int)).ravel(),
+                         minlength=nlines*nlist).reshape(nlines, nlist)
+    # Assign the ID of each line to be the wavelength whose index appears the
+    # largest number of times
+    matched = np.any(counts > 0, axis=1)
+    detids = np.where(matched, linelist[np.argmax(counts, axis=1)], 0.)
+    # Give each ID a score based on the number of occurences
     scores = ['None' for xx in range(nlines)]
-    mask = np.zeros(nlines, dtype=bool)
-    ngd_match = 0
-    for dd in range(nlines):
-        # Grab all the instances of this detected line's pixel position index
-        ww = (dindex == dd)
-        if not np.any(ww):
-            continue
-        # Find the unique set of wavelength indices that this detected line has been matched to, and the number of times
-        unq, cnts = np.unique(lindex[ww], return_counts=True)
-        unq = unq.astype(int)
-        # Assign the ID of this line to be wavelength whose index appears the largest number of times
-        detids[dd] = linelist[unq[np.argmax(cnts)]]
-        # Give this ID a score based on the number of occurences
-        scr = score_triangles(cnts)
-        scores[dd] = scr
-        if scr in ["Perfect", "Very Good", "Good", "OK"]:
-            mask[dd] = True
-            ngd_match += 1
+    for dd in np.where(matched)[0]:
+        scores[dd] = score_triangles(counts[dd][counts[dd] > 0])
+    mask = np.isin(scores, ["Perfect", "Very Good", "Good", "OK"])
+    ngd_match = int(np.sum(mask))
 
     # Iteratively fit this solution, and ID all lines.
     if ngd_match > patt_dict['nmatch']:
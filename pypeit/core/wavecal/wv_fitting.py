@@ -376,6 +376,8 @@ def iterative_fitting(spec, tcent, ifit, IDs, llist, dispersion,
     all_ids = -999.*np.ones(len(tcent))
     all_idsion = np.array(['UNKNWN']*len(tcent))
     all_ids[ifit] = IDs
+    # Wavelengths of the lines in the list, ignoring any masked lines
+    llist_wave = np.ma.filled(np.ma.asarray(llist['wave'], dtype=float), np.inf)
 
     # Fit
     n_order = n_first
@@ -413,16 +415,14 @@ def iterative_fitting(spec, tcent, ifit, IDs, llist, dispersion,
         if not input_only:
             # Find new points from the linelist (should we allow removal of the originals?)
             twave = pypeitFit.eval(tcent/xnspecmin1)#, func, minx=fmin, maxx=fmax)
-            for ss, iwave in enumerate(twave):
-                mn = np.min(np.abs(iwave-llist['wave']))
-                if mn/dispersion < match_toler:
-                    imn = np.argmin(np.abs(iwave-llist['wave']))
-                    #if verbose:
-                    #    print('Adding {:g} at {:g}'.format(llist['wave'][imn],tcent[ss]))
-                    # Update and append
-                    all_ids[ss] = llist['wave'][imn]
-                    all_idsion[ss] = llist['ion'][imn]
-                    ifit.append(ss)
+            # Find the nearest line in the list to all the lines at once
+            imn = np.argmin(np.abs(twave[:,None] - llist_wave[None,:]), axis=1)
+            mn = np.abs(twave - llist_wave[imn])
+            for ss in np.where(mn/dispersion < match_toler)[0]:
+                # Update and append
+                all_ids[ss] = llist['wave'][imn[ss]]
+                all_idsion[ss] = llist['ion'][imn[ss]]
+                ifit.append(ss)
         # Keep unique ones
         ifit = np.unique(np.array(ifit, dtype=int))
         # Increment order?
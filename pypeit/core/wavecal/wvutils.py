@@ -817,6 +817,271 @@ def xcorr_shift_stretch(inspec1, inspec2, cc_thresh=-1.0, percent_ceil=50.0, use
     return result_out, shift_out, stretch_out, stretch2_out, corr_out, shift_cc, corr_cc
 
 
+def _xcorr_stretch_grid(y1, fft_arxiv, norm_arxiv, stretch_grid, lag_range, nfft):
+    """
+    Find the best shift and stretch of a set of spectra relative to y1 on a
+    grid of stretches; see :func:`xcorr_shift_stretch_batch`.
+
+    The stretch is applied relative to the first pixel, which is equivalent to
+    resampling y1 at the stretched pixel coordinates.  This means that the FFTs
+    of the archived spectra are only computed once.
+
+    Args:
+        y1 (`numpy.ndarray`_):
+            Reference spectrum, shape = (nspec,)
+        fft_arxiv (`numpy.ndarray`_):
+            Complex conjugate of the real FFTs of the archived spectra, padded
+            to ``nfft`` pixels, shape = (nfft//2+1, narxiv).
+        norm_arxiv (`numpy.ndarray`_):
+            Square root of the sum of the squares of each archived spectrum,
+            shape = (narxiv,).
+        stretch_grid (`numpy.ndarray`_):
+            Grid of stretches.
+        lag_range (:obj:`tuple`):
+            Range of allowed shifts.
+        nfft (:obj:`int`):
+            Length of the FFTs.
+
+    Returns:
+        :obj:`tuple`: The maximum cross-correlation coefficient and the shift
+        and stretch at which it is found, for each archived spectrum.
+    """
+    nspec = y1.size
+    narxiv = fft_arxiv.shape[1]
+    pix = np.arange(nspec)
+    lags = scipy.fft.fftfreq(nfft, d=1/nfft)
+    aindx = np.arange(narxiv)
+    corr_grid = np.full(narxiv, -np.inf)
+    lag_grid = np.zeros(narxiv, dtype=float)
+    stretch_grid_out = np.ones(narxiv, dtype=float)
+    for stretch in stretch_grid:
+        y1_stretch = np.interp(stretch*pix, pix, y1, left=0., right=0.)
+        norm = np.sqrt(np.sum(y1_stretch**2))
+        if norm == 0:
+            continue
+        corr = scipy.fft.irfft(scipy.fft.rfft(y1_stretch, n=nfft)[:,None] * fft_arxiv, n=nfft,
+                               axis=0) / norm / norm_arxiv[None,:]
+        # Only consider the allowed shifts
+        corr[(stretch*lags < lag_range[0]) | (stretch*lags > lag_range[1])
+                | (np.absolute(lags) >= nspec)] = -np.inf
+        imax = np.argmax(corr, axis=0)
+        corr_max = corr[imax,aindx]
+        better = corr_max > corr_grid
+        if not np.any(better):
+            continue
+        # Parabolic interpolation of the peak
+        corr_lo = corr[(imax-1) % nfft,aindx]
+        corr_hi = corr[(imax+1) % nfft,aindx]
+        denom = corr_lo - 2*corr_max + corr_hi
+        offset = np.zeros(narxiv, dtype=float)
+        indx = np.isfinite(denom) & (denom < 0)
+        offset[indx] = 0.5*(corr_lo[indx] - corr_hi[indx])/denom[indx]
+        corr_grid[better] = corr_max[better]
+        lag_grid[better] = lags[imax[better]] + offset[better]
+        stretch_grid_out[better] = stretch
+    corr_grid[np.logical_not(np.isfinite(corr_grid))] = 0.
+    return corr_grid, stretch_grid_out*lag_grid, stretch_grid_out
+
+
+def xcorr_shift_stretch_batch(inspec1, xcorr_arxiv, cc_thresh=-1.0, percent_ceil=50.0,
+                              use_raw_arc=False, stretch_mnmx=(0.95,1.05), sigdetect=5.0,
+                              sig_ceil=10.0, fwhm=4.0, max_lag_frac=1.0, lag_range=None, nrefine=3,
+                              debug=False, toler=1e-8, stretch_func='quadratic'):
+    """
+    Determine the shift and stretch of a set of archived spectra relative to
+    inspec1.
+
+    This is a batched version of :func:`xcorr_shift_stretch`.  Instead of
+    optimizing the shift and stretch for each archived spectrum in turn, the
+    cross-correlation of inspec1 with *all* of the archived spectra is first
+    computed using FFTs over a grid of stretches.  The FFTs of the archived
+    spectra are computed only once, by resampling inspec1 instead of the
+    archived spectra for each stretch.  The shift and stretch are then only
+    optimized (using the same zero-lag cross-correlation as
+    :func:`xcorr_shift_stretch`) for the ``nrefine`` archived spectra with the
+    largest cross-correlation on the grid, within one grid step of the best
+    grid solution.  The conventions for the shift and stretch are the same as
+    for :func:`xcorr_shift_stretch`.
+
+    Parameters
+    ----------
+    inspec1 : ndarray
+        Reference spectrum, shape = (nspec,)
+    xcorr_arxiv : ndarray
+        Synthetic arcs (see :func:`get_xcorr_arc`) of the archived spectra for
+        which the shift and stretch are computed, shape = (nspec, narxiv).
+        Archived spectra without any detected lines should be all zeros.
+    cc_thresh : float, default = -1.0
+        Threshold on the cross-correlation coefficient; see
+        :func:`xcorr_shift_stretch`.
+    percent_ceil : float, default = 50.0
+        Percentile ceiling applied to the line amplitudes of inspec1; see
+        :func:`get_xcorr_arc`.
+    use_raw_arc : bool, default = False
+        If True, use the raw arc rather than the continuum-subtracted arc to
+        construct the synthetic arc of inspec1.
+    stretch_mnmx : tuple of floats, default = (0.95,1.05)
+        Range of stretches to search.
+    sigdetect : float, default = 5.0
+        Peak finding threshold for the lines in inspec1.
+    sig_ceil : float, default = 10.0
+        Significance threshold for the peaks used to determine the line
+        amplitude clipping threshold; see :func:`get_xcorr_arc`.
+    fwhm : float, default = 4.0
+        FWHM of the arc lines.  This also sets the step of the stretch grid,
+        such that a change in stretch of one step moves the last pixel of the
+        spectrum by ``fwhm`` pixels.
+    max_lag_frac : float, default = 1.0
+        Maximum shift, expressed as a fraction of the number of spectral
+        pixels.  Only used if lag_range is None.
+    lag_range : tuple of floats, default = None
+        Range of shifts to search.
+    nrefine : int, default = 3
+        Number of archived spectra for which the shift and stretch are
+        optimized.  If None, the shift and stretch are optimized for all
+        archived spectra.
+    debug : bool, default = False
+        Show plots of the optimized shift and stretch.
+    toler : float, default = 1e-8
+        Relative tolerance of the optimization of the shift and stretch.
+    stretch_func : str, optional, default = 'quadratic'
+        Use quadratic ('quadratic') or linear ('linear') stretch.
+
+    Returns
+    -------
+    success : ndarray
+        Integer flag for each archived spectrum with the same meaning as for
+        :func:`xcorr_shift_stretch`.  Archived spectra that are not refined
+        have success = -1.
+    shift : ndarray
+        Optimal shift for each archived spectrum.
+    stretch : ndarray
+        Optimal stretch for each archived spectrum.
+    stretch2 : ndarray
+        Optimal second order stretch for each archived spectrum.
+    cross_corr : ndarray
+        Cross-correlation coefficient at the optimal shift and stretch.
+    shift_grid : ndarray
+        Best shift on the stretch grid.
+    cross_corr_grid : ndarray
+        Cross-correlation coefficient at the best shift and stretch on the
+        grid.
+    """
+    nspec, narxiv = xcorr_arxiv.shape
+    success = np.zeros(narxiv, dtype=int)
+    shift_out = np.zeros(narxiv, dtype=float)
+    stretch_out = np.ones(narxiv, dtype=float)
+    stretch2_out = np.zeros(narxiv, dtype=float)
+    corr_out = np.zeros(narxiv, dtype=float)
+
+    y1 = get_xcorr_arc(inspec1, percent_ceil=percent_ceil, use_raw_arc=use_raw_arc,
+                       sigdetect=sigdetect, sig_ceil=sig_ceil, fwhm=fwhm)
+    if y1 is None or np.all(y1 == 0):
+        msgs.warn('No lines detected punting on shift/stretch')
+        return success, shift_out, stretch_out, stretch2_out, corr_out, shift_out.copy(), \
+                corr_out.copy()
+
+    # Conjugate FFTs of all the archived spectra, padded to avoid wrapping
+    nfft = scipy.fft.next_fast_len(2*nspec)
+    fft_arxiv = np.conj(scipy.fft.rfft(xcorr_arxiv, n=nfft, axis=0))
+    norm_arxiv = np.sqrt(np.sum(xcorr_arxiv**2, axis=0))
+    has_lines = norm_arxiv > 0
+    norm_arxiv[np.logical_not(has_lines)] = 1.
+    if lag_range is None:
+        lag_range = (-(nspec - 1) * max_lag_frac, (nspec - 1) * max_lag_frac)
+
+    # Coarse grid of stretches, with a step that moves the last pixel of the
+    # spectrum by the FWHM of the lines.
+    nstretch = int(np.ceil((stretch_mnmx[1] - stretch_mnmx[0]) * nspec / fwhm)) + 1
+    stretch_grid = np.linspace(stretch_mnmx[0], stretch_mnmx[1], nstretch)
+    dstretch = stretch_grid[1] - stretch_grid[0] if nstretch > 1 else 0.
+    corr_grid, shift_grid, stretch_out \
+            = _xcorr_stretch_grid(y1, fft_arxiv, norm_arxiv, stretch_grid, lag_range, nfft)
+    corr_grid[np.logical_not(has_lines)] = 0.
+    shift_out = shift_grid.copy()
+    corr_out = corr_grid.copy()
+    success[has_lines] = -1
+
+    # Refine the shift and stretch of the best-matching archived spectra
+    aindx = np.arange(narxiv)
+    srt = np.argsort(corr_grid[has_lines])[::-1]
+    irefine = aindx[has_lines][srt] if nrefine is None else aindx[has_lines][srt[:nrefine]]
+    pix = np.arange(nspec)
+    for iarxiv in irefine:
+        y2 = xcorr_arxiv[:,iarxiv]
+        # Fine grid of stretches around the best coarse stretch, with a step
+        # that moves the last pixel by a tenth of the FWHM.  The best shift at
+        # each stretch is found using the FFT, but the best stretch is chosen
+        # using the zero-lag cross-correlation, which is much smoother.
+        stretch_bounds = (max(stretch_out[iarxiv] - dstretch, stretch_mnmx[0]),
+                          min(stretch_out[iarxiv] + dstretch, stretch_mnmx[1]))
+        fine_grid = np.linspace(*stretch_bounds, 21)
+        x0 = np.array([shift_out[iarxiv], stretch_out[iarxiv], 0.0])
+        corr0 = -np.inf
+        for stretch in fine_grid:
+            _, _shift, _ = _xcorr_stretch_grid(y1, fft_arxiv[:,[iarxiv]], norm_arxiv[[iarxiv]],
+                                               [stretch], lag_range, nfft)
+            _corr = -zerolag_shift_stretch([_shift[0], stretch, 0.0], y1, y2)
+            if _corr > corr0:
+                x0[:2] = _shift[0], stretch
+                corr0 = _corr
+        # Optimize the zero-lag cross-correlation starting from the fine grid
+        # solution.  The parameters are rescaled to the unit interval within
+        # the bounds so that the optimizer is not affected by their very
+        # different magnitudes.
+        dstretch_fine = fine_grid[1] - fine_grid[0]
+        bounds = np.array([(max(x0[0] - nspec*dstretch_fine - fwhm, lag_range[0]),
+                            min(x0[0] + nspec*dstretch_fine + fwhm, lag_range[1])),
+                           (max(x0[1] - dstretch_fine, stretch_mnmx[0]),
+                            min(x0[1] + dstretch_fine, stretch_mnmx[1])),
+                           (-1.0e-6, 1.0e-6) if stretch_func == 'quadratic' else (0.0, 0.0)])
+        span = np.diff(bounds, axis=1)[:,0]
+        _span = span.copy()
+        _span[span == 0] = 1.
+        try:
+            result = scipy.optimize.minimize(
+                        lambda u: zerolag_shift_stretch(bounds[:,0] + span*u, y1, y2),
+                        np.clip((x0 - bounds[:,0])/_span, 0., 1.), method='L-BFGS-B',
+                        bounds=[(0., 1.)]*3, options=dict(ftol=toler))
+        except PypeItError:
+            msgs.warn("Shift and stretch optimization failed.")
+            success[iarxiv] = 0
+            continue
+        if not result.success:
+            msgs.warn('Fit for shift and stretch did not converge!')
+        if -result.fun < corr0:
+            # Keep the grid solution if the optimizer did worse
+            success[iarxiv] = 1
+            shift_out[iarxiv], stretch_out[iarxiv] = x0[:2]
+            corr_out[iarxiv] = corr0
+        else:
+            success[iarxiv] = int(result.success)
+            shift_out[iarxiv], stretch_out[iarxiv], stretch2_out[iarxiv] \
+                    = bounds[:,0] + span*result.x
+            corr_out[iarxiv] = -result.fun
+
+        if debug:
+            y2_trans = shift_and_stretch(y2, shift_out[iarxiv], stretch_out[iarxiv],
+                                         stretch2_out[iarxiv], stretch_func='quadratic')
+            plt.figure(figsize=(14, 6))
+            plt.plot(pix, y1/y1.max(), 'k-', drawstyle='steps', label='inspec1, input spectrum')
+            plt.plot(pix, y2/y2.max(), color='grey', drawstyle='steps',
+                     label='inspec2, reference original')
+            plt.plot(pix, y2_trans/y2_trans.max(), 'r-', drawstyle='steps',
+                     label='inspec2, reference shift & stretch')
+            plt.title(f'arxiv spectrum {iarxiv}: shift = {shift_out[iarxiv]:5.3f}, '
+                      f'stretch = {stretch_out[iarxiv]:7.5f}, '
+                      f'stretch2 = {stretch2_out[iarxiv]:7.5f}, corr = {corr_out[iarxiv]:5.3f}')
+            plt.legend()
+            plt.show()
+
+        # check if the cc is above the threshold
+        if corr_out[iarxiv] < cc_thresh:
+            success[iarxiv] = -1
+
+    return success, shift_out, stretch_out, stretch2_out, corr_out, shift_grid, corr_grid
+
+
 def wavegrid(wave_min, wave_max, dwave, spec_samp_fact=1.0, log10=False):
     """
 
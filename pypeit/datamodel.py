@@ -854,7 +854,7 @@ class DataContainer:
 
     @classmethod
     def _parse(cls, hdu, ext=None, ext_pseudo=None, transpose_table_arrays=False, 
-               hdu_prefix=None, allow_subclasses=False):
+               hdu_prefix=None, allow_subclasses=False, attrs=None, lazy=False):
         """
         Parse data read from one or more HDUs.
 
@@ -941,6 +941,17 @@ class DataContainer:
                 because the datamodel is defined by the parent class and not
                 altered by the subclasses!  **Use with care! See function
                 warnings.**
+            attrs (:obj:`list`, optional):
+                The datamodel items to read from their own extension or from the
+                columns of a binary table.  Items not in this list are left as
+                None.  Items read from the extension headers are always parsed.
+                If None, all items are read.
+            lazy (:obj:`bool`, optional):
+                Instead of reading the data in image extensions, return a
+                :class:`LazyHDUData` object for each image that reads the data
+                when called.  This is only possible if the HDUs were read from
+                an uncompressed file and have an extension name; the data in
+                other HDUs are read directly.  See :func:`from_hdu`.
                 
         Returns:
             :obj:`tuple`: Return four objects: (1) a dictionary with the
@@ -970,7 +981,10 @@ class DataContainer:
         # Log if relevant data is found for this datamodel, allowing for
         # DataContainers that have no data, although such a usage case should be
         # rare.
-        if np.all([_hdu[e].data is None for e in _ext]):
+        # NOTE: The header is used for image HDUs so that the data are not
+        # read.
+        if np.all([_hdu[e].header['NAXIS'] == 0 if _hdu[e].is_image else _hdu[e].data is None
+                        for e in _ext]):
             msgs.warn(f'Extensions to be read by {cls.__name__} have no data!')
             # This is so that the returned booleans for reading the
             # data are not tripped as false!
@@ -1000,6 +1014,8 @@ class DataContainer:
         if np.any(indx):
             found_data = True
             for e in keys[indx]:
+                if attrs is not None and e not in attrs:
+                    continue
                 pseudo_hduindx = prefix+e.upper()
                 hduindx = _ext[np.where(_ext_pseudo == pseudo_hduindx)[0][0]]
                 # Add it to the list of parsed HDUs
@@ -1038,8 +1054,12 @@ class DataContainer:
                                                     allow_subclasses=allow_subclasses)
                 dm_version_passed &= _hdu[hduindx].header['DMODVER'] == cls.version
                 # Grab it
-                _d[e] = _hdu[hduindx].data if isinstance(_hdu[hduindx], fits.ImageHDU) \
-                    else Table.read(_hdu[hduindx]).copy()
+                if not isinstance(_hdu[hduindx], fits.ImageHDU):
+                    _d[e] = Table.read(_hdu[hduindx]).copy()
+                    continue
+                _d[e] = LazyHDUData.from_hdu(_hdu[hduindx]) if lazy else None
+                if _d[e] is None:
+                    _d[e] = _hdu[hduindx].data
 
         for e in _ext:
             if 'DMODCLS' not in _hdu[e].header.keys() or 'DMODVER' not in _hdu[e].header.keys() \
@@ -1077,7 +1097,7 @@ class DataContainer:
                 # differences.
                 single_row = len(_hdu[e].data) == 1
                 for key in _hdu[e].columns.names:
-                    if key in cls.datamodel.keys():
+                    if key in cls.datamodel.keys() and (attrs is None or key in attrs):
                         _d[key] = _hdu[e].data[key][0] \
                                         if (single_row and _hdu[e].data[key].ndim > 1) \
                                         else _hdu[e].data[key]
@@ -1191,10 +1211,14 @@ class DataContainer:
         """
         Access and set an attribute identically to a dictionary item.
 
-        Items are restricted to those defined by the datamodel.
+        Items are restricted to those defined by the datamodel.  Setting an
+        item that has not yet been read from its file (see :func:`set_lazy`)
+        replaces it without reading it.
         """
         if item not in self.__dict__.keys():
-            raise KeyError('Key {0} not part of the internals nor data model'.format(item))
+            if item not in self.__dict__.get('_lazy_items', {}):
+                raise KeyError('Key {0} not part of the internals nor data model'.format(item))
+            del self.__dict__['_lazy_items'][item]
         # Internal?
         if item not in self.keys():
             self.__dict__[item] = value
@@ -1220,11 +1244,53 @@ class DataContainer:
         self.__dict__[item] = value
 
     def __getitem__(self, item):
-        """Get an item directly from the internal dict."""
+        """
+        Get an item directly from the internal dict.
+
+        If the item has not yet been read from its file (see :func:`set_lazy`),
+        it is read and set before being returned.
+        """
         try:
             return self.__dict__[item]
         except KeyError as e:
-            raise KeyError(f'{item} is not an item in {self.__class__.__name__}.') from e
+            if item not in self.__dict__.get('_lazy_items', {}):
+                raise KeyError(f'{item} is not an item in {self.__class__.__name__}.') from e
+        self[item] = self.__dict__['_lazy_items'][item]()
+        return self.__dict__[item]
+
+    def set_lazy(self, item, loader):
+        """
+        Defer reading a datamodel item until it is first accessed.
+
+        The item is removed from the object and the ``loader`` is called the
+        first time the item is accessed, either as an attribute or as a
+        dictionary item.  The returned object is then assigned to the item,
+        which means it is subject to the same type checking as any other
+        assignment.  Setting the item before it is accessed discards the
+        ``loader``.
+
+        Args:
+            item (:obj:`str`):
+                The datamodel item to read later.
+            loader (callable):
+                Object that takes no arguments and returns the value of the
+                item; e.g., :class:`LazyHDUData`.  To be able to pickle the
+                object, the ``loader`` must also be picklable.
+        """
+        if item not in self.keys():
+            raise KeyError(f'{item} is not a datamodel item of {self.__class__.__name__}.')
+        if '_lazy_items' not in self.__dict__:
+            self.__dict__['_lazy_items'] = {}
+        self.__dict__.pop(item, None)
+        self.__dict__['_lazy_items'][item] = loader
+
+    @property
+    def lazy_items(self):
+        """
+        The list of datamodel items that have not yet been read from their
+        file; see :func:`set_lazy`.
+        """
+        return list(self.__dict__.get('_lazy_items', {}).keys())
 
     def keys(self):
         """
@@ -1439,6 +1505,11 @@ class DataContainer:
 
         This is primarily a wrapper for :func:`_parse`.
 
+        If :func:`_parse` returns any :class:`LazyHDUData` objects (e.g., by
+        passing ``lazy=True``), the object is instantiated with these items set
+        to None, and they are then registered using :func:`set_lazy` such that
+        their data are read from the file the first time they are accessed.
+
         Args:
             hdu (`astropy.io.fits.HDUList`_, `astropy.io.fits.ImageHDU`_, `astropy.io.fits.BinTableHDU`_):
                 The HDU(s) with the data to use for instantiation.
@@ -1453,13 +1524,20 @@ class DataContainer:
         # Check version and type?
         cls._check_parsed(dm_version_passed, dm_type_passed, chk_version=chk_version)
 
+        # Separate the data to be read later
+        lazy_items = {key: val for key, val in d.items() if isinstance(val, LazyHDUData)}
+        d.update(dict.fromkeys(lazy_items.keys()))
+
         # Instantiate
         # NOTE: We can't use `cls(d)`, where `d` is the dictionary returned by
         # `cls._parse`, because this will call the `__init__` method of the
         # derived class and we need to use the `__init__` of the base class
         # instead.  Instead, `d` is passed to `cls.from_dict`, which initiates
         # everything correctly.
-        return cls.from_dict(d=d)
+        self = cls.from_dict(d=d)
+        for key, val in lazy_items.items():
+            self.set_lazy(key, val)
+        return self
 
     @classmethod
     def from_dict(cls, d=None):
@@ -1559,8 +1637,10 @@ class DataContainer:
         repr = '<{:s}: '.format(self.__class__.__name__)
         # Image
         rdict = {}
+        lazy_items = self.lazy_items
         for attr in self.datamodel.keys():
-            if hasattr(self, attr) and getattr(self, attr) is not None:
+            if attr in lazy_items \
+                    or (hasattr(self, attr) and getattr(self, attr) is not None):
                 rdict[attr] = True
             else:
                 rdict[attr] = False
@@ -1583,4 +1663,63 @@ def obj_is_data_container(obj):
     return inspect.isclass(obj) and issubclass(obj, DataContainer)
 
 
+class LazyHDUData:
+    """
+    Read the data in a single fits extension on demand.
+
+    The file is only opened when the object is called, and only the data in
+    the selected extension are read.  The object is picklable, as long as the
+    ``parser`` is.
+
+    Args:
+        filename (:obj:`str`, `Path`_):
+            Fits file with the data.
+        ext (:obj:`str`, :obj:`int`):
+            Name or index of the extension with the data.
+        parser (callable, optional):
+            Function used to parse the extension.  It must take the
+            `astropy.io.fits.ImageHDU`_ or `astropy.io.fits.BinTableHDU`_ as its
+            only argument; e.g., a :func:`functools.partial` wrapper of the
+            :func:`~pypeit.datamodel.DataContainer.from_hdu` method of a nested
+            :class:`DataContainer`.  If None, the object returns a copy of
+            the extension data with native byte ordering.
+    """
+    def __init__(self, filename, ext, parser=None):
+        self.filename = str(filename)
+        self.ext = ext
+        self.parser = parser
 
+    @classmethod
+    def from_hdu(cls, hdu, parser=None):
+        """
+        Construct the object for an HDU read from a file.
+
+        Args:
+            hdu (`astropy.io.fits.ImageHDU`_, `astropy.io.fits.BinTableHDU`_):
+                The HDU to read later.
+            parser (callable, optional):
+                See the class description.
+
+        Returns:
+            :class:`LazyHDUData`: Object used to read the HDU data, or None if
+            the HDU was not read from an uncompressed file or it does not have
+            an extension name.
+        """
+        info = hdu.fileinfo()
+        if info is None or hdu.name == '' or info['file'].compression is not None \
+                or not isinstance(info['file'].name, str):
+            return None
+        return cls(info['file'].name, hdu.name, parser=parser)
+
+    def __call__(self):
+        """
+        Read the extension data.
+        """
+        with io.fits_open(self.filename, memmap=True) as hdu:
+            if self.parser is not None:
+                return self.parser(hdu[self.ext])
+            data = hdu[self.ext].data
+            return None if data is None else data.astype(data.dtype.newbyteorder('='))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.filename}[{self.ext}]>'
@@ -7,6 +7,7 @@ Main driver class for skysubtraction and extraction
 """
 
 import inspect
+import contextlib
 import numpy as np
 import os
 
@@ -310,6 +311,9 @@ class Extract:
         # Slitmask
         self.slitmask = self.slits.slit_img(initial=initial, flexure=self.spat_flexure_shift,
                                             exclude_flag=self.slits.bitmask.exclude_for_reducing)
+        # Bounding boxes of the pixels in each slit in the slitmask
+        self.slit_cutouts = [self.slits.slit_cutout(i, initial=initial, flexure=self.spat_flexure_shift)
+                             for i in range(self.slits.nslits)]
         # Now add the slitmask to the mask (i.e. post CR rejection in proc)
         # NOTE: this uses the par defined by EdgeTraceSet; this will
         # use the tweaked traces if they exist
@@ -680,7 +684,10 @@ class MultiSlitExtract(Extract):
         Perform local sky subtraction, profile fitting, and optimal extraction
         slit by slit.
 
-        Wrapper to :func:`~pypeit.core.skysub.local_skysub_extract`.
+        The slits are processed in parallel if the ``n_proc`` extraction
+        parameter is larger than 1, in which case each slit is processed
+        using cutouts of the detector images; see
+        :func:`local_skysub_extract_slit`.
 
         Args:
             global_sky (`numpy.ndarray`_):
@@ -741,55 +748,81 @@ class MultiSlitExtract(Extract):
 
         base_gpm = self.sciImg.select_flag(invert=True)
 
-        # Loop on slits
+        # TODO: skysub.local_skysub_extract() accepts a `prof_nsigma` parameter, but none
+        #       is provided here.  Additionally, the ExtractionPar keyword std_prof_nsigma
+        #       is not used anywhere in the code.  Should it be be used here, in conjunction
+        #       with whether this object IS_STANDARD?
+        # prof_nsigma = self.par['reduce']['extraction']['std_prof_nsigma'] if IS_STANDARD else None
+
+        # Images and parameters used for all slits
+        images = dict(sciimg=self.sciImg.image, sciivar=self.sciImg.ivar, tilts=self.tilts,
+                      waveimg=self.waveimg, global_sky=self.global_sky, gpm=base_gpm,
+                      slitmask=self.slitmask, bkg_redux_global_sky=bkg_redux_global_sky,
+                      fwhmimg=self.fwhmimg, spat_pix=spat_pix, base_var=self.sciImg.base_var,
+                      count_scale=self.sciImg.img_scale)
+        skysub_kwargs = dict(model_full_slit=self.par['reduce']['extraction']['model_full_slit'],
+                             sigrej=self.par['reduce']['skysub']['sky_sigrej'],
+                             model_noise=model_noise, std=self.std_redux,
+                             bsp=self.par['reduce']['skysub']['bspline_spacing'],
+                             force_gauss=self.par['reduce']['extraction']['use_user_fwhm'],
+                             sn_gauss=self.par['reduce']['extraction']['sn_gauss'],
+                             show_profile=show_profile,
+                             # prof_nsigma=prof_nsigma,
+                             use_2dmodel_mask=self.par['reduce']['extraction']['use_2dmodel_mask'],
+                             no_local_sky=self.par['reduce']['skysub']['no_local_sky'],
+                             adderr=self.sciImg.noise_floor)
+
+        # Select the slits with objects
+        tasks = []
+        objindx = []
         for slit_idx in gdslits:
             slit_spat = self.slits.spat_id[slit_idx]
-            msgs.info("Local sky subtraction and extraction for slit: {:d}".format(slit_spat))
-            thisobj = self.sobjs.SLITID == slit_spat    # indices of objects for this slit
-            if not np.any(thisobj):
+            thisobj = np.where(self.sobjs.SLITID == slit_spat)[0]   # objects on this slit
+            if thisobj.size == 0:
                 continue
-            # Setup to run local skysub
-            thismask = self.slitmask == slit_spat   # pixels for this slit
-            # True  = Good, False = Bad for inmask
-            ingpm = base_gpm & thismask
-
-            # ... Just for readability
-            model_full_slit = self.par['reduce']['extraction']['model_full_slit']
-            sigrej = self.par['reduce']['skysub']['sky_sigrej']
-            bsp = self.par['reduce']['skysub']['bspline_spacing']
-            force_gauss = self.par['reduce']['extraction']['use_user_fwhm']
-            sn_gauss = self.par['reduce']['extraction']['sn_gauss']
-            use_2dmodel_mask = self.par['reduce']['extraction']['use_2dmodel_mask']
-            no_local_sky = self.par['reduce']['skysub']['no_local_sky']
-
-            # TODO: skysub.local_skysub_extract() accepts a `prof_nsigma` parameter, but none
-            #       is provided here.  Additionally, the ExtractionPar keyword std_prof_nsigma
-            #       is not used anywhere in the code.  Should it be be used here, in conjunction
-            #       with whether this object IS_STANDARD?
-            # prof_nsigma = self.par['reduce']['extraction']['std_prof_nsigma'] if IS_STANDARD else None
-
-            # Local sky subtraction and extraction
-            self.skymodel[thismask], _this_bkg_redux_skymodel, self.objmodel[thismask], self.ivarmodel[thismask], self.extractmask[thismask] \
-                = skysub.local_skysub_extract(self.sciImg.image, self.sciImg.ivar,
-                                              self.tilts, self.waveimg, self.global_sky,
-                                              thismask, self.slits_left[:,slit_idx],
-                                              self.slits_right[:, slit_idx],
-                                              self.sobjs[thisobj], ingpm=ingpm,
-                                              bkg_redux_global_sky=bkg_redux_global_sky,
-                                              fwhmimg=self.fwhmimg, spat_pix=spat_pix,
-                                              model_full_slit=model_full_slit,
-                                              sigrej=sigrej, model_noise=model_noise,
-                                              std=self.std_redux, bsp=bsp,
-                                              force_gauss=force_gauss, sn_gauss=sn_gauss,
-                                              show_profile=show_profile,
-                                              # prof_nsigma=prof_nsigma,
-                                              use_2dmodel_mask=use_2dmodel_mask,
-                                              no_local_sky=no_local_sky,
-                                              base_var=self.sciImg.base_var,
-                                              count_scale=self.sciImg.img_scale,
-                                              adderr=self.sciImg.noise_floor)
-            if self.bkg_redux_skymodel is not None:
-                self.bkg_redux_skymodel[thismask] = _this_bkg_redux_skymodel
+            tasks += [(slit_spat, self.slits_left[:,slit_idx], self.slits_right[:,slit_idx],
+                       self.sobjs[thisobj], self.slit_cutouts[slit_idx])]
+            objindx += [thisobj]
+
+        # Perform the local sky subtraction and extraction for each slit,
+        # either serially or in parallel
+        n_proc = 1 if show_profile else \
+                    utils.get_nproc(self.par['reduce']['extraction']['n_proc'], len(tasks))
+        with contextlib.ExitStack() as context:
+            if n_proc > 1:
+                msgs.info(f'Local sky subtraction and extraction for {len(tasks)} slits using '
+                          f'{n_proc} processes.')
+                # NOTE: The images are passed to each process once, when it is
+                # started, instead of with every slit.  Each process only
+                # extracts a cutout of the images around each slit, such that
+                # only the cutouts of the models are returned.  The results
+                # are returned in the order of the slits.
+                pool = context.enter_context(
+                            utils.SharedProcessPool(n_proc, _local_skysub_extract_task,
+                                                    **images, **skysub_kwargs))
+                results = pool.map(tasks)
+            else:
+                # Use the full images; i.e., do not pass the cutouts
+                results = (local_skysub_extract_slit(*task[:-1], **images, **skysub_kwargs)
+                           for task in tasks)
+
+            # Insert the results for each slit into the full images
+            for (slit_spat, _, _, sobjs_slit, _), thisobj, (cols, skymodel, bkg_redux_skymodel,
+                                                         objmodel, ivarmodel, extractmask,
+                                                         sobjs_slit_out) \
+                    in zip(tasks, objindx, results):
+                thismask = self.slitmask[cols] == slit_spat
+                self.skymodel[cols][thismask] = skymodel
+                self.objmodel[cols][thismask] = objmodel
+                self.ivarmodel[cols][thismask] = ivarmodel
+                self.extractmask[cols][thismask] = extractmask
+                if self.bkg_redux_skymodel is not None:
+                    self.bkg_redux_skymodel[cols][thismask] = bkg_redux_skymodel
+                if sobjs_slit_out is not sobjs_slit:
+                    # The objects were extracted by another process, so replace
+                    # them with the extracted ones.
+                    for i, sobj in zip(thisobj, sobjs_slit_out):
+                        self.sobjs[i] = sobj
 
         # Set the bit for pixels which were masked by the extraction.
         # For extractmask, True = Good, False = Bad
@@ -923,3 +956,139 @@ class SlicerIFUExtract(MultiSlitExtract):
     #def __init__(self, sciImg, slits, sobjs_obj, spectrograph, par, objtype, **kwargs):
     #    # IFU doesn't extract, and there's no need for a super call here.
     #    return
+
+
+def local_skysub_extract_slit(slit_spat, slit_left, slit_righ, sobjs, cutout=None, sciimg=None,
+                              sciivar=None,
+                              tilts=None, waveimg=None, global_sky=None, gpm=None,
+                              slitmask=None, bkg_redux_global_sky=None, fwhmimg=None,
+                              spat_pix=None, base_var=None, count_scale=None, **kwargs):
+    """
+    Perform the local sky subtraction and extraction for a single slit.
+
+    If ``cutout`` is provided, the calculation uses cutouts of the images that
+    contain the slit and the boxcar apertures of its objects, instead of the
+    full detector images; see :func:`~pypeit.core.skysub.local_skysub_extract`.
+    The objects are then copied and shifted to the coordinates of the cutout,
+    such that the input objects are not modified.  Note that the profile fits
+    are then performed at different spatial coordinates, so the results are
+    only equal to those using the full images to within numerical precision.
+
+    Args:
+        slit_spat (:obj:`int`):
+            Spatial ID of the slit in ``slitmask``.
+        slit_left (`numpy.ndarray`_):
+            Left edge of the slit.
+        slit_righ (`numpy.ndarray`_):
+            Right edge of the slit.
+        sobjs (:class:`~pypeit.specobjs.SpecObjs`):
+            Objects on the slit.  If ``cutout`` is None, these are modified in
+            place.
+        cutout (:obj:`tuple`, optional):
+            Slices selecting the bounding box of the slit in the full images;
+            see :func:`~pypeit.slittrace.SlitTraceSet.slit_cutout`.  The
+            spectral slice must select all spectral pixels, and the cutout is
+            expanded to include the extraction apertures of the objects.  If
+            None, the full images are used.
+        sciimg (`numpy.ndarray`_):
+            Science image.
+        sciivar (`numpy.ndarray`_):
+            Inverse variance of the science image.
+        tilts (`numpy.ndarray`_):
+            Spectral tilts image.
+        waveimg (`numpy.ndarray`_):
+            Wavelength image.
+        global_sky (`numpy.ndarray`_):
+            Global sky model.
+        gpm (`numpy.ndarray`_):
+            Good-pixel mask for the science image.
+        slitmask (`numpy.ndarray`_):
+            Image with the spatial ID of the slit associated with each pixel.
+        bkg_redux_global_sky (`numpy.ndarray`_, optional):
+            Sky estimate without background subtraction.
+        fwhmimg (`numpy.ndarray`_, optional):
+            Spectral FWHM image.
+        spat_pix (`numpy.ndarray`_, optional):
+            Image containing the spatial location of pixels.
+        base_var (`numpy.ndarray`_, optional):
+            Base-level variance image.
+        count_scale (:obj:`float`, `numpy.ndarray`_, optional):
+            Scale factor applied to the science image.
+        **kwargs:
+            Passed directly to :func:`~pypeit.core.skysub.local_skysub_extract`.
+
+    Returns:
+        :obj:`tuple`: The slice that selects the cutout from the full images
+        (all pixels if ``cutout`` is None); the model sky, the model sky without background subtraction (None if
+        ``bkg_redux_global_sky`` is None), the model object flux, the model
+        inverse variance, and the extraction good-pixel mask for the pixels on
+        the slit in the cutout; and the extracted objects.
+    """
+    msgs.info("Local sky subtraction and extraction for slit: {:d}".format(slit_spat))
+
+    if cutout is None:
+        # Use the full images
+        cols = np.s_[:,:]
+        thismask = slitmask == slit_spat
+        skymodel, bkg_redux_skymodel, objmodel, ivarmodel, extractmask \
+            = skysub.local_skysub_extract(sciimg, sciivar, tilts, waveimg, global_sky, thismask,
+                                          slit_left, slit_righ, sobjs, ingpm=gpm & thismask,
+                                          bkg_redux_global_sky=bkg_redux_global_sky,
+                                          fwhmimg=fwhmimg, spat_pix=spat_pix, base_var=base_var,
+                                          count_scale=count_scale, **kwargs)
+        return cols, skymodel, bkg_redux_skymodel, objmodel, ivarmodel, extractmask, sobjs
+
+    # Expand the cutout to include the regions used to extract the objects
+    nspat = sciimg.shape[1]
+    margin = 2*np.amax(sobjs.BOX_RADIUS) + 2
+    trace_spat = np.atleast_2d(sobjs.TRACE_SPAT)
+    c0 = int(max(0, min(cutout[1].start, np.floor(np.amin(trace_spat) - margin))))
+    c1 = int(min(nspat, max(cutout[1].stop, np.ceil(np.amax(trace_spat) + margin) + 1)))
+    cols = np.s_[:, c0:c1]
+    _cut = lambda img: None if img is None else img[cols]
+    _count_scale = count_scale[cols] if isinstance(count_scale, np.ndarray) \
+                        and count_scale.ndim == 2 else count_scale
+    _spat_pix = None if spat_pix is None else spat_pix[cols] - c0
+
+    # Copy the objects and shift them to the cutout coordinates
+    _sobjs = sobjs.copy()
+    for sobj in _sobjs:
+        sobj.TRACE_SPAT = sobj.TRACE_SPAT - c0
+
+    thismask = slitmask[cols] == slit_spat
+    skymodel, bkg_redux_skymodel, objmodel, ivarmodel, extractmask \
+        = skysub.local_skysub_extract(sciimg[cols], sciivar[cols], tilts[cols], waveimg[cols],
+                                      global_sky[cols], thismask, slit_left - c0,
+                                      slit_righ - c0, _sobjs, ingpm=gpm[cols] & thismask,
+                                      bkg_redux_global_sky=_cut(bkg_redux_global_sky),
+                                      fwhmimg=_cut(fwhmimg), spat_pix=_spat_pix,
+                                      base_var=_cut(base_var), count_scale=_count_scale,
+                                      **kwargs)
+
+    # Shift the extracted objects back to the detector coordinates
+    for sobj in _sobjs:
+        sobj.TRACE_SPAT = sobj.TRACE_SPAT + c0
+        if sobj.min_spat is not None:
+            sobj.min_spat = sobj.min_spat + c0
+            sobj.max_spat = sobj.max_spat + c0
+
+    return cols, skymodel, bkg_redux_skymodel, objmodel, ivarmodel, extractmask, _sobjs
+
+
+def _local_skysub_extract_task(task, **kwargs):
+    """
+    Perform the local sky subtraction and extraction for a slit in a
+    :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        task (:obj:`tuple`):
+            The slit ID, left edge, right edge, objects, and cutout passed to
+            :func:`local_skysub_extract_slit`.
+        **kwargs:
+            The full detector images and other keyword arguments passed to
+            :func:`local_skysub_extract_slit`.
+
+    Returns:
+        :obj:`tuple`: The results of :func:`local_skysub_extract_slit`.
+    """
+    return local_skysub_extract_slit(*task, **kwargs)
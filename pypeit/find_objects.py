@@ -310,6 +310,9 @@ class FindObjects:
         # Slitmask
         self.slitmask = self.slits.slit_img(initial=initial, flexure=self.spat_flexure_shift,
                                             exclude_flag=self.slits.bitmask.exclude_for_reducing+['BOXSLIT'])
+        # Bounding boxes of the pixels in each slit in the slitmask
+        self.slit_cutouts = [self.slits.slit_cutout(i, initial=initial, flexure=self.spat_flexure_shift)
+                             for i in range(self.slits.nslits)]
         # Now add the slitmask to the mask (i.e. post CR rejection in proc)
         # NOTE: this uses the par defined by EdgeTraceSet; this will
         # use the tweaked traces if they exist
@@ -568,12 +571,20 @@ class FindObjects:
         else:
             skysub_ivar = self.sciImg.ivar if bkg_redux_sciimg is None else bkg_redux_sciimg.ivar
 
+        _image = self.sciImg.image if bkg_redux_sciimg is None else bkg_redux_sciimg.image
+        img_gpm = self.sciImg.select_flag(invert=True)
+
         # Loop on slits
         for slit_idx in gdslits:
             slit_spat = self.slits.spat_id[slit_idx]
             msgs.info("Global sky subtraction for slit: {:d}".format(slit_spat))
-            thismask = self.slitmask == slit_spat
-            inmask = self.sciImg.select_flag(invert=True) & thismask & skymask_now
+            # Work on the image cutout with this slit.  NOTE: The cutout
+            # includes all spectral pixels, such that the coordinates are
+            # only shifted spatially.
+            cut = self.slit_cutouts[slit_idx]
+            spat_min = cut[1].start
+            thismask = self.slitmask[cut] == slit_spat
+            inmask = img_gpm[cut] & thismask & skymask_now[cut]
             # All masked?
             if not np.any(inmask):
                 msgs.warn("No pixels for fitting sky.  If you are using mask_by_boxcar=True, your radius may be too large.")
@@ -581,10 +592,9 @@ class FindObjects:
                 continue
 
             # Find sky
-            _image = self.sciImg.image if bkg_redux_sciimg is None else bkg_redux_sciimg.image
-            global_sky[thismask] = skysub.global_skysub(
-                _image, skysub_ivar, self.tilts, thismask,
-                self.slits_left[:,slit_idx], self.slits_right[:,slit_idx],
+            global_sky[cut][thismask] = skysub.global_skysub(
+                _image[cut], skysub_ivar[cut], self.tilts[cut], thismask,
+                self.slits_left[:,slit_idx] - spat_min, self.slits_right[:,slit_idx] - spat_min,
                 inmask=inmask, sigrej=sigrej,
                 bsp=self.par['reduce']['skysub']['bspline_spacing'],
                 trim_edg=tuple(self.par['reduce']['trim_edge']),
@@ -593,7 +603,7 @@ class FindObjects:
                 max_mask_frac=self.par['reduce']['skysub']['max_mask_frac'],
                 show_fit=show_fit)
             # Mask if something went wrong
-            if np.sum(global_sky[thismask]) == 0.:
+            if np.sum(global_sky[cut][thismask]) == 0.:
                 msgs.warn("Bad fit to sky.  Rejecting slit: {:d}".format(slit_spat))
                 self.reduce_bpm[slit_idx] = True
 
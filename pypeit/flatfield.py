@@ -367,6 +367,8 @@ class FlatImages(calibframe.CalibFrame):
                 return np.ones(self.shape, dtype=float)
             msgs.error('Cannot continue without spatial bsplines.')
 
+        # Slit edges used to compute the spatial coordinates
+        left, right, _ = slits.select_edges(initial=initial, flexure=spat_flexure)
         # Loop
         for slit_idx in range(slits.nslits):
             # Skip masked
@@ -374,17 +376,17 @@ class FlatImages(calibframe.CalibFrame):
                 continue
             # Skip those without a bspline
             # DO it
-            _slitid_img = slits.slit_img(slitidx=slit_idx, initial=initial, flexure=spat_flexure)
-            onslit = _slitid_img == slits.spat_id[slit_idx]
-            spat_coo = slits.spatial_coordinate_image(slitidx=slit_idx,
-                                                      initial=initial,
-                                                      slitid_img=_slitid_img,
-                                                      flexure_shift=spat_flexure)
+            # NOTE: Only the pixels in the slit are used.  The spatial
+            # coordinates are the same as those computed by
+            # SlitTraceSet.spatial_coordinate_image.
+            onslit = slits.slit_pixels(slit_idx, initial=initial, flexure=spat_flexure)
+            spat_coo = (onslit[1] - left[onslit[0],slit_idx]) \
+                            / (right[onslit[0],slit_idx] - left[onslit[0],slit_idx])
             if finecorr:
-                spec_coo = np.where(onslit)[0] / (slits.nspec - 1)
-                illumflat[onslit] = spat_bsplines[slit_idx].eval(spat_coo[onslit], spec_coo)
+                spec_coo = onslit[0] / (slits.nspec - 1)
+                illumflat[onslit] = spat_bsplines[slit_idx].eval(spat_coo, spec_coo)
             else:
-                illumflat[onslit] = spat_bsplines[slit_idx].value(spat_coo[onslit])[0]
+                illumflat[onslit] = spat_bsplines[slit_idx].value(spat_coo)[0]
         # TODO -- Update the internal one?  Or remove it altogether??
         return illumflat
 
@@ -867,12 +869,6 @@ class FlatField:
         self.mspixelflat = np.ones_like(rawflat)
         self.msillumflat = np.ones_like(rawflat)
         self.flat_model = np.zeros_like(rawflat)
-
-        # Allocate work arrays only once
-        spec_model = np.ones_like(rawflat)
-        norm_spec = np.ones_like(rawflat)
-        norm_spec_spat = np.ones_like(rawflat)
-        twod_model = np.ones_like(rawflat)
         twod_gpm_out = np.ones_like(rawflat, dtype=bool)
 
         # #################################################
@@ -895,14 +891,22 @@ class FlatField:
             msgs.info('Modeling the flat-field response for slit spat_id={}: {}/{}'.format(
                         slit_spat, slit_idx+1, self.slits.nslits))
 
+            # All the images used to model the slit are cutouts of the
+            # detector images that contain the initial, padded, and trimmed
+            # slit; see SlitTraceSet.slit_cutout.  The cutouts include all
+            # spectral pixels.
+            cut = [self.slits.slit_cutout(slit_idx, pad=_pad, initial=True)
+                        for _pad in [None, pad, -trim]]
+            cut = np.s_[:, min([c[1].start for c in cut]):max([c[1].stop for c in cut])]
+
             # Find the pixels on the initial slit
-            onslit_init = slitid_img_init == slit_spat
+            onslit_init = slitid_img_init[cut] == slit_spat
 
             # Check for saturation of the flat. If there are not enough
             # pixels do not attempt a fit, and continue to the next
             # slit.
             # TODO: set the threshold to a parameter?
-            good_frac = np.sum(onslit_init & (rawflat < nonlinear_counts))/np.sum(onslit_init)
+            good_frac = np.sum(onslit_init & (rawflat[cut] < nonlinear_counts))/np.sum(onslit_init)
             if good_frac < 0.5:
                 common_message = 'To change the behavior, use the \'saturated_slits\' parameter ' \
                                  'in the \'flatfield\' parameter group; see here:\n\n' \
@@ -950,11 +954,12 @@ class FlatField:
             #  calculation?
 
             # Create an image with the spatial coordinates relative to the left edge of this slit
-            spat_coo_init = self.slits.spatial_coordinate_image(slitidx=slit_idx, full=True, initial=True)
+            spat_coo_init = self.slits.spatial_coordinate_image(slitidx=slit_idx, full=True,
+                                                                initial=True, cutout=cut)
 
             # Find pixels on the padded and trimmed slit coordinates
-            onslit_padded = padded_slitid_img == slit_spat
-            onslit_trimmed = trimmed_slitid_img == slit_spat
+            onslit_padded = padded_slitid_img[cut] == slit_spat
+            onslit_trimmed = trimmed_slitid_img[cut] == slit_spat
 
             # ----------------------------------------------------------
             # Collapse the slit spatially and fit the spectral function
@@ -964,13 +969,14 @@ class FlatField:
             # TODO -- JFH Confirm the sign of this shift is correct!
             _flexure = 0. if self.wavetilts.spat_flexure is None else self.wavetilts.spat_flexure
             tilts = tracewave.fit2tilts(rawflat.shape, self.wavetilts['coeffs'][:,:,slit_idx],
-                                        self.wavetilts['func2d'], spat_shift=-1*_flexure)
+                                        self.wavetilts['func2d'], spat_shift=-1*_flexure,
+                                        cutout=cut)
             # Convert the tilt image to an image with the spectral pixel index
             spec_coo = tilts * (nspec-1)
 
             # Only include the trimmed set of pixels in the flat-field
             # fit along the spectral direction.
-            spec_gpm = onslit_trimmed & gpm_log  # & (rawflat < nonlinear_counts)
+            spec_gpm = onslit_trimmed & gpm_log[cut]  # & (rawflat < nonlinear_counts)
             spec_nfit = np.sum(spec_gpm)
             spec_ntot = np.sum(onslit_init)
             msgs.info('Spectral fit of flatfield for {0}/{1} '.format(spec_nfit, spec_ntot)
@@ -986,13 +992,13 @@ class FlatField:
             # Sort the pixels by their spectral coordinate.
             # TODO: Include ivar and sorted gpm in outputs?
             spec_gpm, spec_srt, spec_coo_data, spec_flat_data \
-                    = flat.sorted_flat_data(flat_log, spec_coo, gpm=spec_gpm)
+                    = flat.sorted_flat_data(flat_log[cut], spec_coo, gpm=spec_gpm)
             # NOTE: By default np.argsort sorts the data over the last
             # axis. Just to avoid the possibility (however unlikely) of
             # spec_coo[spec_gpm] returning an array, all the arrays are
             # explicitly flattened.
-            spec_ivar_data = ivar_log[spec_gpm].ravel()[spec_srt]
-            spec_gpm_data = gpm_log[spec_gpm].ravel()[spec_srt]
+            spec_ivar_data = ivar_log[cut][spec_gpm].ravel()[spec_srt]
+            spec_gpm_data = gpm_log[cut][spec_gpm].ravel()[spec_srt]
 
             # Rejection threshold for spectral fit in log(image)
             # TODO: Make this a parameter?
@@ -1025,11 +1031,11 @@ class FlatField:
 
             if sticky:
                 # Add rejected pixels to gpm
-                gpm[spec_gpm] = (spec_gpm_fit & spec_gpm_data)[np.argsort(spec_srt)]
+                gpm[cut][spec_gpm] = (spec_gpm_fit & spec_gpm_data)[np.argsort(spec_srt)]
 
             # Construct the model of the flat-field spectral shape
             # including padding on either side of the slit.
-            spec_model[...] = 1.
+            spec_model = np.ones_like(rawflat[cut])
             spec_model[onslit_padded] = np.exp(spec_bspl.value(spec_coo[onslit_padded])[0])
             # ----------------------------------------------------------
 
@@ -1038,14 +1044,14 @@ class FlatField:
             # spectral response, and then collapse the slit spectrally.
 
             # Normalize out the spectral shape of the flat
-            norm_spec[...] = 1.
-            norm_spec[onslit_padded] = rawflat[onslit_padded] \
+            norm_spec = np.ones_like(rawflat[cut])
+            norm_spec[onslit_padded] = rawflat[cut][onslit_padded] \
                                             / np.fmax(spec_model[onslit_padded],1.0)
 
             # Find pixels fot fit in the spatial direction:
             #   - Fit pixels in the padded slit that haven't been masked
             #     by the BPM
-            spat_gpm = onslit_padded & gpm #& (rawflat < nonlinear_counts)
+            spat_gpm = onslit_padded & gpm[cut] #& (rawflat < nonlinear_counts)
             #   - Fit pixels with non-zero flux and less than 70% above
             #     the average spectral profile.
             spat_gpm &= (norm_spec > 0.0) & (norm_spec < 1.7)
@@ -1082,7 +1088,7 @@ class FlatField:
             exit_status, spat_coo_data,  spat_flat_data, spat_bspl, spat_gpm_fit, \
                 spat_flat_fit, spat_flat_data_raw \
                         = self.spatial_fit(norm_spec, spat_coo_init, median_slit_widths[slit_idx],
-                                           spat_gpm, gpm, debug=debug)
+                                           spat_gpm, gpm[cut], debug=debug)
 
             if tweak_slits:
                 # TODO: Should the tweak be based on the bspline fit?
@@ -1099,11 +1105,30 @@ class FlatField:
                 #  different from the result when you construct the
                 #  image for all slits. Fix this...
 
+                # Make sure the cutout includes all pixels in the tweaked
+                # slit
+                tweak_cut = self.slits.slit_cutout(slit_idx, initial=False)
+                if tweak_cut[1].start < cut[1].start or tweak_cut[1].stop > cut[1].stop:
+                    _cut = np.s_[:, min(cut[1].start, tweak_cut[1].start)
+                                    :max(cut[1].stop, tweak_cut[1].stop)]
+                    onslit_padded = expand_cutout(onslit_padded, cut, _cut, False)
+                    spat_gpm = expand_cutout(spat_gpm, cut, _cut, False)
+                    spec_model = expand_cutout(spec_model, cut, _cut, 1.)
+                    norm_spec = expand_cutout(norm_spec, cut, _cut, 1.)
+                    cut = _cut
+                    spec_coo = tracewave.fit2tilts(rawflat.shape,
+                                                   self.wavetilts['coeffs'][:,:,slit_idx],
+                                                   self.wavetilts['func2d'],
+                                                   spat_shift=-1*_flexure, cutout=cut) * (nspec-1)
+
                 # Update the onslit mask
-                _slitid_img = self.slits.slit_img(slitidx=slit_idx, initial=False)
-                onslit_tweak = _slitid_img == slit_spat
+                onslit_tweak = np.zeros(spec_coo.shape, dtype=bool)
+                _spec, _spat = self.slits.slit_pixels(slit_idx, initial=False)
+                onslit_tweak[_spec, _spat - cut[1].start] = True
+                _slitid_img = np.where(onslit_tweak, slit_spat, -1)
                 spat_coo_tweak = self.slits.spatial_coordinate_image(slitidx=slit_idx,
-                                                               slitid_img=_slitid_img)
+                                                                     slitid_img=_slitid_img,
+                                                                     cutout=cut)
 
                 # Construct the empirical illumination profile
                 # TODO This is extremely inefficient, because we only need to re-fit the illumflat, but
@@ -1112,11 +1137,11 @@ class FlatField:
                 #  save a ton of runtime. It is not a trivial change becauase the coords are sorted, etc.
                 exit_status, spat_coo_data, spat_flat_data, spat_bspl, spat_gpm_fit, \
                     spat_flat_fit, spat_flat_data_raw = self.spatial_fit(
-                    norm_spec, spat_coo_tweak, median_slit_widths[slit_idx], spat_gpm, gpm, debug=False)
+                    norm_spec, spat_coo_tweak, median_slit_widths[slit_idx], spat_gpm, gpm[cut],
+                    debug=False)
 
                 spat_coo_final = spat_coo_tweak
             else:
-                _slitid_img = slitid_img_init
                 spat_coo_final = spat_coo_init
                 onslit_tweak = onslit_init
 
@@ -1159,15 +1184,17 @@ class FlatField:
                 spat_model = np.ones_like(spec_model)
                 spat_model[onslit_padded] = spat_bspl.value(spat_coo_final[onslit_padded])[0]
                 specspat_illum = np.fmax(spec_model, 1.0) * spat_model
-                norm_spatspec = rawflat / specspat_illum
-                self.spatial_fit_finecorr(norm_spatspec, onslit_tweak, slit_idx, slit_spat, gpm, doqa=doqa)
+                norm_spatspec = rawflat[cut] / specspat_illum
+                self.spatial_fit_finecorr(norm_spatspec, onslit_tweak, slit_idx, slit_spat, gpm[cut],
+                                          cut=cut, doqa=doqa)
 
             # ----------------------------------------------------------
             # Construct the illumination profile with the tweaked edges
             # of the slit
             if exit_status <= 1:
                 # TODO -- JFH -- Check this is ok for flexure!!
-                self.msillumflat[onslit_tweak] = spat_illum_fine * spat_bspl.value(spat_coo_final[onslit_tweak])[0]
+                self.msillumflat[cut][onslit_tweak] \
+                        = spat_illum_fine * spat_bspl.value(spat_coo_final[onslit_tweak])[0]
                 self.list_of_spat_bsplines[slit_idx] = spat_bspl
                 # No need to proceed further if we just need the illumination profile
                 if spat_illum_only:
@@ -1184,9 +1211,10 @@ class FlatField:
             msgs.info('Performing 2D illumination + scattered light flat field fit')
 
             # Construct the spectrally and spatially normalized flat
-            norm_spec_spat[...] = 1.
-            norm_spec_spat[onslit_tweak] = rawflat[onslit_tweak] / np.fmax(spec_model[onslit_tweak], 1.0) \
-                                                    / np.fmax(self.msillumflat[onslit_tweak], 0.01)
+            norm_spec_spat = np.ones_like(rawflat[cut])
+            norm_spec_spat[onslit_tweak] = rawflat[cut][onslit_tweak] \
+                                                / np.fmax(spec_model[onslit_tweak], 1.0) \
+                                                / np.fmax(self.msillumflat[cut][onslit_tweak], 0.01)
 
             # Sort the pixels by their spectral coordinate. The mask
             # uses the nominal padding defined by the slits object.
@@ -1195,7 +1223,7 @@ class FlatField:
             # Also apply the sorting to the spatial coordinates
             twod_spat_coo_data = spat_coo_final[twod_gpm].ravel()[twod_srt]
             # TODO: Reset back to origin gpm if sticky is true?
-            twod_gpm_data = gpm[twod_gpm].ravel()[twod_srt]
+            twod_gpm_data = gpm[cut][twod_gpm].ravel()[twod_srt]
             # Only fit data with less than 30% variations
             # TODO: Make 30% a parameter?
             twod_gpm_data &= np.absolute(twod_flat_data - 1) < 0.3
@@ -1264,36 +1292,37 @@ class FlatField:
                 plt.show()
 
             # Save the 2D residual model
-            twod_model[...] = 1.
+            twod_model = np.ones_like(rawflat[cut])
             if exit_status > 1:
                 msgs.warn('Two-dimensional fit to flat-field data failed!  No higher order '
                           'flat-field corrections included in model of slit {0}!'.format(slit_spat))
                 self.slits.mask[slit_idx] = self.slits.bitmask.turn_on(self.slits.mask[slit_idx], 'BADFLATCALIB')
             else:
                 twod_model[twod_gpm] = twod_flat_fit[np.argsort(twod_srt)]
-                twod_gpm_out[twod_gpm] = twod_gpm_fit[np.argsort(twod_srt)]
+                twod_gpm_out[cut][twod_gpm] = twod_gpm_fit[np.argsort(twod_srt)]
 
 
             # Construct the full flat-field model
             # TODO: Why is the 0.05 here for the illumflat compared to the 0.01 above?
-            self.flat_model[onslit_tweak] = twod_model[onslit_tweak] \
-                                        * np.fmax(self.msillumflat[onslit_tweak], 0.05) \
+            self.flat_model[cut][onslit_tweak] = twod_model[onslit_tweak] \
+                                        * np.fmax(self.msillumflat[cut][onslit_tweak], 0.05) \
                                         * np.fmax(spec_model[onslit_tweak], 1.0)
 
             # Construct the pixel flat
             #trimmed_slitid_img_anew = self.slits.slit_img(pad=-trim, slitidx=slit_idx)
             #onslit_trimmed_anew = trimmed_slitid_img_anew == slit_spat
-            self.mspixelflat[onslit_tweak] = rawflat[onslit_tweak]/self.flat_model[onslit_tweak]
+            self.mspixelflat[cut][onslit_tweak] \
+                    = rawflat[cut][onslit_tweak]/self.flat_model[cut][onslit_tweak]
             # TODO: Add some code here to treat the edges and places where fits
             #  go bad?
 
             # Minimum wavelength?
             if self.flatpar['pixelflat_min_wave'] is not None:
-                bad_wv = self.waveimg[onslit_tweak] < self.flatpar['pixelflat_min_wave']
+                bad_wv = self.waveimg[cut][onslit_tweak] < self.flatpar['pixelflat_min_wave']
                 self.mspixelflat[np.where(onslit_tweak)[0][bad_wv]] = 1.
             # Maximum wavelength?
             if self.flatpar['pixelflat_max_wave'] is not None:
-                bad_wv = self.waveimg[onslit_tweak] > self.flatpar['pixelflat_max_wave']
+                bad_wv = self.waveimg[cut][onslit_tweak] > self.flatpar['pixelflat_max_wave']
                 self.mspixelflat[np.where(onslit_tweak)[0][bad_wv]] = 1.
 
         # No need to continue if we're just doing the spatial illumination
@@ -1375,7 +1404,8 @@ class FlatField:
         return exit_status, spat_coo_data, spat_flat_data, spat_bspl, spat_gpm_fit, \
                spat_flat_fit, spat_flat_data_raw
 
-    def spatial_fit_finecorr(self, normed, onslit_tweak, slit_idx, slit_spat, gpm, slit_trim=3, doqa=False):
+    def spatial_fit_finecorr(self, normed, onslit_tweak, slit_idx, slit_spat, gpm, cut=None,
+                             slit_trim=3, doqa=False):
         """
         Generate a relative scaling image for a slicer IFU. All
         slits are scaled relative to a reference slit, specified in
@@ -1393,6 +1423,12 @@ class FlatField:
             Spatial ID of the slit
         gpm : `numpy.ndarray`_
             Good pixel mask
+        cut : tuple, optional
+            Slices selecting the cutout of the detector images that contains
+            the slit; see :func:`~pypeit.slittrace.SlitTraceSet.slit_cutout`.
+            If provided, ``normed``, ``onslit_tweak``, and ``gpm`` must be
+            cutouts of the detector images.  The cutout must include all
+            spectral pixels.  If None, the full images are used.
         slit_txt : str
             if pypeline is "Echelle", then slit_txt should be set to "order", otherwise, use "slit"
         slit_trim : int, optional
@@ -1407,27 +1443,37 @@ class FlatField:
         slit_txt = self.slits.slitord_txt
         slit_ordid = self.slits.slitord_id[slit_idx]
         msgs.info(f"Performing a fine correction to the spatial illumination ({slit_txt} {slit_ordid})")
+        if cut is None:
+            cut = np.s_[:, 0:self.slits.nspat]
+        # Cutouts of the detector images
+        waveimg = self.waveimg[cut]
+        fullmask = self.rawflatimg.fullmask
+        rawgpm = np.logical_not(fullmask.bitmask.flagged(fullmask.mask[cut]))
         # initialise
-        illumflat_finecorr = np.ones_like(self.rawflatimg.image)
+        illumflat_finecorr = np.ones_like(normed)
         # Trim the edges by a few pixels to avoid edge effects
-        onslit_tweak_trim = self.slits.slit_img(pad=-slit_trim, slitidx=slit_idx, initial=False) == slit_spat
+        onslit_tweak_trim = np.zeros(normed.shape, dtype=bool)
+        _spec, _spat = self.slits.slit_pixels(slit_idx, pad=-slit_trim, initial=False)
+        onslit_tweak_trim[_spec, _spat - cut[1].start] = True
         # Setup
         slitimg = (slit_spat + 1) * onslit_tweak.astype(int) - 1  # Need to +1 and -1 so that slitimg=-1 when off the slit
         left, right, msk = self.slits.select_edges(initial=True, flexure=self.wavetilts.spat_flexure)
-        this_left = left[:, slit_idx]
-        this_right = right[:, slit_idx]
+        # Edges in the cutout coordinates
+        this_left = left[:, slit_idx] - cut[1].start
+        this_right = right[:, slit_idx] - cut[1].start
         slitlen = int(np.median(this_right - this_left))
 
         # Generate the coordinates to evaluate the fit
-        this_slit = np.where(onslit_tweak & self.rawflatimg.select_flag(invert=True) & (self.waveimg!=0.0))
-        this_wave = self.waveimg[this_slit]
+        this_slit = np.where(onslit_tweak & rawgpm & (waveimg!=0.0))
+        this_wave = waveimg[this_slit]
         xpos_img = self.slits.spatial_coordinate_image(slitidx=slit_idx,
                                                        initial=True,
                                                        slitid_img=slitimg,
-                                                       flexure_shift=self.wavetilts.spat_flexure)
+                                                       flexure_shift=self.wavetilts.spat_flexure,
+                                                       cutout=cut)
         # Generate the trimmed versions for fitting
-        this_slit_trim = np.where(onslit_tweak_trim & self.rawflatimg.select_flag(invert=True))
-        this_wave_trim = self.waveimg[this_slit_trim]
+        this_slit_trim = np.where(onslit_tweak_trim & rawgpm)
+        this_wave_trim = waveimg[this_slit_trim]
         wave_min, wave_max = this_wave_trim.min(), this_wave_trim.max()
         ypos_fit = (this_wave_trim - wave_min) / (wave_max - wave_min)
         xpos_fit = xpos_img[this_slit_trim]
@@ -1694,6 +1740,31 @@ def spatillum_finecorr_qa(normed, finecorr, left, right, ypos, cut, outfile=None
     return
 
 
+def expand_cutout(img, cut, new_cut, fill):
+    """
+    Place an image cutout in a larger cutout of the same detector image.
+
+    Args:
+        img (`numpy.ndarray`_):
+            Cutout selected by ``cut``.
+        cut (:obj:`tuple`):
+            Slices selecting ``img`` from the detector image; see
+            :func:`~pypeit.slittrace.SlitTraceSet.slit_cutout`.  The cutout
+            must include all spectral pixels.
+        new_cut (:obj:`tuple`):
+            Slices selecting the new cutout, which must contain ``cut``.
+        fill (scalar):
+            Value for the pixels in the new cutout that are not in ``img``.
+
+    Returns:
+        `numpy.ndarray`_: The expanded cutout.
+    """
+    _img = np.full((img.shape[0], new_cut[1].stop - new_cut[1].start), fill, dtype=img.dtype)
+    start = cut[1].start - new_cut[1].start
+    _img[:,start:start+img.shape[1]] = img
+    return _img
+
+
 def detector_structure_qa(det_resp, det_resp_model, outfile=None, title="Detector Structure Correction"):
     """
     Plot the QA for the fine correction fits to the spatial illumination profile
@@ -68,6 +68,16 @@ class BitMaskArray(DataContainer):
         self.mask[...] = arr[...]
         return self
 
+    def __reduce__(self):
+        """
+        Reconstruct the object from the mask array when unpickling.
+
+        The overrides of :func:`__getattr__` and :func:`__setitem__` prevent
+        the default pickling protocol for dictionary subclasses from working.
+        Pickling is required to pass objects between processes.
+        """
+        return (self.__class__.from_array, (self.mask,))
+
     def _set_keys(self):
         """
         Set :attr:`lower_keys`, which are needed for the bit access convenience
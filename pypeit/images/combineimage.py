@@ -5,6 +5,8 @@
 """
 
 import os
+import tempfile
+import contextlib
 
 from IPython import embed
 
@@ -127,6 +129,21 @@ class CombineImage:
         propagated to the combined-image mask; see
         :func:`~pypeit.images.pypeitimage.PypeItImage.build_mask`.
         
+        The files can be processed in parallel by setting the ``n_proc``
+        parameter (see :class:`~pypeit.par.pypeitpar.ProcessImagesPar`).  The
+        calibrations are passed to each process only once, and the processed
+        images are collected in the order of :attr:`files`, meaning the result
+        is identical to processing the files serially.
+
+        To limit the memory used when combining many large images, set the
+        ``comb_mem_limit`` parameter (see
+        :class:`~pypeit.par.pypeitpar.ProcessImagesPar`).  If the stack of
+        processed images exceeds this limit, the images are written to temporary
+        memory-mapped files as they are processed, and they are combined in
+        blocks of image rows; see :func:`stack_block_nrows`.  Because all of the
+        combination operations are independent for each pixel, the result is
+        identical to combining the full stack in memory.
+
         .. warning::
 
             All image processing of the data in :attr:`files` *must* result
@@ -190,117 +207,138 @@ class CombineImage:
             msgs.error(f'Unknown image combination method, {combine_method}.  Must be '
                        '"mean" or "median".')
 
-        # Loop on the files
-        for kk, ifile in enumerate(self.files):
-            # Load raw image
-            rawImage = rawimage.RawImage(ifile, self.spectrograph, self.det)
-            # Process
-            pypeitImage = rawImage.process(self.par, scattlight=scattlight, bias=bias, bpm=bpm, dark=dark,
-                                           flatimages=flatimages, slits=slits, mosaic=mosaic)
-
-            if self.nfiles == 1:
-                # Only 1 file, so we're done
-                pypeitImage.files = self.files
-                return pypeitImage
-            elif kk == 0:
-                # Allocate arrays to collect data for each frame
-                shape = (self.nfiles,) + pypeitImage.shape
-                img_stack = np.zeros(shape, dtype=float)
-                scl_stack = np.ones(shape, dtype=float)
-                rn2img_stack = np.zeros(shape, dtype=float)
-                basev_stack = np.zeros(shape, dtype=float)
-                gpm_stack = np.zeros(shape, dtype=bool)
-                lampstat = [None]*self.nfiles
-                exptime = np.zeros(self.nfiles, dtype=float)
-
-            # Save the lamp status
-            # TODO: As far as I can tell, this is the *only* place rawheadlist
-            # is used.  Is there a way we can get this from fitstbl instead?
-            lampstat[kk] = self.spectrograph.get_lamps_status(pypeitImage.rawheadlist)
-            # Save the exposure time to check if it's consistent for all images.
-            exptime[kk] = pypeitImage.exptime
-            # Processed image
-            img_stack[kk] = pypeitImage.image
-            # Get the count scaling
-            if pypeitImage.img_scale is not None:
-                scl_stack[kk] = pypeitImage.img_scale
-            # Read noise squared image
-            if pypeitImage.rn2img is not None:
-                rn2img_stack[kk] = pypeitImage.rn2img * scl_stack[kk]**2
-            # Processing variance image
-            if pypeitImage.base_var is not None:
-                basev_stack[kk] = pypeitImage.base_var * scl_stack[kk]**2
-            # Final mask for this image
-            # TODO: This seems kludgy to me. Why not just pass ignore_saturation
-            # to process_one and ignore the saturation when the mask is actually
-            # built, rather than untoggling the bit here?
-            if ignore_saturation:  # Important for calibrations as we don't want replacement by 0
-                pypeitImage.update_mask('SATURATION', action='turn_off')
-            # Get a simple boolean good-pixel mask for all the unmasked pixels
-            gpm_stack[kk] = pypeitImage.select_flag(invert=True)
-
-        # Check that the lamps being combined are all the same:
-        if not lampstat[1:] == lampstat[:-1]:
-            msgs.warn("The following files contain different lamp status")
-            # Get the longest strings
-            maxlen = max([len("Filename")]+[len(os.path.split(x)[1]) for x in self.files])
-            maxlmp = max([len("Lamp status")]+[len(x) for x in lampstat])
-            strout = "{0:" + str(maxlen) + "}  {1:s}"
-            # Print the messages
-            print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
-            print(msgs.indent() + strout.format("Filename", "Lamp status"))
-            print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
-            for ff, file in enumerate(self.files):
-                print(msgs.indent()
-                      + strout.format(os.path.split(file)[1], " ".join(lampstat[ff].split("_"))))
-            print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
-
-        # Do a similar check for exptime
-        if np.any(np.absolute(np.diff(exptime)) > 0):
-            # TODO: This should likely throw an error instead!
-            msgs.warn('Exposure time is not consistent for all images being combined!  '
-                      'Using the average.')
-            comb_texp = np.mean(exptime)
-        else:
-            comb_texp = exptime[0]
-
-        # Coadd them
-        if combine_method == 'mean':
-            weights = np.ones(self.nfiles, dtype=float)/self.nfiles
-            img_list_out, var_list_out, gpm, nframes \
-                    = combine.weighted_combine(weights,
-                                               [img_stack, scl_stack],  # images to stack
-                                               [rn2img_stack, basev_stack], # variances to stack
-                                               gpm_stack, sigma_clip=sigma_clip,
-                                               sigma_clip_stack=img_stack,  # clipping based on img
-                                               sigrej=sigrej, maxiters=maxiters)
-            comb_img, comb_scl = img_list_out
-            comb_rn2, comb_basev = var_list_out
-            # Divide by the number of images that contributed to each pixel
-            comb_scl[gpm] /= nframes[gpm]
-
-        elif combine_method == 'median':
-            bpm_stack = np.logical_not(gpm_stack)
-            nframes = np.sum(gpm_stack, axis=0)
-            gpm = nframes > 0
-            comb_img = np.ma.median(np.ma.MaskedArray(img_stack, mask=bpm_stack),axis=0).filled(0.)
-            # TODO: I'm not sure if this is right.  Maybe we should just take
-            # the masked average scale instead?
-            comb_scl = np.ma.median(np.ma.MaskedArray(scl_stack, mask=bpm_stack),axis=0).filled(0.)
-            # First calculate the error in the sum.  The variance is set to 0
-            # for pixels masked in all images.
-            comb_rn2 = np.ma.sum(np.ma.MaskedArray(rn2img_stack, mask=bpm_stack),axis=0).filled(0.)
-            comb_basev = np.ma.sum(np.ma.MaskedArray(basev_stack, mask=bpm_stack),axis=0).filled(0.)
-            # Convert to standard error in the median (pi/2 factor relates standard variance
-            # in mean (sum(variance_i)/n^2) to standard variance in median)
-            comb_rn2[gpm] *= np.pi/2/nframes[gpm]**2
-            comb_basev[gpm] *= np.pi/2/nframes[gpm]**2
-            # Divide by the number of images that contributed to each pixel
-            comb_scl[gpm] *= np.pi/2/nframes[gpm]
-        else:
-            # NOTE: Given the check at the beginning of the function, the code
-            # should *never* make it here.
-            msgs.error("Bad choice for combine.  Allowed options are 'median', 'mean'.")
+        # Number of processes used to process the files
+        n_proc = utils.get_nproc(self.par['n_proc'], self.nfiles)
+        process_kwargs = dict(scattlight=scattlight, bias=bias, bpm=bpm, dark=dark,
+                              flatimages=flatimages, slits=slits, mosaic=mosaic)
+
+        # Temporary directory for memory-mapped stacks, if needed.  It is
+        # always removed, even if the processing or combination fails.
+        scratch = None
+        try:
+            with contextlib.ExitStack() as context:
+                if n_proc > 1:
+                    msgs.info(f'Processing {self.nfiles} files using {n_proc} processes.')
+                    # NOTE: The calibrations are passed to each process once, when
+                    # it is started, instead of with every file.  The processed
+                    # images are returned in the order of the files.  Files are
+                    # only submitted as the processed images are added to the
+                    # stack, such that no more than n_proc processed images are
+                    # held in memory at once, in addition to the stack.
+                    pool = context.enter_context(
+                                utils.SharedProcessPool(n_proc, self.process_file,
+                                                        **process_kwargs))
+                    processed = pool.map(self.files, max_pending=n_proc)
+                else:
+                    processed = (self.process_file(ifile, **process_kwargs) for ifile in self.files)
+
+                # Loop on the processed files
+                for kk, pypeitImage in enumerate(processed):
+                    if self.nfiles == 1:
+                        # Only 1 file, so we're done
+                        pypeitImage.files = self.files
+                        return pypeitImage
+                    elif kk == 0:
+                        # Allocate arrays to collect data for each frame
+                        shape = (self.nfiles,) + pypeitImage.shape
+                        # Number of image rows to combine at once; None means the full
+                        # stack is kept in memory.
+                        block_nrows = self.stack_block_nrows(shape)
+                        if block_nrows is not None:
+                            # Write the stack to memory-mapped files in a temporary
+                            # directory
+                            scratch = tempfile.TemporaryDirectory(prefix='pypeit_combine_',
+                                                                  ignore_cleanup_errors=True)
+                            msgs.info(f'Stack of {self.nfiles} images exceeds the memory limit; '
+                                      'writing the processed images to temporary files in '
+                                      f'{scratch.name} and combining them in blocks of '
+                                      f'{block_nrows} rows.')
+                        img_stack = self.empty_stack(shape, float, scratch=scratch, name='img')
+                        scl_stack = self.empty_stack(shape, float, scratch=scratch, name='scl')
+                        rn2img_stack = self.empty_stack(shape, float, scratch=scratch,
+                                                        name='rn2img')
+                        basev_stack = self.empty_stack(shape, float, scratch=scratch, name='basev')
+                        gpm_stack = self.empty_stack(shape, bool, scratch=scratch, name='gpm')
+                        lampstat = [None]*self.nfiles
+                        exptime = np.zeros(self.nfiles, dtype=float)
+
+                    # Save the lamp status
+                    # TODO: As far as I can tell, this is the *only* place rawheadlist
+                    # is used.  Is there a way we can get this from fitstbl instead?
+                    lampstat[kk] = self.spectrograph.get_lamps_status(pypeitImage.rawheadlist)
+                    # Save the exposure time to check if it's consistent for all images.
+                    exptime[kk] = pypeitImage.exptime
+                    # Processed image
+                    img_stack[kk] = pypeitImage.image
+                    # Get the count scaling
+                    scl_stack[kk] = 1. if pypeitImage.img_scale is None else pypeitImage.img_scale
+                    # Read noise squared image
+                    if pypeitImage.rn2img is not None:
+                        rn2img_stack[kk] = pypeitImage.rn2img * scl_stack[kk]**2
+                    # Processing variance image
+                    if pypeitImage.base_var is not None:
+                        basev_stack[kk] = pypeitImage.base_var * scl_stack[kk]**2
+                    # Final mask for this image
+                    # TODO: This seems kludgy to me. Why not just pass ignore_saturation
+                    # to process_one and ignore the saturation when the mask is actually
+                    # built, rather than untoggling the bit here?
+                    # Important for calibrations as we don't want replacement by 0
+                    if ignore_saturation:
+                        pypeitImage.update_mask('SATURATION', action='turn_off')
+                    # Get a simple boolean good-pixel mask for all the unmasked pixels
+                    gpm_stack[kk] = pypeitImage.select_flag(invert=True)
+
+            # Check that the lamps being combined are all the same:
+            if not lampstat[1:] == lampstat[:-1]:
+                msgs.warn("The following files contain different lamp status")
+                # Get the longest strings
+                maxlen = max([len("Filename")]+[len(os.path.split(x)[1]) for x in self.files])
+                maxlmp = max([len("Lamp status")]+[len(x) for x in lampstat])
+                strout = "{0:" + str(maxlen) + "}  {1:s}"
+                # Print the messages
+                print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
+                print(msgs.indent() + strout.format("Filename", "Lamp status"))
+                print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
+                for ff, file in enumerate(self.files):
+                    print(msgs.indent()
+                          + strout.format(os.path.split(file)[1],
+                                          " ".join(lampstat[ff].split("_"))))
+                print(msgs.indent() + '-'*maxlen + "  " + '-'*maxlmp)
+
+            # Do a similar check for exptime
+            if np.any(np.absolute(np.diff(exptime)) > 0):
+                # TODO: This should likely throw an error instead!
+                msgs.warn('Exposure time is not consistent for all images being combined!  '
+                          'Using the average.')
+                comb_texp = np.mean(exptime)
+            else:
+                comb_texp = exptime[0]
+
+            # Coadd them
+            if block_nrows is None:
+                comb_img, comb_scl, comb_rn2, comb_basev, gpm, nframes \
+                        = self.combine_stack(img_stack, scl_stack, rn2img_stack, basev_stack,
+                                             gpm_stack, combine_method=combine_method,
+                                             sigma_clip=sigma_clip, sigrej=sigrej,
+                                             maxiters=maxiters)
+            else:
+                # Combine the images in blocks of rows.  All the combination
+                # operations are independent for each pixel, meaning the result is
+                # identical to combining the full stack at once.
+                comb_blocks = []
+                for i in range(0, shape[1], block_nrows):
+                    s = np.s_[:,i:i+block_nrows]
+                    comb_blocks += [self.combine_stack(img_stack[s], scl_stack[s], rn2img_stack[s],
+                                                       basev_stack[s], gpm_stack[s],
+                                                       combine_method=combine_method,
+                                                       sigma_clip=sigma_clip, sigrej=sigrej,
+                                                       maxiters=maxiters)]
+                comb_img, comb_scl, comb_rn2, comb_basev, gpm, nframes \
+                        = [np.concatenate(b, axis=0) for b in zip(*comb_blocks)]
+                del comb_blocks, img_stack, scl_stack, rn2img_stack, basev_stack, gpm_stack
+        finally:
+            if scratch is not None:
+                scratch.cleanup()
 
         # Recompute the inverse variance using the combined image
         comb_var = procimg.variance_model(comb_basev,
@@ -337,6 +375,154 @@ class CombineImage:
         # Return
         return comb
 
+    def process_file(self, ifile, **kwargs):
+        """
+        Process a single raw file.
+
+        Args:
+            ifile (:obj:`str`):
+                File to process.
+            **kwargs:
+                Passed directly to
+                :func:`~pypeit.images.rawimage.RawImage.process`.
+
+        Returns:
+            :class:`~pypeit.images.pypeitimage.PypeItImage`: The processed
+            image.
+        """
+        # Load raw image
+        rawImage = rawimage.RawImage(ifile, self.spectrograph, self.det)
+        # Process
+        return rawImage.process(self.par, **kwargs)
+
+    def stack_block_nrows(self, shape):
+        """
+        Determine the number of image rows to combine at once, given the memory
+        limit set by the ``comb_mem_limit`` parameter.
+
+        The memory accounting includes the image, scaling, read-noise variance,
+        processing variance, and good-pixel mask stacks.
+
+        Args:
+            shape (:obj:`tuple`):
+                Shape of the full image stack; i.e., the number of images
+                followed by the shape of each processed image.
+
+        Returns:
+            :obj:`int`: The number of rows to combine at once.  If None, the
+            full stack fits within the memory limit (or there is no limit), and
+            it is kept in memory.
+        """
+        if self.par['comb_mem_limit'] is None:
+            return None
+        # Four floating-point stacks and one boolean stack
+        row_bytes = shape[0] * np.prod(shape[2:]) \
+                        * (4*np.dtype(float).itemsize + np.dtype(bool).itemsize)
+        nrows = int(self.par['comb_mem_limit']*1024**2 // row_bytes)
+        return None if nrows >= shape[1] else max(nrows, 1)
+
+    @staticmethod
+    def empty_stack(shape, dtype, scratch=None, name=None):
+        """
+        Allocate an image stack.
+
+        Args:
+            shape (:obj:`tuple`):
+                Shape of the image stack.
+            dtype (:obj:`type`):
+                Data type of the stack.
+            scratch (`tempfile.TemporaryDirectory`_, optional):
+                Temporary directory used for a memory-mapped stack.  If None,
+                the stack is held in memory.
+            name (:obj:`str`, optional):
+                Root name of the memory-mapped file.  Only used if ``scratch``
+                is provided.
+
+        Returns:
+            `numpy.ndarray`_: The image stack, initialized to 0 (or False).  If
+            ``scratch`` is provided, this is a `numpy.memmap`_ object.
+        """
+        if scratch is None:
+            return np.zeros(shape, dtype=dtype)
+        return np.lib.format.open_memmap(os.path.join(scratch.name, f'{name}.npy'), mode='w+',
+                                         dtype=dtype, shape=shape)
+
+    @staticmethod
+    def combine_stack(img_stack, scl_stack, rn2img_stack, basev_stack, gpm_stack,
+                      combine_method='mean', sigma_clip=True, sigrej=None, maxiters=5):
+        """
+        Combine a stack of processed images.
+
+        See :func:`run` for a description of the combination methods and the
+        propagation of the variance.  All arrays must have the same shape, with
+        the first axis running over the images in the stack.
+
+        Args:
+            img_stack (`numpy.ndarray`_):
+                Processed images.
+            scl_stack (`numpy.ndarray`_):
+                Image scaling applied during processing.
+            rn2img_stack (`numpy.ndarray`_):
+                Read-noise variance, including the image scaling.
+            basev_stack (`numpy.ndarray`_):
+                Processing variance, including the image scaling.
+            gpm_stack (`numpy.ndarray`_):
+                Boolean good-pixel masks.
+            combine_method (:obj:`str`, optional):
+                Method used to combine images.  Must be ``'mean'`` or
+                ``'median'``.
+            sigma_clip (:obj:`bool`, optional):
+                When ``combine_method='mean'``, perform a sigma-clip the data.
+            sigrej (:obj:`float`, optional):
+                Sigma-rejection threshold; see :func:`run`.
+            maxiters (:obj:`int`, optional):
+                Maximum number of rejection iterations; see :func:`run`.
+
+        Returns:
+            :obj:`tuple`: The combined image, image scaling, read-noise
+            variance, and processing variance, the good-pixel mask of the
+            combined image, and the number of images contributing to each
+            pixel.
+        """
+        if combine_method == 'mean':
+            weights = np.ones(img_stack.shape[0], dtype=float)/img_stack.shape[0]
+            img_list_out, var_list_out, gpm, nframes \
+                    = combine.weighted_combine(weights,
+                                               [img_stack, scl_stack],  # images to stack
+                                               [rn2img_stack, basev_stack], # variances to stack
+                                               gpm_stack, sigma_clip=sigma_clip,
+                                               sigma_clip_stack=img_stack,  # clipping based on img
+                                               sigrej=sigrej, maxiters=maxiters)
+            comb_img, comb_scl = img_list_out
+            comb_rn2, comb_basev = var_list_out
+            # Divide by the number of images that contributed to each pixel
+            comb_scl[gpm] /= nframes[gpm]
+
+        elif combine_method == 'median':
+            bpm_stack = np.logical_not(gpm_stack)
+            nframes = np.sum(gpm_stack, axis=0)
+            gpm = nframes > 0
+            comb_img = np.ma.median(np.ma.MaskedArray(img_stack, mask=bpm_stack),axis=0).filled(0.)
+            # TODO: I'm not sure if this is right.  Maybe we should just take
+            # the masked average scale instead?
+            comb_scl = np.ma.median(np.ma.MaskedArray(scl_stack, mask=bpm_stack),axis=0).filled(0.)
+            # First calculate the error in the sum.  The variance is set to 0
+            # for pixels masked in all images.
+            comb_rn2 = np.ma.sum(np.ma.MaskedArray(rn2img_stack, mask=bpm_stack),axis=0).filled(0.)
+            comb_basev = np.ma.sum(np.ma.MaskedArray(basev_stack, mask=bpm_stack),axis=0).filled(0.)
+            # Convert to standard error in the median (pi/2 factor relates standard variance
+            # in mean (sum(variance_i)/n^2) to standard variance in median)
+            comb_rn2[gpm] *= np.pi/2/nframes[gpm]**2
+            comb_basev[gpm] *= np.pi/2/nframes[gpm]**2
+            # Divide by the number of images that contributed to each pixel
+            comb_scl[gpm] *= np.pi/2/nframes[gpm]
+        else:
+            # NOTE: Given the check at the beginning of run, the code should
+            # *never* make it here.
+            msgs.error("Bad choice for combine.  Allowed options are 'median', 'mean'.")
+
+        return comb_img, comb_scl, comb_rn2, comb_basev, gpm, nframes
+
     @property
     def nfiles(self):
         """
@@ -344,4 +530,3 @@ class CombineImage:
         """
         return len(self.files) if isinstance(self.files, (np.ndarray, list)) else 0
 
-
@@ -641,7 +641,8 @@ class RawImage:
         # bias and dark subtraction) and before field flattening.  Also the
         # function checks that the slits exist if running the spatial flexure
         # correction, so no need to do it again here.
-        self.spat_flexure_shift = self.spatial_flexure_shift(slits, maxlag = self.par['spat_flexure_maxlag']) \
+        self.spat_flexure_shift = self.spatial_flexure_shift(slits, maxlag = self.par['spat_flexure_maxlag'],
+                                                             method=self.par['spat_flexure_method']) \
                                     if self.par['spat_flexure_correct'] else None
 
         #   - Subtract scattered light... this needs to be done before flatfielding.
@@ -734,7 +735,7 @@ class RawImage:
         return _det, self.image, self.ivar, self.datasec_img, self.det_img, self.rn2img, \
                 self.base_var, self.img_scale, self.bpm
 
-    def spatial_flexure_shift(self, slits, force=False, maxlag = 20):
+    def spatial_flexure_shift(self, slits, force=False, maxlag = 20, method='correlate'):
         """
         Calculate a spatial shift in the edge traces due to flexure.
 
@@ -749,6 +750,9 @@ class RawImage:
                 (:attr:`steps`) indicates that it already has been.
             maxlag (:obj:'float', optional):
                 Maximum range of lag values over which to compute the CCF.
+            method (:obj:`str`, optional):
+                Method used to compute the CCF.  See
+                :func:`~pypeit.core.flexure.spat_flexure_shift`.
 
         Return:
             float: The calculated flexure correction
@@ -762,7 +766,8 @@ class RawImage:
         if self.nimg > 1:
             msgs.error('CODING ERROR: Must use a single image (single detector or detector '
                        'mosaic) to determine spatial flexure.')
-        self.spat_flexure_shift = flexure.spat_flexure_shift(self.image[0], slits, maxlag = maxlag)
+        self.spat_flexure_shift = flexure.spat_flexure_shift(self.image[0], slits, maxlag = maxlag,
+                                                             method=method)
         self.steps[step] = True
         # Return
         return self.spat_flexure_shift
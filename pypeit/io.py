@@ -15,6 +15,11 @@ import sys
 import warnings
 import gzip
 import shutil
+import json
+import sqlite3
+import threading
+import weakref
+import queue
 from packaging import version
 
 from IPython import embed
@@ -23,6 +28,7 @@ import numpy
 
 from astropy.io import fits
 from astropy.table import Table
+import astropy.config.paths
 
 # These imports are largely just to make the versions available for
 # writing to the header. See `initialize_header`
@@ -801,6 +807,311 @@ def fits_open(filename, **kwargs):
                        f'following error: {e}')
 
 
+def fits_headers(filename, **kwargs):
+    """
+    Read the headers of all the extensions in a fits file, without reading
+    their data.
+
+    The file is opened using :func:`fits_open`, such that the data of each
+    extension is skipped when the headers are read, and it is closed before
+    returning.  The headers of compressed image extensions are the headers of
+    the decompressed images, as provided by `astropy.io.fits.CompImageHDU`_.
+
+    Args:
+        filename (:obj:`str`, `Path`_):
+            File name for the fits file to read.
+        **kwargs:
+            Passed directly to :func:`fits_open`.
+
+    Returns:
+        :obj:`list`: List of `astropy.io.fits.Header`_ objects, one per
+        extension.
+    """
+    with fits_open(filename, lazy_load_hdus=True, **kwargs) as hdul:
+        return [hdu.header for hdu in hdul]
+
+
+class HeaderCache:
+    """
+    Persistent, on-disk cache of the headers read from fits files.
+
+    The headers of all the extensions in each file are saved to an ``sqlite3``
+    database, keyed by the absolute path to the file.  Cached headers are only
+    returned if the size and modification time of the file are unchanged since
+    the headers were cached.  The cache only holds headers that were added
+    using :func:`add`; i.e., the headers of any file not in the cache must be
+    read by the caller (see :func:`fits_headers`).
+
+    When the cache is closed, the oldest entries are removed such that the
+    total size of the cached headers does not exceed ``max_size``.  The
+    database may be shared by concurrent processes; changes are only written
+    when the cache is closed, and each process waits up to ``timeout`` seconds
+    for the other processes to release the database before raising an
+    ``sqlite3.OperationalError``.
+
+    Args:
+        cache_file (:obj:`str`, `Path`_, optional):
+            Database file.  If None, the default is ``fits_headers.db`` in the
+            PypeIt cache directory (see :mod:`~pypeit.cache`).
+        max_size (:obj:`float`, optional):
+            Maximum size in MB of the cached headers.
+        timeout (:obj:`float`, optional):
+            Time in seconds to wait for the database to be released by other
+            processes.
+    """
+    def __init__(self, cache_file=None, max_size=100., timeout=30.):
+        self.cache_file = Path(astropy.config.paths.get_cache_dir('pypeit')) / 'fits_headers.db' \
+                            if cache_file is None else Path(cache_file).absolute()
+        self.max_size = max_size
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.cache_file), timeout=timeout)
+        self.db.execute('CREATE TABLE IF NOT EXISTS headers '
+                        '(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, headers TEXT)')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def file_signature(ifile):
+        """
+        Return the size and modification time (in ns) of a file.
+        """
+        stat = Path(ifile).stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def get(self, ifile):
+        """
+        Get the cached headers for a file.
+
+        Args:
+            ifile (:obj:`str`, `Path`_):
+                File name.
+
+        Returns:
+            :obj:`list`: List of `astropy.io.fits.Header`_ objects with the
+            headers of all the extensions in the file.  None is returned if
+            the file headers have not been cached or if the file has changed.
+        """
+        _ifile = Path(ifile).absolute()
+        row = self.db.execute('SELECT size, mtime, headers FROM headers WHERE path = ?',
+                              (str(_ifile),)).fetchone()
+        if row is None or tuple(row[:2]) != self.file_signature(_ifile):
+            return None
+        return [fits.Header.fromstring(h) for h in json.loads(row[2])]
+
+    def add(self, ifile, headarr):
+        """
+        Add (or replace) the headers for a file in the cache.
+
+        Args:
+            ifile (:obj:`str`, `Path`_):
+                File name.
+            headarr (:obj:`list`):
+                List of `astropy.io.fits.Header`_ objects with the headers of
+                all the extensions in the file.
+        """
+        _ifile = Path(ifile).absolute()
+        self.db.execute('INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?)',
+                        (str(_ifile), *self.file_signature(_ifile),
+                         json.dumps([h.tostring() for h in headarr])))
+
+    def close(self):
+        """
+        Remove the oldest entries that exceed the maximum size of the cache,
+        commit any changes, and close the database.
+        """
+        try:
+            # NOTE: Rows that are added or replaced get a new rowid, so the
+            # rowid orders the entries by when they were cached.
+            self.db.execute('DELETE FROM headers WHERE rowid IN '
+                            '(SELECT rowid FROM (SELECT rowid, SUM(LENGTH(headers)) '
+                            'OVER (ORDER BY rowid DESC) AS total FROM headers) '
+                            'WHERE total > ?)', (self.max_size * 1024**2,))
+            self.db.commit()
+        finally:
+            self.db.close()
+
+
+class FitsWriter:
+    """
+    Write fits files using a background thread.
+
+    Files submitted to the writer are written in the order they are submitted
+    by a single thread, such that the HDUs are serialized while the calling
+    thread continues.  Each file is first written to a temporary file in the
+    same directory and then renamed, such that an output file is never left
+    partially written.  The number of files waiting to be written is limited
+    to ``queue_size``; if the queue is full, :func:`submit` blocks until the
+    oldest file is written.
+
+    Failures are logged when they occur and are returned by :func:`close`;
+    they are never raised by the writer thread.  If the main thread exits
+    (e.g., because of an exception) before the writer is closed, the writer
+    thread finishes writing the submitted files before it stops.
+
+    Forking a process while the writer thread holds a lock (e.g., while it
+    logs a message) can deadlock the child process.  Before the process is
+    forked (e.g., to start a pool of processes), the forking thread therefore
+    waits until all the open writers have written their submitted files.
+
+    Args:
+        queue_size (:obj:`int`, optional):
+            Maximum number of files waiting to be written.
+    """
+    _open_writers = weakref.WeakSet()
+    """
+    Writers that have not been closed.
+    """
+
+    def __init__(self, queue_size=2):
+        self.queue = queue.Queue(maxsize=max(queue_size, 1))
+        self.pending = set()
+        self.failures = []
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run)
+        self.thread.start()
+        FitsWriter._open_writers.add(self)
+
+    @staticmethod
+    def wait_all():
+        """
+        Wait until all open writers have written their submitted files.
+
+        This is called before the process is forked; see
+        :func:`os.register_at_fork`.
+        """
+        for writer in list(FitsWriter._open_writers):
+            if writer.thread.is_alive() and writer.thread is not threading.current_thread():
+                writer.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _run(self):
+        """
+        Execute the queued tasks until the writer is closed.
+        """
+        while True:
+            try:
+                item = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                if threading.main_thread().is_alive():
+                    continue
+                # The main thread has exited without closing the writer
+                return
+            if item is None:
+                self.queue.task_done()
+                return
+            ofile, task = item
+            try:
+                task()
+            except Exception as e:
+                msgs.warn(f'Failed to write {ofile}: {e}')
+                with self._lock:
+                    self.failures += [(str(ofile), e)]
+            finally:
+                with self._lock:
+                    self.pending.discard(ofile)
+                self.queue.task_done()
+
+    def _put(self, ofile, task):
+        """
+        Queue a task that writes a file.
+        """
+        if not self.thread.is_alive():
+            msgs.error('CODING ERROR: Cannot submit files to a closed writer.')
+        _ofile = Path(ofile).absolute()
+        with self._lock:
+            self.pending.add(_ofile)
+        self.queue.put((_ofile, task))
+
+    def submit(self, hdulist, ofile, overwrite=True, checksum=False):
+        """
+        Queue a fits file to be written.
+
+        Args:
+            hdulist (`astropy.io.fits.HDUList`_):
+                HDUs to write.  The HDUs must not be altered after they are
+                submitted.
+            ofile (:obj:`str`, `Path`_):
+                Output file name.  The file is compressed if the name has a
+                ``.gz`` extension.
+            overwrite (:obj:`bool`, optional):
+                Overwrite any existing file.
+            checksum (:obj:`bool`, optional):
+                Passed to `astropy.io.fits.HDUList.writeto`_ to add the
+                DATASUM and CHECKSUM keywords to the headers.
+        """
+        _ofile = Path(ofile).absolute()
+        _ofile.parent.mkdir(parents=True, exist_ok=True)
+
+        def write():
+            if _ofile.exists() and not overwrite:
+                raise FileExistsError(f'{_ofile} exists; to overwrite, set overwrite=True.')
+            tmp_file = _ofile.with_name(f'.{_ofile.stem}.{os.getpid()}.tmp{_ofile.suffix}')
+            try:
+                hdulist.writeto(str(tmp_file), overwrite=True, checksum=checksum)
+                os.replace(tmp_file, _ofile)
+            finally:
+                tmp_file.unlink(missing_ok=True)
+            msgs.info(f'Wrote: {_ofile}')
+
+        self._put(_ofile, write)
+
+    def call(self, func, ofile):
+        """
+        Queue a function that writes a file.
+
+        The function is called by the writer thread after all previously
+        submitted files have been written.
+
+        Args:
+            func (callable):
+                Function without arguments that writes the file.
+            ofile (:obj:`str`, `Path`_):
+                Name of the file written by the function, only used to track
+                pending files and report failures.
+        """
+        self._put(ofile, func)
+
+    def is_pending(self, ofile):
+        """
+        Check if a file is waiting to be written.
+        """
+        with self._lock:
+            return Path(ofile).absolute() in self.pending
+
+    def wait(self):
+        """
+        Wait until all submitted files have been written.
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Write all the submitted files and stop the writer thread.
+
+        Returns:
+            :obj:`list`: List of tuples with the name of each file that could
+            not be written and the raised exception.
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        FitsWriter._open_writers.discard(self)
+        return self.failures
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=FitsWriter.wait_all)
+
+
 def create_symlink(filename, symlink_dir, relative_symlink=False, overwrite=False, quiet=False):
     """
     Create a symlink to the input file in the provided directory.
@@ -961,6 +1272,125 @@ def load_telluric_grid(filename: str):
     return fits_open(file_with_path)
 
 
+def prune_file_cache(cache_dir, pattern, max_bytes):
+    """
+    Remove the least recently used files from an on-disk cache.
+
+    Files are removed in the order of their modification time, which the
+    caches update whenever a file is used, until the total size of the
+    remaining files is no more than ``max_bytes``.
+
+    Args:
+        cache_dir (`Path`_):
+            Cache directory.
+        pattern (:obj:`str`):
+            Glob pattern selecting the cached files.
+        max_bytes (:obj:`int`, :obj:`float`):
+            Maximum total size in bytes of the remaining files.
+    """
+    cached = []
+    for f in cache_dir.glob(pattern):
+        try:
+            stat = f.stat()
+        except FileNotFoundError:
+            # Removed by a concurrent run
+            continue
+        cached += [(stat.st_mtime, stat.st_size, f)]
+    total = sum(c[1] for c in cached)
+    for _, size, f in sorted(cached, key=lambda c: c[0]):
+        if total <= max_bytes:
+            break
+        f.unlink(missing_ok=True)
+        total -= size
+
+
+def load_telluric_band(hdu, ind_lower, ind_upper, cache_size=0., cache_dir=None, nblocks=32):
+    """
+    Read the wavelength band of a telluric model grid or PCA basis.
+
+    Only the pixels in the band, ``ind_lower:ind_upper`` along the last
+    (wavelength) axis of the image data in ``hdu``, are read from the file,
+    which is assumed to be memory-mapped (see :func:`load_telluric_grid`).  The
+    band keeps the data type of the file, but it is converted to the native
+    byte order.
+
+    If ``cache_size`` is larger than 0, the band is also saved as a ``.npy``
+    file in ``cache_dir``, and it is memory-mapped from the cached file for any
+    subsequent fit of data with a similar wavelength coverage, instead of being
+    read from the (much larger) telluric file.  To limit the number of cached
+    files, the wavelength axis of the telluric file is split into ``nblocks``
+    blocks, and the cached band always includes all of the blocks that overlap
+    the requested band.  The cached files are keyed by the name, size, and
+    modification time of the telluric file and the limits of the cached
+    blocks.  When the total size of the cached files would exceed
+    ``cache_size``, the least recently used files are removed.
+
+    Args:
+        hdu (`astropy.io.fits.ImageHDU`_):
+            HDU with the telluric models, opened from a file.
+        ind_lower (:obj:`int`):
+            Index of the first wavelength pixel in the band.
+        ind_upper (:obj:`int`):
+            Index one beyond the last wavelength pixel in the band.
+        cache_size (:obj:`float`, optional):
+            Maximum size in MB of all the files in the on-disk cache.  If 0,
+            the band is always read from the telluric file and never cached.
+        cache_dir (:obj:`str`, `Path`_, optional):
+            Cache directory.  If None, the default is ``telluric`` in the PypeIt
+            cache directory (see :mod:`~pypeit.cache`).
+        nblocks (:obj:`int`, optional):
+            Number of blocks along the wavelength axis used to set the limits
+            of the cached bands.
+
+    Returns:
+        `numpy.ndarray`_: The telluric models in the band.  If the band is read
+        from the cache, this is a read-only memory map.
+    """
+    native = lambda data: data.astype(data.dtype.newbyteorder('='))
+    if cache_size <= 0:
+        return native(hdu.data[...,ind_lower:ind_upper])
+
+    # Expand the band to the limits of the overlapping blocks
+    nspec = hdu.data.shape[-1]
+    block = int(numpy.ceil(nspec/nblocks))
+    blk_lower = (ind_lower // block) * block
+    blk_upper = min(nspec, -(-ind_upper // block) * block)
+    band_slice = numpy.s_[...,ind_lower-blk_lower:ind_upper-blk_lower]
+
+    _cache_dir = Path(astropy.config.paths.get_cache_dir('pypeit')) / 'telluric' \
+                    if cache_dir is None else Path(cache_dir).absolute()
+    ifile = Path(hdu.fileinfo()['file'].name)
+    size, mtime = HeaderCache.file_signature(ifile)
+    cache_file = _cache_dir / f'{ifile.stem}_{size}_{mtime}_{blk_lower}_{blk_upper}.npy'
+    if cache_file.exists():
+        try:
+            # Mark the file as recently used
+            os.utime(cache_file)
+        except OSError:
+            pass
+        return numpy.load(cache_file, mmap_mode='r')[band_slice]
+
+    band = native(hdu.data[...,blk_lower:blk_upper])
+    max_bytes = cache_size * 1024**2
+    if band.nbytes > max_bytes:
+        msgs.warn(f'Telluric model band ({band.nbytes/1024**2:.1f} MB) is larger than the '
+                  f'telluric cache size ({cache_size} MB); not caching.')
+        return band[band_slice]
+    try:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+        # Remove the least recently used files to make room for the new band
+        prune_file_cache(_cache_dir, '*.npy', max_bytes - band.nbytes)
+        # Write to a temporary file first so that concurrent runs never read a
+        # partially written cache file
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'wb') as f:
+            numpy.save(f, band)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        msgs.warn(f'Unable to cache the telluric model band in {_cache_dir}: {e}')
+    return band[band_slice]
+
+
 def load_thar_spec():
     """
     Load the archived ThAr spectrum from the PypeIt data directory.
@@ -10,6 +10,8 @@ import io
 import string
 from copy import deepcopy
 import datetime
+import concurrent.futures
+import sqlite3
 
 from IPython import embed
 
@@ -23,7 +25,7 @@ from pypeit.core import framematch
 from pypeit.core import flux_calib
 from pypeit.core import parse
 from pypeit.core import meta
-from pypeit.io import dict_to_lines
+from pypeit.io import dict_to_lines, HeaderCache
 from pypeit.par import PypeItPar
 from pypeit.bitmask import BitMask
 
@@ -72,6 +74,11 @@ class PypeItMetaData:
             header for any of the provided files; see
             :func:`~pypeit.spectrographs.spectrograph.Spectrograph.get_headarr`.
             Set to False to instead report a warning and continue.
+        header_cache (:obj:`bool`, :obj:`str`, `Path`_, optional):
+            Use a persistent cache of the file headers (see
+            :class:`~pypeit.io.HeaderCache`), such that only the headers of new
+            or modified files are read.  If a string or path, this sets the
+            cache file to use; if True, the default cache file is used.
 
     Attributes:
         spectrograph
@@ -94,7 +101,7 @@ class PypeItMetaData:
             use in the data reduction.
     """
     def __init__(self, spectrograph, par, files=None, data=None, usrdata=None, 
-                 strict=True):
+                 strict=True, header_cache=False):
 
         if data is None and files is None:
             # Warn that table will be empty
@@ -115,7 +122,7 @@ class PypeItMetaData:
         # Build table
         self.table = table.Table(data if files is None 
                                  else self._build(files, strict=strict, 
-                                                  usrdata=usrdata))
+                                                  usrdata=usrdata, header_cache=header_cache))
 
         # Merge with user data, if present
         if usrdata is not None:
@@ -181,7 +188,7 @@ class PypeItMetaData:
                               f'expected one! Found {instr_names[0]}, expected {self.spectrograph.header_name}.  '
                               'You may have chosen the wrong PypeIt spectrograph name!')
 
-    def _build(self, files, strict=True, usrdata=None):
+    def _build(self, files, strict=True, usrdata=None, header_cache=False):
         """
         Generate the fitstbl that will be at the heart of PypeItMetaData.
 
@@ -195,6 +202,9 @@ class PypeItMetaData:
             usrdata (`astropy.table.Table`_, optional):
                 Parsed for frametype for a few instruments (e.g. VLT)
                 where meta data may not be required
+            header_cache (:obj:`bool`, :obj:`str`, `Path`_, optional):
+                Use a persistent cache of the file headers; see
+                :func:`read_headers`.
 
         Returns:
             dict: Dictionary with the data to assign to :attr:`table`.
@@ -209,9 +219,14 @@ class PypeItMetaData:
         data['directory'] = ['None']*len(_files)
         data['filename'] = ['None']*len(_files)
 
+        # Read the fits headers.  NOTE: If a file cannot be opened, its
+        # headarr will be None, and the subsequent loop over the meta keys will
+        # fill the data dictionary with None values.
+        _files = [Path(ifile).absolute() for ifile in _files]
+        headarrs = self.read_headers(_files, strict=strict, header_cache=header_cache)
+
         # Build the table
-        for idx, ifile in enumerate(_files):
-            _ifile = Path(ifile).absolute()
+        for idx, (_ifile, headarr) in enumerate(zip(_files, headarrs)):
             # User data (for frame type)
             if usrdata is None:
                 usr_row = None
@@ -229,11 +244,7 @@ class PypeItMetaData:
             if not data['directory'][idx]:
                 data['directory'][idx] = '.'
 
-            # Read the fits headers.  NOTE: If the file cannot be opened,
-            # headarr will be None, and the subsequent loop over the meta keys
-            # will fill the data dictionary with None values.
             msgs.info(f'Adding metadata for {data["filename"][idx]}')
-            headarr = self.spectrograph.get_headarr(_ifile, strict=strict)
 
             # Grab Meta
             for meta_key in self.spectrograph.meta.keys():
@@ -269,6 +280,77 @@ class PypeItMetaData:
         # Return
         return data
 
+    def read_headers(self, files, strict=True, header_cache=False):
+        """
+        Read the headers of a set of files.
+
+        The headers are read concurrently by a pool of threads, using
+        :func:`~pypeit.spectrographs.spectrograph.Spectrograph.get_headarr`.
+        Optionally, the headers are also read from and saved to a persistent
+        cache (see :class:`~pypeit.io.HeaderCache`), such that only the
+        headers of new or modified files are read.  Only the headers are read
+        from the files that are not in the cache; their data are skipped (see
+        :func:`~pypeit.io.fits_headers`).  If the cache cannot be used (e.g., because it is locked by another process
+        for too long), a warning is issued and the headers are read directly
+        from the files.
+
+        Args:
+            files (:obj:`list`):
+                List of files to read.
+            strict (:obj:`bool`, optional):
+                Function will fault if any of the files cannot be opened.  Set
+                to False to report a warning and continue.
+            header_cache (:obj:`bool`, :obj:`str`, `Path`_, optional):
+                Use a persistent cache of the file headers.  If a string or
+                path, this sets the cache file to use; if True, the default
+                cache file is used.
+
+        Returns:
+            :obj:`list`: List with the headers of each file; see
+            :func:`~pypeit.spectrographs.spectrograph.Spectrograph.get_headarr`.
+            The list element is None for any file that could not be opened.
+        """
+        headarrs = [None]*len(files)
+        cache = None
+        if header_cache is not False and header_cache is not None:
+            try:
+                cache = HeaderCache(cache_file=None if header_cache is True else header_cache)
+                headarrs = [cache.get(f) if Path(f).exists() else None for f in files]
+            except sqlite3.Error as e:
+                msgs.warn(f'Unable to read the header cache: {e}')
+                if cache is not None:
+                    cache.db.close()
+                cache = None
+                headarrs = [None]*len(files)
+        to_read = [i for i, headarr in enumerate(headarrs) if headarr is None]
+        if cache is not None:
+            msgs.info(f'Found cached headers for {len(files)-len(to_read)} of {len(files)} '
+                      'files.')
+
+        # Read the remaining headers
+        if len(to_read) > 1:
+            with concurrent.futures.ThreadPoolExecutor() as pool:
+                # NOTE: Executor.map returns the results in the order of the
+                # input files.
+                read = list(pool.map(lambda i: self.spectrograph.get_headarr(files[i],
+                                                                             strict=strict),
+                                     to_read))
+        else:
+            read = [self.spectrograph.get_headarr(files[i], strict=strict) for i in to_read]
+
+        for i, headarr in zip(to_read, read):
+            headarrs[i] = headarr
+        if cache is not None:
+            try:
+                for i in to_read:
+                    if headarrs[i] is not None:
+                        cache.add(files[i], headarrs[i])
+                cache.close()
+            except sqlite3.Error as e:
+                msgs.warn(f'Unable to update the header cache: {e}')
+                cache.db.close()
+        return headarrs
+
     # TODO:  In this implementation, slicing the PypeItMetaData object
     # will return an astropy.table.Table, not a PypeItMetaData object.
     def __getitem__(self, item):
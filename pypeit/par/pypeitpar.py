@@ -212,7 +212,7 @@ class ProcessImagesPar(ParSet):
                  #cr_sigrej=None, 
                  n_lohi=None, #replace=None,
                  lamaxiter=None, grow=None,
-                 comb_sigrej=None,
+                 comb_sigrej=None, comb_mem_limit=None, n_proc=None,
 #                 calib_setup_and_bit=None,
                  rmcompact=None, sigclip=None, sigfrac=None, objlim=None,
                  use_biasimage=None, use_overscan=None, use_darkimage=None,
@@ -220,7 +220,8 @@ class ProcessImagesPar(ParSet):
                  empirical_rn=None, shot_noise=None, noise_floor=None,
                  use_pixelflat=None, use_illumflat=None, use_specillum=None,
                  use_pattern=None, subtract_scattlight=None, scattlight=None, subtract_continuum=None,
-                 spat_flexure_correct=None, spat_flexure_maxlag=None):
+                 spat_flexure_correct=None, spat_flexure_maxlag=None,
+                 spat_flexure_method=None):
 
         # Grab the parameter names and values from the function
         # arguments
@@ -353,6 +354,18 @@ class ProcessImagesPar(ParSet):
         dtypes['spat_flexure_maxlag'] = int
         descr['spat_flexure_maxlag'] = 'Maximum of possible spatial flexure correction, in pixels'
 
+        defaults['spat_flexure_method'] = 'correlate'
+        options['spat_flexure_method'] = ProcessImagesPar.valid_spat_flexure_methods()
+        dtypes['spat_flexure_method'] = str
+        descr['spat_flexure_method'] = 'Method used to cross-correlate the science image with ' \
+                                       'the slits to measure the spatial flexure.  Options are: ' \
+                                       '{0}.  ``correlate`` cross-correlates the full images ' \
+                                       'directly, ``fft`` is equivalent but cross-correlates ' \
+                                       'each spectral row using FFTs, and ``collapse`` ' \
+                                       'cross-correlates the images summed along the spectral ' \
+                                       'direction, which is fastest but less precise for ' \
+                                       'curved slits.'.format(', '.join(options['spat_flexure_method']))
+
         defaults['combine'] = 'mean'
         options['combine'] = ProcessImagesPar.valid_combine_methods()
         dtypes['combine'] = str
@@ -368,6 +381,23 @@ class ProcessImagesPar(ParSet):
         descr['comb_sigrej'] = 'Sigma-clipping level for when clip=True; ' \
                            'Use None for automatic limit (recommended).  '
 
+        defaults['comb_mem_limit'] = None
+        dtypes['comb_mem_limit'] = [int, float]
+        descr['comb_mem_limit'] = 'Approximate memory limit in MB for the stack of processed ' \
+                                  'images to combine.  If None, all the processed images are ' \
+                                  'kept in memory.  Otherwise, if the size of the stack exceeds ' \
+                                  'this limit, the processed images are written to temporary ' \
+                                  'memory-mapped files and combined in blocks of detector rows, ' \
+                                  'where the size of each block is below the limit.  The ' \
+                                  'result is identical to combining the images in memory.'
+
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use when processing the raw images to be ' \
+                          'combined.  If 1, the images are processed serially.  If less than ' \
+                          '1, the number of processes is set to the number of available CPUs.  ' \
+                          'The number of processes is never more than the number of images.'
+
         defaults['satpix'] = 'reject'
         options['satpix'] = ProcessImagesPar.valid_saturation_handling()
         dtypes['satpix'] = str
@@ -445,11 +475,13 @@ class ProcessImagesPar(ParSet):
         k = np.array([*cfg.keys()])
         parkeys = ['trim', 'apply_gain', 'orient', 'use_biasimage', 'subtract_continuum', 'subtract_scattlight',
                    'scattlight', 'use_pattern', 'use_overscan', 'overscan_method', 'overscan_par',
-                   'use_darkimage', 'dark_expscale', 'spat_flexure_correct', 'spat_flexure_maxlag', 'use_illumflat',
+                   'use_darkimage', 'dark_expscale', 'spat_flexure_correct', 'spat_flexure_maxlag',
+                   'spat_flexure_method', 'use_illumflat',
                    'use_specillum', 'empirical_rn', 'shot_noise', 'noise_floor', 'use_pixelflat', 'combine',
                    'satpix', #'calib_setup_and_bit',
                    'n_lohi', 'mask_cr',
-                   'lamaxiter', 'grow', 'clip', 'comb_sigrej', 'rmcompact', 'sigclip',
+                   'lamaxiter', 'grow', 'clip', 'comb_sigrej', 'comb_mem_limit', 'n_proc',
+                   'rmcompact', 'sigclip',
                    'sigfrac', 'objlim']
 
         badkeys = np.array([pk not in parkeys for pk in k])
@@ -478,6 +510,13 @@ class ProcessImagesPar(ParSet):
         """
         return ['median', 'mean' ]
 
+    @staticmethod
+    def valid_spat_flexure_methods():
+        """
+        Return the valid methods for measuring the spatial flexure.
+        """
+        return ['correlate', 'fft', 'collapse']
+
     @staticmethod
     def valid_saturation_handling():
         """
@@ -1569,7 +1608,7 @@ class CubePar(ParSet):
                  ra_min=None, ra_max=None, dec_min=None, dec_max=None, wave_min=None, wave_max=None,
                  spatial_delta=None, wave_delta=None, astrometric=None, grating_corr=None, scale_corr=None,
                  skysub_frame=None, spec_subpixel=None, spat_subpixel=None, slice_subpixel=None,
-                 correct_dar=None):
+                 correct_dar=None, n_proc=None, single_precision=None, memmap_dir=None):
 
         # Grab the parameter names and values from the function
         # arguments
@@ -1772,6 +1811,27 @@ class CubePar(ParSet):
         dtypes['correct_dar'] = bool
         descr['correct_dar'] = 'If True, the data will be corrected for differential atmospheric refraction (DAR).'
 
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use when resampling the slits of the spec2d frames ' \
+                          'onto the datacube with method=subpixel or method=ngp.  Each process resamples ' \
+                          'one slit of one frame at a time, and the partial cubes are summed at the end.  ' \
+                          'If 1, the slits are resampled serially.  If less than 1, the number ' \
+                          'of processes is set to the number of available CPUs.'
+
+        defaults['single_precision'] = False
+        dtypes['single_precision'] = bool
+        descr['single_precision'] = 'If True, accumulate the datacube (and its variance and weights) ' \
+                                    'in single precision.  This halves the memory needed to hold the ' \
+                                    'output cubes, at the expense of a small loss in precision.'
+
+        defaults['memmap_dir'] = None
+        dtypes['memmap_dir'] = str
+        descr['memmap_dir'] = 'If set, accumulate the output datacubes in temporary memory-mapped ' \
+                              'files in this directory instead of memory.  Use this when the output ' \
+                              'cubes are too large to fit in memory.  The files are deleted when the ' \
+                              'datacube has been written.'
+
         defaults['skysub_frame'] = 'image'
         dtypes['skysub_frame'] = str
         descr['skysub_frame'] = 'Set the sky subtraction to be implemented. The default behaviour is to subtract ' \
@@ -1801,7 +1861,8 @@ class CubePar(ParSet):
         parkeys = ['slit_spec', 'output_filename', 'standard_cube', 'reference_image', 'save_whitelight',
                    'method', 'spec_subpixel', 'spat_subpixel', 'slice_subpixel', 'ra_min', 'ra_max', 'dec_min', 'dec_max',
                    'wave_min', 'wave_max', 'spatial_delta', 'wave_delta', 'weight_method', 'align', 'combine',
-                   'astrometric', 'grating_corr', 'scale_corr', 'skysub_frame', 'whitelight_range', 'correct_dar']
+                   'astrometric', 'grating_corr', 'scale_corr', 'skysub_frame', 'whitelight_range', 'correct_dar',
+                   'n_proc', 'single_precision', 'memmap_dir']
 
         badkeys = np.array([pk not in parkeys for pk in k])
         if np.any(badkeys):
@@ -2322,7 +2383,7 @@ class TelluricPar(ParSet):
     def __init__(self, telgridfile=None, sn_clip=None, resln_guess=None, resln_frac_bounds=None, pix_shift_bounds=None,
                  delta_coeff_bounds=None, minmax_coeff_bounds=None, maxiter=None, tell_npca=None, teltype=None,
                  sticky=None, lower=None, upper=None, seed=None, tol=None, popsize=None, recombination=None, polish=None,
-                 disp=None, objmodel=None, redshift=None, delta_redshift=None, pca_file=None, npca=None,
+                 disp=None, vectorized=None, n_proc=None, band_cache_size=None, objmodel=None, redshift=None, delta_redshift=None, pca_file=None, npca=None,
                  bal_wv_min_max=None, bounds_norm=None, tell_norm_thresh=None, only_orders=None, pca_lower=None,
                  pca_upper=None, star_type=None, star_mag=None, star_ra=None, star_dec=None,
                  func=None, model=None, polyorder=None, fit_wv_min_max=None, mask_lyman_a=None):
@@ -2482,6 +2543,32 @@ class TelluricPar(ParSet):
                         'screen indicating the status of the optimization. See documentation for telluric.Telluric ' \
                         'for a description of the output and how to know if things are working well.'
 
+        defaults['vectorized'] = False
+        dtypes['vectorized'] = bool
+        descr['vectorized'] = 'If True, the differential evolution optimization evaluates the object + ' \
+                              'telluric model for its full population at once, which is faster.  The ' \
+                              'population is then updated once per generation instead of after each ' \
+                              'evaluation, such that the result is not identical to the default optimization.'
+
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use when fitting the orders of echelle data.  If 1, ' \
+                          'the orders are fit serially.  If less than 1, the number of processes is set ' \
+                          'to the number of available CPUs.  When fit in parallel, each order uses its own ' \
+                          'random number generator, such that the result does not depend on the number of ' \
+                          'processes, but differs from the serial fit.'
+
+        defaults['band_cache_size'] = 0.
+        dtypes['band_cache_size'] = [int, float]
+        descr['band_cache_size'] = 'The maximum size (in MB) of the on-disk cache of the telluric ' \
+                                   'models within the wavelength range of the data, which is kept ' \
+                                   'in the telluric directory of the PypeIt cache.  If larger than ' \
+                                   '0, subsequent fits of data with a similar wavelength coverage ' \
+                                   'memory-map the cached models instead of reading them from the ' \
+                                   'telluric file.  When the limit is reached, the least recently ' \
+                                   'used models are removed.  The cache is shared by all PypeIt ' \
+                                   'runs.  Set to 0 to always read the models from the telluric file.'
+
 
         defaults['only_orders'] = None
         dtypes['only_orders'] = [int, list, np.ndarray]
@@ -2589,7 +2676,9 @@ class TelluricPar(ParSet):
         parkeys = ['telgridfile', 'teltype', 'sn_clip', 'resln_guess', 'resln_frac_bounds', 'tell_npca',
                    'pix_shift_bounds', 'delta_coeff_bounds', 'minmax_coeff_bounds',
                    'maxiter', 'sticky', 'lower', 'upper', 'seed', 'tol',
-                   'popsize', 'recombination', 'polish', 'disp', 'objmodel','redshift', 'delta_redshift',
+                   'popsize', 'recombination', 'polish', 'disp', 'vectorized', 'n_proc',
+                   'band_cache_size', 'objmodel',
+                   'redshift', 'delta_redshift',
                    'pca_file', 'npca', 'bal_wv_min_max', 'bounds_norm',
                    'tell_norm_thresh', 'only_orders', 'pca_lower', 'pca_upper',
                    'star_type','star_mag','star_ra','star_dec',
@@ -2642,7 +2731,8 @@ class ReduxPar(ParSet):
     """
     def __init__(self, spectrograph=None, detnum=None, sortroot=None, calwin=None, scidir=None,
                  qadir=None, redux_path=None, ignore_bad_headers=None, slitspatnum=None,
-                 maskIDs=None, quicklook=None, chk_version=None):
+                 maskIDs=None, quicklook=None, chk_version=None, n_proc=None,
+                 n_exp_proc=None, write_queue=None):
 
         # Grab the parameter names and values from the function
         # arguments
@@ -2733,6 +2823,38 @@ class ReduxPar(ParSet):
                                'results. I.e., you really need to know what you are doing if ' \
                                'you set this to False!'
 
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use when reducing the detectors/mosaics of ' \
+                          'a single exposure.  If 1, the detectors are reduced serially.  If ' \
+                          'less than 1, the number of processes is set to the number of ' \
+                          'available CPUs.  The number of processes is never more than the ' \
+                          'number of detectors to reduce, and the reduction is always serial ' \
+                          'when the reduction steps are shown interactively.'
+
+        defaults['n_exp_proc'] = 1
+        dtypes['n_exp_proc'] = int
+        descr['n_exp_proc'] = 'Number of processes to use when reducing separate exposures ' \
+                              '(combination groups).  If larger than 1, the calibrations for ' \
+                              'all calibration groups are built first, and the standard and ' \
+                              'science exposures are then reduced in parallel, each writing ' \
+                              'its own log file.  The detectors of each exposure are then ' \
+                              'reduced serially (i.e., ``n_proc`` is ignored).  If less than ' \
+                              '1, the number of processes is set to the number of available ' \
+                              'CPUs.'
+
+        defaults['write_queue'] = 0
+        dtypes['write_queue'] = int
+        descr['write_queue'] = 'If larger than 0, the spec1d and spec2d files of each exposure ' \
+                               'are written by a background thread while the next exposure is ' \
+                               'reduced, and this sets the maximum number of files waiting to ' \
+                               'be written.  The files are written in order and any failures ' \
+                               'are reported once all exposures have been reduced.  If 0, the ' \
+                               'files are written before the next exposure is reduced.  Any ' \
+                               'step that starts a pool of processes (see, e.g., ``n_proc``) ' \
+                               'first waits until the queued files are written.  Ignored if ' \
+                               '``n_exp_proc`` is larger than 1.'
+
         # Instantiate the parameter set
         super(ReduxPar, self).__init__(list(pars.keys()),
                                         values=list(pars.values()),
@@ -2748,7 +2870,8 @@ class ReduxPar(ParSet):
 
         # Basic keywords
         parkeys = [ 'spectrograph', 'quicklook', 'detnum', 'sortroot', 'calwin', 'scidir', 'qadir',
-                    'redux_path', 'ignore_bad_headers', 'slitspatnum', 'maskIDs', 'chk_version']
+                    'redux_path', 'ignore_bad_headers', 'slitspatnum', 'maskIDs', 'chk_version',
+                    'n_proc', 'n_exp_proc', 'write_queue']
 
         badkeys = np.array([pk not in parkeys for pk in k])
         if np.any(badkeys):
@@ -2790,7 +2913,8 @@ class WavelengthSolutionPar(ParSet):
                  nfitpix=None, refframe=None,
                  nsnippet=None, use_instr_flag=None, wvrng_arxiv=None,
                  ech_2dfit=None, ech_separate_2d=None, redo_slits=None, qa_log=None,
-                 cc_percent_ceil=None, echelle_pad=None, cc_offset_minmax=None, stretch_func=None):
+                 cc_percent_ceil=None, echelle_pad=None, cc_offset_minmax=None, stretch_func=None,
+                 cc_nrefine=None, reid_cache_size=None, n_proc=None):
 
         # Grab the parameter names and values from the function
         # arguments
@@ -3105,6 +3229,36 @@ class WavelengthSolutionPar(ParSet):
                                 'the extracted arcs when identifying emission lines with reidentify. For NIRSPEC, ' \
                                 'the quadratic mode tends to do better because the wavelength solution ' \
                                 'is typically at least 2nd or 3rd order.'
+
+        dtypes['cc_nrefine'] = int
+        descr['cc_nrefine'] = 'If set, the arc spectrum is cross-correlated with all of the archived ' \
+                              'spectra at once, by computing the cross-correlation over a grid of ' \
+                              'stretches using FFTs, and the shift and stretch are only optimized ' \
+                              'for the ``cc_nrefine`` archived spectra with the largest ' \
+                              'cross-correlation.  The lines detected in the archived spectra are ' \
+                              'also cached on disk (see ``reid_cache_size``).  This is much ' \
+                              'faster for large archives.  If None, the shift and stretch are ' \
+                              'optimized for each archived spectrum.  Only used by the ' \
+                              '``reidentify`` and ``echelle`` methods.'
+
+        defaults['reid_cache_size'] = 100.
+        dtypes['reid_cache_size'] = [int, float]
+        descr['reid_cache_size'] = 'The maximum size (in MB) of the on-disk cache of the lines ' \
+                                   'detected in the archived spectra, which is kept in the ' \
+                                   '``reid_arxiv`` directory of the PypeIt cache.  Only used if ' \
+                                   '``cc_nrefine`` is set.  When the limit is reached, the least ' \
+                                   'recently used files are removed.  Set to 0 to always detect ' \
+                                   'the lines in the archived spectra.'
+
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use when reidentifying the arc lines and fitting ' \
+                          'the wavelength solution of each slit/order with the ``reidentify``, ' \
+                          '``full_template``, and ``echelle`` methods.  If 1, the slits are ' \
+                          'calibrated serially.  If less than 1, the number of processes is set ' \
+                          'to the number of available CPUs.  The number of processes is never ' \
+                          'more than the number of slits, and the slits are always calibrated ' \
+                          'serially when debugging.'
                 
         
 
@@ -3129,7 +3283,8 @@ class WavelengthSolutionPar(ParSet):
                    'nlocal_cc', 'rms_thresh_frac_fwhm', 'match_toler', 'func', 'n_first','n_final',
                    'sigrej_first', 'sigrej_final', 'numsearch', 'nfitpix',
                    'refframe', 'nsnippet', 'use_instr_flag', 'wvrng_arxiv', 
-                   'redo_slits', 'qa_log', 'cc_percent_ceil', 'echelle_pad', 'cc_offset_minmax', 'stretch_func']
+                   'redo_slits', 'qa_log', 'cc_percent_ceil', 'echelle_pad', 'cc_offset_minmax', 'stretch_func',
+                   'cc_nrefine', 'reid_cache_size', 'n_proc']
 
         badkeys = np.array([pk not in parkeys for pk in k])
         if np.any(badkeys):
@@ -4346,7 +4501,8 @@ class ExtractionPar(ParSet):
 
     def __init__(self, boxcar_radius=None, std_prof_nsigma=None, sn_gauss=None,
                  model_full_slit=None, skip_extraction=None, skip_optimal=None,
-                 use_2dmodel_mask=None, use_user_fwhm=None, return_negative=None):
+                 use_2dmodel_mask=None, use_user_fwhm=None, return_negative=None,
+                 n_proc=None):
 
         # Grab the parameter names and values from the function
         # arguments
@@ -4408,6 +4564,19 @@ class ExtractionPar(ParSet):
         dtypes['return_negative'] = bool
         descr['return_negative'] = 'If ``True`` the negative traces will be extracted and saved to disk'
 
+        defaults['n_proc'] = 1
+        dtypes['n_proc'] = int
+        descr['n_proc'] = 'Number of processes to use for the local sky subtraction and ' \
+                          'extraction of the slits of a multi-slit or long-slit ' \
+                          'reduction.  If 1, the slits are extracted serially.  If less ' \
+                          'than 1, the number of processes is set to the number of ' \
+                          'available CPUs.  The number of processes is never more than the ' \
+                          'number of slits with objects, and the extraction is always ' \
+                          'serial when the profile fits are shown interactively.  In ' \
+                          'parallel, each slit is extracted using cutouts of the images ' \
+                          'around the slit; the results are equal to the serial ' \
+                          'extraction only to within numerical precision.'
+
         # Instantiate the parameter set
         super(ExtractionPar, self).__init__(list(pars.keys()),
                                         values=list(pars.values()),
@@ -4423,7 +4592,8 @@ class ExtractionPar(ParSet):
 
         # Basic keywords
         parkeys = ['boxcar_radius', 'std_prof_nsigma', 'sn_gauss', 'model_full_slit',
-                   'skip_extraction', 'skip_optimal', 'use_2dmodel_mask', 'use_user_fwhm', 'return_negative']
+                   'skip_extraction', 'skip_optimal', 'use_2dmodel_mask', 'use_user_fwhm', 'return_negative',
+                   'n_proc']
 
         badkeys = np.array([pk not in parkeys for pk in k])
         if np.any(badkeys):
@@ -4455,7 +4625,7 @@ class CalibrationsPar(ParSet):
                  alignframe=None, alignment=None, traceframe=None, illumflatframe=None,
                  lampoffflatsframe=None, scattlightframe=None, skyframe=None, standardframe=None,
                  scattlight_pad=None, flatfield=None, wavelengths=None, slitedges=None, tilts=None,
-                 raise_chk_error=None):
+                 raise_chk_error=None, cache_size=None):
 
 
         # Grab the parameter names and values from the function
@@ -4487,6 +4657,19 @@ class CalibrationsPar(ParSet):
         dtypes['bpm_usebias'] = bool
         descr['bpm_usebias'] = 'Make a bad pixel mask from bias frames? Bias frames must be provided.'
 
+        defaults['cache_size'] = 1024.
+        dtypes['cache_size'] = [int, float]
+        descr['cache_size'] = 'The maximum amount of memory (in MB) used to keep processed ' \
+                              'calibration frames in memory after they are built or read from ' \
+                              'disk, such that they are not read again when calibrating ' \
+                              'subsequent detectors or exposures.  When the limit is reached, ' \
+                              'the least recently used frames are removed.  The cache is kept ' \
+                              'by each process; i.e., when detectors or exposures are reduced ' \
+                              'in parallel (see ``n_proc`` and ``n_exp_proc`` in ``rdx``), each ' \
+                              'process can use up to this amount of memory and the frames are ' \
+                              'not shared between processes.  Set to 0 to always read the ' \
+                              'frames from disk.'
+
         # Calibration Frames
         defaults['biasframe'] = FrameGroupPar(frametype='bias',
                                               process=ProcessImagesPar(use_biasimage=False,
@@ -4627,7 +4810,7 @@ class CalibrationsPar(ParSet):
         k = np.array([*cfg.keys()])
 
         # Basic keywords
-        parkeys = [ 'calib_dir', 'bpm_usebias', 'raise_chk_error']
+        parkeys = [ 'calib_dir', 'bpm_usebias', 'raise_chk_error', 'cache_size']
 
         allkeys = parkeys + ['biasframe', 'darkframe', 'arcframe', 'tiltframe', 'pixelflatframe',
                              'illumflatframe', 'lampoffflatsframe', 'scattlightframe',
@@ -6,9 +6,11 @@ Main driver class for PypeIt run
 
 """
 from pathlib import Path
+import sys
 import time
 import os
 import copy
+import itertools
 from datetime import datetime
 
 # TODO: datetime.UTC is not defined in python 3.10.  Remove this when we decide
@@ -28,7 +30,7 @@ from astropy.table import Table
 
 from pypeit import io
 from pypeit import inputfiles
-from pypeit.calibframe import CalibFrame
+from pypeit.calibframe import CalibFrame, CalibFrameCache
 from pypeit.core import parse, wave, qa
 from pypeit import msgs
 from pypeit import calibrations
@@ -144,6 +146,12 @@ class PypeIt:
         self.reuse_calibs = reuse_calibs
         self.show = show
 
+        # In-memory cache of the processed calibration frames read from disk
+        self.calib_cache = CalibFrameCache(max_size=self.par['calibrations']['cache_size'])
+
+        # Background writer for the output files; see reduce_all
+        self.writer = None
+
         # Set paths
         self.calibrations_path = os.path.join(self.par['rdx']['redux_path'],
                                               self.par['calibrations']['calib_dir'])
@@ -171,6 +179,13 @@ class PypeIt:
         self.basename = None
         self.obstime = None
 
+    def __getstate__(self):
+        # The background writer (and its thread) cannot be copied to other
+        # processes, which instead write their output files directly.
+        state = self.__dict__.copy()
+        state['writer'] = None
+        return state
+
     @property
     def science_path(self):
         """Return the path to the science directory."""
@@ -271,7 +286,16 @@ class PypeIt:
         science/standard frames.
         """
         self.tstart = time.perf_counter()
+        self._calib_all_groups()
+        # Finish
+        self.print_end_time()
+
+    def _calib_all_groups(self):
+        """
+        Build the calibrations for all calibration groups and detectors.
 
+        See :func:`calib_all`.
+        """
         # Frame indices
         frame_indx = np.arange(len(self.fitstbl))
         for calib_ID in self.fitstbl.calib_groups:
@@ -296,7 +320,7 @@ class PypeIt:
                     self.fitstbl, self.par['calibrations'], self.spectrograph,
                     self.calibrations_path, qadir=self.qa_path, reuse_calibs=self.reuse_calibs,
                     show=self.show, user_slits=user_slits,
-                    chk_version=self.par['rdx']['chk_version'])
+                    chk_version=self.par['rdx']['chk_version'], calib_cache=self.calib_cache)
                 # Do it
                 # These need to be separate to accommodate COADD2D
                 self.caliBrate.set_config(grp_frames[0], self.det, self.par['calibrations'])
@@ -307,9 +331,6 @@ class PypeIt:
                               f'that failed was {self.caliBrate.failed_step}.  Continuing to next '
                               f'detector.')
 
-        # Finish
-        self.print_end_time()
-
     def reduce_all(self):
         """
         Main driver of the entire reduction
@@ -343,113 +364,263 @@ class PypeIt:
         # Frame indices
         frame_indx = np.arange(len(self.fitstbl))
 
-        # Standard Star(s) Loop
-        # Iterate over each calibration group and reduce the standards
-        for calib_ID in self.fitstbl.calib_groups:
+        # Number of processes used to reduce the exposures
+        n_exp_proc = 1 if self.show else utils.get_nproc(
+                            self.par['rdx']['n_exp_proc'],
+                            len(np.unique(self.fitstbl['comb_id'][is_science | is_standard])))
+        if n_exp_proc > 1:
+            # Build all the calibrations first, such that the exposures can be
+            # reduced independently of one another.
+            msgs.info('Building calibrations for all calibration groups before reducing the '
+                      f'exposures using {n_exp_proc} processes.')
+            self._calib_all_groups()
+        summary = []
 
-            # Find all the frames in this calibration group
-            in_grp = self.fitstbl.find_calib_group(calib_ID)
+        # Write the output files in the background?  The processes that reduce
+        # the exposures in parallel always write their output files directly.
+        if self.par['rdx']['write_queue'] > 0 and n_exp_proc == 1:
+            self.writer = io.FitsWriter(queue_size=self.par['rdx']['write_queue'])
 
-            if not np.any(is_standard & in_grp):
-                continue
+        try:
+            # Standard Star(s) Loop
+            # Iterate over each calibration group and reduce the standards
+            comb_groups = []
+            for calib_ID in self.fitstbl.calib_groups:
 
-            # Find the indices of the standard frames in this calibration group:
-            grp_standards = frame_indx[is_standard & in_grp]
-
-            msgs.info(f'Found {len(grp_standards)} standard frames in calibration group '
-                      f'{calib_ID}.')
-
-            # Reduce all the standard frames, loop on unique comb_id
-            u_combid_std = np.unique(self.fitstbl['comb_id'][grp_standards])
-            for j, comb_id in enumerate(u_combid_std):
-                frames = np.where(self.fitstbl['comb_id'] == comb_id)[0]
-                # Find all frames whose comb_id matches the current frames
-                # bkg_id (same as for science frames).
-                bg_frames = np.where((self.fitstbl['comb_id'] == self.fitstbl['bkg_id'][frames][0])
-                                     & (self.fitstbl['comb_id'] >= 0))[0]
-                if not self.outfile_exists(frames[0]) or self.overwrite:
-                    # Build history to document what contributed to the reduced
-                    # exposure
-                    history = History(self.fitstbl.frame_paths(frames[0]))
-                    history.add_reduce(calib_ID, self.fitstbl, frames, bg_frames)
-                    std_spec2d, std_sobjs = self.reduce_exposure(frames, bg_frames=bg_frames)
-                    # TODO come up with sensible naming convention for save_exposure for combined files
-                    self.save_exposure(frames[0], std_spec2d, std_sobjs, self.basename, history)
-                else:
-                    msgs.info('Output file: {:s} already exists'.format(self.fitstbl.construct_basename(frames[0])) +
-                              '. Set overwrite=True to recreate and overwrite.')
-
-        # Science Frame(s) Loop
-        # Iterate over each calibration group again and reduce the science frames
-        for calib_ID in self.fitstbl.calib_groups:
-            # Find all the frames in this calibration group
-            in_grp = self.fitstbl.find_calib_group(calib_ID)
+                # Find all the frames in this calibration group
+                in_grp = self.fitstbl.find_calib_group(calib_ID)
 
-            if not np.any(is_science & in_grp):
-                continue
+                if not np.any(is_standard & in_grp):
+                    continue
+
+                # Find the indices of the standard frames in this calibration group:
+                grp_standards = frame_indx[is_standard & in_grp]
+
+                msgs.info(f'Found {len(grp_standards)} standard frames in calibration group '
+                          f'{calib_ID}.')
+
+                # Reduce all the standard frames, loop on unique comb_id
+                comb_groups += self.get_comb_groups(calib_ID, grp_standards)
+
+            summary += self.reduce_comb_groups(comb_groups, n_exp_proc)
+
+            # Science Frame(s) Loop
+            # Iterate over each calibration group again and reduce the science frames
+            comb_groups = []
+            for calib_ID in self.fitstbl.calib_groups:
+                # Find all the frames in this calibration group
+                in_grp = self.fitstbl.find_calib_group(calib_ID)
+
+                if not np.any(is_science & in_grp):
+                    continue
+
+                # Find the indices of the science frames in this calibration group:
+                grp_science = frame_indx[is_science & in_grp]
+                msgs.info(f'Found {len(grp_science)} science frames in calibration group '
+                          f'{calib_ID}.')
+
+                # Associate standards (previously reduced above) for this setup
+                std_outfile = self.get_std_outfile(frame_indx[is_standard])
 
-            # Find the indices of the science frames in this calibration group:
-            grp_science = frame_indx[is_science & in_grp]
-            msgs.info(f'Found {len(grp_science)} science frames in calibration group {calib_ID}.')
-
-            # Associate standards (previously reduced above) for this setup
-            std_outfile = self.get_std_outfile(frame_indx[is_standard])
-            # Reduce all the science frames; keep the basenames of the science
-            # frames for use in flux calibration
-            science_basename = [None]*len(grp_science)
-            # Loop on unique comb_id
-            u_combid = np.unique(self.fitstbl['comb_id'][grp_science])
-        
-            for j, comb_id in enumerate(u_combid):
                 # TODO: This was causing problems when multiple science frames
                 # were provided to quicklook and the user chose *not* to stack
                 # the frames.  But this means it now won't skip processing the
                 # B-A pair when the background image(s) are defined.  Punting
                 # for now...
-#                # Quicklook mode?
-#                if self.par['rdx']['quicklook'] and j > 0:
-#                    msgs.warn('PypeIt executed in quicklook mode.  Only reducing science frames '
-#                              'in the first combination group!')
-#                    break
-                #
-                frames = np.where(self.fitstbl['comb_id'] == comb_id)[0]
-                # Find all frames whose comb_id matches the current frames bkg_id.
-                bg_frames = np.where((self.fitstbl['comb_id'] == self.fitstbl['bkg_id'][frames][0])
-                                     & (self.fitstbl['comb_id'] >= 0))[0]
-                # JFH changed the syntax below to that above, which allows
-                # frames to be used more than once as a background image. The
-                # syntax below would require that we could somehow list multiple
-                # numbers for the bkg_id which is impossible without a comma
-                # separated list
-#                bg_frames = np.where(self.fitstbl['bkg_id'] == comb_id)[0]
-                if not self.outfile_exists(frames[0]) or self.overwrite:
-
-                    # Build history to document what contributd to the reduced
-                    # exposure
-                    history = History(self.fitstbl.frame_paths(frames[0]))
-                    history.add_reduce(calib_ID, self.fitstbl, frames, bg_frames)
-
-                    # TODO -- Should we reset/regenerate self.slits.mask for a new exposure
-                    sci_spec2d, sci_sobjs = self.reduce_exposure(frames, bg_frames=bg_frames,
-                                                                 std_outfile=std_outfile)
-                    science_basename[j] = self.basename
-
-                    # TODO: come up with sensible naming convention for
-                    # save_exposure for combined files
-                    if len(sci_spec2d.detectors) > 0:
-                        self.save_exposure(frames[0], sci_spec2d, sci_sobjs, self.basename, history)
-                    else:
-                        msgs.warn('No spec2d and spec1d saved to file because the '
-                                  'calibration/reduction was not successful for all the detectors')
-                else:
-                    msgs.warn(f'Output file: {self.fitstbl.construct_basename(frames[0])} already '
-                              'exists. Set overwrite=True to recreate and overwrite.')
-
-            msgs.info(f'Finished calibration group {calib_ID}')
+#            # Quicklook mode?
+#            if self.par['rdx']['quicklook'] and j > 0:
+#                msgs.warn('PypeIt executed in quicklook mode.  Only reducing science frames '
+#                          'in the first combination group!')
+#                break
+
+                # Reduce all the science frames, loop on unique comb_id
+                grp_comb_groups = self.get_comb_groups(calib_ID, grp_science,
+                                                       std_outfile=std_outfile)
+                if n_exp_proc > 1:
+                    comb_groups += grp_comb_groups
+                    continue
+                summary += self.reduce_comb_groups(grp_comb_groups, n_exp_proc)
+                msgs.info(f'Finished calibration group {calib_ID}')
+
+            if n_exp_proc > 1:
+                summary += self.reduce_comb_groups(comb_groups, n_exp_proc)
+
+            # Report the summary of the reduced exposures.  When the exposures
+            # are reduced in parallel, this merges the results of all the
+            # processes.
+            if len(summary) > 0:
+                msgs.info('Summary of the reduced exposures:' + msgs.newline()
+                          + msgs.newline().join(Table(rows=summary).pformat(max_width=-1,
+                                                                            max_lines=-1)))
+        finally:
+            if self.writer is not None:
+                # Finish writing any queued output files, also if the
+                # reduction failed
+                failures = self.writer.close()
+                self.writer = None
+                if len(failures) > 0:
+                    msg = 'Failed to write the following output files:' + msgs.newline() \
+                            + msgs.newline().join([f'{f}: {e}' for f, e in failures])
+                    # Do not replace the exception raised by the reduction
+                    if sys.exc_info()[0] is None:
+                        msgs.error(msg)
+                    msgs.warn(msg)
 
         # Finish
         self.print_end_time()
 
+    def get_comb_groups(self, calib_ID, grp_frames, std_outfile=None):
+        """
+        Construct the list of combination groups to reduce.
+
+        Args:
+            calib_ID (:obj:`int`, :obj:`str`):
+                Calibration group of the frames.
+            grp_frames (`numpy.ndarray`_):
+                Indices of the standard or science frames in :attr:`fitstbl`
+                in this calibration group.
+            std_outfile (:obj:`str`, optional):
+                File with a previously reduced standard spectrum from
+                PypeIt.
+
+        Returns:
+            :obj:`list`: List of tuples with the calibration group, the
+            indices of the frames to combine, the indices of the background
+            frames, and the standard file for each unique combination group;
+            see :func:`reduce_comb_group`.
+        """
+        comb_groups = []
+        for comb_id in np.unique(self.fitstbl['comb_id'][grp_frames]):
+            frames = np.where(self.fitstbl['comb_id'] == comb_id)[0]
+            # Find all frames whose comb_id matches the current frames bkg_id.
+            bg_frames = np.where((self.fitstbl['comb_id'] == self.fitstbl['bkg_id'][frames][0])
+                                 & (self.fitstbl['comb_id'] >= 0))[0]
+            # JFH changed the syntax below to that above, which allows
+            # frames to be used more than once as a background image. The
+            # syntax below would require that we could somehow list multiple
+            # numbers for the bkg_id which is impossible without a comma
+            # separated list
+#            bg_frames = np.where(self.fitstbl['bkg_id'] == comb_id)[0]
+            comb_groups += [(calib_ID, frames, bg_frames, std_outfile)]
+        return comb_groups
+
+    def reduce_comb_groups(self, comb_groups, n_exp_proc):
+        """
+        Reduce and save a set of combination groups.
+
+        Args:
+            comb_groups (:obj:`list`):
+                List of combination groups to reduce; see
+                :func:`get_comb_groups`.
+            n_exp_proc (:obj:`int`):
+                Number of processes to use.  If 1, the groups are reduced
+                serially by this process.  Otherwise, the groups are reduced
+                by a pool of processes, and the calibrations must have already
+                been built; see :func:`calib_all`.
+
+        Returns:
+            :obj:`list`: List of dictionaries summarizing the reduction of
+            each group; see :func:`reduce_comb_group`.
+        """
+        if n_exp_proc == 1:
+            return [self.reduce_comb_group(*grp) for grp in comb_groups]
+
+        msgs.info(f'Reducing {len(comb_groups)} exposures using {n_exp_proc} processes.  See the '
+                  'log file of each exposure for the details of its reduction.')
+        # NOTE: This object is passed to each process once, when it is started,
+        # such that only the combination group is passed with each task.  The
+        # results are returned in the order of the input groups.
+        with utils.SharedProcessPool(n_exp_proc, _reduce_comb_group_task, pypeit=self) as pool:
+            return list(pool.map(comb_groups, max_pending=n_exp_proc))
+
+    def _reduce_comb_group_proc(self, comb_group):
+        """
+        Reduce a single combination group in a separate process.
+
+        The messages are written to a separate log file (if a log file is
+        written), the calibrations previously built by :func:`calib_all` are
+        reused, and the detectors are reduced serially.
+
+        Args:
+            comb_group (:obj:`tuple`):
+                Combination group to reduce; see :func:`get_comb_groups`.
+
+        Returns:
+            :obj:`dict`: Summary of the reduction; see
+            :func:`reduce_comb_group`.
+        """
+        # NOTE: The same object is used for all the groups reduced by a
+        # process, so the name of the main log file must be restored.
+        logname = self.logname
+        if logname is not None:
+            _logname = Path(logname)
+            comb_id = self.fitstbl['comb_id'][comb_group[1][0]]
+            self.logname = str(_logname.parent / f'{_logname.stem}_{comb_id}{_logname.suffix}')
+        self.msgs_reset()
+        self.reuse_calibs = True
+        self.par['rdx']['n_proc'] = 1
+        try:
+            summary = self.reduce_comb_group(*comb_group)
+        finally:
+            msgs.reset_log_file(None)
+            self.logname = logname
+        return summary
+
+    def reduce_comb_group(self, calib_ID, frames, bg_frames, std_outfile=None):
+        """
+        Reduce and save a single combination group.
+
+        Args:
+            calib_ID (:obj:`int`, :obj:`str`):
+                Calibration group of the frames.
+            frames (`numpy.ndarray`_):
+                Indices of the frames in :attr:`fitstbl` to combine and
+                reduce.
+            bg_frames (`numpy.ndarray`_):
+                Indices of the frames in :attr:`fitstbl` to use as the
+                background.  Can be empty.
+            std_outfile (:obj:`str`, optional):
+                File with a previously reduced standard spectrum from
+                PypeIt.
+
+        Returns:
+            :obj:`dict`: Summary of the reduction, providing the calibration
+            group, combination group, target, basename of the output files,
+            number of reduced detectors, number of extracted objects, status,
+            elapsed time, and log file.
+        """
+        tstart = time.perf_counter()
+        summary = dict(calib=str(calib_ID), comb_id=int(self.fitstbl['comb_id'][frames[0]]),
+                       target=str(self.fitstbl['target'][frames[0]]), basename='None', ndet=0,
+                       nobj=0, status='skipped', time=0.,
+                       log='None' if self.logname is None else Path(self.logname).name)
+        if self.outfile_exists(frames[0]) and not self.overwrite:
+            msgs.warn(f'Output file: {self.fitstbl.construct_basename(frames[0])} already '
+                      'exists. Set overwrite=True to recreate and overwrite.')
+            return summary
+
+        # Build history to document what contributed to the reduced exposure
+        history = History(self.fitstbl.frame_paths(frames[0]))
+        history.add_reduce(calib_ID, self.fitstbl, frames, bg_frames)
+
+        # TODO -- Should we reset/regenerate self.slits.mask for a new exposure
+        spec2d, sobjs = self.reduce_exposure(frames, bg_frames=bg_frames, std_outfile=std_outfile)
+        summary['basename'] = self.basename
+        summary['ndet'] = len(spec2d.detectors)
+        summary['nobj'] = sobjs.nobj
+
+        # TODO: come up with sensible naming convention for save_exposure for
+        # combined files
+        if len(spec2d.detectors) > 0:
+            self.save_exposure(frames[0], spec2d, sobjs, self.basename, history)
+            summary['status'] = 'saved'
+        else:
+            msgs.warn('No spec2d and spec1d saved to file because the '
+                      'calibration/reduction was not successful for all the detectors')
+            summary['status'] = 'failed'
+        summary['time'] = np.round(time.perf_counter() - tstart, 1)
+        return summary
+
     @staticmethod
     def select_detectors(spectrograph, detnum, slitspatnum=None):
         """
@@ -561,16 +732,38 @@ class PypeIt:
                                           slitspatnum=self.par['rdx']['slitspatnum'])
         msgs.info(f'Detectors to work on: {detectors}')
 
+        # Number of processes used to reduce the detectors
+        n_proc = 1 if self.show else utils.get_nproc(self.par['rdx']['n_proc'], len(detectors))
+
         # Loop on Detectors -- Calibrate, process image, find objects
-        # TODO: Attempt to put in a multiprocessing call here?
-        for self.det in detectors:
-            msgs.info(f'Reducing detector {self.det}')
-            # run calibration
-            self.caliBrate = self.calib_one(frames, self.det)
-            if not self.caliBrate.success:
+        if n_proc > 1:
+            msgs.info(f'Calibrating and finding objects on {len(detectors)} detectors using '
+                      f'{n_proc} processes.')
+            # NOTE: This object is passed to each process once, when it is
+            # started, such that only the detector-specific arguments are
+            # passed with each task.  The results are returned in the order of
+            # the input detectors, which keeps the output identical to the
+            # serial reduction.
+            with utils.SharedProcessPool(n_proc, _calib_objfind_task, pypeit=self) as pool:
+                objfind_results = list(pool.map([(frames, det, bg_frames, std_outfile)
+                                                 for det in detectors]))
+            # Set the metadata that would otherwise have been set by objfind_one
+            self.objtype, self.setup, self.obstime, self.basename, self.binning \
+                    = self.get_sci_metadata(frames[0], detectors[-1])
+            # The calibrations were built or loaded by the other processes
+            self.caliBrate = None
+        else:
+            # NOTE: This is a generator so that each detector is fully reduced
+            # before the next one is calibrated.
+            objfind_results = (self._calib_objfind_one(frames, det, bg_frames=bg_frames,
+                                                       std_outfile=std_outfile)
+                                    for det in detectors)
+
+        for self.det, (failed_step, slits, objfind_output) in zip(detectors, objfind_results):
+            if failed_step is not None:
                 msgs.warn(f'Calibrations for detector {self.det} were unsuccessful!  The step '
-                          f'that failed was {self.caliBrate.failed_step}.  Continuing by '
-                          f'skipping this detector.')
+                          f'that failed was {failed_step}.  Continuing by skipping this '
+                          f'detector.')
                 continue
 
             # we save only the detectors that had a successful calibration,
@@ -578,10 +771,9 @@ class PypeIt:
             calibrated_det.append(self.det)
             # we also save the successful slit calibrations because they are used and modified
             # in the slitmask stuff in between the two loops
-            calib_slits.append(self.caliBrate.slits)
+            calib_slits.append(slits)
             # global_sky, skymask and sciImg are needed in the extract loop
-            initial_sky, sobjs_obj, sciImg, bkg_redux_sciimg, objFind = self.objfind_one(
-                frames, self.det, bg_frames=bg_frames, std_outfile=std_outfile)
+            initial_sky, sobjs_obj, sciImg, bkg_redux_sciimg, objFind = objfind_output
             if len(sobjs_obj)>0:
                 all_specobjs_objfind.add_sobj(sobjs_obj)
             initial_sky_list.append(initial_sky)
@@ -614,26 +806,35 @@ class PypeIt:
                 all_specobjs_objfind, calib_slits, spat_flexure, platescale,
                 self.par['reduce']['slitmask'], self.par['reduce']['findobj']['find_fwhm'])
 
-        # Extract
-        for i, self.det in enumerate(calibrated_det):
-            # re-run (i.e., load) calibrations
-            self.caliBrate = self.calib_one(frames, self.det)
-            self.caliBrate.slits = calib_slits[i]
-
+        # Collect the objects to extract on each detector
+        specobjs_on_det = []
+        for i in range(len(calibrated_det)):
             detname = sciImg_list[i].detector.name
-
             # TODO: pass back the background frame, pass in background
             # files as an argument. extract one takes a file list as an
             # argument and instantiates science within
             if all_specobjs_objfind.nobj > 0:
-                all_specobjs_on_det = all_specobjs_objfind[all_specobjs_objfind.DET == detname]
+                specobjs_on_det += [all_specobjs_objfind[all_specobjs_objfind.DET == detname]]
             else:
-                all_specobjs_on_det = all_specobjs_objfind
+                specobjs_on_det += [all_specobjs_objfind]
 
-            # Extract
-            all_spec2d[detname], tmp_sobjs \
-                    = self.extract_one(frames, self.det, sciImg_list[i], bkg_redux_sciimg_list[i], objFind_list[i],
-                                       initial_sky_list[i], all_specobjs_on_det)
+        # Extract
+        n_proc = 1 if self.show else utils.get_nproc(self.par['rdx']['n_proc'],
+                                                      len(calibrated_det))
+        extract_args = list(zip(itertools.repeat(frames), calibrated_det, calib_slits,
+                                sciImg_list, bkg_redux_sciimg_list, objFind_list,
+                                initial_sky_list, specobjs_on_det))
+        if n_proc > 1:
+            msgs.info(f'Extracting objects on {len(calibrated_det)} detectors using {n_proc} '
+                      'processes.')
+            with utils.SharedProcessPool(n_proc, _calib_extract_task, pypeit=self) as pool:
+                extract_results = list(pool.map(extract_args))
+        else:
+            extract_results = itertools.starmap(self._calib_extract_one, extract_args)
+
+        for i, (self.det, (spec2DObj, tmp_sobjs)) \
+                in enumerate(zip(calibrated_det, extract_results)):
+            all_spec2d[sciImg_list[i].detector.name] = spec2DObj
             # Hold em
             if tmp_sobjs.nobj > 0:
                 all_specobjs_extract.add_sobj(tmp_sobjs)
@@ -649,6 +850,12 @@ class PypeIt:
 
             # TODO -- Save here?  Seems like we should.  Would probably need to use update_det=True
 
+        if n_proc > 1:
+            # The calibrations were loaded by the other processes.  Load the
+            # calibrations of the last detector, as in the serial reduction.
+            self.caliBrate = self.calib_one(frames, calibrated_det[-1], reuse_calibs=True)
+            self.caliBrate.slits = calib_slits[-1]
+
         # Return
         return all_spec2d, all_specobjs_extract
 
@@ -687,7 +894,7 @@ class PypeIt:
                                                    self.spectrograph.get_det_name(det))
         return objtype_out, calib_key, obstime, basename, binning
 
-    def calib_one(self, frames, det):
+    def calib_one(self, frames, det, reuse_calibs=None):
         """
         Run Calibration for a single exposure/detector pair
 
@@ -697,6 +904,9 @@ class PypeIt:
                 is provided
             det (:obj:`int`):
                 Detector number (1-indexed)
+            reuse_calibs (:obj:`bool`, optional):
+                Reuse any existing processed calibration frames.  If None,
+                use :attr:`reuse_calibs`.
 
         Returns:
             caliBrate (:class:`pypeit.calibrations.Calibrations`)
@@ -710,14 +920,83 @@ class PypeIt:
         caliBrate = calibrations.Calibrations.get_instance(
             self.fitstbl, self.par['calibrations'], self.spectrograph,
             self.calibrations_path, qadir=self.qa_path,
-            reuse_calibs=self.reuse_calibs, show=self.show, user_slits=user_slits,
-            chk_version=self.par['rdx']['chk_version'])
+            reuse_calibs=self.reuse_calibs if reuse_calibs is None else reuse_calibs,
+            show=self.show, user_slits=user_slits, chk_version=self.par['rdx']['chk_version'],
+            calib_cache=self.calib_cache)
         # These need to be separate to accomodate COADD2D
         caliBrate.set_config(frames[0], det, self.par['calibrations'])
         caliBrate.run_the_steps()
 
         return caliBrate
 
+    def _calib_objfind_one(self, frames, det, bg_frames=None, std_outfile=None):
+        """
+        Calibrate and find objects in a single exposure/detector pair.
+
+        This is a thin wrapper of :func:`calib_one` and :func:`objfind_one`
+        that only returns picklable objects, such that it can be executed by
+        a separate process; see :func:`reduce_exposure`.
+
+        Args:
+            frames (:obj:`list`):
+                List of frames to extract; stacked if more than one is
+                provided
+            det (:obj:`int`, :obj:`tuple`):
+                Detector number (1-indexed) or mosaic
+            bg_frames (:obj:`list`, optional):
+                List of frames to use as the background. Can be empty.
+            std_outfile (:obj:`str`, optional):
+                Filename for the standard star spec1d file.
+
+        Returns:
+            :obj:`tuple`: The name of the calibration step that failed (None if
+            the calibrations were successful), the calibrated
+            :class:`~pypeit.slittrace.SlitTraceSet`, and the tuple returned by
+            :func:`objfind_one`.  If the calibrations failed, the last two
+            objects are None.
+        """
+        msgs.info(f'Reducing detector {det}')
+        self.det = det
+        self.caliBrate = self.calib_one(frames, det)
+        if not self.caliBrate.success:
+            return self.caliBrate.failed_step, None, None
+        objfind_output = self.objfind_one(frames, det, bg_frames=bg_frames,
+                                          std_outfile=std_outfile)
+        # Write the messages to the log file before returning, in case this is
+        # executed by a separate process
+        msgs.flush()
+        return None, self.caliBrate.slits, objfind_output
+
+    def _calib_extract_one(self, frames, det, slits, sciImg, bkg_redux_sciimg, objFind,
+                           initial_sky, sobjs_obj):
+        """
+        Load the calibrations and extract the objects in a single
+        exposure/detector pair.
+
+        This is a thin wrapper of :func:`calib_one` and :func:`extract_one`
+        such that it can be executed by a separate process; see
+        :func:`reduce_exposure`.  The slits from the object-finding pass (which
+        may have been modified by the slitmask matching) replace the slits
+        loaded with the calibrations.  See :func:`extract_one` for the
+        argument descriptions.
+
+        Returns:
+            :obj:`tuple`: The :class:`~pypeit.spec2dobj.Spec2DObj` and
+            :class:`~pypeit.specobjs.SpecObjs` objects returned by
+            :func:`extract_one`.
+        """
+        self.det = det
+        # Load the calibrations.  They were either built or loaded by
+        # _calib_objfind_one, so they must be reused here.
+        self.caliBrate = self.calib_one(frames, det, reuse_calibs=True)
+        self.caliBrate.slits = slits
+        extract_output = self.extract_one(frames, det, sciImg, bkg_redux_sciimg, objFind,
+                                          initial_sky, sobjs_obj)
+        # Write the messages to the log file before returning, in case this is
+        # executed by a separate process
+        msgs.flush()
+        return extract_output
+
     def objfind_one(self, frames, det, bg_frames=None, std_outfile=None):
         """
         Reduce + Find Objects in a single exposure/detector pair
@@ -1215,15 +1494,22 @@ class PypeIt:
             all_specobjs.write_to_fits(subheader, outfile1d,
                                        update_det=update_det,
                                        slitspatnum=self.par['rdx']['slitspatnum'],
-                                       history=history)
+                                       history=history, writer=self.writer)
             # Info
             outfiletxt = os.path.join(self.science_path, 'spec1d_{:s}.txt'.format(basename))
             # TODO: Note we re-read in the specobjs from disk to deal with situations where
             # only a single detector is run in a second pass but in the same reduction directory.
             # Thiw was to address Issue #1116 in PR #1154. Slightly inefficient, but only other
             # option is to re-work write_info to also "append"
-            sobjs = specobjs.SpecObjs.from_fitsfile(outfile1d, chk_version=False)
-            sobjs.write_info(outfiletxt, self.spectrograph.pypeline)
+            pypeline = self.spectrograph.pypeline
+            def write_info():
+                sobjs = specobjs.SpecObjs.from_fitsfile(outfile1d, chk_version=False)
+                sobjs.write_info(outfiletxt, pypeline)
+            if self.writer is None:
+                write_info()
+            else:
+                # Written after the spec1d file
+                self.writer.call(write_info, outfiletxt)
             #all_specobjs.write_info(outfiletxt, self.spectrograph.pypeline)
 
         # 2D spectra
@@ -1231,14 +1517,15 @@ class PypeIt:
         # Build header
         pri_hdr = all_spec2d.build_primary_hdr(head2d, self.spectrograph,
                                                redux_path=self.par['rdx']['redux_path'],
-                                               calib_dir=self.caliBrate.calib_dir,
+                                               calib_dir=Path(self.calibrations_path).absolute(),
                                                subheader=subheader,
                                                history=history)
 
         # Write
         all_spec2d.write_to_fits(outfile2d, pri_hdr=pri_hdr,
                                  update_det=update_det,
-                                 slitspatnum=self.par['rdx']['slitspatnum'])
+                                 slitspatnum=self.par['rdx']['slitspatnum'],
+                                 writer=self.writer)
 
     def msgs_reset(self):
         """
@@ -1269,3 +1556,54 @@ class PypeIt:
         return '<{:s}: pypeit_file={}>'.format(self.__class__.__name__, self.pypeit_file)
 
 
+def _reduce_comb_group_task(comb_group, pypeit=None):
+    """
+    Reduce a single combination group in a
+    :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        comb_group (:obj:`tuple`):
+            Combination group to reduce; see :func:`PypeIt.get_comb_groups`.
+        pypeit (:class:`PypeIt`):
+            Object performing the reduction.
+
+    Returns:
+        :obj:`dict`: The summary returned by
+        :func:`PypeIt._reduce_comb_group_proc`.
+    """
+    return pypeit._reduce_comb_group_proc(comb_group)
+
+
+def _calib_objfind_task(task, pypeit=None):
+    """
+    Calibrate and find objects in a single exposure/detector pair in a
+    :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        task (:obj:`tuple`):
+            The frames, detector, background frames, and standard file passed
+            to :func:`PypeIt._calib_objfind_one`.
+        pypeit (:class:`PypeIt`):
+            Object performing the reduction.
+
+    Returns:
+        :obj:`tuple`: The results of :func:`PypeIt._calib_objfind_one`.
+    """
+    return pypeit._calib_objfind_one(*task)
+
+
+def _calib_extract_task(task, pypeit=None):
+    """
+    Load the calibrations and extract the objects in a single
+    exposure/detector pair in a :class:`~pypeit.utils.SharedProcessPool`.
+
+    Args:
+        task (:obj:`tuple`):
+            The arguments passed to :func:`PypeIt._calib_extract_one`.
+        pypeit (:class:`PypeIt`):
+            Object performing the reduction.
+
+    Returns:
+        :obj:`tuple`: The results of :func:`PypeIt._calib_extract_one`.
+    """
+    return pypeit._calib_extract_one(*task)
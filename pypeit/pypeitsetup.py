@@ -228,7 +228,7 @@ class PypeItSetup:
     def __repr__(self):
         return '<{:s}: nfiles={:d}>'.format(self.__class__.__name__, self.nfiles)
 
-    def build_fitstbl(self, strict=True):
+    def build_fitstbl(self, strict=True, header_cache=False):
         """
         Construct the table with metadata for the frames to reduce.
 
@@ -239,6 +239,10 @@ class PypeItSetup:
                 Function will fault if `astropy.io.fits.getheader`_ fails to
                 read the headers of any of the files in :attr:`file_list`.  Set
                 to False to only report a warning and continue.
+            header_cache (:obj:`bool`, optional):
+                Use the persistent cache of the file headers, such that only
+                the headers of new or modified files are read; see
+                :class:`~pypeit.io.HeaderCache`.
 
         Returns:
             `astropy.table.Table`_: Table with the metadata for each fits file
@@ -248,7 +252,8 @@ class PypeItSetup:
         # Build and sort the table
         self.fitstbl = PypeItMetaData(self.spectrograph, par=self.par, 
                                       files=self.file_list,
-                                      usrdata=self.usrdata, strict=strict)
+                                      usrdata=self.usrdata, strict=strict,
+                                      header_cache=header_cache)
         # Sort by the time
         if 'time' in self.fitstbl.keys():
             self.fitstbl.sort('time')
@@ -277,7 +282,7 @@ class PypeItSetup:
         # Use PypeItMetaData methods to get the frame types
         self.fitstbl.get_frame_types(flag_unknown=flag_unknown, user=self.frametype)
 
-    def run(self, setup_only=False, clean_config=True, groupings=True):
+    def run(self, setup_only=False, clean_config=True, groupings=True, header_cache=False):
         """
         Perform the main setup operations.
         
@@ -316,6 +321,9 @@ class PypeItSetup:
             groupings (:obj:`bool`, optional):
                 Group frames into instrument configurations and calibration
                 sets, and add the default combination-group columns.
+            header_cache (:obj:`bool`, optional):
+                When building the metadata table, use the persistent cache of
+                the file headers; see :func:`build_fitstbl`.
 
         Returns:
             :obj:`tuple`: Returns, respectively, the
@@ -328,7 +336,7 @@ class PypeItSetup:
         """
         # Build the minimal metadata table if it doesn't exist already
         if self.fitstbl is None:
-            self.build_fitstbl(strict=not setup_only)
+            self.build_fitstbl(strict=not setup_only, header_cache=header_cache)
 
         # Remove frames that have invalid values for
         # configuration-defining metadata
@@ -189,6 +189,16 @@ class Messages:
             self._log = None
         self._initialize_log_file(log=log)
 
+    def flush(self):
+        """
+        Flush any buffered messages to the log file.
+
+        This should be called before starting new processes, such that the
+        buffered messages are not duplicated by each child process.
+        """
+        if self._log:
+            self._log.flush()
+
     def close(self):
         '''
         Close the log file before the code exits
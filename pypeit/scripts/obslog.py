@@ -82,6 +82,13 @@ class ObsLog(scriptbase.ScriptBase):
                                  'session).  The table is always written in ascii format using '
                                  'format=ascii.fixed_with for the call to '
                                  'Astropy.table.Table.write .')
+        parser.add_argument('--header_cache', default=False, action='store_true',
+                            help='Use a cache of previously read file headers.  The headers are '
+                                 'saved to a database in the PypeIt cache directory, and only the '
+                                 'headers of new or modified files are read when the log is re-generated.  '
+                                 'Files not in the cache are fully opened, as without the '
+                                 'cache.  The oldest headers are removed when the cache exceeds '
+                                 '100 MB.')
         parser.add_argument('-G','--gui', default=False, action='store_true',
                             help='View the obs log in a GUI')
         return parser
@@ -119,7 +126,8 @@ class ObsLog(scriptbase.ScriptBase):
                                         extension=args.extension)
         ps.run(setup_only=True,  # This allows for bad headers
                groupings=args.groupings,
-               clean_config=args.bad_frames)
+               clean_config=args.bad_frames,
+               header_cache=args.header_cache)
 
         # Check the file can be written (this is here because the spectrograph
         # needs to be defined first)
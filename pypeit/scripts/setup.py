@@ -55,6 +55,13 @@ class Setup(scriptbase.ScriptBase):
                                  'pypeit_obslog; i.e., you have to tell pypeit_setup to keep '
                                  'these frames, whereas you have to tell pypeit_obslog to remove '
                                  'them.')
+        parser.add_argument('--header_cache', default=False, action='store_true',
+                            help='Use a cache of previously read file headers.  The headers are '
+                                 'saved to a database in the PypeIt cache directory, and only the '
+                                 'headers of new or modified files are read when the setup is re-run.  '
+                                 'Files not in the cache are fully opened, as without the '
+                                 'cache.  The oldest headers are removed when the cache exceeds '
+                                 '100 MB.')
         parser.add_argument('-G', '--gui', default=False, action='store_true',
                             help='Run setup in a GUI')        
 
@@ -115,7 +122,8 @@ class Setup(scriptbase.ScriptBase):
         # Initialize PypeItSetup based on the arguments
         ps = PypeItSetup.from_file_root(args.root, args.spectrograph, extension=args.extension)
         # Run the setup
-        ps.run(setup_only=True, clean_config=not args.keep_bad_frames)
+        ps.run(setup_only=True, clean_config=not args.keep_bad_frames,
+               header_cache=args.header_cache)
 
         # Print selected files
         output_path = Path(args.output_path).absolute()
@@ -149,9 +149,13 @@ class Show2DSpec(scriptbase.ScriptBase):
         _clear = args.clear
 
         # Try to read the Spec2DObj using the current datamodel, but allowing
-        # for the datamodel version to be different
+        # for the datamodel version to be different.  Only the components used
+        # by this script are read.
         try:
-            spec2DObj = spec2dobj.Spec2DObj.from_file(args.file, detname, chk_version=chk_version)
+            spec2DObj = spec2dobj.Spec2DObj.from_file(args.file, detname, chk_version=chk_version,
+                                                      attrs=['sciimg', 'skymodel', 'objmodel',
+                                                             'ivarmodel', 'bpmmask', 'waveimg',
+                                                             'slits'])
         except (PypeItDataModelError, PypeItBitMaskError):
             try:
                 # Try to get the pypeit version used to write this file
@@ -170,6 +170,9 @@ class TellFit(scriptbase.ScriptBase):
                                            maxiter=par['telluric']['maxiter'],
                                            popsize=par['telluric']['popsize'],
                                            tol=par['telluric']['tol'],
+                                           vectorized=par['telluric']['vectorized'],
+                                           n_proc=par['telluric']['n_proc'],
+                                           band_cache_size=par['telluric']['band_cache_size'],
                                            debug_init=args.debug, disp=args.debug,
                                            debug=args.debug, show=args.plot,
                                            chk_version=args.chk_version)
@@ -194,6 +197,9 @@ class TellFit(scriptbase.ScriptBase):
                                              maxiter=par['telluric']['maxiter'],
                                              popsize=par['telluric']['popsize'],
                                              tol=par['telluric']['tol'],
+                                             vectorized=par['telluric']['vectorized'],
+                                             n_proc=par['telluric']['n_proc'],
+                                             band_cache_size=par['telluric']['band_cache_size'],
                                              debug_init=args.debug, disp=args.debug,
                                              debug=args.debug, show=args.plot,
                                              chk_version=args.chk_version)
@@ -214,6 +220,9 @@ class TellFit(scriptbase.ScriptBase):
                                              maxiter=par['telluric']['maxiter'],
                                              popsize=par['telluric']['popsize'],
                                              tol=par['telluric']['tol'],
+                                             vectorized=par['telluric']['vectorized'],
+                                             n_proc=par['telluric']['n_proc'],
+                                             band_cache_size=par['telluric']['band_cache_size'],
                                              debug_init=args.debug, disp=args.debug,
                                              debug=args.debug, show=args.plot,
                                              chk_version=args.chk_version)
@@ -925,7 +925,11 @@ class IRSensFunc(SensFunc):
                                                    popsize=self.par['IR']['popsize'],
                                                    recombination=self.par['IR']['recombination'],
                                                    polish=self.par['IR']['polish'],
-                                                   disp=self.par['IR']['disp'], debug=self.debug,
+                                                   disp=self.par['IR']['disp'],
+                                                   vectorized=self.par['IR']['vectorized'],
+                                                   n_proc=self.par['IR']['n_proc'],
+                                                   band_cache_size=self.par['IR']['band_cache_size'],
+                                                   debug=self.debug,
                                                    debug_init=self.debug)
 
         # Copy the relevant metadata
@@ -87,6 +87,10 @@ class SlitTraceSet(calibframe.CalibFrame):
             Convenient spot to hold flexure corrected left
         right_flexure (`numpy.ndarray`_):
             Convenient spot to hold flexure corrected right
+        span_cache (:obj:`dict`):
+            Cache of the run-length slit geometry computed by
+            :func:`slit_spans`, keyed by the requested edges, flexure, and
+            padding.
     """
     calib_type = 'Slits'
     """Name for type of calibration frame."""
@@ -102,7 +106,12 @@ class SlitTraceSet(calibframe.CalibFrame):
     Bit interpreter for slit masks.
     """
 
-    internals = calibframe.CalibFrame.internals + ['left_flexure', 'right_flexure']
+    span_cache_size = 8
+    """
+    Maximum number of slit geometries kept by :func:`slit_spans`.
+    """
+
+    internals = calibframe.CalibFrame.internals + ['left_flexure', 'right_flexure', 'span_cache']
     """
     Attributes kept separate from the datamodel.
     """
@@ -369,6 +378,7 @@ class SlitTraceSet(calibframe.CalibFrame):
         """
         self.left_tweak = self.left_init.copy()
         self.right_tweak = self.right_init.copy()
+        self.span_cache = None
 
     def rm_tweaked(self):
         """
@@ -376,6 +386,7 @@ class SlitTraceSet(calibframe.CalibFrame):
         """
         self.left_tweak = None
         self.right_tweak = None
+        self.span_cache = None
 
     @property
     def slit_info(self):
@@ -548,21 +559,64 @@ class SlitTraceSet(calibframe.CalibFrame):
                 continue
             onslit = (slitid_img_init == spatid)
             onslit_init = np.where(onslit)
-            if self.mask[slit_idx] != 0:
-                msgs.error(f'Slit {spatid} ({slit_idx+1}/{self.spat_id.size}) is masked. Cannot '
-                           'generate RA/DEC image.')
-            # Retrieve the pixel offset from the central trace
-            evalpos = alignSplines.transform(slit_idx, onslit_init[1], onslit_init[0])
+            world_ra, world_dec, evalpos \
+                    = self.get_radec(wcs, alignSplines, tilts, slit_idx, onslit_init[0],
+                                     onslit_init[1], slice_offset=slice_offset)
             minmax[slit_idx, 0] = np.min(evalpos)
             minmax[slit_idx, 1] = np.max(evalpos)
-            # Calculate the WCS from the pixel positions
-            slitID = np.ones(evalpos.size) * slit_idx + slice_offset - wcs.wcs.crpix[0]
-            world_ra, world_dec, _ = wcs.wcs_pix2world(slitID, evalpos, tilts[onslit_init]*(self.nspec-1), 0)
             # Set the RA first and DEC next
-            raimg[onslit] = world_ra.copy()
-            decimg[onslit] = world_dec.copy()
+            raimg[onslit] = world_ra
+            decimg[onslit] = world_dec
         return raimg, decimg, minmax
 
+    def get_radec(self, wcs, alignSplines, tilts, slit_idx, specpix, spatpix, slice_offset=None):
+        """
+        Calculate the RA and DEC of a set of pixels in a single slit.
+
+        This is the per-slit calculation performed by :func:`get_radec_image`,
+        which avoids constructing full images when only the coordinates of the
+        pixels in one slit are needed.
+
+        Parameters
+        ----------
+        wcs : `astropy.wcs.WCS`_
+            The World Coordinate system of a science frame
+        alignSplines : :class:`pypeit.alignframe.AlignmentSplines`
+            An instance of the AlignmentSplines class that allows one to build and
+            transform between detector pixel coordinates and WCS pixel coordinates.
+        tilts : `numpy.ndarray`_
+            Spectral tilts.
+        slit_idx : int
+            The index of the slit.
+        specpix : `numpy.ndarray`_
+            Spectral pixel coordinates of the pixels in the slit.
+        spatpix : `numpy.ndarray`_
+            Spatial pixel coordinates of the pixels in the slit.
+        slice_offset : float, optional
+            Offset to apply to the slice positions; see :func:`get_radec_image`.
+
+        Returns
+        -------
+        ra : `numpy.ndarray`_
+            RA coordinates of each pixel in degrees.
+        dec : `numpy.ndarray`_
+            DEC coordinates of each pixel in degrees.
+        evalpos : `numpy.ndarray`_
+            The spatial offset (in pixels) of each pixel from the WCS reference
+            (usually the centre of the slit).
+        """
+        if self.mask[slit_idx] != 0:
+            msgs.error(f'Slit {self.spat_id[slit_idx]} ({slit_idx+1}/{self.spat_id.size}) is '
+                       'masked. Cannot generate RA/DEC image.')
+        if slice_offset is None:
+            slice_offset = 0.0
+        # Retrieve the pixel offset from the central trace
+        evalpos = alignSplines.transform(slit_idx, spatpix, specpix)
+        # Calculate the WCS from the pixel positions
+        slitID = np.ones(evalpos.size) * slit_idx + slice_offset - wcs.wcs.crpix[0]
+        ra, dec, _ = wcs.wcs_pix2world(slitID, evalpos, tilts[specpix, spatpix]*(self.nspec-1), 0)
+        return ra, dec, evalpos
+
     def select_edges(self, initial=False, flexure=None):
         """
         Select between the initial or tweaked slit edges and allow for
@@ -662,18 +716,6 @@ class SlitTraceSet(calibframe.CalibFrame):
         #
         if slitidx is not None and exclude_flag is not None:
             msgs.error("Cannot pass in both slitidx and exclude_flag!")
-        # Check the input
-        if pad is None:
-            pad = self.pad
-        _pad = pad if isinstance(pad, tuple) else (pad,pad)
-        if len(_pad) != 2:
-            msgs.error('Padding for both left and right edges should be provided as a 2-tuple!')
-
-        # Pixel coordinates
-        spat = np.arange(self.nspat)
-        spec = np.arange(self.nspec)
-
-        left, right, _ = self.select_edges(initial=initial, flexure=flexure)
 
         # Choose the slits to use
         if slitidx is not None:
@@ -688,20 +730,208 @@ class SlitTraceSet(calibframe.CalibFrame):
         # TODO: When specific slits are chosen, need to check that the
         # padding doesn't lead to slit overlap.
 
-        # Find the pixels in each slit, limited by the minimum and
-        # maximum spectral position.
+        # Fill the pixels in each slit, limited by the minimum and
+        # maximum spectral position.  Slits are filled in order, such that
+        # overlapping pixels are assigned to the last slit.
+        spans = self.slit_spans(pad=pad, initial=initial, flexure=flexure)
         slitid_img = np.full((self.nspec,self.nspat), -1, dtype=int)
         for i in slitidx:
             slit_id = self.spat_id[i] if use_spatial else i
-            indx = (spat[None,:] > left[:,i,None] - _pad[0]) \
-                        & (spat[None,:] < right[:,i,None] + _pad[1]) \
-                        & (spec > self.specmin[i])[:,None] & (spec < self.specmax[i])[:,None]
-            slitid_img[indx] = slit_id
+            slitid_img.flat[self._span_flat_indices(spans, i)] = slit_id
         # Return
         return slitid_img
 
+    def slit_spans(self, pad=None, initial=False, flexure=None):
+        r"""
+        Construct the run-length geometry of all slits.
+
+        For each slit and spectral row, the pixels associated with the slit
+        by :func:`slit_img` are the contiguous range of spatial pixels that
+        satisfy :math:`x_{\rm left} - p_{\rm left} < x < x_{\rm right} +
+        p_{\rm right}`; the rows of the slit are limited to
+        :math:`s_{\rm min} < s < s_{\rm max}`, using :attr:`specmin` and
+        :attr:`specmax`.  The spans are computed in
+        :math:`\mathcal{O}(N_{\rm spec} N_{\rm slits})` operations, and the
+        slit images, pixel lists, and bounding boxes derived from them only
+        visit the pixels in each slit.
+
+        The result is cached by the requested edges, flexure, and padding.
+        The cache is only used if the slit edges and spectral limits are
+        unchanged since it was computed, and it is cleared by
+        :func:`init_tweaked` and :func:`rm_tweaked`.
+
+        Args:
+            pad (:obj:`float`, :obj:`int`, :obj:`tuple`, optional):
+                The number of pixels used to pad (extend) the edge of
+                each slit.  See :func:`slit_img`.
+            initial (:obj:`bool`, optional):
+                Use the initial edges regardless of the presence of the
+                tweaked edges.  See :func:`select_edges`.
+            flexure (:obj:`float`, optional):
+                If provided, offset each slit by this amount.  See
+                :func:`select_edges`.
+
+        Returns:
+            :obj:`tuple`: Four integer arrays.  The first two have shape
+            :math:`(N_{\rm spec}, N_{\rm slits})` and provide the first
+            spatial pixel in each row of each slit and the spatial pixel
+            *after* the last pixel in the row; rows where the first array is
+            not smaller than the second are empty.  The spatial ranges are
+            provided for all rows.  The last two arrays have shape
+            :math:`(N_{\rm slits},)` and provide the first and one beyond the
+            last spectral row of each slit.  The arrays are read-only.
+        """
+        if pad is None:
+            pad = self.pad
+        _pad = pad if isinstance(pad, tuple) else (pad,pad)
+        if len(_pad) != 2:
+            msgs.error('Padding for both left and right edges should be provided as a 2-tuple!')
+
+        left, right, _ = self.select_edges(initial=initial, flexure=flexure)
+
+        # Use the cached spans if the edges have not changed
+        key = (bool(initial), flexure if flexure else None, float(_pad[0]), float(_pad[1]))
+        if self.span_cache is None:
+            self.span_cache = {}
+        if key in self.span_cache:
+            edges, spans = self.span_cache[key]
+            if np.array_equal(edges[0], left, equal_nan=True) \
+                    and np.array_equal(edges[1], right, equal_nan=True) \
+                    and np.array_equal(edges[2], self.specmin) \
+                    and np.array_equal(edges[3], self.specmax):
+                return spans
+
+        # Pixels are in the slit if left - pad < spat < right + pad
+        with np.errstate(invalid='ignore'):
+            spat_start = np.floor(left - _pad[0]) + 1
+            spat_stop = np.ceil(right + _pad[1])
+        # Rows with undefined edges are empty
+        indx = np.logical_not(np.isfinite(spat_start) & np.isfinite(spat_stop))
+        spat_start[indx] = self.nspat
+        spat_stop[indx] = 0
+        spat_start = np.clip(spat_start, 0, self.nspat).astype(int)
+        spat_stop = np.clip(spat_stop, 0, self.nspat).astype(int)
+        # Same for specmin < spec < specmax
+        spec_start = np.clip(np.floor(self.specmin) + 1, 0, self.nspec).astype(int)
+        spec_stop = np.clip(np.ceil(self.specmax), spec_start, self.nspec).astype(int)
+
+        spans = (spat_start, spat_stop, spec_start, spec_stop)
+        for a in spans:
+            a.flags.writeable = False
+
+        # Cache the result, removing the oldest entry if necessary
+        self.span_cache.pop(key, None)
+        if len(self.span_cache) >= self.span_cache_size:
+            self.span_cache.pop(next(iter(self.span_cache)))
+        self.span_cache[key] = ((left, right, self.specmin.copy(), self.specmax.copy()), spans)
+        return spans
+
+    def _span_flat_indices(self, spans, slitidx):
+        r"""
+        Return the flattened image indices of the pixels in a slit.
+
+        Args:
+            spans (:obj:`tuple`):
+                Slit geometry returned by :func:`slit_spans`.
+            slitidx (:obj:`int`):
+                Index (zero-based) of the slit.
+
+        Returns:
+            `numpy.ndarray`_: Indices of the slit pixels in the flattened
+            :math:`(N_{\rm spec}, N_{\rm spat})` image, ordered by spectral
+            row and then spatial pixel.
+        """
+        spat_start, spat_stop, spec_start, spec_stop = spans
+        rows = np.arange(spec_start[slitidx], spec_stop[slitidx])
+        start = spat_start[rows,slitidx]
+        npix = np.clip(spat_stop[rows,slitidx] - start, 0, None)
+        # Offset of each row in the output vector
+        offset = np.cumsum(npix) - npix
+        return np.repeat(rows*self.nspat + start - offset, npix) + np.arange(np.sum(npix))
+
+    def slit_pixels(self, slitidx, pad=None, initial=False, flexure=None):
+        """
+        Return the indices of the pixels associated with a single slit.
+
+        The pixels are the same as those selected by ``slit_img(...) ==
+        spat_id[slitidx]`` for the same ``pad``, ``initial``, and ``flexure``,
+        except that pixels shared with other slits are always included.
+        Only the pixels in the slit are visited (see :func:`slit_spans`).
+
+        Args:
+            slitidx (:obj:`int`):
+                Index (zero-based) of the slit.
+            pad (:obj:`float`, :obj:`int`, :obj:`tuple`, optional):
+                The number of pixels used to pad (extend) the edge of
+                the slit.  See :func:`slit_img`.
+            initial (:obj:`bool`, optional):
+                Use the initial edges regardless of the presence of the
+                tweaked edges.  See :func:`select_edges`.
+            flexure (:obj:`float`, optional):
+                If provided, offset the slit by this amount.  See
+                :func:`select_edges`.
+
+        Returns:
+            :obj:`tuple`: Two integer arrays with the spectral and spatial
+            indices of the slit pixels, respectively, such that they can be
+            used to index a full detector image.
+        """
+        spans = self.slit_spans(pad=pad, initial=initial, flexure=flexure)
+        return np.divmod(self._span_flat_indices(spans, slitidx), self.nspat)
+
+    def slit_cutout(self, slitidx, pad=None, initial=False, flexure=None, trim_spec=False):
+        r"""
+        Return the bounding box of the pixels associated with a single slit.
+
+        The bounding box includes all pixels that would be associated with the
+        slit by :func:`slit_img` when called with the same ``pad``,
+        ``initial``, and ``flexure``.  Indexing a full detector image with the
+        returned slices yields a view of the image cutout, which allows
+        per-slit algorithms to operate on :math:`N_{\rm pix,slit}` instead of
+        :math:`N_{\rm pix,det}` pixels; e.g.:
+
+        .. code-block:: python
+
+            cut = slits.slit_cutout(slitidx)
+            thismask = slitmask[cut] == slits.spat_id[slitidx]
+            skymodel[cut][thismask] = ...
+
+        Args:
+            slitidx (:obj:`int`):
+                Index (zero-based) of the slit.
+            pad (:obj:`float`, :obj:`int`, :obj:`tuple`, optional):
+                The number of pixels used to pad (extend) the edge of
+                the slit.  See :func:`slit_img`.
+            initial (:obj:`bool`, optional):
+                Use the initial edges regardless of the presence of the
+                tweaked edges.  See :func:`select_edges`.
+            flexure (:obj:`float`, optional):
+                If provided, offset the slit by this amount.  See
+                :func:`select_edges`.
+            trim_spec (:obj:`bool`, optional):
+                Limit the cutout along the spectral direction to the range set
+                by :attr:`specmin` and :attr:`specmax`.  By default, the
+                cutout includes all spectral pixels, which is required by
+                algorithms that use the number of spectral pixels in the image
+                (e.g., to convert the tilts to spectral pixel coordinates).
+
+        Returns:
+            :obj:`tuple`: Two :obj:`slice` objects selecting the spectral and
+            spatial ranges of the cutout, respectively.
+        """
+        spat_start, spat_stop, spec_start, spec_stop \
+                = self.slit_spans(pad=pad, initial=initial, flexure=flexure)
+        # Bounding box of the spatial ranges in all rows
+        spat_min = int(np.amin(spat_start[:,slitidx]))
+        spat_max = int(np.clip(np.amax(spat_stop[:,slitidx]), spat_min, self.nspat))
+        if not trim_spec:
+            return np.s_[:, spat_min:spat_max]
+        spec_min = int(spec_start[slitidx])
+        spec_max = int(spec_stop[slitidx])
+        return np.s_[spec_min:spec_max, spat_min:spat_max]
+
     def spatial_coordinate_image(self, slitidx=None, full=False, slitid_img=None,
-                                 pad=None, initial=False, flexure_shift=None):
+                                 pad=None, initial=False, flexure_shift=None, cutout=None):
         r"""
         Generate an image with the normalized spatial coordinate
         within each slit.
@@ -738,24 +968,41 @@ class SlitTraceSet(calibframe.CalibFrame):
                 :attr:`right`) are used. To use the nominal edges
                 regardless of the presence of the tweaked edges, set
                 this to True. See :func:`select_edges`.
+            flexure_shift (:obj:`float`, optional):
+                If provided, offset each slit by this amount.  See
+                :func:`select_edges`.
+            cutout (:obj:`tuple`, optional):
+                Slices selecting a cutout of the image; see
+                :func:`slit_cutout`.  If provided, the coordinates are
+                only computed for the pixels in the cutout, and
+                ``slitid_img`` must have the shape of the cutout.
 
         Returns:
             `numpy.ndarray`_: Array specifying the spatial coordinate
             of pixel in its own slit, scaled to go from 0 to 1. If
             ``full`` is True, the image provides the coordinates
             relative to the left edge for the provided slit over the
-            full image.
+            full image (or cutout).
         """
         # Slit indices to include
         _slitidx = np.arange(self.nslits) if slitidx is None else np.atleast_1d(slitidx).ravel()
         if full and len(_slitidx) > 1:
             msgs.error('For a full image with the slit coordinates, must select a single slit.')
 
+        # Pixels in the output image
+        spec = np.arange(self.nspec)
+        spat = np.arange(self.nspat)
+        if cutout is not None:
+            spec = spec[cutout[0]]
+            spat = spat[cutout[1]]
+
         # Generate the slit ID image if it wasn't provided
         if not full:
             if slitid_img is None:
                 slitid_img = self.slit_img(pad=pad, slitidx=_slitidx, initial=initial)
-            if slitid_img.shape != (self.nspec,self.nspat):
+                if cutout is not None:
+                    slitid_img = slitid_img[cutout]
+            if slitid_img.shape != (spec.size,spat.size):
                 msgs.error('Provided slit ID image does not have the correct shape!')
 
         # Choose the slit edges to use
@@ -774,10 +1021,9 @@ class SlitTraceSet(calibframe.CalibFrame):
             msgs.warn('Slits {0} have negative (or 0) slit width!'.format(bad_slits))
 
         # Output image
-        coo_img = np.zeros((self.nspec,self.nspat), dtype=float)
-        spat = np.arange(self.nspat)
+        coo_img = np.zeros((spec.size,spat.size), dtype=float)
         for i in _slitidx:
-            coo = (spat[None,:] - left[:,i,None])/slitwidth[:,i,None]
+            coo = (spat[None,:] - left[spec,i,None])/slitwidth[spec,i,None]
             if not full:
                 indx = slitid_img == self.spat_id[i]
                 coo_img[indx] = coo[indx]
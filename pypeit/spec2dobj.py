@@ -9,6 +9,7 @@ from pathlib import Path
 import os
 import inspect
 import datetime
+import functools
 
 from copy import deepcopy
 
@@ -112,7 +113,7 @@ class Spec2DObj(datamodel.DataContainer):
                 ]
 
     @classmethod
-    def from_file(cls, ifile, detname, chk_version=True):
+    def from_file(cls, ifile, detname, chk_version=True, attrs=None, lazy=False):
         """
         Instantiate the object from an extension in the specified fits file.
 
@@ -127,16 +128,20 @@ class Spec2DObj(datamodel.DataContainer):
                 the data that is read.
             chk_version (:obj:`bool`, optional):
                 Passed to :func:`from_hdu`.
+            attrs (:obj:`list`, optional):
+                Passed to :func:`from_hdu`.
+            lazy (:obj:`bool`, optional):
+                Passed to :func:`from_hdu`.
         """
         with io.fits_open(ifile) as hdu:
             # Check detname is valid
             detnames = np.unique([h.name.split('-')[0] for h in hdu[1:]])
             if detname not in detnames:
                 msgs.error(f'Your --det={detname} is not available. \n   Choose from: {detnames}')
-            return cls.from_hdu(hdu, detname, chk_version=chk_version)
+            return cls.from_hdu(hdu, detname, chk_version=chk_version, attrs=attrs, lazy=lazy)
 
     @classmethod
-    def from_hdu(cls, hdu, detname, chk_version=True):
+    def from_hdu(cls, hdu, detname, chk_version=True, attrs=None, lazy=False):
         """
         Override base-class :func:`~pypeit.datamodel.DataContainer.from_hdu` to
         specify detector to read.
@@ -149,6 +154,18 @@ class Spec2DObj(datamodel.DataContainer):
                 the data that is read.
             chk_version (:obj:`bool`, optional):
                 If False, allow a mismatch in datamodel to proceed
+            attrs (:obj:`list`, optional):
+                The datamodel items with data to read; e.g., ``['sciimg',
+                'slits']``.  All other items saved in their own extension are
+                left as None.  The ``detector`` and the items saved in the
+                extension headers (e.g., ``sci_spat_flexure``) are always read.
+                If None, all items are read.
+            lazy (:obj:`bool`, optional):
+                Only read the images (and the bad-pixel mask) when they are
+                first accessed.  This requires the HDUs to have been read from
+                an uncompressed file; otherwise, the images are read
+                immediately.  See
+                :func:`~pypeit.datamodel.DataContainer.set_lazy`.
 
         Returns:
             :class:`~pypeit.spec2dobj.Spec2DObj`: 2D spectra object.
@@ -165,11 +182,21 @@ class Spec2DObj(datamodel.DataContainer):
         has_mask = mask_ext in ext
         if has_mask:
             ext.remove(mask_ext)
-
-        self = super().from_hdu(hdu, ext=ext, hdu_prefix=f'{detname}-', chk_version=chk_version)
-        if has_mask:
-            self.bpmmask = imagebitmask.ImageBitMaskArray.from_hdu(hdu[mask_ext], ext_pseudo='MASK',
-                                                                   chk_version=chk_version)
+        read_mask = has_mask and (attrs is None or 'bpmmask' in attrs)
+        # The detector is needed to validate the object
+        _attrs = None if attrs is None else list(attrs) + ['detector']
+
+        self = super().from_hdu(hdu, ext=ext, hdu_prefix=f'{detname}-', chk_version=chk_version,
+                                attrs=_attrs, lazy=lazy)
+        if read_mask:
+            parse_mask = functools.partial(imagebitmask.ImageBitMaskArray.from_hdu,
+                                           ext_pseudo='MASK', chk_version=chk_version)
+            lazy_mask = datamodel.LazyHDUData.from_hdu(hdu[mask_ext], parser=parse_mask) \
+                            if lazy else None
+            if lazy_mask is None:
+                self.bpmmask = parse_mask(hdu[mask_ext])
+            else:
+                self.set_lazy('bpmmask', lazy_mask)
         # Try to fill the internals based on the header of the first parsed
         # extension
         hdr = hdu[ext[0]].header
@@ -443,7 +470,7 @@ class AllSpec2DObj:
     """
     hdr_prefix = 'ALLSPEC2D_'
     @classmethod
-    def from_fits(cls, filename, chk_version=True):
+    def from_fits(cls, filename, chk_version=True, attrs=None, lazy=False):
         """
 
         Args:
@@ -452,6 +479,12 @@ class AllSpec2DObj:
             chk_version (:obj:`bool`, optional):
                 If True, demand the on-disk datamodel equals the current one.
                 Passed to from_hdu() of DataContainer.
+            attrs (:obj:`list`, optional):
+                The datamodel items to read for each detector.  Passed to
+                :func:`Spec2DObj.from_hdu`.
+            lazy (:obj:`bool`, optional):
+                Only read the images when they are first accessed.  Passed to
+                :func:`Spec2DObj.from_hdu`.
 
         Returns:
             :class:`~pypeit.spec2dobj.AllSpec2DObj`: The constructed object.
@@ -470,7 +503,8 @@ class AllSpec2DObj:
             # Detectors included
             detectors = hdu[0].header[self.hdr_prefix+'DETS']
             for detname in detectors.split(','):
-                self[detname] = Spec2DObj.from_hdu(hdu, detname, chk_version=chk_version)
+                self[detname] = Spec2DObj.from_hdu(hdu, detname, chk_version=chk_version,
+                                                   attrs=attrs, lazy=lazy)
         return self
 
     def __init__(self):
@@ -602,7 +636,7 @@ class AllSpec2DObj:
         return hdr
 
     def write_to_fits(self, outfile, pri_hdr=None, update_det=None, 
-                      slitspatnum=None, overwrite=True):
+                      slitspatnum=None, overwrite=True, writer=None):
         """
         Write the spec2d FITS file
 
@@ -632,13 +666,20 @@ class AllSpec2DObj:
                 If true and the output file already exists, overwrite it.  The
                 combination of this and ``update_det`` may also alter this
                 object based on the existing file.
+            writer (:class:`~pypeit.io.FitsWriter`, optional):
+                If provided, the HDUs are constructed by this method, but the
+                file is written by the background writer.
         """
         _outfile = Path(outfile).absolute()
+        if writer is not None and writer.is_pending(_outfile):
+            # Make sure any previous version of the file has been written
+            writer.wait()
         if _outfile.exists():
             # Clobber?
             if not overwrite:
                 msgs.warn(f'File {_outfile} exits.  Use -o to overwrite.')
                 return
+        if _outfile.exists() and (update_det is not None or slitspatnum is not None):
             # Load up the original
             _allspecobj = AllSpec2DObj.from_fits(_outfile)
             # Replace the newly reduced detector?
@@ -716,6 +757,9 @@ class AllSpec2DObj:
 
         # Finish
         hdulist = fits.HDUList(hdus)
+        if writer is not None:
+            writer.submit(hdulist, _outfile, overwrite=overwrite)
+            return
         hdulist.writeto(_outfile, overwrite=overwrite)
         msgs.info(f'Wrote: {_outfile}')
 
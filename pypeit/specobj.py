@@ -7,6 +7,7 @@ Module for the SpecObj classes
 """
 import copy
 import inspect
+import weakref
 from IPython import embed
 
 import numpy as np
@@ -261,6 +262,51 @@ class SpecObj(datamodel.DataContainer):
         slf[mode+'_MASK'] = (slf[mode+'_COUNTS_IVAR'] > 0.) & np.isfinite(slf[mode+'_COUNTS_IVAR'])
         return slf
 
+    def __setitem__(self, item, value):
+        """
+        Override the base class to empty the cached attribute arrays of any
+        :class:`~pypeit.specobjs.SpecObjs` object built using this object; see
+        :func:`add_owner`.
+        """
+        super().__setitem__(item, value)
+        owners = self.__dict__.pop('_owners', None)
+        if owners is not None:
+            for sobjs in list(owners):
+                sobjs._reset_columns()
+
+    def add_owner(self, sobjs):
+        """
+        Register a :class:`~pypeit.specobjs.SpecObjs` object that has cached
+        arrays constructed from the attributes of this object.
+
+        The cache of each registered object is emptied the next time an
+        attribute of this object is set.  The registration only holds a weak
+        reference to ``sobjs`` and is not copied or pickled.
+
+        Args:
+            sobjs (:class:`~pypeit.specobjs.SpecObjs`):
+                Object with the cached attribute arrays.
+        """
+        # NOTE: Set directly to avoid __setattr__, which restricts the
+        # attributes to the datamodel and internals.
+        if '_owners' not in self.__dict__:
+            self.__dict__['_owners'] = weakref.WeakSet()
+        self.__dict__['_owners'].add(sobjs)
+
+    def __getstate__(self):
+        """
+        Return the instance attributes for copying and pickling, excluding the
+        registered :class:`~pypeit.specobjs.SpecObjs` objects; see
+        :func:`add_owner`.
+        """
+        return {key: val for key, val in self.__dict__.items() if key != '_owners'}
+
+    def __setstate__(self, state):
+        """
+        Restore the instance attributes; see :func:`__getstate__`.
+        """
+        self.__dict__.update(state)
+
     def _validate(self):
         """
         Validate the object.
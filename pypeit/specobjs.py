@@ -39,10 +39,17 @@ class SpecObjs:
 
         - ``__getitem__`` to allow one to pull an attribute or a portion
           of the SpecObjs list
+        - ``__setitem__`` to replace one of the SpecObj objects
         - ``__setattr__`` to force a custom assignment method
         - ``__getattr__`` to generate an array of attribute 'k' from the
           specobjs.
 
+    The arrays of scalar attributes (e.g., ``DET`` or ``SPAT_PIXPOS``) are
+    cached as columns, which are kept in sync when objects are added, removed,
+    or selected, and rebuilt if any :class:`~pypeit.specobj.SpecObj` is
+    modified.  Array attributes (e.g., the extracted spectra) are always
+    constructed from the individual objects.
+
     Args:
         specobjs (`numpy.ndarray`_, list, optional):
             One or more :class:`~pypeit.specobj.SpecObj`  objects
@@ -50,8 +57,9 @@ class SpecObjs:
             Baseline header to use
 
     Attributes:
-        summary (`astropy.table.Table`_):
-            Summary table (?)
+        specobjs (`numpy.ndarray`_):
+            Read-only object array with the
+            :class:`~pypeit.specobj.SpecObj` objects.
     """
     version = '1.0.0'
 
@@ -164,7 +172,8 @@ class SpecObjs:
         """
         if not '_SpecObjs__initialised' in self.__dict__:  # this test allows attributes to be set in the __init__ method
             return dict.__setattr__(self, item, value)
-        elif item in self.__dict__:  # any normal attributes are handled normally
+        elif item in self.__dict__ or isinstance(getattr(type(self), item, None), property):
+            # any normal attributes are handled normally
             dict.__setattr__(self, item, value)
         else:
             # Special handling when the input is an array/list and the length matches that of the slice
@@ -177,6 +186,52 @@ class SpecObjs:
             for specobj in self.specobjs:
                 setattr(specobj, item, value)
 
+    @property
+    def specobjs(self):
+        """
+        The :class:`~pypeit.specobj.SpecObj` objects.
+
+        This is a read-only view of the underlying array, which has extra
+        capacity to allow objects to be appended efficiently; use
+        :func:`add_sobj`, :func:`remove_sobj`, or ``sobjs[i] = sobj`` to change
+        the objects.
+        """
+        view = self._sobj_buffer[:self._nsobj]
+        view.flags.writeable = False
+        return view
+
+    @specobjs.setter
+    def specobjs(self, value):
+        _value = np.asarray(value.specobjs if isinstance(value, SpecObjs) else value)
+        self._sobj_buffer = np.empty(_value.size, dtype=object)
+        self._sobj_buffer[:] = _value.ravel()
+        self._nsobj = _value.size
+        self._reset_columns()
+
+    def _reset_columns(self, columns=None):
+        """
+        Reset the cached attribute arrays.
+
+        Args:
+            columns (:obj:`dict`, optional):
+                New set of cached arrays.  If None, the cache is emptied.
+        """
+        # NOTE: Set directly to avoid __setattr__, which would set the
+        # attributes of the SpecObj objects instead.
+        self.__dict__['_columns'] = {} if columns is None else columns
+        if len(self.__dict__['_columns']) > 0:
+            self._track_columns()
+
+    def _track_columns(self):
+        """
+        Register this object with each of its
+        :class:`~pypeit.specobj.SpecObj` objects so that setting any of
+        their attributes empties the cached attribute arrays; see
+        :func:`~pypeit.specobj.SpecObj.add_owner`.
+        """
+        for sobj in self.specobjs:
+            sobj.add_owner(self)
+
     @property
     def nobj(self):
         """
@@ -508,18 +563,35 @@ class SpecObjs:
                 :class:`~pypeit.specobj.SpecObj`.
         """
         if isinstance(sobj, specobj.SpecObj):
-            self.specobjs = np.append(self.specobjs, [sobj])
+            self._append([sobj])
             return
         if isinstance(sobj, SpecObjs):
-            # TODO: Possible to instead do np.append(self.specobjs, sobj.specobjs)?
-            for isobj in sobj:
-                self.specobjs = np.append(self.specobjs, isobj)
+            self._append(sobj.specobjs)
             return
         if not isinstance(sobj, (np.ndarray, list)):
             msgs.error(f'Unable to add {type(sobj)} objects to SpecObjs')
         if any([not isinstance(s, specobj.SpecObj) for s in sobj]):
             msgs.error('List or arrays of objects to add must all be of type SpecObj.')
-        self.specobjs = np.append(self.specobjs, sobj)
+        self._append(np.ravel(sobj))
+
+    def _append(self, sobjs):
+        """
+        Append SpecObj objects to the underlying array, growing its capacity
+        geometrically such that repeated appends are efficient.
+
+        Args:
+            sobjs (array-like):
+                The :class:`~pypeit.specobj.SpecObj` objects to append.
+        """
+        n = len(sobjs)
+        if self._nsobj + n > self._sobj_buffer.size:
+            buffer = np.empty(max(2*self._sobj_buffer.size, self._nsobj + n, 8), dtype=object)
+            buffer[:self._nsobj] = self._sobj_buffer[:self._nsobj]
+            self._sobj_buffer = buffer
+        for i in range(n):
+            self._sobj_buffer[self._nsobj+i] = sobjs[i]
+        self._nsobj += n
+        self._reset_columns()
 
     def remove_sobj(self, index):
         """
@@ -531,7 +603,9 @@ class SpecObjs:
         msk = np.ones(self.specobjs.size, dtype=bool)
         msk[index] = False
         # Do it
+        columns = {k: v[msk] for k, v in self._columns.items()}
         self.specobjs = self.specobjs[msk]
+        self._reset_columns(columns=columns)
 
     def ready_for_fluxing(self):
         # Fluxing
@@ -669,7 +743,24 @@ class SpecObjs:
             # here for the many ways to give a slice; a tuple of ndarray
             # is produced by np.where, as in t[np.where(t['a'] > 2)]
             # For all, a new table is constructed with slice of all columns
-            return SpecObjs(specobjs=self.specobjs[item], header=self.header)
+            sobjs = SpecObjs(specobjs=self.specobjs[item], header=self.header)
+            sobjs._reset_columns(columns={k: v[item] for k, v in self._columns.items()})
+            return sobjs
+
+    def __setitem__(self, item, value):
+        """
+        Replace one of the SpecObj objects.
+
+        Args:
+            item (:obj:`int`):
+                Index of the object to replace.
+            value (:class:`~pypeit.specobj.SpecObj`):
+                The new object.
+        """
+        if not isinstance(value, specobj.SpecObj):
+            msgs.error(f'Unable to add {type(value)} objects to SpecObjs')
+        self._sobj_buffer[:self._nsobj][item] = value
+        self._reset_columns()
 
     def __getattr__(self, attr):
         """
@@ -687,7 +778,45 @@ class SpecObjs:
         except NameError:
             raise NameError(f'{attr} is not an attribute of SpecObjs or SpecObj.')
 
-        return lst_to_array([getattr(specobj, attr) for specobj in self.specobjs])
+        if attr in self._columns:
+            return self._columns[attr].copy()
+        values = [getattr(sobj, attr) for sobj in self.specobjs]
+        arr = lst_to_array(values)
+        # Only cache attributes that cannot be changed in place.  Array
+        # attributes, like the spectra, are always collected from the
+        # individual objects.
+        if all([v is None or isinstance(v, (str, int, float, np.generic)) for v in values]):
+            if len(self._columns) == 0:
+                self._track_columns()
+            self._columns[attr] = arr
+            return arr.copy()
+        return arr
+
+    def __getstate__(self):
+        """
+        Return the instance attributes for pickling.
+
+        Defined explicitly (along with :func:`__setstate__`) so that pickling
+        does not fall through to :func:`__getattr__` before :attr:`specobjs`
+        is defined, which leads to an infinite recursion.  Pickling is
+        required to pass objects between processes.
+
+        The cached attribute arrays are not included because the unpickled
+        :class:`~pypeit.specobj.SpecObj` objects do not keep track of the
+        objects that cache their attributes; see
+        :func:`~pypeit.specobj.SpecObj.add_owner`.
+        """
+        return {key: val for key, val in self.__dict__.items() if key != '_columns'}
+
+    def __setstate__(self, state):
+        """
+        Restore the instance attributes when unpickling; see
+        :func:`__getstate__`.  The cache of attribute arrays is emptied.
+        """
+        self.__dict__.update(state)
+        # NOTE: Set directly to avoid __setattr__, which would set the
+        # attributes of the SpecObj objects instead.
+        self.__dict__['_columns'] = {}
 
     # Printing
     def __repr__(self):
@@ -713,7 +842,7 @@ class SpecObjs:
         return self.specobjs.shape
 
     def write_to_fits(self, subheader, outfile, overwrite=True, update_det=None,
-                      slitspatnum=None, history=None, debug=False):
+                      slitspatnum=None, history=None, debug=False, writer=None):
         """
         Write the set of SpecObj objects to one multi-extension FITS file
 
@@ -728,8 +857,14 @@ class SpecObjs:
             update_det (int or list, optional):
               If provided, do not clobber the existing file but only update
               the indicated detectors.  Useful for re-running on a subset of detectors
+            writer (:class:`~pypeit.io.FitsWriter`, optional):
+              If provided, the HDUs are constructed by this method, but the
+              file is written by the background writer.
 
         """
+        if writer is not None and writer.is_pending(outfile):
+            # Make sure any previous version of the file has been written
+            writer.wait()
         if os.path.isfile(outfile) and not overwrite:
             msgs.warn(f'{outfile} exits. Set overwrite=True to overwrite it.')
             return
@@ -835,6 +970,9 @@ class SpecObjs:
             raise NotImplementedError('Debugging for developers only.')
              #embed()
              #exit()
+        if writer is not None:
+            writer.submit(hdulist, outfile, overwrite=overwrite)
+            return
         hdulist.writeto(outfile, overwrite=overwrite)
         msgs.info(f'Wrote 1D spectra to {outfile}')
 
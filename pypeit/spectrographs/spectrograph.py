@@ -1546,17 +1546,17 @@ class Spectrograph:
             :obj:`list`: A list of `astropy.io.fits.Header`_ objects with the
             extension headers.  If ``strict`` is False and ``inp`` is a file
             name to be opened, the function will return None if
-            :func:`~pypeit.io.fits_open` faults for any reason.
+            :func:`~pypeit.io.fits_headers` faults for any reason.
         """
         if inp is None:
             return None
 
-        # Faster to open the whole file and then assign the headers,
-        # particularly for gzipped files (e.g., DEIMOS)
+        # Read all the headers with a single pass through the file,
+        # particularly for gzipped files (e.g., DEIMOS).  The data are skipped.
         if isinstance(inp, (str, Path)):
             self._check_extensions(inp)
             try:
-                hdul = io.fits_open(inp)
+                return io.fits_headers(inp)
             except:
                 if strict:
                     msgs.error(f'Cannot open {inp}.')
@@ -1565,10 +1565,8 @@ class Spectrograph:
                     return None
         elif isinstance(inp, (list, fits.HDUList)):
             # TODO: If a list, check that the list elements are HDUs?
-            hdul = inp
-        else:
-            msgs.error(f'Input to get_headarr has incorrect type: {type(inp)}.')
-        return [hdu.header for hdu in hdul]
+            return [hdu.header for hdu in inp]
+        msgs.error(f'Input to get_headarr has incorrect type: {type(inp)}.')
 
     def check_frame_type(self, ftype, fitstbl, exprng=None):
         """
@@ -0,0 +1,106 @@
+"""
+Module to run tests on the automated wavelength calibration
+"""
+import numpy as np
+
+from pypeit.core.wavecal import autoid, waveio, wvutils
+from pypeit.par import pypeitpar
+
+
+def synthetic_arc(line_list, wave0, disp, nspec=2048):
+    """
+    Construct a synthetic arc spectrum with a quadratic wavelength solution.
+    """
+    pix = np.arange(nspec)
+    wave = wave0 + disp*pix + 2e-6*(pix - nspec/2)**2
+    # The line amplitudes are tied to the line list so that all spectra agree
+    amp = np.random.default_rng(1).uniform(100, 1000, len(line_list))
+    indx = (line_list['wave'] > wave[0]) & (line_list['wave'] < wave[-1])
+    spec = np.sum(amp[indx,None] * np.exp(-0.5*((wave[None,:] - line_list['wave'][indx,None])
+                                                 / (2*disp))**2), axis=0)
+    return wave, spec + 10.
+
+
+def test_calibrate_slits():
+    line_list, _, _ = waveio.load_line_lists(['ArI', 'NeI'])
+    wave_arxiv, spec_arxiv = synthetic_arc(line_list, 6000., 1.2)
+    spec = np.column_stack([synthetic_arc(line_list, 6000.+s, 1.2)[1] for s in [3., 1., -2.]])
+
+    par = pypeitpar.WavelengthSolutionPar()
+    fit_kwargs = dict(match_toler=par['match_toler'], func=par['func'], n_first=par['n_first'],
+                      sigrej_first=par['sigrej_first'], sigrej_final=par['sigrej_final'])
+    tasks = [dict(slit=slit, iarxiv=0) for slit in range(spec.shape[1])]
+    kwargs = dict(spec=spec, spec_arxiv=spec_arxiv[:,None], wave_arxiv=wave_arxiv[:,None],
+                  line_list=line_list, nreid_min=1, fit_kwargs=fit_kwargs, sigdetect=5.,
+                  fwhm=4., nonlinear_counts=1e10)
+
+    serial = autoid.calibrate_slits(autoid.reidentify_slit, tasks, n_proc=1, **kwargs)
+    parallel = autoid.calibrate_slits(autoid.reidentify_slit, tasks, n_proc=2, **kwargs)
+
+    assert len(serial) == len(parallel) == len(tasks), 'Bad number of results'
+    for s, p in zip(serial, parallel):
+        assert s[2]['acceptable'], 'Reidentification failed'
+        assert s[3]['rms'] < 0.5, 'Bad fit'
+        # The results must not depend on the number of processes
+        assert np.array_equal(s[0], p[0]), 'Detections changed'
+        assert np.array_equal(s[3]['pypeitfit']['fitc'], p[3]['pypeitfit']['fitc']), \
+                'Fit changed'
+
+
+def test_xcorr_shift_stretch_batch():
+    line_list, _, _ = waveio.load_line_lists(['ArI', 'NeI'])
+    _, spec = synthetic_arc(line_list, 6000., 1.2)
+    pix = np.arange(spec.size)
+    # Archived spectra with known shifts and stretches relative to spec
+    shifts = np.array([-20., 5.5, 12.3])
+    stretches = np.array([1.01, 0.995, 1.])
+    spec_arxiv = np.column_stack([np.interp(pix*t + s, pix, spec, left=0., right=0.)
+                                  for s, t in zip(shifts, stretches)])
+    xcorr_arxiv = np.column_stack([wvutils.get_xcorr_arc(spec_arxiv[:,i])
+                                   for i in range(shifts.size)] + [np.zeros(spec.size)])
+
+    success, shift, stretch, stretch2, corr, _, _ \
+            = wvutils.xcorr_shift_stretch_batch(spec, xcorr_arxiv, nrefine=2,
+                                                stretch_func='linear')
+    # Only the two best-matching spectra are refined, and the last one has no
+    # lines
+    assert np.array_equal(np.sort(success), [-1, 0, 1, 1]), 'Bad refinement'
+    assert success[-1] == 0, 'Spectrum without lines should fail'
+    indx = success[:-1] == 1
+    assert np.allclose(shift[:-1][indx], shifts[indx], atol=0.5), 'Bad shift'
+    assert np.allclose(stretch[:-1][indx], stretches[indx], atol=1e-3), 'Bad stretch'
+    assert np.all(stretch2 == 0.), 'Linear stretch should not have a second-order term'
+    assert np.all(corr[:-1][indx] > 0.95), 'Bad cross-correlation'
+
+
+def test_reid_arxiv_lines(tmp_path):
+    line_list, _, _ = waveio.load_line_lists(['ArI', 'NeI'])
+    spec_arxiv = np.column_stack([synthetic_arc(line_list, 6000.+s, 1.2)[1] for s in [0., 40.]])
+
+    cont_sub, det, xcorr = autoid.reid_arxiv_lines(spec_arxiv, xcorr=True, cache_size=1.,
+                                                   cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 1, 'Result not cached'
+    cache_file = list(tmp_path.glob('*.npz'))[0]
+    _cont_sub, _det, _xcorr = autoid.reid_arxiv_lines(spec_arxiv, xcorr=True, cache_size=1.,
+                                                      cache_dir=tmp_path)
+    assert np.array_equal(cont_sub, _cont_sub), 'Bad cached continuum-subtracted spectra'
+    assert np.array_equal(xcorr, _xcorr), 'Bad cached synthetic arcs'
+    assert list(det.keys()) == list(_det.keys()), 'Bad cached detections'
+    assert all([np.array_equal(det[k], _det[k]) for k in det.keys()]), 'Bad cached detections'
+
+    # Different parameters are cached separately
+    autoid.reid_arxiv_lines(spec_arxiv, sigdetect=10., xcorr=True, cache_size=1.,
+                            cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 2, 'Parameters not part of the cache key'
+
+    # The least recently used file is removed when the cache is full
+    nbytes = sum(f.stat().st_size for f in tmp_path.glob('*.npz'))
+    autoid.reid_arxiv_lines(spec_arxiv, xcorr=True, cache_size=1.1*nbytes/1024**2,
+                            cache_dir=tmp_path)
+    autoid.reid_arxiv_lines(spec_arxiv, sigdetect=20., xcorr=True,
+                            cache_size=1.1*nbytes/1024**2, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.npz'))) == 2, 'Cache not pruned'
+    assert cache_file.exists(), 'Recently used file removed'
+    _cont_sub, _det, _xcorr = autoid.reid_arxiv_lines(spec_arxiv, xcorr=True, cache_size=0.,
+                                                      cache_dir=tmp_path)
+    assert np.array_equal(cont_sub, _cont_sub), 'Bad continuum-subtracted spectra'
@@ -75,6 +75,27 @@ def test_intrv_versions():
     assert np.allclose(indx, _indx), 'Differences in index'
 
 
+@bspline_ext_required
+def test_action_versions():
+    from pypeit.bspline.utilpy import bspline_action as action_py
+    from pypeit.bspline.utilc import bspline_action as action_c
+    from pypeit.bspline.utilc import intrv
+
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0., 10., 1000))
+    sset = bspline.bspline(x, nord=4, npoly=3, bkspace=0.5)
+    breakpoints = sset.breakpoints[sset.mask]
+    indx = intrv(sset.nord, breakpoints, x)
+    basis = rng.normal(size=(x.size, 3))
+
+    action = action_py(sset.nord, breakpoints, x, indx, basis)
+    _action = action_c(sset.nord, breakpoints, x, indx, basis)
+    assert _action.flags['F_CONTIGUOUS'], 'Action matrix must be column-major'
+    assert np.allclose(action, _action), 'Differences in action'
+    # The b-spline basis functions sum to unity
+    assert np.allclose(np.sum(sset.bsplvn(x, indx), axis=1), 1.), 'Bad b-spline basis'
+
+
 @bspline_ext_required
 def test_solution_array_versions_time():
     command = "solution_arrays(d['nn'], d['npoly'], d['nord'], d['ydata'], d['action'], " \
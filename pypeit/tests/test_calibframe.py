@@ -10,7 +10,7 @@ import numpy as np
 import pytest
 
 from pypeit.pypmsgs import PypeItError
-from pypeit.calibframe import CalibFrame
+from pypeit.calibframe import CalibFrame, CalibFrameCache
 from pypeit import io
 from pypeit.tests.tstutils import data_output_path
 
@@ -32,6 +32,16 @@ class MinimalCalibFrame(CalibFrame):
     calib_type = 'Minimal'
 
 
+class ImageCalibFrame(CalibFrame):
+    version = '1.0.0'
+    calib_type = 'Image'
+    datamodel = {**CalibFrame.datamodel,
+                 'image': dict(otype=np.ndarray, atype=np.floating, descr='Image')}
+
+    def __init__(self, PYP_SPEC=None, image=None):
+        super().__init__(d={'PYP_SPEC': PYP_SPEC, 'image': image})
+
+
 def test_implementation_faults():
     # CalibFrame cannot be instantiated by itself because a version of the
     # datamodel does not exist.
@@ -180,3 +190,74 @@ def test_hdr():
     assert hdr['CALIBID'] == ','.join(calib.calib_id)
 
 
+
+
+def test_cache():
+    odir = Path(data_output_path('')).absolute()
+    calib = ImageCalibFrame(PYP_SPEC='this is a test', image=np.ones((10,10), dtype=float))
+    calib.set_paths(odir, 'A', '1', 'DET01')
+    calib.to_file(overwrite=True)
+    opath = Path(calib.get_path()).absolute()
+
+    cache = CalibFrameCache(max_size=1.)
+    _calib = cache.load(ImageCalibFrame, opath)
+    assert len(cache) == 1, 'Frame should have been cached'
+    assert cache.nbytes == calib.image.nbytes, 'Bad size'
+    # Altering the returned object should not alter the cached object
+    _calib.image[0,0] = 2.
+    _calib = cache.load(ImageCalibFrame, opath)
+    assert _calib.image[0,0] == 1., 'Cached object was altered'
+    assert _calib.calib_key == calib.calib_key, 'Bad calibration key'
+
+    # A rewritten file should be read again
+    calib.image[0,0] = 3.
+    calib.image = np.vstack((calib.image, calib.image))
+    calib.to_file(overwrite=True)
+    _calib = cache.load(ImageCalibFrame, opath)
+    assert _calib.image[0,0] == 3., 'Changed file not reread'
+    assert len(cache) == 1, 'Should replace the cached frame'
+
+    # Least-recently used frames should be evicted
+    cache.max_size = 1.5 * calib.image.nbytes / 1024**2
+    calib.set_paths(odir, 'A', '2', 'DET01')
+    calib.to_file(overwrite=True)
+    opath2 = Path(calib.get_path()).absolute()
+    _calib = cache.load(ImageCalibFrame, opath2)
+    assert len(cache) == 1, 'Frame should have been evicted'
+    assert cache.construct_key(ImageCalibFrame, opath2) in cache._cache, 'Wrong frame evicted'
+
+    # Caching can be turned off
+    cache = CalibFrameCache(max_size=0)
+    _calib = cache.load(ImageCalibFrame, opath)
+    assert len(cache) == 0, 'Nothing should be cached'
+
+    opath.unlink()
+    opath2.unlink()
+
+
+def test_cache_insert(monkeypatch):
+    odir = Path(data_output_path('')).absolute()
+    calib = ImageCalibFrame(PYP_SPEC='this is a test', image=np.ones((10,10), dtype=float))
+    calib.set_paths(odir, 'A', '1', 'DET01')
+    calib.to_file(overwrite=True)
+    opath = Path(calib.get_path()).absolute()
+
+    # Frames are cached when they are written
+    cache = CalibFrameCache(max_size=1.)
+    cache.insert(calib)
+    assert len(cache) == 1, 'Frame should have been cached'
+    # Altering the inserted object should not alter the cached object
+    calib.image[0,0] = 2.
+    # The cached frame is used instead of reading the file
+    with monkeypatch.context() as m:
+        m.setattr(ImageCalibFrame, 'from_file', None)
+        _calib = cache.load(ImageCalibFrame, opath)
+    assert _calib.image[0,0] == 1., 'Cached object was altered'
+    assert _calib.calib_key == calib.calib_key, 'Bad calibration key'
+
+    # Nothing is cached if caching is turned off
+    cache = CalibFrameCache(max_size=0)
+    cache.insert(calib)
+    assert len(cache) == 0, 'Nothing should be cached'
+
+    opath.unlink()
@@ -0,0 +1,48 @@
+"""
+Module to run tests on the 1D coadding
+"""
+import numpy as np
+
+from pypeit.core import coadd
+
+
+def test_stack_binning():
+    rng = np.random.default_rng(1)
+    wave_grid = np.logspace(np.log10(4000.), np.log10(5000.), 501)
+    waves = [np.sort(rng.uniform(3900., 5100., n)) for n in [800, 1000, 1200]]
+    # Include pixels on the edges of the grid
+    waves[0][:3] = [wave_grid[0], wave_grid[10], wave_grid[-1]]
+    values = [rng.normal(size=wave.size) for wave in waves]
+    gpms = [rng.uniform(size=wave.size) > 0.1 for wave in waves]
+
+    binning = coadd.StackBinning(wave_grid, waves)
+    gpm = binning.flatten(gpms)
+    nused, total = binning.accumulate(gpm, binning.flatten(values))
+
+    wave_flat = binning.wave[gpm]
+    assert np.array_equal(nused, np.histogram(wave_flat, bins=wave_grid)[0]), 'Bad counts'
+    assert np.allclose(total, np.histogram(wave_flat, bins=wave_grid,
+                                           weights=binning.flatten(values)[gpm])[0]), 'Bad sums'
+
+
+def test_compute_stack():
+    rng = np.random.default_rng(1)
+    wave_grid = np.linspace(4000., 5000., 201)
+    waves = [np.linspace(4003., 4997., 1000) + rng.uniform(-2., 2.) for _ in range(3)]
+    fluxes = [1. + rng.normal(scale=0.1, size=wave.size) for wave in waves]
+    ivars = [np.full(wave.size, 100.) for wave in waves]
+    gpms = [np.ones(wave.size, dtype=bool) for wave in waves]
+    weights = [np.full(wave.size, w) for wave, w in zip(waves, [1., 2., 3.])]
+
+    wave_stack, flux_stack, ivar_stack, gpm_stack, nused \
+            = coadd.compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights)
+    binning = coadd.StackBinning(wave_grid, waves)
+    _wave_stack, _flux_stack, _ivar_stack, _gpm_stack, _nused \
+            = coadd.compute_stack(wave_grid, waves, fluxes, ivars, gpms, weights, binning=binning)
+
+    assert np.array_equal(flux_stack, _flux_stack), 'Binning should not change the stack'
+    assert np.array_equal(nused, _nused), 'Binning should not change the counts'
+    assert np.all(gpm_stack), 'All bins should have data'
+    assert np.all((wave_stack > wave_grid[:-1]) & (wave_stack < wave_grid[1:])), \
+            'Stacked wavelengths should be within their bins'
+    assert np.sum(nused) == 3000, 'All pixels should be used'
@@ -2,6 +2,7 @@
 Module to run tests on collate_1d code.
 """
 
+import copy
 import pytest
 import os, os.path
 
@@ -246,6 +247,46 @@ def test_group_spectra_by_pixel(monkeypatch):
     assert [x.NAME for x in source_list[5].spec_obj_list] == ['SPAT6934_SLIT6245_DET05']
 
 
+def test_group_spectra_many_sources():
+    # Compare the indexed grouping against comparing every source to every
+    # collated source
+    rng = np.random.default_rng(1234)
+    spectrograph = load_spectrograph('keck_deimos')
+    headers = [mock_header('spec1d_file1'), mock_header('spec1d_file1')]
+    headers[1]['DISPNAME'] = '600ZD'
+
+    nsrc = 150
+    ra = 201.1 + rng.uniform(-1, 1, size=nsrc)/3600.
+    dec = 27.3 + rng.uniform(-1, 1, size=nsrc)/3600.
+    pix = rng.uniform(0, 200, size=nsrc)
+    hdr = rng.integers(2, size=nsrc)
+
+    for match_type, tolerance in zip(['ra/dec', 'pixel'], [0.3, 3.0]):
+        source_list = [SourceObject(MockSpecObj(MASKDEF_OBJNAME='object', MASKDEF_ID='1', DET=1,
+                                                RA=ra[i], DEC=dec[i], SPAT_PIXPOS=pix[i],
+                                                NAME=f'SPAT{i}', WAVE_RMS=0.01),
+                                    headers[hdr[i]], f'spec1d_file{i}', spectrograph, match_type)
+                        for i in range(nsrc)]
+
+        brute_list = []
+        for source in source_list:
+            found = False
+            for collated_source in brute_list:
+                if collated_source.match(source.spec_obj_list[0], source.spec1d_header_list[0],
+                                         tolerance, u.arcsec):
+                    collated_source.combine(source)
+                    found = True
+            if not found:
+                brute_list.append(copy.deepcopy(source))
+
+        collated_list = collate_spectra_by_source(source_list, tolerance, u.arcsec)
+        assert len(collated_list) == len(brute_list)
+        assert [x.spec1d_file_list for x in collated_list] \
+                    == [x.spec1d_file_list for x in brute_list]
+        # The input sources should not have changed
+        assert all([len(x.spec_obj_list) == 1 for x in source_list])
+
+
 def test_config_key_match():
 
     file_list = ['spec1d_file1', 'spec1d_file2']
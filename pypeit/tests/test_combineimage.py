@@ -0,0 +1,78 @@
+"""
+Module to test image combination
+"""
+import tempfile
+
+import pytest
+import numpy as np
+
+from pypeit import dataPaths
+from pypeit.images.combineimage import CombineImage
+from pypeit.spectrographs.util import load_spectrograph
+
+
+def test_combine_stack_blocks():
+    # Build a fake stack of images with outliers and masked pixels
+    rng = np.random.default_rng(99)
+    shape = (7, 50, 40)
+    img_stack = rng.normal(size=shape, loc=100., scale=10.)
+    img_stack[rng.uniform(size=shape) > 0.95] *= 10.
+    scl_stack = rng.uniform(size=shape, low=0.9, high=1.1)
+    rn2img_stack = np.full(shape, 4., dtype=float)
+    basev_stack = rng.uniform(size=shape)
+    gpm_stack = rng.uniform(size=shape) > 0.1
+    gpm_stack[:,0,0] = False
+
+    for method in ['mean', 'median']:
+        full = CombineImage.combine_stack(img_stack, scl_stack, rn2img_stack, basev_stack,
+                                          gpm_stack, combine_method=method)
+        # Combining in blocks of rows must give identical results
+        blocks = [CombineImage.combine_stack(img_stack[:,i:i+6], scl_stack[:,i:i+6],
+                                             rn2img_stack[:,i:i+6], basev_stack[:,i:i+6],
+                                             gpm_stack[:,i:i+6], combine_method=method)
+                    for i in range(0, shape[1], 6)]
+        for f, b in zip(full, zip(*blocks)):
+            assert np.array_equal(f, np.concatenate(b, axis=0)), \
+                f'Block combination is different for {method}'
+        assert not full[4][0,0], 'Pixel masked in all images should be masked'
+        assert full[5][0,0] == 0, 'Pixel masked in all images should have no contributions'
+
+
+def test_combine_parallel():
+    files = [str(dataPaths.tests.get_file_path(f'b{i}.fits.gz')) for i in [21, 22, 23]]
+    spectrograph = load_spectrograph('shane_kast_blue')
+    par = spectrograph.default_pypeit_par()['calibrations']['biasframe']['process']
+    serial = CombineImage(spectrograph, 1, par, files).run()
+
+    # Processing the files in parallel must give identical results, including
+    # when the stack is held in memory-mapped files
+    for mem_limit in [None, 1]:
+        par['n_proc'] = 2
+        par['comb_mem_limit'] = mem_limit
+        parallel = CombineImage(spectrograph, 1, par, files).run()
+        for attr in ['image', 'ivar', 'rn2img', 'base_var', 'img_scale']:
+            assert np.array_equal(serial[attr], parallel[attr]), \
+                f'Parallel processing changed {attr}'
+        assert np.array_equal(serial.fullmask.mask, parallel.fullmask.mask), \
+            'Parallel processing changed the mask'
+
+
+def test_combine_scratch_cleanup(tmp_path, monkeypatch):
+    files = [str(dataPaths.tests.get_file_path(f'b{i}.fits.gz')) for i in [21, 22, 23]]
+    spectrograph = load_spectrograph('shane_kast_blue')
+    par = spectrograph.default_pypeit_par()['calibrations']['biasframe']['process']
+    par['comb_mem_limit'] = 1
+
+    # Force the combination to fail after the stack is written to disk
+    def failed_combination(*args, **kwargs):
+        assert len(list(tmp_path.iterdir())) == 1, 'Stack should be written to disk'
+        raise ValueError('Combination failed')
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    monkeypatch.setattr(CombineImage, 'combine_stack', staticmethod(failed_combination))
+
+    # NOTE: The exception (and its traceback) are kept while checking the
+    # directory, such that the removal does not rely on garbage collection
+    with pytest.raises(ValueError, match='Combination failed') as excinfo:
+        CombineImage(spectrograph, 1, par, files).run()
+    assert excinfo.tb is not None
+    assert len(list(tmp_path.iterdir())) == 0, 'Temporary files should be removed'
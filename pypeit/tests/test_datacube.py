@@ -0,0 +1,108 @@
+"""
+Module to run tests on the datacube resampling routines
+"""
+import numpy as np
+
+from pypeit import utils
+from pypeit import alignframe
+from pypeit import coadd3d
+from pypeit.core import datacube
+from pypeit.slittrace import SlitTraceSet
+
+
+def test_subpixel_occurrences():
+    rng = np.random.default_rng(1)
+    vox_index = rng.integers(-1, 5, size=(20, 8))
+    wght = datacube.subpixel_occurrences(vox_index)
+    assert np.array_equal(wght, np.apply_along_axis(utils.occurrences, 1, vox_index)), \
+            'Vectorized weights should match the weights of each row'
+
+
+def test_bin_voxels():
+    rng = np.random.default_rng(2)
+    outshape = (4, 5, 6)
+    binrng = np.array([[0., 4.], [-1., 1.], [10., 16.]])
+    # Include coordinates outside the cube
+    vox_coord = rng.uniform(binrng[:,0] - 0.5, binrng[:,1] + 0.5, size=(1000, 3))
+    weights = [rng.uniform(size=1000), np.ones(1000)]
+    vox_index = datacube.voxel_index(vox_coord, outshape, binrng)
+    assert np.all((vox_index == -1) == np.any((vox_coord < binrng[:,0])
+                                              | (vox_coord >= binrng[:,1]), axis=1)), \
+            'Coordinates outside the cube should have an index of -1'
+    offset, parts = datacube.bin_voxels(vox_index, weights)
+    for part, w in zip(parts, weights):
+        cube = np.zeros(outshape)
+        cube.reshape(-1)[offset:offset+part.size] += part
+        hist, _ = np.histogramdd(vox_coord, bins=outshape, range=binrng, weights=w)
+        assert np.allclose(cube, hist), 'Binned cube should match the histogram'
+    # The partial cubes can be returned in single precision
+    _offset, _parts = datacube.bin_voxels(vox_index, weights, dtype=np.float32)
+    assert _offset == offset, 'Offset should not depend on the data type'
+    for _part, part in zip(_parts, parts):
+        assert _part.dtype == np.float32, 'Wrong data type'
+        assert np.allclose(_part, part, rtol=1e-6), 'Single precision cube is different'
+
+
+def test_empty_cube(tmp_path):
+    cube = datacube.empty_cube((3, 4, 5))
+    assert isinstance(cube, np.ndarray) and not isinstance(cube, np.memmap), 'Should be in memory'
+    cube = datacube.empty_cube((3, 4, 5), dtype=np.float32, memmap_dir=str(tmp_path))
+    assert isinstance(cube, np.memmap), 'Should be memory mapped'
+    assert cube.dtype == np.float32 and cube.shape == (3, 4, 5), 'Wrong type or shape'
+    assert not np.any(cube), 'Cube should be initialized to zero'
+
+
+def synthetic_ifu(nspec=100, nslices=4, slice_width=12, gap=3, seed=5):
+    """
+    Construct a small slicer-IFU exposure and return the positional arguments
+    of :func:`~pypeit.core.datacube.subpixellate`.
+    """
+    rng = np.random.default_rng(seed)
+    nspat = nslices*(slice_width + gap) + gap
+    left = gap + np.arange(nslices)*(slice_width + gap) + 0.3
+    left = np.tile(left, (nspec, 1))
+    slits = SlitTraceSet(left, left + slice_width - 0.6, 'SlicerIFU', nspat=nspat,
+                         PYP_SPEC='dummy')
+    spec = np.arange(nspec)[:,None]
+    spat = np.arange(nspat)[None,:]
+    tilts = (spec + 0.01*(spat - nspat/2))/(nspec-1)
+    slitmask = slits.slit_img(pad=0, initial=True)
+    wave0, dwave = 5000., 1.
+    waveimg = (wave0 + dwave*tilts*(nspec-1)) * (slitmask > -1)
+    sciimg = (100. + rng.normal(size=slitmask.shape)) * (slitmask > -1)
+
+    pxscl = 0.3/3600.
+    slscl = 1.0/3600.
+    exp_wcs = datacube.generate_WCS([180., 30., wave0], [-slscl, pxscl, dwave])
+    exp_wcs.wcs.crpix = [nslices/2, 0., 1.]
+    _left, _right, _ = slits.select_edges(initial=True)
+    astrom_trans = alignframe.AlignmentSplines(np.stack([_left, _right], axis=1),
+                                               np.array([0., 1.]), tilts)
+    raimg, decimg, _ = slits.get_radec_image(exp_wcs, astrom_trans, tilts)
+    dar = coadd3d.DARcorrection(1.1, 0., 611., 2., 10., np.cos(np.radians(30.)))
+    slitid_img_gpm = np.clip(slitmask, 0, None)
+    output_wcs, bins, _ = datacube.create_wcs(raimg, decimg, waveimg, slitid_img_gpm,
+                                              pxscl, dwave)
+    return (output_wcs, bins, sciimg, np.ones_like(sciimg), waveimg, slitid_img_gpm,
+            np.ones_like(sciimg), exp_wcs, tilts, slits, astrom_trans, dar, 0., 0.)
+
+
+def test_subpixellate_parallel():
+    args = list(synthetic_ifu())
+    # Use two exposures, each with its own weights, to test that the partial
+    # cubes are accumulated in the same order
+    frame_args = slice(2, 14)
+    args[frame_args] = [[a, a] for a in args[frame_args]]
+    args[6] = [args[6][0], 2*args[6][1]]
+    kwargs = dict(spec_subpixel=2, spat_subpixel=2, slice_subpixel=2)
+    serial = datacube.subpixellate(*args, **kwargs)
+    parallel = datacube.subpixellate(*args, n_proc=2, **kwargs)
+    assert np.any(serial[0] != 0), 'Cube should not be empty'
+    for s, p in zip(serial, parallel):
+        assert np.array_equal(s, p, equal_nan=True), 'Parallel resampling changed the cube'
+    # Same for single-precision cubes
+    serial = datacube.subpixellate(*args, dtype=np.float32, **kwargs)
+    parallel = datacube.subpixellate(*args, n_proc=2, dtype=np.float32, **kwargs)
+    for s, p in zip(serial, parallel):
+        assert np.array_equal(s, p, equal_nan=True), 'Parallel resampling changed the cube'
+    assert serial[0].dtype == np.float32, 'Wrong data type'
@@ -0,0 +1,68 @@
+"""
+Module to run tests on the object finding routines
+"""
+import numpy as np
+
+from pypeit.core import findobj_skymask
+
+
+def synthetic_echelle():
+    """
+    Build a noisy image with four curved orders, each with one object.  The
+    last two orders abut.
+    """
+    rng = np.random.default_rng(42)
+    nspec, nspat = 400, 300
+    spec = np.arange(nspec)
+    curve = 5*((spec - nspec/2)/nspec)**2
+    slit_left = np.stack([10.3, 80.7, 160.2, 215.1]) + curve[:,None]
+    slit_righ = np.stack([60.6, 140.1, 214.6, 270.5]) + curve[:,None]
+    slit_spats = np.array([35, 110, 187, 243])
+
+    spat = np.arange(nspat)[None,:]
+    slitmask = np.full((nspec, nspat), -1, dtype=int)
+    image = rng.normal(scale=1., size=(nspec, nspat))
+    for i in range(slit_spats.size):
+        onslit = (spat > slit_left[:,i,None]) & (spat < slit_righ[:,i,None])
+        slitmask[onslit] = slit_spats[i]
+        obj = slit_left[:,i,None] + 0.4*(slit_righ[:,i,None] - slit_left[:,i,None])
+        image += onslit * 20*np.exp(-0.5*((spat - obj)/1.5)**2)
+    ivar = np.ones_like(image)
+    spec_min_max = np.array([[0]*4, [nspec-1]*4])
+    return image, ivar, slitmask, slit_left, slit_righ, slit_spats, spec_min_max
+
+
+def test_rectify_and_clip_slits():
+    image, ivar, slitmask, slit_left, slit_righ, slit_spats, spec_min_max = synthetic_echelle()
+    gpm = ivar > 0
+    # Rectify all orders at once
+    rect = findobj_skymask.rectify_and_clip_slits(image, ivar, gpm, slit_left, slit_righ,
+                                                  spec_min_max, slitmask=slitmask,
+                                                  slit_ids=slit_spats)
+    assert len(rect) == slit_spats.size, 'Should get one result per order'
+    # ... and compare to rectifying them one at a time
+    for i in range(slit_spats.size):
+        _rect = findobj_skymask.rectify_and_clip_slits(image, ivar, gpm & (slitmask == slit_spats[i]),
+                                                       slit_left[:,i], slit_righ[:,i],
+                                                       spec_min_max[:,i])
+        assert len(_rect) == 1, 'Should get one result'
+        for r, _r in zip(rect[i], _rect[0]):
+            assert np.array_equal(r, _r), 'Batched rectification should be identical'
+
+
+def test_ech_findobj_ineach_order():
+    image, ivar, slitmask, slit_left, slit_righ, slit_spats, spec_min_max = synthetic_echelle()
+    order_vec = np.arange(slit_spats.size)
+    plate_scale = np.full(slit_spats.size, 0.2)
+    sobjs = findobj_skymask.ech_findobj_ineach_order(image, ivar, slitmask, slit_left, slit_righ,
+                                                      slit_spats, order_vec, spec_min_max,
+                                                      plate_scale, nperorder=1)
+    assert len(sobjs) == slit_spats.size, 'Should find one object per order'
+    # Compare to the objects found by rectifying each order separately
+    for i in range(slit_spats.size):
+        thismask = slitmask == slit_spats[i]
+        _sobjs = findobj_skymask.objs_in_slit(image, ivar, thismask, slit_left[:,i],
+                                              slit_righ[:,i], spec_min_max=spec_min_max[:,i],
+                                              boxcar_rad=10., nperslit=1)
+        assert np.array_equal(sobjs[i].TRACE_SPAT, _sobjs[0].TRACE_SPAT), 'Traces changed'
+        assert sobjs[i].smash_snr == _sobjs[0].smash_snr, 'S/N changed'
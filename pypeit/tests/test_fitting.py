@@ -54,3 +54,23 @@ def test_legendre():
 def test_robust_fit():
     # NEED A TEST!!
     pass
+
+
+def test_iterfit_masked_breakpoints():
+    # Requiring more points per breakpoint interval than are available masks
+    # breakpoints such that fewer than 2*nord remain.  The fit should exit
+    # gracefully, instead of using an action matrix that cannot be built.
+    rng = np.random.default_rng(1)
+    x = np.linspace(0., 1., 200)
+    y = np.sin(3*x) + rng.normal(scale=0.01, size=x.size)
+    sset, outmask = fitting.iterfit(x, y, invvar=np.ones_like(x), bkpt=np.array([0., 0.5, 1.]),
+                                    nord=4, kwargs_bspline={'requiren': 150})
+    assert sset.mask.sum() < 2*sset.nord, 'Breakpoints should have been masked'
+    assert np.all(sset.coeff == 0.), 'Fit should not have been performed'
+    assert np.all(outmask), 'No data should be rejected'
+
+    # Fit succeeds without masking the breakpoints
+    sset, outmask = fitting.iterfit(x, y, invvar=np.ones_like(x), bkpt=np.array([0., 0.5, 1.]),
+                                    nord=4)
+    assert np.all(sset.mask), 'No breakpoints should be masked'
+    assert np.allclose(sset.value(x)[0], np.sin(3*x), atol=0.01), 'Bad fit'
@@ -9,6 +9,7 @@ import numpy as np
 
 from pypeit import flatfield
 from pypeit import bspline
+from pypeit import slittrace
 from pypeit.spectrographs.util import load_spectrograph
 from pypeit.tests.tstutils import data_output_path
 
@@ -60,6 +61,38 @@ def test_flatimages():
     ofile.unlink()
 
 
+def test_fit2illumflat():
+    # Slits
+    nspec, nspat = 100, 60
+    spec = np.arange(nspec)
+    left = np.stack([3.5 + 0.02*spec, 24. + 0.*spec, 40.2 - 0.01*spec], axis=1)
+    right = np.stack([20.7 + 0.02*spec, 38. + 0.*spec, 58.4 - 0.01*spec], axis=1)
+    slits = slittrace.SlitTraceSet(left, right, 'MultiSlit', nspat=nspat, PYP_SPEC='dummy')
+    # Fit a different illumination profile to each slit
+    x = np.linspace(0., 1., 200)
+    spat_bsplines = []
+    for i in range(slits.nslits):
+        spat_bspline = bspline.bspline(x, bkspace=0.1)
+        spat_bspline.fit(x, 1. + (i+1)*0.1*x*(1-x), np.ones_like(x))
+        spat_bsplines += [spat_bspline]
+    flatImages = flatfield.FlatImages(pixelflat_raw=np.ones((nspec, nspat)),
+                                      illumflat_spat_bsplines=np.asarray(spat_bsplines),
+                                      spat_id=slits.spat_id, PYP_SPEC='dummy')
+
+    for spat_flexure in [None, 1.5]:
+        illumflat = flatImages.fit2illumflat(slits, spat_flexure=spat_flexure)
+        # Evaluate the profiles using the slit ID image
+        _illumflat = np.ones((nspec, nspat), dtype=float)
+        for i in range(slits.nslits):
+            slitid_img = slits.slit_img(slitidx=i, flexure=spat_flexure)
+            onslit = slitid_img == slits.spat_id[i]
+            spat_coo = slits.spatial_coordinate_image(slitidx=i, slitid_img=slitid_img,
+                                                      flexure_shift=spat_flexure)
+            _illumflat[onslit] = spat_bsplines[i].value(spat_coo[onslit])[0]
+        assert np.array_equal(illumflat, _illumflat), 'Illumination profile changed'
+        assert np.any(illumflat != 1.), 'Profiles not evaluated'
+
+
 def test_fit_det_response():
     spec = load_spectrograph('keck_kcwi')
     # Generate a good pixel mask
@@ -77,3 +110,12 @@ def test_fit_det_response():
     assert np.allclose(img, model, atol=0.001), 'structure fitting failed.'
 
 
+
+
+def test_expand_cutout():
+    img = np.arange(24.).reshape(4,6)
+    cut = np.s_[:, 2:4]
+    new_cut = np.s_[:, 1:5]
+    _img = flatfield.expand_cutout(img[cut], cut, new_cut, -1.)
+    assert np.array_equal(_img[:,1:3], img[cut]), 'Cutout not copied'
+    assert np.all(_img[:,[0,3]] == -1.), 'Bad fill value'
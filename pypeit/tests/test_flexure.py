@@ -9,6 +9,7 @@ from linetools.spectra.io import readspec
 from pypeit.core import flexure
 from pypeit import dataPaths
 from pypeit.core.wavecal import autoid
+from pypeit.slittrace import SlitTraceSet
 
 from IPython import embed
 
@@ -42,3 +43,33 @@ def test_flex_image():
     xshft, yshft = flexure.calculate_image_offset(img[:-1, :-1], img[:-1, :-1])
     assert(np.abs(xshft) < 1.0e-6 and np.abs(yshft) < 1.0e-6)
 
+
+
+def test_spat_cross_correlate_fft():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(30,50))
+    y = rng.normal(size=(30,50))
+    lags, xcorr = flexure.spat_cross_correlate_fft(x, y, 10)
+    # Correlate each row separately
+    _xcorr = np.sum([np.correlate(_x, _y, mode='full')[39:60] for _x, _y in zip(x, y)], axis=0)
+    assert np.array_equal(lags, np.arange(-10., 11.)), 'Bad lags'
+    assert np.allclose(xcorr, _xcorr), 'Bad cross-correlation'
+
+
+def test_spat_flexure_shift():
+    # Slits offset by a known shift
+    nspec, nspat, shift = 200, 310, 4.3
+    spec = np.arange(nspec)
+    left = np.stack([10.3 + i*50. + 0.01*spec for i in range(6)], axis=1)
+    right = left + 40.
+    slits = SlitTraceSet(left, right, 'MultiSlit', nspat=nspat, PYP_SPEC='dummy')
+    spat = np.arange(nspat)[None,:,None]
+    sciimg = 100.*np.clip(np.minimum(spat + 0.5, right[:,None,:] + shift)
+                          - np.maximum(spat - 0.5, left[:,None,:] + shift), 0, 1).sum(axis=2)
+    sciimg += np.random.default_rng(2).normal(size=sciimg.shape)
+
+    _shift = flexure.spat_flexure_shift(sciimg, slits, method='correlate')
+    assert np.absolute(_shift - shift) < 1., 'Bad reference shift'
+    for method in ['fft', 'collapse']:
+        _shift = flexure.spat_flexure_shift(sciimg, slits, method=method)
+        assert np.absolute(_shift - shift) < 0.2, f'Bad shift for {method}'
@@ -2,9 +2,14 @@
 Tests on io module
 """
 from pathlib import Path
+import multiprocessing
+import time
 
 from IPython import embed
 
+import numpy as np
+
+from astropy.io import fits
 from astropy.table import Table
 
 from pypeit import dataPaths
@@ -50,3 +55,101 @@ def test_grab_rawfiles():
     assert len(_raw_files) == 9, 'Found the wrong number of files'
     assert all([str(root / f) in _raw_files for f in tbl['filename']]), 'Missing expected files'
 
+
+def test_fits_headers(tmp_path, monkeypatch):
+    ofile = tmp_path / 'test.fits'
+    fits.HDUList([fits.PrimaryHDU(np.ones((10,10))),
+                  fits.ImageHDU(np.ones((20,20)), name='IMAGE'),
+                  fits.CompImageHDU(np.arange(400.).reshape(20,20), name='COMP')]
+                 ).writeto(ofile)
+
+    # The data must not be read
+    def no_data(*args, **kwargs):
+        raise AssertionError('Data should not be read')
+    monkeypatch.setattr(fits.hdu.base._BaseHDU, '_get_raw_data', no_data)
+    headers = io.fits_headers(ofile)
+    monkeypatch.undo()
+
+    assert [h.get('EXTNAME') for h in headers] == [None, 'IMAGE', 'COMP'], 'Bad extensions'
+    assert all([h == fits.getheader(ofile, i) for i, h in enumerate(headers)]), 'Bad headers'
+    assert headers[2]['NAXIS1'] == 20, 'Compressed image header should be decompressed'
+
+
+def test_load_telluric_band(tmp_path):
+    # FITS data are big-endian
+    models = np.arange(3*50, dtype='>f4').reshape(3,50)
+    ofile = tmp_path / 'telluric.fits'
+    fits.HDUList([fits.PrimaryHDU(data=models)]).writeto(ofile)
+    cache_dir = tmp_path / 'cache'
+
+    # Not cached by default
+    with io.fits_open(ofile) as hdul:
+        band = io.load_telluric_band(hdul[0], 12, 18, cache_dir=cache_dir)
+    assert band.dtype.isnative, 'Band should be in native byte order'
+    assert band.dtype == np.float32, 'Band should keep the data type of the file'
+    assert np.array_equal(band, models[:,12:18]), 'Bad band'
+    assert not cache_dir.exists(), 'Band should not be cached'
+
+    # The cached band includes the full blocks
+    cache_size = 1e-3
+    with io.fits_open(ofile) as hdul:
+        _band = io.load_telluric_band(hdul[0], 12, 18, cache_size=cache_size,
+                                      cache_dir=cache_dir, nblocks=5)
+    assert np.array_equal(_band, band), 'Band changed'
+    assert len(list(cache_dir.glob('telluric_*_10_20.npy'))) == 1, 'Band should be cached'
+
+    # A similar band is read from the same cached file
+    with io.fits_open(ofile) as hdul:
+        _band = io.load_telluric_band(hdul[0], 11, 19, cache_size=cache_size,
+                                      cache_dir=cache_dir, nblocks=5)
+    assert isinstance(_band, np.memmap), 'Cached band should be memory-mapped'
+    assert np.array_equal(_band, models[:,11:19]), 'Cached band changed'
+    assert len(list(cache_dir.glob('*.npy'))) == 1, 'Band should be read from the cache'
+
+    # The least recently used band is removed to limit the size of the cache
+    with io.fits_open(ofile) as hdul:
+        _band = io.load_telluric_band(hdul[0], 31, 39, cache_size=200/1024**2,
+                                      cache_dir=cache_dir, nblocks=5)
+    assert np.array_equal(_band, models[:,31:39]), 'Bad band'
+    assert [f.name.split('_')[-2:] for f in cache_dir.glob('*.npy')] == [['30', '40.npy']], \
+            'Cache should only include the last band'
+
+    # Bands larger than the cache are not cached
+    with io.fits_open(ofile) as hdul:
+        _band = io.load_telluric_band(hdul[0], 0, 50, cache_size=200/1024**2,
+                                      cache_dir=cache_dir, nblocks=5)
+    assert np.array_equal(_band, models), 'Bad band'
+    assert len(list(cache_dir.glob('*.npy'))) == 1, 'Band should not be cached'
+
+
+def test_fits_writer(tmp_path):
+    files = [tmp_path / f'tst_{i}.fits' for i in range(4)]
+    written = []
+    with io.FitsWriter(queue_size=2) as writer:
+        for i, ofile in enumerate(files):
+            writer.submit(fits.HDUList([fits.PrimaryHDU(data=np.full((10,10), i))]), ofile)
+            # Functions are called in order with the written files
+            writer.call(lambda ofile=ofile: written.append(ofile.exists()), ofile)
+        # Cannot overwrite
+        writer.submit(fits.HDUList([fits.PrimaryHDU()]), files[0], overwrite=False)
+        writer.wait()
+        assert not writer.is_pending(files[0]), 'Should have been written'
+    assert written == [True]*len(files), 'Files should be written in order'
+    for i, ofile in enumerate(files):
+        assert np.all(fits.getdata(ofile) == i), 'Bad data'
+    assert len(writer.failures) == 1 and writer.failures[0][0] == str(files[0]), \
+            'Should fail to overwrite'
+    assert sorted(tmp_path.iterdir()) == files, 'Temporary files should be removed'
+
+
+def test_fits_writer_fork(tmp_path):
+    written = []
+    with io.FitsWriter() as writer:
+        writer.call(lambda: (time.sleep(0.5), written.append(True)), tmp_path / 'tst.fits')
+        # Forking waits until the submitted files are written
+        proc = multiprocessing.get_context('fork').Process(target=int)
+        proc.start()
+        assert written == [True], 'Files should be written before forking'
+        proc.join()
+        assert proc.exitcode == 0, 'Forked process failed'
+    assert writer not in io.FitsWriter._open_writers, 'Writer should be closed'
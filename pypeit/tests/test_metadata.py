@@ -1,6 +1,9 @@
 from pathlib import Path
 import shutil
 import os
+import json
+import sqlite3
+import functools
 
 from IPython import embed
 
@@ -9,6 +12,8 @@ import pytest
 import numpy as np
 
 from pypeit.tests import tstutils
+from pypeit import io
+from pypeit import metadata
 from pypeit.metadata import PypeItMetaData
 from pypeit.spectrographs.util import load_spectrograph
 from pypeit.scripts.setup import Setup
@@ -122,3 +127,55 @@ def test_multiple_setups():
     # Remove the created files
     for fil in filelist:
         os.remove(fil)
+
+
+def test_header_cache(monkeypatch):
+    tstutils.install_shane_kast_blue_raw_data()
+    files = [tstutils.data_output_path(f'b{i}.fits.gz') for i in [1, 11, 24, 27]]
+    spectrograph = load_spectrograph('shane_kast_blue')
+    par = spectrograph.default_pypeit_par()
+    cache_file = Path(tstutils.data_output_path('test_header_cache.db')).absolute()
+    if cache_file.exists():
+        cache_file.unlink()
+
+    # Read the headers directly and then using the cache, once to build the
+    # cache and once to read from it
+    pmd = PypeItMetaData(spectrograph, par, files=files)
+    pmd_new = PypeItMetaData(spectrograph, par, files=files, header_cache=cache_file)
+    pmd_cached = PypeItMetaData(spectrograph, par, files=files, header_cache=cache_file)
+    for key in pmd.keys():
+        assert np.array_equal(pmd[key], pmd_new[key]), f'{key} changed when building the cache'
+        assert np.array_equal(pmd[key], pmd_cached[key]), f'{key} changed when read from cache'
+
+    with io.HeaderCache(cache_file=cache_file) as cache:
+        assert all([cache.get(f) is not None for f in files]), 'Headers should be cached'
+        # Changing the file signature invalidates the cached headers
+        tmp_file = Path(tstutils.data_output_path('test_header_cache.fits.gz')).absolute()
+        shutil.copy(files[0], tmp_file)
+        cache.add(tmp_file, cache.get(files[0]))
+        assert cache.get(tmp_file) is not None, 'Headers should be cached'
+        os.utime(tmp_file, ns=(0, 0))
+        assert cache.get(tmp_file) is None, 'Cached headers should not be valid'
+
+    # The oldest headers are removed when the cache exceeds its size
+    with io.HeaderCache(cache_file=cache_file) as cache:
+        nbytes = len(json.dumps([h.tostring() for h in cache.get(files[-1])]))
+    with io.HeaderCache(cache_file=cache_file, max_size=1.5*nbytes/1024**2) as cache:
+        cache.add(files[0], cache.get(files[0]))
+    with io.HeaderCache(cache_file=cache_file) as cache:
+        assert cache.get(files[0]) is not None, 'Last cached headers should be kept'
+        assert all([cache.get(f) is None for f in files[1:]]), 'Old headers should be removed'
+
+    # The cache is skipped if it is locked by another process
+    lock = sqlite3.connect(str(cache_file))
+    lock.execute('BEGIN EXCLUSIVE')
+    with pytest.raises(sqlite3.OperationalError):
+        io.HeaderCache(cache_file=cache_file, timeout=0.1)
+    monkeypatch.setattr(metadata, 'HeaderCache', functools.partial(io.HeaderCache, timeout=0.1))
+    headarrs = pmd.read_headers(files, header_cache=cache_file)
+    assert all([len(h) > 0 for h in headarrs]), 'Headers should be read from the files'
+    lock.rollback()
+    lock.close()
+
+    cache_file.unlink()
+    tmp_file.unlink()
@@ -0,0 +1,67 @@
+"""
+Module to run tests on the arc-line pattern matching
+"""
+import itertools
+
+import numpy as np
+
+from pypeit.core.wavecal import patterns
+
+
+def brute_force_matches(detlines, linelist, nptn, detsrch, lstsrch, pixtol):
+    """
+    Find the matched patterns by looping over all pattern pairs.
+    """
+    dmatch, lmatch = [], []
+    for d in itertools.combinations(range(detlines.size), nptn):
+        if d[-1] - d[0] >= detsrch:
+            continue
+        dspan = detlines[d[-1]] - detlines[d[0]]
+        dval = (detlines[list(d[1:-1])] - detlines[d[0]]) / dspan
+        for l in itertools.combinations(range(linelist.size), nptn):
+            if l[-1] - l[0] >= lstsrch:
+                continue
+            lval = (linelist[list(l[1:-1])] - linelist[l[0]]) / (linelist[l[-1]] - linelist[l[0]])
+            if np.all(np.absolute(lval - dval) <= pixtol / dspan):
+                dmatch += [d]
+                lmatch += [l]
+    return np.array(dmatch).reshape(-1, nptn), np.array(lmatch).reshape(-1, nptn)
+
+
+def test_patterns():
+    rng = np.random.default_rng(1)
+    linelist = np.sort(rng.uniform(4000., 6000., 40))
+    # Detect a subset of the lines with a linear dispersion of 2 A/pix
+    detlines = np.sort((rng.choice(linelist, 15, replace=False) - 3900.)/2.
+                       + rng.normal(scale=0.1, size=15))
+
+    for nptn, generate_patterns in zip([3, 4], [patterns.triangles, patterns.quadrangles]):
+        dindex, lindex, wvcen, disps \
+                = generate_patterns(detlines, linelist, 1000, detsrch=5, lstsrch=6, pixtol=1.)
+        _dindex, _lindex = brute_force_matches(detlines, linelist, nptn, 5, 6, 1.)
+        # Sort the brute-force matches in the same order as the loops in the
+        # original implementation
+        srt = np.lexsort(np.vstack((_lindex[:,1:-1].T[::-1], _lindex[:,-1], _lindex[:,0],
+                                    _dindex[:,1:-1].T[::-1], _dindex[:,-1], _dindex[:,0])))
+        assert np.array_equal(dindex, _dindex[srt]), 'Bad detected-line patterns'
+        assert np.array_equal(lindex, _lindex[srt]), 'Bad line-list patterns'
+        assert wvcen.size == disps.size == dindex.shape[0], 'Bad number of solutions'
+
+    # The correct solution should be among the matched triangles
+    dindex, lindex, wvcen, disps = patterns.triangles(detlines, linelist, 1000, detsrch=5,
+                                                      lstsrch=6, pixtol=1.)
+    assert np.any(np.isclose(disps, 2., rtol=1e-3) & np.isclose(wvcen, 4900., atol=1.)), \
+            'Correct solution not found'
+
+
+def test_solve_triangles():
+    linelist = np.arange(10) * 100. + 4000.
+    # Line 0 is always matched to line 2, and line 1 is matched to lines 3 and 4
+    dindex = np.array([[0, 1, 2], [0, 1, 2], [0, 1, 2], [0, 1, 2]])
+    lindex = np.array([[2, 3, 5], [2, 3, 5], [2, 3, 5], [2, 4, 5]])
+    patt_dict = dict(acceptable=False, nmatch=0, ibest=-1, bwv=0., mask=np.zeros(4, dtype=bool))
+    patterns.solve_triangles(np.arange(4.), linelist, dindex, lindex, patt_dict)
+    assert patt_dict['acceptable'], 'Should find a solution'
+    assert np.array_equal(patt_dict['IDs'], [4200., 4300., 4500., 0.]), 'Bad IDs'
+    assert patt_dict['scores'] == ['Perfect', 'Good', 'Perfect', 'None'], 'Bad scores'
+    assert patt_dict['nmatch'] == 3, 'Bad number of matches'
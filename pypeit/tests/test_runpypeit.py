@@ -118,3 +118,144 @@ def test_run_pypeit():
     shutil.rmtree(outdir)
 
 
+
+
+def setup_kast_blue(outdir):
+    """
+    Write the pypeit file for the Kast blue test data to the provided directory.
+    """
+    testrawdir = dataPaths.tests.path
+    tstutils.install_shane_kast_blue_raw_data()
+    Setup.main(Setup.parse_args(['-r', str(testrawdir / 'b'), '-s', 'shane_kast_blue',
+                                 '-c all', '--output_path', str(outdir)]))
+    return outdir / 'shane_kast_blue_A' / 'shane_kast_blue_A.pypeit'
+
+
+def test_reduce_exposure_parallel(tmp_path, monkeypatch):
+
+    from types import SimpleNamespace
+    from pypeit import calibrations, pypeit, spec2dobj
+    from pypeit.images import imagebitmask
+    from pypeit.spectrographs.shane_kast import ShaneKastBlueSpectrograph
+
+    pyp_file = setup_kast_blue(tmp_path)
+
+    # Replace the calibration, object finding, and extraction steps with
+    # stand-ins for two detectors.  The forked processes inherit the patches.
+    def calib_one(self, frames, det, reuse_calibs=False):
+        return SimpleNamespace(success=True, failed_step=None, slits=f'slits_{det}')
+
+    def objfind_one(self, frames, det, bg_frames=None, std_outfile=None):
+        detector = self.spectrograph.get_detector_par(1)
+        detector.det = det
+        sobjs = specobjs.SpecObjs()
+        sobjs.add_sobj(specobjs.specobj.SpecObj('MultiSlit', detector.name, SLITID=det))
+        return np.full(5, det, dtype=float), sobjs, SimpleNamespace(detector=detector), \
+                None, None
+
+    def extract_one(self, frames, det, sciImg, bkg_redux_sciimg, objFind, initial_sky,
+                    sobjs_obj):
+        # The slits used for the extraction must be from the same detector
+        assert self.caliBrate.slits == f'slits_{det}'
+        img = np.full((5,5), det, dtype=float)
+        spec2d = spec2dobj.Spec2DObj(sciimg=img, ivarraw=img, skymodel=initial_sky[:,None]*img,
+                                     bkg_redux_skymodel=None, objmodel=img, ivarmodel=img,
+                                     scaleimg=img, waveimg=img,
+                                     bpmmask=imagebitmask.ImageBitMaskArray(img.shape),
+                                     detector=sciImg.detector, sci_spat_flexure=0.,
+                                     sci_spec_flexure=None, vel_type=None, vel_corr=None,
+                                     slits=None, wavesol=None, tilts=None,
+                                     maskdef_designtab=None)
+        return spec2d, sobjs_obj
+
+    monkeypatch.setattr(pypeit.PypeIt, 'select_detectors',
+                        staticmethod(lambda *args, **kwargs: [1, 2]))
+    monkeypatch.setattr(pypeit.PypeIt, 'calib_one', calib_one)
+    monkeypatch.setattr(pypeit.PypeIt, 'objfind_one', objfind_one)
+    monkeypatch.setattr(pypeit.PypeIt, 'extract_one', extract_one)
+    monkeypatch.setattr(ShaneKastBlueSpectrograph, 'get_det_name',
+                        staticmethod(lambda det: f'DET{det:02d}'))
+    monkeypatch.setattr(calibrations.Calibrations, 'get_association',
+                        staticmethod(lambda *args, **kwargs: {}))
+
+    results = []
+    for n_proc in [1, 2]:
+        pypeIt = pypeit.PypeIt(str(pyp_file), redux_path=str(tmp_path / f'nproc{n_proc}'))
+        pypeIt.par['rdx']['n_proc'] = n_proc
+        frames = np.where(pypeIt.fitstbl.find_frames('science'))[0][:1]
+        all_spec2d, all_specobjs = pypeIt.reduce_exposure(frames)
+        # The calibrations of the last detector are kept in both cases
+        assert pypeIt.caliBrate.slits == 'slits_2', 'Wrong calibrations kept'
+        results += [(all_spec2d, all_specobjs)]
+
+    (spec2d_serial, sobjs_serial), (spec2d_parallel, sobjs_parallel) = results
+    assert spec2d_serial.detectors == spec2d_parallel.detectors == ['DET01', 'DET02']
+    for detname in spec2d_serial.detectors:
+        assert np.array_equal(spec2d_serial[detname].skymodel,
+                              spec2d_parallel[detname].skymodel), 'Sky models differ'
+    assert np.array_equal(sobjs_serial.SLITID, sobjs_parallel.SLITID), 'Objects differ'
+    assert np.array_equal(sobjs_parallel.DET, ['DET01', 'DET02']), 'Objects out of order'
+
+
+def test_reduce_all_parallel(tmp_path, monkeypatch):
+
+    import os
+    from pypeit import msgs, pypeit
+
+    pyp_file = setup_kast_blue(tmp_path)
+
+    # Replace the calibrations and the reduction of each exposure with
+    # stand-ins.  The forked processes inherit the patches.
+    calls = dict(calib=0, end_time=0)
+    def calib_all_groups(self):
+        calls['calib'] += 1
+
+    def print_end_time(self):
+        calls['end_time'] += 1
+
+    def reduce_comb_group(self, calib_ID, frames, bg_frames, std_outfile=None):
+        return dict(calib=str(calib_ID), comb_id=int(self.fitstbl['comb_id'][frames[0]]),
+                    reuse_calibs=self.reuse_calibs, pid=os.getpid(),
+                    log='None' if self.logname is None else Path(self.logname).name)
+
+    monkeypatch.setattr(pypeit.PypeIt, '_calib_all_groups', calib_all_groups)
+    monkeypatch.setattr(pypeit.PypeIt, 'print_end_time', print_end_time)
+    monkeypatch.setattr(pypeit.PypeIt, 'reduce_comb_group', reduce_comb_group)
+    monkeypatch.setattr(pypeit.PypeIt, 'get_std_outfile', lambda self, std_frame: None)
+
+    summaries = []
+    for n_exp_proc in [1, 2]:
+        pypeIt = pypeit.PypeIt(str(pyp_file), redux_path=str(tmp_path / f'nproc{n_exp_proc}'))
+        pypeIt.par['rdx']['n_exp_proc'] = n_exp_proc
+        info = []
+        with monkeypatch.context() as m:
+            m.setattr(msgs, 'info', lambda msg: info.append(msg))
+            pypeIt.reduce_all()
+        summary = [m for m in info if m.startswith('Summary of the reduced exposures')]
+        assert len(summary) == 1, 'Summary should be reported once in both modes'
+        summaries += [summary[0]]
+
+    # The calibrations are only built first for the parallel reduction, and
+    # the elapsed time is only reported at the end of each reduction.
+    assert calls == dict(calib=1, end_time=2), 'Unexpected calls'
+    # The standard and science exposures are reduced in the same order
+    serial = summaries[0].split(msgs.newline())
+    parallel = summaries[1].split(msgs.newline())
+    assert len(serial) == len(parallel) == 5, 'Expected a header and two exposures'
+    assert [r.split()[:2] for r in serial] == [r.split()[:2] for r in parallel], \
+            'Exposures reduced in a different order'
+    # The parallel reductions reuse the calibrations in other processes
+    assert all(r.split()[2] == 'True' for r in parallel[3:]), 'Calibrations not reused'
+    assert all(int(r.split()[3]) != os.getpid() for r in parallel[3:]), \
+            'Exposures not reduced by other processes'
+
+    # Each process can reduce more than one group, and each group is logged to
+    # its own file
+    pypeIt.logname = str(tmp_path / 'run.log')
+    frames = np.where(pypeIt.fitstbl.find_frames('science')
+                      | pypeIt.fitstbl.find_frames('standard'))[0]
+    comb_groups = pypeIt.get_comb_groups(pypeIt.fitstbl.calib_groups[0], frames)
+    summary = pypeIt.reduce_comb_groups(2*comb_groups, 2)
+    comb_ids = [pypeIt.fitstbl['comb_id'][g[1][0]] for g in comb_groups]
+    assert [s['log'] for s in summary] == 2*[f'run_{c}.log' for c in comb_ids], 'Bad log files'
+    assert pypeIt.logname == str(tmp_path / 'run.log'), 'Log file name changed'
@@ -6,6 +6,7 @@ from IPython import embed
 
 import numpy as np
 
+from pypeit import specobj, specobjs, extraction, utils
 from pypeit.core import skysub
 from pypeit.images.buildimage import SkyRegions
 from pypeit.slittrace import SlitTraceSet
@@ -72,3 +73,100 @@ def test_skyregions_io():
     ofile.unlink()
 
 
+
+
+def synthetic_multislit():
+    """
+    Build a noisy image with two slits, each with one object.
+    """
+    rng = np.random.default_rng(1)
+    nspec, nspat = 200, 120
+    spec = np.arange(nspec)[:,None]
+    spat = np.arange(nspat)[None,:]
+    slit_left = np.array([10.2, 65.7])
+    slit_righ = np.array([55.4, 110.3])
+    slit_spats = np.array([33, 88])
+    slitmask = np.full((nspec, nspat), -1)
+    sky = 100 + 20*np.sin(spec/7.)
+    image = np.zeros((nspec, nspat)) + sky
+    sobjs = specobjs.SpecObjs()
+    for i in range(slit_spats.size):
+        onslit = np.broadcast_to((spat > slit_left[i]) & (spat < slit_righ[i]), image.shape)
+        slitmask[onslit] = slit_spats[i]
+        trace = slit_left[i] + 18.3 + 0.01*spec[:,0]
+        image = image + onslit*200*np.exp(-0.5*((spat-trace[:,None])/1.8)**2)
+        sobj = specobj.SpecObj('MultiSlit', 'DET01', SLITID=slit_spats[i])
+        sobj.TRACE_SPAT = trace
+        sobj.trace_spec = spec[:,0]
+        sobj.FWHM = 4.2
+        sobj.maskwidth = 12.
+        sobj.BOX_RADIUS = 5.
+        sobj.SPAT_PIXPOS = trace[nspec//2]
+        sobj.OBJID = 1
+        sobj.set_name()
+        sobjs.add_sobj(sobj)
+    var = image + 4.
+    image = image + rng.normal(size=image.shape)*np.sqrt(var)
+    images = dict(sciimg=image, sciivar=1/var,
+                  tilts=np.broadcast_to(spec/(nspec-1), image.shape).copy(),
+                  waveimg=(4000. + spec*2.)*(slitmask > -1),
+                  global_sky=np.broadcast_to(sky, image.shape).copy(),
+                  gpm=np.ones(image.shape, dtype=bool), slitmask=slitmask,
+                  base_var=np.full(image.shape, 4.))
+    cutouts = [np.s_[:, int(np.ceil(slit_left[i])):int(np.ceil(slit_righ[i]))]
+               for i in range(slit_spats.size)]
+    tasks = [(slit_spats[i], np.full(nspec, slit_left[i]), np.full(nspec, slit_righ[i]),
+              sobjs[np.array([i])], cutouts[i]) for i in range(slit_spats.size)]
+    return images, tasks
+
+
+def test_local_skysub_extract_slit():
+    # Without a cutout, the extraction is identical to using the full images
+    images, tasks = synthetic_multislit()
+    full = [extraction.local_skysub_extract_slit(*task[:-1], **images) for task in tasks]
+    images, tasks = synthetic_multislit()
+    for (slit_spat, slit_left, slit_righ, sobjs, _), f in zip(tasks, full):
+        thismask = images['slitmask'] == slit_spat
+        models = skysub.local_skysub_extract(images['sciimg'], images['sciivar'],
+                                             images['tilts'], images['waveimg'],
+                                             images['global_sky'], thismask, slit_left,
+                                             slit_righ, sobjs, ingpm=images['gpm'] & thismask,
+                                             base_var=images['base_var'])
+        for _m, _f in zip(models, f[1:6]):
+            assert (_m is None and _f is None) or np.array_equal(_m, _f), \
+                    'Extraction changed the models'
+        for key in ['TRACE_SPAT', 'OPT_COUNTS', 'OPT_COUNTS_IVAR']:
+            assert np.array_equal(getattr(sobjs[0], key), getattr(f[6][0], key)), \
+                    f'Extraction changed {key}'
+
+    # Extract the slit cutouts serially ...
+    images, tasks = synthetic_multislit()
+    input_trace = [task[3][0].TRACE_SPAT.copy() for task in tasks]
+    serial = [extraction.local_skysub_extract_slit(*task, **images) for task in tasks]
+    for task, trace in zip(tasks, input_trace):
+        assert np.array_equal(task[3][0].TRACE_SPAT, trace), 'Input objects should not change'
+        assert task[3][0].OPT_COUNTS is None, 'Input objects should not be extracted'
+    # ... and in parallel
+    images, tasks = synthetic_multislit()
+    with utils.SharedProcessPool(2, extraction._local_skysub_extract_task, **images) as pool:
+        parallel = list(pool.map(tasks))
+
+    for f, s, p in zip(full, serial, parallel):
+        assert s[0] == p[0], 'Cutouts should be the same'
+        assert s[0][1].start > 0, 'Cutout should not include the full detector'
+        for _s, _p in zip(s[1:6], p[1:6]):
+            assert (_s is None and _p is None) or np.array_equal(_s, _p), \
+                    'Parallel extraction changed the models'
+        assert np.array_equal(s[6][0].OPT_COUNTS, p[6][0].OPT_COUNTS), \
+                'Parallel extraction changed the spectrum'
+        # The cutout only changes the results to within numerical precision
+        assert np.allclose(s[6][0].TRACE_SPAT, f[6][0].TRACE_SPAT, rtol=0., atol=0.05), \
+                'Cutout changed the trace'
+        for key in ['OPT_COUNTS', 'OPT_COUNTS_IVAR', 'BOX_COUNTS']:
+            assert np.allclose(getattr(s[6][0], key), getattr(f[6][0], key), rtol=1e-3), \
+                    f'Cutout changed {key}'
+        assert s[6][0].min_spat == f[6][0].min_spat and s[6][0].max_spat == f[6][0].max_spat, \
+                'Cutout changed the extraction region'
+        # The models are returned for the same pixels on the slit
+        assert np.allclose(s[3], f[3], rtol=0., atol=1.), 'Cutout changed the object model'
+        assert np.allclose(s[4], f[4], rtol=5e-3), 'Cutout changed the model variance'
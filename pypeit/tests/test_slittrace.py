@@ -38,6 +38,69 @@ def test_init():
     assert np.all(center == 5), 'Bad center'
 
 
+def test_slit_cutout():
+    nspec, nspat = 100, 60
+    spec = np.arange(nspec)
+    left = np.stack([3.5 + 0.02*spec, 30.2 - 0.01*spec], axis=1)
+    right = np.stack([20.7 + 0.02*spec, 58.4 - 0.01*spec], axis=1)
+    slits = SlitTraceSet(left, right, 'MultiSlit', nspat=nspat, PYP_SPEC='dummy',
+                         specmin=np.array([10.,-1.]), specmax=np.array([80.,nspec]))
+    for pad in [0, 2, (1,-2)]:
+        slitmask = slits.slit_img(pad=pad)
+        for i in range(slits.nslits):
+            onslit = slitmask == slits.spat_id[i]
+            cut = slits.slit_cutout(i, pad=pad, trim_spec=True)
+            # The cutout is the bounding box of the slit pixels
+            spec_indx, spat_indx = np.where(onslit)
+            assert cut[0] == slice(spec_indx.min(), spec_indx.max()+1), 'Bad spectral range'
+            assert cut[1] == slice(spat_indx.min(), spat_indx.max()+1), 'Bad spatial range'
+            assert np.sum(onslit[cut]) == np.sum(onslit), 'Cutout missing slit pixels'
+            # By default, all spectral pixels are included
+            assert slits.slit_cutout(i, pad=pad)[0] == slice(None), 'Should include all rows'
+            # Spatial coordinates in the cutout match those in the full image
+            cut = slits.slit_cutout(i, pad=pad)
+            for full in [True, False]:
+                coo = slits.spatial_coordinate_image(slitidx=i, full=full, pad=pad)
+                _coo = slits.spatial_coordinate_image(slitidx=i, full=full, pad=pad, cutout=cut)
+                assert np.array_equal(coo[cut], _coo), 'Bad spatial coordinates in the cutout'
+
+
+def test_slit_img():
+    nspec, nspat = 100, 60
+    spec = np.arange(nspec)
+    spat = np.arange(nspat)
+    left = np.stack([3.5 + 0.02*spec, 24. + 0.*spec, 40.2 - 0.01*spec], axis=1)
+    right = np.stack([20.7 + 0.02*spec, 38. + 0.*spec, 58.4 - 0.01*spec], axis=1)
+    left[10:20,2] = np.nan
+    slits = SlitTraceSet(left, right, 'MultiSlit', nspat=nspat, PYP_SPEC='dummy',
+                         specmin=np.array([10.,-1.,5.5]), specmax=np.array([80.,nspec,90.2]))
+    for pad in [0, 2, (1,-2), 10]:
+        _left, _right, _ = slits.select_edges()
+        slitmask = slits.slit_img(pad=pad)
+        _pad = pad if isinstance(pad, tuple) else (pad,pad)
+        _slitmask = np.full((nspec,nspat), -1, dtype=int)
+        for i in range(slits.nslits):
+            with np.errstate(invalid='ignore'):
+                onslit = (spat[None,:] > _left[:,i,None] - _pad[0]) \
+                            & (spat[None,:] < _right[:,i,None] + _pad[1]) \
+                            & (spec > slits.specmin[i])[:,None] & (spec < slits.specmax[i])[:,None]
+            _slitmask[onslit] = slits.spat_id[i]
+            spec_indx, spat_indx = slits.slit_pixels(i, pad=pad)
+            assert np.array_equal(np.where(onslit), (spec_indx, spat_indx)), 'Bad slit pixels'
+        assert np.array_equal(slitmask, _slitmask), 'Bad slit image'
+
+    # The cached geometry is updated when the edges change
+    slits.init_tweaked()
+    slits.left_tweak[:,1] += 5.
+    assert np.sum(slits.slit_img() == slits.spat_id[1]) == nspec*8, 'Tweak not applied'
+    slits.left_tweak[:,1] -= 10.
+    assert np.sum(slits.slit_img() == slits.spat_id[1]) == nspec*18, 'Cache not invalidated'
+    assert np.sum(slits.slit_img(flexure=-20.) == slits.spat_id[1]) == nspec*18, \
+            'Bad flexure shift'
+    assert np.sum(slits.slit_img(initial=True) == slits.spat_id[1]) == nspec*13, \
+            'Bad initial edges'
+
+
 def test_io():
 
     slits = SlitTraceSet(np.full((1000,3), 2, dtype=float), np.full((1000,3), 8, dtype=float),
@@ -13,6 +13,7 @@ from astropy.table import Table
 from astropy.io import fits
 
 from pypeit import dataPaths
+from pypeit import io
 from pypeit import spec2dobj
 from pypeit.spectrographs.util import load_spectrograph
 from pypeit.tests import tstutils
@@ -92,6 +93,46 @@ def test_spec2dobj_io(init_dict):
     os.remove(ofile)
 
 
+def test_spec2dobj_partial_io(init_dict):
+    init_dict['detector'] = tstutils.get_kastb_detector()
+    spec2DObj = spec2dobj.Spec2DObj(**init_dict)
+    ofile = tstutils.data_output_path('tst_spec2d.fits')
+    if os.path.isfile(ofile):
+        os.remove(ofile)
+    spec2DObj.to_file(ofile)
+
+    # Only read some of the extensions
+    _spec2DObj = spec2dobj.Spec2DObj.from_file(ofile, spec2DObj.detname, attrs=['sciimg', 'slits'])
+    assert np.array_equal(_spec2DObj.sciimg, spec2DObj.sciimg), 'Bad read'
+    assert _spec2DObj.slits.nslits == 3, 'Bad read'
+    assert _spec2DObj.skymodel is None and _spec2DObj.bpmmask is None, 'Should not be read'
+    assert _spec2DObj.sci_spat_flexure == 3.5, 'Header items should always be read'
+
+    # Only read the images when they are accessed
+    _spec2DObj = spec2dobj.Spec2DObj.from_file(ofile, spec2DObj.detname, lazy=True)
+    assert 'sciimg' in _spec2DObj.lazy_items and 'bpmmask' in _spec2DObj.lazy_items, \
+            'Images should not be read'
+    assert 'slits' not in _spec2DObj.lazy_items, 'Slits should be read'
+    assert np.array_equal(_spec2DObj.sciimg, spec2DObj.sciimg), 'Bad lazy read'
+    assert np.array_equal(_spec2DObj['waveimg'], spec2DObj.waveimg), 'Bad lazy read'
+    assert np.array_equal(_spec2DObj.bpmmask.mask, spec2DObj.bpmmask.mask), 'Bad lazy read'
+    assert 'sciimg' not in _spec2DObj.lazy_items, 'Image should have been read'
+    _spec2DObj.skymodel = np.zeros_like(spec2DObj.skymodel)
+    assert 'skymodel' not in _spec2DObj.lazy_items, 'Setting the image should replace the read'
+    assert np.all(_spec2DObj.skymodel == 0.), 'Bad assignment'
+
+    # Write the object with the images that have not been read
+    _spec2DObj = spec2dobj.Spec2DObj.from_file(ofile, spec2DObj.detname, lazy=True)
+    _ofile = tstutils.data_output_path('tst_spec2d_lazy.fits')
+    _spec2DObj.to_file(_ofile, overwrite=True)
+    __spec2DObj = spec2dobj.Spec2DObj.from_file(_ofile, spec2DObj.detname)
+    spec2DObj = spec2dobj.Spec2DObj.from_file(ofile, spec2DObj.detname)
+    assert np.array_equal(__spec2DObj.ivarmodel, spec2DObj.ivarmodel), 'Bad write'
+
+    os.remove(ofile)
+    os.remove(_ofile)
+
+
 def test_spec2dobj_update_slit(init_dict):
     # Build two
     spec2DObj1 = spec2dobj.Spec2DObj(**init_dict,
@@ -174,6 +215,16 @@ def test_all2dobj_write(init_dict):
     assert __allspec2D['meta'] == _allspec2D['meta'], 'Bad read: meta mismatch'
     assert __allspec2D['meta'] != allspec2D['meta'], 'Bad read: meta mismatch'
     assert __allspec2D[detname].vel_corr == 2., 'Bad update'
+
+    # Same using the background writer
+    with io.FitsWriter() as writer:
+        allspec2D.write_to_fits(ofile, writer=writer)
+        # Waits for the file to be written before updating it
+        _allspec2D.write_to_fits(ofile, update_det='DET01', writer=writer)
+    assert len(writer.failures) == 0, 'Writing should not fail'
+    __allspec2D = spec2dobj.AllSpec2DObj.from_fits(ofile)
+    assert __allspec2D['meta'] == _allspec2D['meta'], 'Bad read: meta mismatch'
+    assert __allspec2D[detname].vel_corr == 2., 'Bad update'
     os.remove(ofile)
 
 
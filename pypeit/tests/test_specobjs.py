@@ -2,6 +2,7 @@
 Module to run tests on SpecObjs
 """
 import os
+import pickle
 
 from IPython import embed
 
@@ -79,6 +80,68 @@ def test_set(sobj1, sobj2, sobj3):
     assert sobjs.PYPELINE[0] == 'MultiSlit'
 
 
+def test_columns(sobj1, sobj2, sobj3, sobj4):
+    sobjs = specobjs.SpecObjs()
+    for sobj in [sobj1, sobj2, sobj3]:
+        sobjs.add_sobj(sobj)
+    assert np.array_equal(sobjs.DET, ['DET01', 'DET02', 'DET03'])
+    # Cached arrays are copies
+    det = sobjs.DET
+    det[0] = 'DET09'
+    assert sobjs.DET[0] == 'DET01'
+    # Modifying an object updates the array
+    sobj2.SLITID = 5
+    assert np.array_equal(sobjs.SLITID, [0, 5, 0])
+    # Selections and removals keep the arrays in sync
+    assert np.array_equal(sobjs[sobjs.SLITID == 0].DET, ['DET01', 'DET03'])
+    assert np.array_equal(sobjs[[2,1]].SLITID, [0, 5])
+    sobjs.remove_sobj(0)
+    assert np.array_equal(sobjs.DET, ['DET02', 'DET03'])
+    # As do additions and replacements
+    sobjs.add_sobj(specobjs.SpecObjs([sobj1]))
+    assert np.array_equal(sobjs.DET, ['DET02', 'DET03', 'DET01'])
+    sobjs[1] = sobj4
+    assert np.array_equal(sobjs.SLITID, [5, 10, 0])
+    with pytest.raises(ValueError):
+        sobjs.specobjs[0] = sobj3
+
+
+def test_columns_owner(sobj1, sobj2, sobj3):
+    sobjs = specobjs.SpecObjs([sobj1, sobj2])
+    other = specobjs.SpecObjs([sobj3])
+    assert np.array_equal(sobjs.SLITID, [0, 1])
+    assert np.array_equal(other.SLITID, [0])
+    # Modifying an object in one set does not empty the cache of the other
+    sobj3.SLITID = 3
+    assert 'SLITID' in sobjs._columns
+    assert np.array_equal(other.SLITID, [3])
+    # Selections are updated when the shared objects change
+    sub = sobjs[1:]
+    assert 'SLITID' in sub._columns
+    sobj2.SLITID = 7
+    assert np.array_equal(sub.SLITID, [7])
+    assert np.array_equal(sobjs.SLITID, [0, 7])
+    # Copies are independent
+    _sobj1 = sobj1.copy()
+    _sobj1.SLITID = 9
+    assert 'SLITID' in sobjs._columns
+    assert np.array_equal(sobjs.SLITID, [0, 7])
+
+
+def test_pickle(sobj1, sobj2):
+    sobjs = specobjs.SpecObjs([sobj1,sobj2])
+    # Cache one of the attribute arrays
+    det = sobjs.DET
+    _sobjs = pickle.loads(pickle.dumps(sobjs))
+    assert _sobjs.nobj == 2, 'Bad number of objects'
+    assert len(_sobjs._columns) == 0, 'Cached attributes should not be pickled'
+    assert np.array_equal(_sobjs.DET, det), 'Bad unpickled attributes'
+    _sobjs[0].DET = 'DET05'
+    assert np.array_equal(_sobjs.DET, ['DET05', det[1]]), 'Bad update of unpickled attributes'
+    _sobjs = pickle.loads(pickle.dumps(specobjs.SpecObjs()))
+    assert _sobjs.nobj == 0, 'Should be empty'
+
+
 def test_io(sobj1, sobj2, sobj3, sobj4):
     sobjs = specobjs.SpecObjs([sobj1,sobj2,sobj3,sobj4])
     sobjs[0]['BOX_WAVE'] = np.arange(1000).astype(float)
@@ -0,0 +1,59 @@
+"""
+Module to run tests on the telluric model evaluation
+"""
+import numpy as np
+
+from pypeit.core import telluric
+from pypeit.core.wavecal import wvutils
+
+
+def synthetic_tell_dict():
+    """
+    Build a small telluric PCA model with a log-uniform wavelength grid.
+    """
+    wave = 10**np.arange(np.log10(9000.), np.log10(9800.), 4e-6)
+    x = np.linspace(0, 1, wave.size)
+    tell_pca = np.array([0.1 + 0.05*np.sin(50*x*(k+1)) + 0.02*np.cos(300*x*(k+2)) for k in range(5)])
+    dwave, dloglam, resln_guess, pix_per_sigma = wvutils.get_sampling(wave)
+    return dict(wave_grid=wave, dloglam=dloglam, tell_pad_pix=int(np.ceil(10.0 * pix_per_sigma)),
+                ncomp_tell_pca=4, tell_pca=tell_pca, teltype='pca')
+
+
+def test_eval_telluric_vectorized():
+    rng = np.random.default_rng(3)
+    tell_dict = synthetic_tell_dict()
+    nsamp = 20
+    theta = np.vstack([rng.uniform(-1, 1, (4, nsamp)), rng.uniform(2000, 6000, nsamp),
+                       rng.uniform(-3, 3, nsamp), rng.uniform(0.95, 1.05, nsamp)])
+    for ind_lower, ind_upper in [(None, None), (100, 2000)]:
+        models = telluric.eval_telluric(theta, tell_dict, ind_lower=ind_lower, ind_upper=ind_upper)
+        for _theta, model in zip(theta.T, models):
+            _model = telluric.eval_telluric(_theta, tell_dict, ind_lower=ind_lower,
+                                            ind_upper=ind_upper)
+            assert np.allclose(model, _model, rtol=0, atol=1e-12), \
+                    'Vectorized models should match the models of each parameter vector'
+
+
+def test_tellfit_chi2_vectorized():
+    rng = np.random.default_rng(4)
+    tell_dict = synthetic_tell_dict()
+    ind_lower, ind_upper = 100, 2000
+    wave = tell_dict['wave_grid'][ind_lower:ind_upper+1]
+    obj_dict = dict(wave=wave, wave_min=wave.min(), wave_max=wave.max(), func='legendre',
+                    model='exp')
+    nsamp = 10
+    theta_obj = np.array([2., 0.1, -0.05])[:,None] + rng.normal(scale=0.01, size=(3, nsamp))
+    theta_tell = np.vstack([rng.uniform(-1, 1, (4, nsamp)), rng.uniform(2000, 6000, nsamp),
+                            rng.uniform(-3, 3, nsamp), rng.uniform(0.95, 1.05, nsamp)])
+    theta = np.vstack([theta_obj, theta_tell])
+    flux = telluric.eval_poly_model(theta_obj[:,0], obj_dict)[0] \
+                * telluric.eval_telluric(theta_tell[:,0], tell_dict, ind_lower=ind_lower,
+                                         ind_upper=ind_upper)
+    arg_dict = dict(obj_model_func=telluric.eval_poly_model, obj_dict=obj_dict,
+                    ivar=np.ones_like(flux), tell_dict=tell_dict, tell_npca=4,
+                    ind_lower=ind_lower, ind_upper=ind_upper)
+    gpm = np.ones(flux.size, dtype=bool)
+    chi2 = telluric.tellfit_chi2(theta, flux, gpm, arg_dict)
+    assert chi2.shape == (nsamp,), 'Should get one loss function per parameter vector'
+    assert np.allclose(chi2, [telluric.tellfit_chi2(t, flux, gpm, arg_dict) for t in theta.T]), \
+            'Vectorized loss function should match the loss of each parameter vector'
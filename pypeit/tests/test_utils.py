@@ -144,3 +144,27 @@ def test_occurrences():
     tstarr = np.array([2, 2, 1,  1, 3, 1, 3, 3, 1, 1])
     outarr = utils.occurrences(inparr)
     assert np.array_equal(outarr, tstarr), 'Occurrences has failed'
+
+
+def test_get_nproc():
+    assert utils.get_nproc(None, 4) == 1, 'Default should be serial'
+    assert utils.get_nproc(1, 4) == 1, 'Should be serial'
+    assert utils.get_nproc(8, 4) == 4, 'Should be limited by the number of tasks'
+    assert utils.get_nproc(2, 0) == 1, 'Should always be at least one process'
+    assert 1 <= utils.get_nproc(0, 1000) <= max(os.cpu_count(), 1), \
+            'Should be limited by the number of CPUs'
+
+
+def _scale_row(i, image=None, factor=1.):
+    return factor * image[i]
+
+
+def test_shared_process_pool():
+    image = np.arange(20.).reshape(10,2)
+    with utils.SharedProcessPool(2, _scale_row, image=image, factor=2.) as pool:
+        rows = np.array(list(pool.map(range(10))))
+        assert np.array_equal(rows, 2*image), 'Bad results'
+        # Results are returned in order when the number of pending tasks is limited
+        rows = np.array(list(pool.map(range(9, -1, -1), max_pending=2)))
+        assert np.array_equal(rows, 2*image[::-1]), 'Bad bounded results'
+        assert np.array_equal(pool.submit(3).result(), 2*image[3]), 'Bad submitted result'
@@ -12,7 +12,9 @@ import pathlib
 import itertools
 import glob
 import colorsys
+import collections
 import collections.abc
+import concurrent.futures
 
 from IPython import embed
 
@@ -368,6 +370,167 @@ def distinct_colors(num_colors):
     return colors
 
 
+def get_nproc(n_proc, ntasks):
+    """
+    Determine the number of processes to use for a set of independent tasks.
+
+    Args:
+        n_proc (:obj:`int`):
+            The requested number of processes.  If None or 1, only one process
+            is used.  If less than 1, the number of available CPUs is used.
+        ntasks (:obj:`int`):
+            The number of independent tasks to distribute.
+
+    Returns:
+        :obj:`int`: The number of processes to use, which is never larger than
+        ``ntasks`` and always at least 1.
+    """
+    if n_proc is None:
+        return 1
+    if n_proc < 1:
+        n_proc = os.cpu_count()
+        n_proc = 1 if n_proc is None else n_proc
+    return max(1, min(n_proc, ntasks))
+
+
+_shared_pool_data = {}
+"""
+Function and data shared by all the tasks executed by a single process of a
+:class:`SharedProcessPool`.
+"""
+
+
+def _init_shared_pool(func, shared):
+    """
+    Initialize a process of a :class:`SharedProcessPool`.
+
+    Args:
+        func (callable):
+            Function applied to each task.
+        shared (:obj:`dict`):
+            Keyword arguments passed to ``func`` for every task.
+    """
+    _shared_pool_data['func'] = func
+    _shared_pool_data['shared'] = shared
+
+
+def _call_shared(task):
+    """
+    Apply the function of a :class:`SharedProcessPool` to a task using the data
+    shared by this process; see :func:`_init_shared_pool`.
+
+    Args:
+        task (object):
+            The task-specific argument passed to the function.
+
+    Returns:
+        object: The result of the function.
+    """
+    result = _shared_pool_data['func'](task, **_shared_pool_data['shared'])
+    # Write the messages to the log file before returning
+    msgs.flush()
+    return result
+
+
+class SharedProcessPool:
+    """
+    Pool of processes that apply the same function to a set of tasks using
+    read-only data shared by all of the tasks.
+
+    The shared data are passed to each process once, when it is started,
+    instead of with every task.  When the processes are forked (the default on
+    linux), the data are shared with the parent process instead of being
+    copied.  The shared data should not be altered by the function; any
+    changes are only seen by the tasks executed by the same process.
+
+    The object can be used as a context manager, which shuts down the pool
+    on exit.
+
+    Args:
+        n_proc (:obj:`int`):
+            Number of processes.
+        func (callable):
+            Module-level function, or method of a picklable object, called as
+            ``func(task, **shared)`` for each task.
+        mp_context (`multiprocessing.context.BaseContext`_, optional):
+            Context used to start the processes.  If None, the default start
+            method is used.
+        **shared:
+            Keyword arguments passed to ``func`` for every task.
+    """
+    def __init__(self, n_proc, func, mp_context=None, **shared):
+        self.n_proc = n_proc
+        # Make sure the buffered messages are not duplicated by the new
+        # processes
+        msgs.flush()
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+                            max_workers=n_proc, mp_context=mp_context,
+                            initializer=_init_shared_pool, initargs=(func, shared))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+    def submit(self, task):
+        """
+        Submit a single task.
+
+        Args:
+            task (object):
+                The task-specific argument passed to the function.
+
+        Returns:
+            `concurrent.futures.Future`_: The future with the result.
+        """
+        return self.executor.submit(_call_shared, task)
+
+    def map(self, tasks, max_pending=None):
+        """
+        Apply the function to a set of tasks.
+
+        Args:
+            tasks (iterable):
+                The task-specific arguments passed to the function.
+            max_pending (:obj:`int`, optional):
+                The maximum number of tasks submitted but whose results have
+                not yet been returned.  This limits the number of results held
+                in memory when they are consumed more slowly than they are
+                produced.  If None, all the tasks are submitted at once.
+
+        Returns:
+            iterator: The results of the function, in the order of the tasks.
+        """
+        if max_pending is None:
+            return self.executor.map(_call_shared, tasks)
+        return self._bounded_map(tasks, max_pending)
+
+    def _bounded_map(self, tasks, max_pending):
+        """
+        Generator for :func:`map` that submits new tasks only as the results
+        are returned.
+        """
+        pending = collections.deque()
+        for task in tasks:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(self.submit(task))
+        while len(pending) > 0:
+            yield pending.popleft().result()
+
+    def shutdown(self, wait=True):
+        """
+        Shut down the processes.
+
+        Args:
+            wait (:obj:`bool`, optional):
+                Wait for all submitted tasks to finish.
+        """
+        self.executor.shutdown(wait=wait)
+
+
 def get_time_string(codetime):
     """
     Utility function that takes the codetime and
@@ -675,7 +675,8 @@ class BuildWaveCalib:
                 ok_mask=ok_mask_idx,
                 measured_fwhms=self.measured_fwhms,
                 orders=self.orders,
-                nonlinear_counts=self.nonlinear_counts)
+                nonlinear_counts=self.nonlinear_counts,
+                n_proc=self.par['n_proc'])
             patt_dict, final_fit = arcfitter.get_results()
 
             # Grab arxiv for redo later?
@@ -692,7 +693,8 @@ class BuildWaveCalib:
                                              measured_fwhms=self.measured_fwhms,
                                              nonlinear_counts=self.nonlinear_counts,
                                              nsnippet=self.par['nsnippet'], 
-                                             x_percentile=self.par['cc_percent_ceil'])
+                                             x_percentile=self.par['cc_percent_ceil'],
+                                             n_proc=self.par['n_proc'])
 
             # Grab arxiv for redo later?
             if self.par['echelle']: 
@@ -722,7 +724,7 @@ class BuildWaveCalib:
                 self.lamps, self.par, ok_mask=ok_mask_idx,
                 measured_fwhms=self.measured_fwhms,
                 nonlinear_counts=self.nonlinear_counts,
-                debug_all=False,
+                debug_all=False, n_proc=self.par['n_proc'],
                 redo_slits=np.atleast_1d(self.par['redo_slits']) if self.par['redo_slits'] is not None else None)
 
             # Save as internals in case we need to redo